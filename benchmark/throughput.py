@@ -0,0 +1,63 @@
+"""
+Measure the throughput of the element-wise kernels on long lists, with one
+core and with all the cores, and output the result as Markdown Table.
+
+Usage: python throughput.py [size ...]
+"""
+import gc
+import sys
+from timeit import timeit
+from typing import Callable, Dict, List
+
+import numpy as np
+import ulist as ul
+
+SIZES = [1_000_000, 10_000_000, 100_000_000]
+N_RUNS = 5
+
+TASKS: Dict[str, Callable] = {
+    "x * 2 + 1": lambda x, y: x * 2 + 1,
+    "x + y": lambda x, y: x + y,
+    "x / y": lambda x, y: x / y,
+    "x < 0.5": lambda x, y: x < 0.5,
+    "x < y": lambda x, y: x < y,
+}
+
+
+def _rows_per_sec(fn: Callable, x, y, size: int) -> float:
+    seconds = timeit(lambda: fn(x, y), number=N_RUNS) / N_RUNS
+    return size / seconds
+
+
+def _format(rows_per_sec: float) -> str:
+    return f"{rows_per_sec / 1e6:.1f}M"
+
+
+def _line(cells: List[str]) -> str:
+    return "| " + " | ".join(cells) + " |"
+
+
+def main(sizes: List[int]) -> None:
+    header = ["Task", "Rows", "numpy", "ulist 1 core", "ulist all cores"]
+    print("Throughput (rows/s):")
+    print()
+    print(_line(header))
+    print(_line(["-" * len(x) for x in header]))
+    threshold = ul.get_parallel_threshold()
+    for size in sizes:
+        x, y = ul.random(size, "float64"), ul.random(size, "float64")
+        x_np, y_np = np.asarray(x), np.asarray(y)
+        for name, fn in TASKS.items():
+            result = [_format(_rows_per_sec(fn, x_np, y_np, size))]
+            try:
+                ul.set_parallel_threshold(sys.maxsize)
+                result.append(_format(_rows_per_sec(fn, x, y, size)))
+            finally:
+                ul.set_parallel_threshold(threshold)
+            result.append(_format(_rows_per_sec(fn, x, y, size)))
+            print(_line([name, f"{size:,}"] + result))
+            gc.collect()
+
+
+if __name__ == "__main__":
+    main([int(x) for x in sys.argv[1:]] or SIZES)
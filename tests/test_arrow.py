@@ -0,0 +1,110 @@
+from typing import List
+
+import pytest
+import ulist as ul
+from ulist.typedef import ELEM_OPT
+from ulist.utils import check_test_result
+
+
+@pytest.mark.parametrize(
+    "dtype, nums",
+    [
+        ("bool", [True, False, None, True]),
+        ("bool", [True, None] * 50),
+        ("category", ["foo", "bar", None, "foo"]),
+        ("category", [None, None]),
+        ("float32", [1.0, None, 3.0]),
+        ("float64", [1.0, 2.0, 3.0]),
+        ("int32", [1, None, 3]),
+        ("int64", list(range(100))),
+        ("int64", []),
+        ("string", ["foo", "", None, "bär"]),
+        ("string", []),
+    ],
+)
+def test_arrow_c(dtype: str, nums: List[ELEM_OPT]) -> None:
+    arr = ul.from_seq(nums, dtype)
+    result = ul.from_arrow_c(arr)
+    assert result.dtype == dtype
+    check_test_result(dtype, "from_arrow_c", result, nums)
+    result = ul.from_arrow_c(arr.to_arrow_c())
+    check_test_result(dtype, "from_arrow_c", result, nums)
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, test_method, args",
+    [
+        ("bool", [True, False], "sort", (True,)),
+        ("category", ["foo", "bar"], "set", (0, "baz")),
+        ("float64", [1.0, 2.0], "pop", ()),
+        ("int32", [1, 2], "sort", (True,)),
+        ("int64", [1, 2], "append", (3,)),
+        ("string", ["foo", "bar"], "replace", ("foo", "baz")),
+    ],
+)
+def test_arrow_c_exports(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    test_method: str,
+    args: tuple,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    capsules = arr.to_arrow_c()
+    # The ulist can not be modified while the array is exported.
+    with pytest.raises(BufferError):
+        getattr(arr, test_method)(*args)
+    del capsules
+    getattr(arr, test_method)(*args)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64", "int32", "int64"])
+def test_arrow_c_shared(dtype: str) -> None:
+    arr = ul.from_seq([1, 2, 3], dtype)
+    result = ul.from_arrow_c(arr)
+    # The values are borrowed from arr, which can not be modified until
+    # the result copies them on write.
+    with pytest.raises(BufferError):
+        arr.append(4)
+    result.set(0, 5)
+    arr.append(4)
+    assert result.to_list() == [5, 2, 3]
+    assert arr.to_list() == [1, 2, 3, 4]
+    # The values with missing values are copied.
+    arr = ul.from_seq([1, None, 3], dtype)
+    result = ul.from_arrow_c(arr)
+    arr.append(4)
+    assert result.to_list() == [1, None, 3]
+
+
+@pytest.mark.parametrize(
+    "dtype, nums",
+    [
+        ("bool", [True, None, False]),
+        ("category", ["foo", None, "foo"]),
+        ("float64", [1.0, None, 3.0]),
+        ("int32", [1, None, 3]),
+        ("string", ["foo", None, "bar"]),
+    ],
+)
+def test_pyarrow(dtype: str, nums: List[ELEM_OPT]) -> None:
+    pa = pytest.importorskip("pyarrow")
+    arr = ul.from_seq(nums, dtype)
+    assert pa.array(arr).to_pylist() == nums
+    assert ul.from_arrow_c(pa.array(nums)).to_list() == nums
+
+
+@pytest.mark.parametrize(
+    "nums, expected_value",
+    [
+        (["foo", None, "bar", "foo"], ["foo", None, "bar", "foo"]),
+        ([None, None], [None, None]),
+    ],
+)
+def test_pyarrow_dictionary(
+    nums: List[ELEM_OPT],
+    expected_value: List[ELEM_OPT],
+) -> None:
+    pa = pytest.importorskip("pyarrow")
+    result = ul.from_arrow_c(pa.array(nums, pa.string()).dictionary_encode())
+    assert result.dtype == "category"
+    assert result.to_list() == expected_value
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Union, Callable, Optional
 
 import operator as op
@@ -655,6 +656,10 @@ def test_methods_with_args(
          'foo', 'baz'], {'index': 1, 'elem': 'baz'}),
         ('set', 'string', ['foo', 'bar'], [
          'foo', None], {'index': 1, 'elem': None}),
+        ('set', 'string', ['foo', 'bar', 'baz'], [
+         'foo', 'ba', 'baz'], {'index': 1, 'elem': 'ba'}),
+        ('set', 'string', ['foo', 'bar', 'baz'], [
+         'foobar', 'bar', 'baz'], {'index': 0, 'elem': 'foobar'}),
 
         ('replace', 'bool', [True, False, True], [
          False, False, False], {'old': True, 'new': False}),
@@ -671,6 +676,8 @@ def test_methods_with_args(
          None, 'bar', None], {'old': 'foo', 'new': None}),
         ('replace', 'string', [None, 'bar', None], [
          None, None, None], {'old': 'bar', 'new': None}),
+        ('replace', 'string', ['foo', 'ba', 'foo'], [
+         'x', 'ba', 'x'], {'old': 'foo', 'new': 'x'}),
 
         (
             'sort',
@@ -1127,6 +1134,42 @@ def test_multable_methods(
     check_test_result(dtype, test_method, arr, expected_value)
 
 
+@pytest.mark.parametrize(
+    'test_method, dtype, nums, expected_value, kwargs',
+    [
+        ('append', 'bool', [True, False], [True, False, None],
+         {'elem': None}),
+        ('pop', 'category', ['foo', 'bar'], ['foo'], {}),
+        ('replace', 'float32', [1.0, 2.0], [3.0, 2.0],
+         {'old': 1.0, 'new': 3.0}),
+        ('set', 'float64', [1.0, 2.0], [1.0, None],
+         {'index': 1, 'elem': None}),
+        ('set', 'int32', [1, None], [1, 3], {'index': 1, 'elem': 3}),
+        ('sort', 'int64', [2, None, 1], [1, 2, None], {'ascending': True}),
+        ('replace', 'string', ['foo', None], ['foo', 'bar'],
+         {'old': None, 'new': 'bar'}),
+    ],
+)
+def test_copy_on_write(
+    test_method: str,
+    dtype: str,
+    nums: LIST_TYPE,
+    expected_value: LIST_TYPE,
+    kwargs: dict,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    # Modifying the copy does not change the original ulist.
+    result = arr.copy()
+    getattr(result, test_method)(**kwargs)
+    check_test_result(dtype, test_method, result, expected_value)
+    check_test_result(dtype, test_method, arr, nums)
+    # And vice versa.
+    result = arr.copy()
+    getattr(arr, test_method)(**kwargs)
+    check_test_result(dtype, test_method, arr, expected_value)
+    check_test_result(dtype, test_method, result, nums)
+
+
 @expand_dtypes
 @pytest.mark.parametrize(
     'dtype, nums, expected_value, kwargs',
@@ -1205,6 +1248,183 @@ def test_indexing_operations(
     check_test_result(dtype, test_method, result, expected_value)
 
 
+@pytest.mark.parametrize(
+    'dtype, nums, index, expected_value',
+    [
+        ('bool', [True, None, False, True], slice(1, 3), [None, False]),
+        ('bool', [True, False] * 40, slice(65, 68), [False, True, False]),
+        ('category', ['foo', None, 'bar'], slice(1, None), [None, 'bar']),
+        ('float32', [1.0, 2.0, 3.0], slice(None, -1), [1.0, 2.0]),
+        ('float64', [1.0, None, 3.0], slice(None, None, 2), [1.0, 3.0]),
+        ('int32', [1, 2, 3, 4], slice(None, None, -1), [4, 3, 2, 1]),
+        ('int64', [1, None, 3], slice(1, 2), [None]),
+        ('int64', [1, 2, 3], slice(2, 1), []),
+        ('int64', [1, 2, 3], slice(5, 10), []),
+        ('string', ['foo', 'bar', None], slice(-2, None), ['bar', None]),
+        ('string', ['foo', 'bar', 'baz'], slice(None, None, -2),
+         ['baz', 'foo']),
+    ],
+)
+def test_slicing(
+    dtype: str,
+    nums: LIST_TYPE,
+    index: slice,
+    expected_value: LIST_TYPE,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    result = arr[index]
+    assert result.dtype == dtype
+    check_test_result(dtype, 'slice', result, expected_value)
+    # The view is copied on write, and the original ulist is not changed.
+    if result.size() > 0:
+        result.set(0, None)
+        check_test_result(dtype, 'slice', arr, nums)
+        assert result[0] is None
+    result.append(None)
+    check_test_result(dtype, 'slice', arr, nums)
+    check_test_result(dtype, 'slice', result[:-1][1:], expected_value[1:])
+
+
+@pytest.mark.parametrize(
+    'test_method, nums, n, expected_value',
+    [
+        ('head', [1, 2, 3], 2, [1, 2]),
+        ('head', [1, 2, 3], 5, [1, 2, 3]),
+        ('head', [1, 2, 3], 0, []),
+        ('tail', [1, 2, 3], 2, [2, 3]),
+        ('tail', [1, 2, 3], 5, [1, 2, 3]),
+        ('tail', [1, 2, 3], 0, []),
+    ],
+)
+def test_head_tail(
+    test_method: str,
+    nums: LIST_TYPE,
+    n: int,
+    expected_value: LIST_TYPE,
+) -> None:
+    arr = ul.from_seq(nums, 'int64')
+    result = getattr(arr, test_method)(n)
+    check_test_result('int64', test_method, result, expected_value)
+
+
+@pytest.mark.parametrize(
+    'dtype, batch',
+    [
+        ('bool', [True, None, False]),
+        ('category', ['foo', None, 'bar']),
+        ('float32', [1.0, None]),
+        ('float64', [1.0, 2.0, None]),
+        ('int32', [None, 1]),
+        ('int64', [1, 2, 3]),
+        ('string', ['foo', None, '']),
+    ],
+)
+def test_union_all_chunks(dtype: str, batch: LIST_TYPE) -> None:
+    n = 100
+    arr = ul.from_seq(batch, dtype)
+    result = arr
+    for _ in range(n - 1):
+        result = result.union_all(arr)
+    assert result.n_chunks() == n
+    assert result.size() == len(batch) * n
+    # The chunks are compacted explicitly, or by the first write. The reads
+    # iterate the chunks instead.
+    result.copy().rechunk()
+    assert result.n_chunks() == n
+    check_test_result(dtype, 'union_all', result, batch * n)
+    assert result.count_na() == batch.count(None) * n
+    assert result[len(batch) * n - 1] == batch[-1]
+    assert result.n_chunks() == n
+    # The chunks are shared, so that modifying the result does not change
+    # the batches.
+    result.set(0, None)
+    assert result.n_chunks() == 1
+    check_test_result(dtype, 'union_all', arr, batch)
+
+
+def test_union_all_shared_chunks() -> None:
+    # The results appended to the same ulist share its chunks, but not the
+    # chunks appended by each other.
+    arr = ul.from_seq([1, 2], 'int64').union_all(ul.from_seq([3], 'int64'))
+    x = arr.union_all(ul.from_seq([4], 'int64'))
+    y = arr.union_all(ul.from_seq([5], 'int64'))
+    z = arr.union_all(arr)
+    assert arr.n_chunks() == 2
+    assert x.n_chunks() == 3
+    assert y.n_chunks() == 3
+    assert z.n_chunks() == 4
+    assert arr.to_list() == [1, 2, 3]
+    assert x.to_list() == [1, 2, 3, 4]
+    assert y.to_list() == [1, 2, 3, 5]
+    assert z.to_list() == [1, 2, 3, 1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    'dtype, nums',
+    [
+        ('bool', [True, None, False]),
+        ('category', ['foo', None, 'bar']),
+        ('float64', [3.0, None, 1.0, 2.0]),
+        ('int64', [3, None, 1, 2]),
+        ('string', ['foo', None, 'bar']),
+    ],
+)
+def test_threads(dtype: str, nums: LIST_TYPE) -> None:
+    # The kernels release the GIL, so that the other threads may use and
+    # modify the list meanwhile.
+    expected_value = set(nums)
+    arr = ul.from_seq(nums * 10000, dtype)
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(lambda: set(arr.unique().to_list()))
+                   for _ in range(8)]
+        for i in range(len(nums), 1000):
+            arr.set(i, None)
+        results = [x.result() for x in futures]
+    assert results == [expected_value] * 8
+    arr.sort(True)
+    assert set(arr.unique().to_list()) == expected_value
+
+
+@pytest.mark.parametrize(
+    'dtype, nums',
+    [
+        ('category', ['foo', None, 'bar']),
+        ('float32', [1.5, None, -2.0]),
+        ('float64', [1.5, None, -2.0]),
+        ('int32', [1, None, -2]),
+        ('int64', [1, None, -2]),
+        ('string', ['foo', None, 'bar']),
+    ],
+)
+def test_parallel_threshold(dtype: str, nums: LIST_TYPE) -> None:
+    # The results do not depend on whether the kernels run on all the cores.
+    def run(arr: ul.UltraFastList) -> list:
+        if dtype in ('category', 'string'):
+            return [
+                (arr == 'foo').to_list(),
+                arr.equal(arr).to_list(),
+                arr.contains('a').to_list(),
+            ]
+        return [
+            (arr * 2 + 1).to_list(),
+            (arr / 3).to_list(),
+            (arr > 0).to_list(),
+            (arr <= arr).to_list(),
+            arr.astype('float64').to_list(),
+        ]
+
+    arr = ul.from_seq(nums * 10000, dtype)
+    threshold = ul.get_parallel_threshold()
+    expected_value = run(arr)
+    try:
+        ul.set_parallel_threshold(0)
+        assert ul.get_parallel_threshold() == 0
+        result = run(arr)
+    finally:
+        ul.set_parallel_threshold(threshold)
+    assert result == expected_value
+
+
 @expand_dtypes
 @pytest.mark.parametrize(
     'dtype, nums, expected_value, expected_dtype',
@@ -1245,6 +1465,14 @@ def test_indexing_operations(
         ('string', ['true', 'false', None], [True, False, None], 'bool'),
         ('string', ['foo', 'bar'], ['foo', 'bar'], 'string'),
         ('string', ['foo', 'bar', None], ['foo', 'bar', None], 'string'),
+        ('string', ['foo', 'bar', 'foo'], ['foo', 'bar', 'foo'], 'category'),
+        ('string', ['foo', None, 'foo'], ['foo', None, 'foo'], 'category'),
+        ('int', [1, 2, None], ['1', '2', None], 'category'),
+
+        ('category', ['1', '2', None], [1, 2, None], 'int'),
+        ('category', ['1.0', '2.0', None], [1.0, 2.0, None], 'float'),
+        ('category', ['foo', 'bar', None], ['foo', 'bar', None], 'string'),
+        ('category', ['foo', 'bar', None], ['foo', 'bar', None], 'category'),
     ],
 )
 def test_astype(
@@ -1442,6 +1670,141 @@ def test_operators(
     check_test_result(dtype, test_method, result, expected_value)
 
 
+@expand_dtypes
+@pytest.mark.parametrize(
+    'test_method, dtype, nums, expected_value, kwargs',
+    [
+        (op.iadd, 'float', [1.0, 2.0, None], [1.5, 2.5, None],
+         {'other': 0.5}),
+        (op.iadd, 'int', [1, 2, None], [4, None, None],
+         {'other': [3, None, 1]}),
+        (op.imul, 'float', [1.0, 2.0, None], [2.0, 1.0, None],
+         {'other': [2.0, 0.5, 1.0]}),
+        (op.imul, 'int', [1, 2, None], [3, 6, None], {'other': 3}),
+        (op.isub, 'float', [1.0, 2.0, None], [0.5, None, None],
+         {'other': [0.5, None, 1.0]}),
+        (op.isub, 'int', [1, 2, None], [0, 1, None], {'other': 1}),
+        (op.itruediv, 'float', [1.0, 2.0, None], [0.5, 1.0, None],
+         {'other': 2.0}),
+        (op.itruediv, 'float', [1.0, 2.0, None], [0.5, None, None],
+         {'other': [2.0, None, 1.0]}),
+    ],
+)
+def test_inplace_operators(
+    test_method: Callable,
+    dtype: str,
+    nums: LIST_TYPE,
+    expected_value: LIST_TYPE,
+    kwargs: dict,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    copy = arr.copy()
+    if isinstance(kwargs['other'], list):
+        other = ul.from_seq(kwargs['other'], dtype)
+    else:
+        other = kwargs['other']
+    result = test_method(arr, other)
+    # The buffers of self are updated, and the copy sharing them is not.
+    assert result is arr
+    check_test_result(dtype, test_method, result, expected_value)
+    check_test_result(dtype, test_method, copy, nums)
+    # The quotients of the integers are floats, which make a new ulist.
+    if dtype.startswith('int'):
+        arr = ul.from_seq(nums, dtype)
+        result = op.itruediv(arr, 2)
+        assert result is not arr
+        assert result.to_list() == (arr / 2).to_list()
+
+
+@pytest.mark.parametrize(
+    'test_method, dtype, out_dtype, other, expected_value',
+    [
+        ('add', 'int64', 'int64', [3, None, 1, 2], [4, None, None, 6]),
+        ('add_scala', 'float32', 'float32', 0.5, [1.5, 2.5, None, 4.5]),
+        ('div', 'int64', 'float64', [2, 1, 1, 2], [0.5, 2.0, None, 2.0]),
+        ('div', 'float64', 'float64', [2.0, None, 1.0, 4.0],
+         [0.5, None, None, 1.0]),
+        ('div_scala', 'int32', 'float64', 2.0, [0.5, 1.0, None, 2.0]),
+        ('equal', 'float64', 'bool', [1.0, 1.0, None, 4.0],
+         [True, False, None, True]),
+        ('equal_scala', 'int32', 'bool', 2, [False, True, None, False]),
+        ('greater_than', 'int64', 'bool', [0, 2, 1, None],
+         [True, False, None, None]),
+        ('greater_than_or_equal_scala', 'int32', 'bool', 2,
+         [False, True, None, True]),
+        ('less_than', 'float32', 'bool', [2.0, 2.0, 2.0, 2.0],
+         [True, False, None, False]),
+        ('less_than_or_equal_scala', 'float64', 'bool', 2.0,
+         [True, True, None, False]),
+        ('mul', 'int32', 'int32', [2, 3, 4, None], [2, 6, None, None]),
+        ('mul_scala', 'float64', 'float64', 2.0, [2.0, 4.0, None, 8.0]),
+        ('not_equal_scala', 'int64', 'bool', 2, [True, False, None, True]),
+        ('pow_scala', 'int64', 'int64', 2, [1, 4, None, 16]),
+        ('pow_scala', 'float32', 'float32', 0, [1.0, 1.0, 1.0, 1.0]),
+        ('sub', 'float32', 'float32', [0.5, 0.5, 0.5, None],
+         [0.5, 1.5, None, None]),
+        ('sub_scala', 'int32', 'int32', 1, [0, 1, None, 3]),
+    ],
+)
+def test_out(
+    test_method: str,
+    dtype: str,
+    out_dtype: str,
+    other: Union[ELEM_TYPE, LIST_TYPE],
+    expected_value: LIST_TYPE,
+) -> None:
+    nums = [1, 2, None, 4]
+    junk: Dict[str, LIST_TYPE] = {
+        'bool': [None, True, False, True],
+        'float32': [None, 7.0, 8.0, 9.0],
+        'float64': [None, 7.0, 8.0, 9.0],
+        'int32': [None, 7, 8, 9],
+        'int64': [None, 7, 8, 9],
+    }
+    arr = ul.from_seq(nums, dtype)
+    if isinstance(other, list):
+        other = ul.from_seq(other, dtype)
+    expected = getattr(arr, test_method)(other)
+    assert expected.to_list() == expected_value
+    # The elements of `out` are overwritten, including the missing values.
+    out = ul.from_seq(junk[out_dtype], out_dtype)
+    result = getattr(arr, test_method)(other, out=out)
+    assert result is out
+    assert result.dtype == expected.dtype
+    assert result.to_list() == expected_value
+    if out_dtype != dtype:
+        return
+    # `out` may be self or other, and the copies sharing their buffers are
+    # not affected.
+    copy = arr.copy()
+    result = getattr(arr, test_method)(other, out=arr)
+    assert result is arr
+    assert arr.to_list() == expected_value
+    assert copy.to_list() == nums
+    if isinstance(other, ul.UltraFastList):
+        arr = ul.from_seq(nums, dtype)
+        result = getattr(arr, test_method)(other, out=other)
+        assert result is other
+        assert other.to_list() == expected_value
+
+
+@pytest.mark.parametrize(
+    'dtype, nums',
+    [
+        ('bool', [True, False, None, True]),
+        ('float32', [1.5, None, -2.0, 4.0]),
+        ('float64', [1.5, None, -2.0, 4.0]),
+        ('int32', [1, None, -2, 4]),
+        ('int64', [1, None, -2, 4]),
+    ],
+)
+def test_var_unchanged(dtype: str, nums: LIST_TYPE) -> None:
+    # The temporary list of `var` is updated in place, not self.
+    arr = ul.from_seq(nums, dtype)
+    arr.var()
+    assert arr.to_list() == nums
+
+
 @expand_dtypes
 @pytest.mark.parametrize(
     'dtype, nums, expected_value',
@@ -144,6 +144,16 @@ from ulist.utils import check_test_result
             [None, None, None],
             None,
         ),
+        (
+            'all',
+            [True] * 100 + [None],
+            None,
+        ),
+        (
+            'all',
+            [True] * 100 + [None, False],
+            False,
+        ),
 
         (
             'any',
@@ -280,6 +290,16 @@ from ulist.utils import check_test_result
             [None, None, None],
             None,
         ),
+        (
+            'any',
+            [False] * 100 + [None],
+            None,
+        ),
+        (
+            'any',
+            [False] * 100 + [None, True],
+            True,
+        ),
 
         (
             'not_',
@@ -291,6 +311,11 @@ from ulist.utils import check_test_result
             [True, False, None],
             [False, True, None],
         ),
+        (
+            'not_',
+            [True, False, None] * 30,
+            [False, True, None] * 30,
+        ),
 
         (
             'to_index',
@@ -330,6 +355,12 @@ def test_methods(
             [True, False, None, True, False, None, True, False, None],
             [True, False, None, False, False, False, None, False, None],
         ),
+        (
+            'and_',
+            [True, True, True, False, False, False, None, None, None] * 10,
+            [True, False, None, True, False, None, True, False, None] * 10,
+            [True, False, None, False, False, False, None, False, None] * 10,
+        ),
 
         (
             'or_',
@@ -343,6 +374,12 @@ def test_methods(
             [True, False, None, True, False, None, True, False, None],
             [True, True, True, True, False, None, True, None, None],
         ),
+        (
+            'or_',
+            [True, True, True, False, False, False, None, None, None] * 10,
+            [True, False, None, True, False, None, True, False, None] * 10,
+            [True, True, True, True, False, None, True, None, None] * 10,
+        ),
     ],
 )
 def test_methods_with_args(
@@ -0,0 +1,113 @@
+from typing import List
+
+import numpy as np
+import pytest
+import ulist as ul
+from ulist.typedef import ELEM_OPT
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, expected_dtype, expected_value",
+    [
+        ("float32", [1.0, None, 3.0], np.float32, [1.0, 0.0, 3.0]),
+        ("float64", [1.0, None, 3.0], np.float64, [1.0, 0.0, 3.0]),
+        ("int32", [1, None, 3], np.int32, [1, 0, 3]),
+        ("int64", [1, None, 3], np.int64, [1, 0, 3]),
+        ("int64", [], np.int64, []),
+    ],
+)
+def test_array_interface(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    expected_dtype: type,
+    expected_value: list,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    result = np.asarray(arr)
+    assert result.dtype == expected_dtype
+    assert result.tolist() == expected_value
+    # The memory is shared instead of copied.
+    assert np.asarray(arr).ctypes.data == result.ctypes.data
+    assert not result.flags.writeable
+    # The ulist can not be modified while the numpy array is alive.
+    with pytest.raises(BufferError):
+        arr.append(None)
+    with pytest.raises(BufferError):
+        arr.sort(ascending=False)
+    del result
+    arr.append(None)
+
+
+@pytest.mark.parametrize(
+    "dtype, nums",
+    [
+        ("bool", [True, False]),
+        ("string", ["foo", "bar"]),
+        ("category", ["foo", "bar"]),
+    ],
+)
+def test_array_interface_not_supported(
+    dtype: str,
+    nums: List[ELEM_OPT],
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    with pytest.raises(AttributeError):
+        arr.__array_interface__
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, expected_format, expected_value",
+    [
+        ("float32", [1.0, 2.0], "f", [1.0, 2.0]),
+        ("float64", [1.0, 2.0], "d", [1.0, 2.0]),
+        ("int32", [1, None], "i", [1, 0]),
+        ("int64", [1, None], "q", [1, 0]),
+        ("bool", [True, False, None, True], "B", [0b1001]),
+        ("bool", [True] * 9, "B", [0xFF, 0b1]),
+    ],
+)
+def test_values_buffer(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    expected_format: str,
+    expected_value: list,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    with arr.values_buffer() as mv:
+        assert mv.readonly
+        assert mv.format == expected_format
+        assert mv.tolist() == expected_value
+        # The ulist can not be modified while the buffer is exported.
+        with pytest.raises(BufferError):
+            arr.append(None)
+        with pytest.raises(BufferError):
+            arr.pop()
+        with pytest.raises(BufferError):
+            arr.set(0, None)
+        # The copy shares the buffer but can be modified.
+        result = arr.copy()
+        result.set(0, None)
+        assert result.get(0) is None
+        assert mv.tolist() == expected_value
+    arr.append(None)
+    assert arr.size() == len(nums) + 1
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, expected_value",
+    [
+        ("int32", [1, None, 3], b"\x05"),
+        ("float64", [None] * 3 + [1.0] * 6, b"\xf8\x01"),
+        ("bool", [True, None, None, False], b"\x09"),
+        ("string", ["foo", None], b"\x01"),
+        ("category", [None, "foo"], b"\x02"),
+        ("int64", [], b""),
+    ],
+)
+def test_validity_buffer(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    expected_value: bytes,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    assert arr.validity_buffer() == expected_value
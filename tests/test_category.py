@@ -0,0 +1,161 @@
+from typing import List, Optional
+
+import pytest
+import ulist as ul
+from ulist.utils import check_test_result
+
+
+@pytest.mark.parametrize(
+    "test_method, nums, expected_value, kwargs",
+    [
+        (
+            "contains",
+            ["num1", "num2", "element1", None, "num1"],
+            [True, True, False, None, True],
+            {"elem": "num"},
+        ),
+
+        (
+            "counter",
+            ["foo", "bar", None, "foo", None],
+            {"foo": 2, "bar": 1, None: 2},
+            {},
+        ),
+
+        (
+            "equal_scala",
+            ["foo", "bar", None, "foo"],
+            [True, False, None, True],
+            {"elem": "foo"},
+        ),
+        (
+            "equal_scala",
+            ["foo", "bar", None, "foo"],
+            [False, False, None, False],
+            {"elem": "baz"},
+        ),
+
+        (
+            "get",
+            ["foo", "bar", None, "foo"],
+            "bar",
+            {"index": 1},
+        ),
+        (
+            "get",
+            ["foo", "bar", None, "foo"],
+            None,
+            {"index": 2},
+        ),
+
+        (
+            "not_equal_scala",
+            ["foo", "bar", None, "foo"],
+            [False, True, None, False],
+            {"elem": "foo"},
+        ),
+
+        (
+            "str_len",
+            ["foo", "ba", None, "foo"],
+            [3, 2, None, 3],
+            {},
+        ),
+
+        (
+            "union_all",
+            ["foo", "bar", None],
+            ["foo", "bar", None, "baz", None],
+            {"other": ul.from_seq(["baz", None], dtype="category")},
+        ),
+
+        (
+            "unique",
+            ["foo", "bar", None, "foo", "baz"],
+            ["bar", "baz", "foo", None],
+            {},
+        ),
+    ],
+)
+def test_methods_with_args(
+    test_method: str,
+    nums: List[Optional[str]],
+    expected_value: List[Optional[str]],
+    kwargs: dict,
+) -> None:
+    dtype = "category"
+    arr = ul.from_seq(nums, dtype=dtype)
+    result = getattr(arr, test_method)(**kwargs)
+    check_test_result(dtype, test_method, result, expected_value)
+
+
+@pytest.mark.parametrize(
+    "test_method, nums, expected_value, kwargs",
+    [
+        ("append", ["foo"], ["foo", "bar"], {"elem": "bar"}),
+        ("append", ["foo"], ["foo", None], {"elem": None}),
+
+        ("pop", ["foo", None], ["foo"], {}),
+
+        ("replace", ["foo", "bar", "foo"], ["baz", "bar", "baz"],
+         {"old": "foo", "new": "baz"}),
+        ("replace", ["foo", "bar", "foo"], ["bar", "bar", "bar"],
+         {"old": "foo", "new": "bar"}),
+        ("replace", ["foo", "bar", None], [None, "bar", None],
+         {"old": "foo", "new": None}),
+        ("replace", ["foo", "bar", None], ["foo", "bar", "baz"],
+         {"old": None, "new": "baz"}),
+        ("replace", ["foo", "bar", None], ["foo", "bar", None],
+         {"old": "baz", "new": "qux"}),
+        ("replace", ["foo", "bar", None], ["foo", "bar", None],
+         {"old": "baz", "new": None}),
+
+        ("set", ["foo", "bar"], ["foo", "baz"], {"index": 1, "elem": "baz"}),
+        ("set", ["foo", "bar"], ["foo", None], {"index": 1, "elem": None}),
+
+        ("sort", ["foo", None, "bar", "foo"], ["bar", "foo", "foo", None],
+         {"ascending": True}),
+        ("sort", ["foo", None, "bar", "foo"], ["foo", "foo", "bar", None],
+         {"ascending": False}),
+    ],
+)
+def test_inplace_methods(
+    test_method: str,
+    nums: List[Optional[str]],
+    expected_value: List[Optional[str]],
+    kwargs: dict,
+) -> None:
+    dtype = "category"
+    arr = ul.from_seq(nums, dtype=dtype)
+    getattr(arr, test_method)(**kwargs)
+    check_test_result(dtype, test_method, arr, expected_value)
+
+
+def test_dictionary_index() -> None:
+    # The lookups of the dictionary values follow the renamed and inserted
+    # values, and the views keep the values of their own.
+    arr = ul.from_seq(["foo", "bar", "foo"], dtype="category")
+    view = arr[:2]
+    assert (arr == "foo").to_list() == [True, False, True]
+    arr.replace("foo", "baz")
+    arr.append("foo")
+    arr.append("baz")
+    expected_value = ["baz", "bar", "baz", "foo", "baz"]
+    check_test_result("category", "replace", arr, expected_value)
+    assert (arr == "foo").to_list() == [False, False, False, True, False]
+    assert (arr != "baz").to_list() == [False, True, False, True, False]
+    assert (view == "foo").to_list() == [True, False]
+
+
+def test_filter() -> None:
+    arr = ul.from_seq(["foo", "bar", None, "foo", "baz"], dtype="category")
+    result = arr.filter(arr != "foo")
+    assert result.dtype == "category"
+    check_test_result("category", "filter", result, ["bar", "baz"])
+
+
+def test_equal() -> None:
+    arr1 = ul.from_seq(["foo", "bar", None, "baz"], dtype="category")
+    arr2 = ul.from_seq(["baz", "bar", "foo", "baz"], dtype="category")
+    result = arr1 == arr2
+    check_test_result("category", "equal", result, [False, True, None, True])
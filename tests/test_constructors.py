@@ -1,5 +1,7 @@
-from typing import Callable, List, Optional
+import array
+from typing import Any, Callable, List, Optional
 
+import numpy as np
 import pytest
 import ulist as ul
 from ulist.utils import check_test_result
@@ -87,6 +89,50 @@ def test_constructors(
     check_test_result(dtype, test_method, result, expected_value)
 
 
+@pytest.mark.parametrize(
+    "obj, dtype, mask, expected_value",
+    [
+        (array.array("q", [1, 2, 3]), "int", None, [1, 2, 3]),
+        (array.array("i", [1, 2, 3]), "int32", None, [1, 2, 3]),
+        (array.array("d", [1.0, 2.0]), "float", None, [1.0, 2.0]),
+        (array.array("f", [1.0, 2.0]), "float32", None, [1.0, 2.0]),
+        (bytes([1, 0, 2]), "bool", None, [True, False, True]),
+        (
+            array.array("q", [1, 2, 3]).tobytes(),
+            "int64",
+            bytes([0, 1, 0]),
+            [1, None, 3],
+        ),
+
+        (np.array([1, 2, 3]), "int64", None, [1, 2, 3]),
+        (np.array([1, 2, 3], dtype=np.int32), "int32", None, [1, 2, 3]),
+        (np.arange(6)[::2], "int", None, [0, 2, 4]),
+        (
+            np.array([1.0, 2.0, 3.0]),
+            "float",
+            np.array([False, True, False]),
+            [1.0, None, 3.0],
+        ),
+        (
+            np.array([True, False, True]),
+            "bool",
+            np.array([False, False, True]),
+            [True, False, None],
+        ),
+        (np.array([], dtype=np.float32), "float32", None, []),
+    ],
+)
+def test_from_buffer(
+    obj: Any,
+    dtype: str,
+    mask: Any,
+    expected_value: list,
+) -> None:
+    result = ul.from_buffer(obj, dtype=dtype, mask=mask)
+    assert result.dtype.startswith(dtype)
+    assert result.to_list() == expected_value
+
+
 @pytest.mark.parametrize(
     "test_method, args, kwargs",
     [
@@ -1,4 +1,4 @@
-from typing import List, Union, Optional
+from typing import Callable, List, Union, Optional
 
 import pytest
 import ulist as ul
@@ -425,3 +425,156 @@ def test_case_when(
     else:
         raise TypeError(f"Unexpected type {type(expected_value[0])}!")
     check_test_result(result_dtype, "ul.select", result, expected_value)
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, choices, default, expected_dtype, expected_value",
+    [
+        (
+            "int32",
+            [0, 1, 2, 3, 4, 5],
+            [[10, 11, 12, 13, 14, 15], 1],
+            2,
+            "int32",
+            [10, 11, 1, 1, 2, 2],
+        ),
+        (
+            "float32",
+            [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+            [0.5, [0.0, None, 2.0, None, 4.0, 5.0]],
+            -1,
+            "float32",
+            [0.5, 0.5, 2.0, None, -1.0, -1.0],
+        ),
+        (
+            "int64",
+            [0, 1, 2, 3, 4, 5],
+            [[10, None, 12, 13, 14, 15], [20, 21, 22, 23, 24, 25]],
+            0,
+            "int64",
+            [10, None, 22, 23, 0, 0],
+        ),
+        (
+            "float64",
+            [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+            [[0.5, 1.5, 2.5, 3.5, 4.5, 5.5], 1.0],
+            2.0,
+            "float64",
+            [0.5, 1.5, 1.0, 1.0, 2.0, 2.0],
+        ),
+        (
+            "bool",
+            [True, False, None, True, False, True],
+            [[None, False, True, True, None, False], True],
+            False,
+            "bool",
+            [None, False, True, True, False, False],
+        ),
+        (
+            "string",
+            ["a", "b", "c", "d", "e", "f"],
+            [["a", None, "c", "d", "e", "f"], "x"],
+            "y",
+            "string",
+            ["a", None, "x", "x", "y", "y"],
+        ),
+        (
+            "category",
+            ["a", "b", "c", "d", "e", "f"],
+            ["x", ["a", "b", "c", "d", "e", "f"]],
+            "y",
+            "string",
+            ["x", "x", "c", "d", "y", "y"],
+        ),
+    ],
+)
+def test_select_choices(
+    dtype: str,
+    nums: LIST_TYPE,
+    choices: list,
+    default: Union[float, int, bool, str],
+    expected_dtype: str,
+    expected_value: list,
+) -> None:
+    # The first condition is true for the rows 0 and 1, the second one for
+    # the rows 0 to 3.
+    conditions = [
+        ul.from_seq([True, True, False, False, False, False], "bool"),
+        ul.from_seq([True, True, True, True, False, False], "bool"),
+    ]
+    choices = [
+        ul.from_seq(x, dtype) if isinstance(x, list) else x for x in choices
+    ]
+    result = ul.select(conditions, choices=choices, default=default)
+    assert result.dtype == expected_dtype
+    assert result.to_list() == expected_value
+
+
+@pytest.mark.parametrize(
+    "test_method, operator, conditions, expected_value",
+    [
+        (
+            ul.all_of,
+            op.and_,
+            [[True, True, False, None], [True, None, None, None]],
+            [True, None, False, None],
+        ),
+        (
+            ul.any_of,
+            op.or_,
+            [[True, False, False, None], [None, None, False, False]],
+            [True, None, False, None],
+        ),
+        (
+            ul.all_of,
+            op.and_,
+            [
+                [True, False, None, True, None, True, True],
+                [True, True, True, False, None, None, True],
+                [None, True, False, True, True, True, True],
+            ],
+            [None, False, False, False, None, None, True],
+        ),
+        (
+            ul.any_of,
+            op.or_,
+            [
+                [True, False, None, False, None, False, False],
+                [False, False, False, False, None, None, True],
+                [None, False, False, True, False, False, False],
+            ],
+            [True, False, None, True, None, None, True],
+        ),
+        (ul.all_of, op.and_, [[True, None, False]], [True, None, False]),
+        (ul.any_of, op.or_, [[], []], []),
+    ],
+)
+def test_all_of_any_of(
+    test_method: Callable,
+    operator: Callable,
+    conditions: List[List[Optional[bool]]],
+    expected_value: List[Optional[bool]],
+) -> None:
+    arrs = [ul.from_seq(x, "bool") for x in conditions]
+    result = test_method(arrs)
+    check_test_result("bool", test_method, result, expected_value)
+    # The same as combining the conditions pairwise.
+    expected = arrs[0]
+    for arr in arrs[1:]:
+        expected = operator(expected, arr)
+    assert result.to_list() == expected.to_list()
+
+
+def test_all_of_any_of_parallel() -> None:
+    a = ul.from_seq([True, False, None, True] * 50000, "bool")
+    b = ul.from_seq([None, True, False, True] * 50000, "bool")
+    c = ul.from_seq([True, None, True, False] * 50000, "bool")
+    threshold = ul.get_parallel_threshold()
+    try:
+        ul.set_parallel_threshold(0)
+        result_all = ul.all_of([a, b, c])
+        result_any = ul.any_of([a, b, c])
+    finally:
+        ul.set_parallel_threshold(threshold)
+    assert result_all.to_list() == (a & b & c).to_list()
+    assert result_any.to_list() == (a | b | c).to_list()
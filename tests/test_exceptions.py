@@ -75,6 +75,34 @@ class _Foo:
             ValueError
         ),
 
+        (
+            _ARR4.add_scala,
+            {"elem": 1, "out": ul.from_seq(range(2), dtype='int')},
+            RuntimeError
+        ),
+
+        (
+            _ARR4.add_scala,
+            {"elem": 1, "out": ul.from_seq([0.0, 1.0, 2.0], dtype='float')},
+            TypeError
+        ),
+
+        (
+            _ARR4.less_than,
+            {"other": _ARR4, "out": ul.from_seq(range(3), dtype='int')},
+            TypeError
+        ),
+
+        (
+            ul.from_buffer,
+            {"obj": b"foo", "dtype": "string"},
+            ValueError
+        ),
+        (
+            ul.from_buffer,  # mismatch length of mask
+            {"obj": bytes(16), "dtype": "int", "mask": bytes(3)},
+            ValueError
+        ),
         (
             ul.from_seq,
             {"obj": [1, 2], "dtype": "foo"},
@@ -168,6 +196,41 @@ class _Foo:
             {"fn": lambda x: x < 2, "then": 1.0},
             TypeError
         ),
+        (
+            ul.select,
+            {
+                "conditions": [ul.from_seq([True, False], "bool")] * 2,
+                "choices": [ul.from_seq([1, 2], "int32"),
+                            ul.from_seq([1, 2], "int64")],
+                "default": 0,
+            },
+            TypeError
+        ),
+        (
+            ul.select,
+            {
+                "conditions": [ul.from_seq([True, False], "bool")],
+                "choices": [ul.from_seq([1, 2, 3], "int")],
+                "default": 0,
+            },
+            RuntimeError
+        ),
+        (
+            ul.all_of,
+            {"conditions": []},
+            ValueError
+        ),
+        (
+            ul.any_of,
+            {"conditions": [ul.from_seq([True], "bool"),
+                            ul.from_seq([True, False], "bool")]},
+            RuntimeError
+        ),
+        (
+            ul.all_of,
+            {"conditions": [ul.from_seq([1, 2], "int")]},
+            AssertionError
+        ),
         (
             ul.read_csv,  # mismatch dtype
             {
@@ -195,6 +258,16 @@ class _Foo:
             },
             IOError
         ),
+        (
+            ul.load,
+            {"path": str(here / "non_exists_file.ulist")},
+            IOError
+        ),
+        (
+            ul.load,  # not saved by ulist
+            {"path": str(here / "test_csv/00_test_int.csv")},
+            IOError
+        ),
         (
             ul.read_csv,  # wrong dtype
             {
@@ -205,7 +278,48 @@ class _Foo:
                            "bool": "boolean"}
             },
             ValueError
-        )
+        ),
+        (
+            ul.read_csv_batches,
+            {
+                "path": str(here / "non_exists_csv.csv"),
+                "schema": {"whatever": "int32"}
+            },
+            IOError
+        ),
+        (
+            ul.read_csv_batches,  # wrong dtype
+            {
+                "path": str(here / "test_csv/04_test_nan.csv"),
+                "schema": {"int": "integer"}
+            },
+            ValueError
+        ),
+        (
+            ul.read_csv_batches,
+            {
+                "path": str(here / "test_csv/04_test_nan.csv"),
+                "schema": {"int": "int"},
+                "batch_size": 0,
+            },
+            AssertionError
+        ),
+        (
+            lambda **kwargs: list(ul.read_csv_batches(**kwargs)),
+            {
+                "path": str(here / "test_csv/00_test_int.csv"),
+                "schema": {"int32": "bool"}
+            },
+            TypeError
+        ),
+        (
+            ul.read_csv,
+            {
+                "path": str(here / "test_csv/04_test_nan.csv"),
+                "sample_size": 0,
+            },
+            AssertionError
+        ),
     ],
 )
 def test_exceptions(
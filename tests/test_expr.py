@@ -0,0 +1,248 @@
+from typing import Callable, List
+
+import pytest
+import ulist as ul
+from ulist.typedef import ELEM_OPT
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, fn",
+    [
+        ("int64", [0, 1, None, 3, 4, 5], lambda x: x * 2 + 1),
+        ("int64", [0, 1, None, 3, 4, 5], lambda x: (x * 2 + 1 > 4) & (x < 5)),
+        ("int64", [1, 2, None], lambda x: x / x + x / 2),
+        ("int32", [0, -1, None, 3], lambda x: x ** 2 - x),
+        ("int32", [0, -1, None, 3], lambda x: (x >= 0) | (x == 3)),
+        ("float32", [1.0, None, 3.5], lambda x: (x - 1) / 2),
+        ("float64", [1.0, None, 3.5], lambda x: x * x != 1.0),
+        ("float64", [1.5, None, -2.5], lambda x: x.astype("int") * 3),
+        ("int64", [1, 0, None], lambda x: x.astype("bool") & (x <= 1)),
+        ("bool", [True, False, None], lambda x: ~x | (x == False)),  # noqa
+        ("bool", [True, False, None], lambda x: x.astype("float") + 0.5),
+        ("int64", [], lambda x: x + 1 > 0),
+    ],
+)
+def test_lazy(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    fn: Callable,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    expected_value = fn(arr)
+    result = fn(arr.lazy()).collect()
+    assert result.dtype == expected_value.dtype
+    assert result.to_list() == expected_value.to_list()
+    result = fn(ul.col("x")).collect(x=arr)
+    assert result.to_list() == expected_value.to_list()
+
+
+def test_lazy_columns() -> None:
+    x = ul.from_seq([1, 2, None, 4], "int64")
+    y = ul.from_seq([4, None, 2, 1], "int64")
+    expr = (ul.col("x") * 2 + ul.col("y") > 5) | (ul.col("x") == 1)
+    assert expr.collect(x=x, y=y).to_list() == [True, None, None, True]
+    expr = x.lazy() - y
+    assert expr.collect().to_list() == [-3, None, None, 3]
+    # The shared subexpressions are evaluated once, and the same results
+    # are used by both sides.
+    z = x.lazy() * 3
+    assert (z + z).collect().to_list() == [6, 12, None, 24]
+    assert repr(ul.col("x") + 1) == "Expr((col('x') + 1))"
+
+
+def test_lazy_parallel() -> None:
+    arr = ul.from_seq([1.0, None, -2.0, 4.5] * 50000, "float64")
+    threshold = ul.get_parallel_threshold()
+    expected_value = ((arr * 2 - 1 < 3.0) & (arr != 1.0)).to_list()
+    try:
+        ul.set_parallel_threshold(0)
+        result = ((arr.lazy() * 2 - 1 < 3.0) & (arr.lazy() != 1.0)).collect()
+    finally:
+        ul.set_parallel_threshold(threshold)
+    assert result.to_list() == expected_value
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, fns",
+    [
+        ("int64", [0, 1, None, 3, 4, 5], [lambda x: x > 1, lambda x: x < 5]),
+        ("int32", [5, -1, None, 3], [lambda x: x * 2 != 6]),
+        (
+            "float64",
+            [1.5, None, -2.5, 4.0, 0.5],
+            [lambda x: x > -3.0, lambda x: x / 2 < 1.0, lambda x: x != 1.5],
+        ),
+        ("bool", [True, False, None, True], [lambda x: x]),
+        ("int64", [1, 2, 3], [lambda x: x > 5, lambda x: x < 0]),
+        ("int64", [], [lambda x: x > 0]),
+    ],
+)
+def test_lazy_where(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    fns: List[Callable],
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    expected_value = arr
+    expr = arr.lazy()
+    for fn in fns:
+        expected_value = expected_value.where(fn)
+        expr = expr.where(fn)
+    result = expr.collect()
+    assert result.dtype == expected_value.dtype
+    assert result.to_list() == expected_value.to_list()
+    assert expr.sum() == expected_value.sum()
+    assert expr.size() == expected_value.size()
+    assert expr.count_na() == expected_value.count_na()
+
+
+def test_lazy_where_columns() -> None:
+    x = ul.from_seq([1, None, 3, 4, 5], "int64")
+    y = ul.from_seq([1.0, 2.0, None, -1.0, 3.0], "float64")
+    expr = ul.col("x").where(lambda x: ul.col("y") > 0.0)
+    assert expr.collect(x=x, y=y).to_list() == [1, None, 5]
+    assert expr.count_na(x=x, y=y) == 1
+    assert expr.mean(x=x, y=y) == 3.0
+    # The operations are pushed down below the predicates.
+    expr = (expr * 2 + 1).where(lambda x: x < 10)
+    assert expr.collect(x=x, y=y).to_list() == [3]
+    assert expr.sum(x=x, y=y) == 3
+    assert repr(ul.col("x").where(lambda x: x > 1) + 1) == \
+        "Expr((col('x') + 1).where((col('x') > 1)))"
+
+
+def test_lazy_where_parallel() -> None:
+    arr = ul.from_seq([1, None, -2, 4, 7] * 40000, "int64")
+    threshold = ul.get_parallel_threshold()
+    expected_value = arr.where(lambda x: x > 0).where(lambda x: x < 5)
+    try:
+        ul.set_parallel_threshold(0)
+        expr = arr.lazy().where(lambda x: x > 0).where(lambda x: x < 5)
+        result = expr.collect()
+        total = expr.sum()
+    finally:
+        ul.set_parallel_threshold(threshold)
+    assert result.to_list() == expected_value.to_list()
+    assert total == expected_value.sum()
+
+
+@pytest.mark.parametrize(
+    "fn, columns, expected_error",
+    [
+        (lambda: ul.col("x") + 1.5, {"x": [1, 2]}, TypeError),
+        (lambda: ul.col("x") + ul.col("y"), {"x": [1, 2], "y": [1.0, 2.0]},
+         TypeError),
+        (lambda: ul.col("x") + ul.col("y"), {"x": [1, 2], "y": [1]},
+         ValueError),
+        (lambda: ul.col("x") & ul.col("x"), {"x": [1, 2]}, TypeError),
+        (lambda: ul.col("x") ** -1, {"x": [1, 2]}, TypeError),
+        (lambda: ul.col("x") == "foo", {"x": ["foo"]}, TypeError),
+        (lambda: ul.col("y") + 1, {"x": [1, 2]}, ValueError),
+        (lambda: ul.col("x").where(lambda x: x + 1), {"x": [1, 2]}, TypeError),
+        (lambda: ul.col("x").where(lambda x: x > 1) + ul.col("x"),
+         {"x": [1, 2]}, ValueError),
+        (lambda: ul.col("x").where(lambda x: x > 1).where(
+            lambda x: ul.col("x").where(lambda y: y < 2) > 0),
+         {"x": [1, 2]}, ValueError),
+    ],
+)
+def test_lazy_exceptions(
+    fn: Callable,
+    columns: dict,
+    expected_error: type,
+) -> None:
+    dtypes = {int: "int", float: "float", str: "string"}
+    columns = {
+        k: ul.from_seq(v, dtypes[type(v[0])]) for k, v in columns.items()
+    }
+    with pytest.raises(expected_error):
+        fn().collect(**columns)
+
+
+@pytest.mark.parametrize(
+    "dtype, nums, default, fn_and_then, expected_value",
+    [
+        (
+            "int64",
+            [0, 1, 2, 3, 4, 5],
+            2.0,
+            [(lambda x: x.lazy() * 2 < 4, 0.0), (lambda x: x < 4, 1.0)],
+            [0.0, 0.0, 1.0, 1.0, 2.0, 2.0],
+        ),
+        (
+            "float32",
+            [0.5, 1.5, 2.5],
+            True,
+            [(lambda x: (x.lazy() > 1.0) & (x.lazy() < 2.0), False)],
+            [True, False, True],
+        ),
+        (
+            "int32",
+            [0, 1, 2],
+            0,
+            [(lambda x: x.not_equal_scala(1), 1)],
+            [1, 0, 1],
+        ),
+    ],
+)
+def test_lazy_case(
+    dtype: str,
+    nums: List[ELEM_OPT],
+    default: ELEM_OPT,
+    fn_and_then: list,
+    expected_value: list,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    case = arr.case(default)
+    for fn, then in fn_and_then:
+        case = case.when(fn, then)
+    assert case.end().to_list() == expected_value
+
+
+def test_lazy_case_parallel() -> None:
+    arr = ul.from_seq([0.5, 1.5, 2.5, -1.0] * 50000, "float64")
+    threshold = ul.get_parallel_threshold()
+    expected_value = [1, 2, 3, 1] * 50000
+    try:
+        ul.set_parallel_threshold(0)
+        result = arr.case(default=3)\
+            .when(lambda x: x.lazy() < 1.0, then=1)\
+            .when(lambda x: x.lazy() < 2.0, then=2)\
+            .end()
+    finally:
+        ul.set_parallel_threshold(threshold)
+    assert result.to_list() == expected_value
+
+
+def test_lazy_case_exceptions() -> None:
+    # The missing values are rejected by `select` as before.
+    cond = ul.from_seq([True, None, False], "bool")
+    arr = ul.from_seq([1, 2, 3], "int64")
+    with pytest.raises(ValueError):
+        arr.case(default=0)\
+            .when(lambda x: cond.lazy() & (x.lazy() > 1), then=1)\
+            .end()
+    # The conditions are checked by `when` without evaluating them.
+    with pytest.raises(TypeError):
+        arr.case(default=0).when(lambda x: x.lazy() + 1, then=1)
+    with pytest.raises(TypeError):
+        arr.case(default=Int(0))\
+            .when(lambda x: x.lazy() > 1, then=Int(1))\
+            .end()
+
+
+class Int(int):
+    pass
+
+
+def test_lazy_case_calls_once() -> None:
+    arr = ul.from_seq([0, 1, 2, 3], "int64")
+    calls = []
+
+    def fn(x: ul.UltraFastList) -> ul.Expr:
+        calls.append(x)
+        return x.lazy() > 1
+
+    result = arr.case(default=0).when(fn, then=1).end()
+    assert result.to_list() == [0, 0, 1, 1]
+    assert len(calls) == 1
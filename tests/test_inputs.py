@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Optional, Union
 
 import pytest
 from ulist.utils import check_test_result
@@ -41,6 +41,19 @@ here = Path(__file__).parent.resolve()
         }, {
             "string": ["String", 'Hello, "World"', None, "Long\nString"]
         }),
+        (ul.read_csv, (), {
+            "path": str(here / "test_csv/03_test_string.csv"),
+            "schema": {"string": "category"}
+        }, {
+            "string": ["String", 'Hello, "World"', None, "Long\nString"]
+        }),
+        (ul.read_csv, (), {
+            "path": str(here / "test_csv/03_test_string.csv"),
+            "schema": {"string": "string"},
+            "n_threads": 2,
+        }, {
+            "string": ["String", 'Hello, "World"', None, "Long\nString"]
+        }),
         (ul.read_csv, (), {
             "path": str(here / "test_csv/04_test_nan.csv"),
             "schema": {"int": "int",
@@ -81,3 +94,285 @@ def test_constructors(
 ) -> None:
     result = test_method(*args, **kwargs)
     check_test_result(kwargs["path"], test_method, result, expected_value)
+
+
+@pytest.mark.parametrize("n_threads", [0, 1, 3, 8])
+def test_read_csv_parallel(tmp_path: Path, n_threads: int) -> None:
+    path = str(tmp_path / "foo.csv")
+    size = 20000
+    expected_value: Dict[str, List] = {
+        "int": [None if i % 5 == 0 else i for i in range(size)],
+        "string": [f'x{i},\n"y"' if i % 3 == 0 else str(i)
+                   for i in range(size)],
+        "bool": [i % 2 == 0 for i in range(size)],
+    }
+    with open(path, "w", newline="") as f:
+        f.write("int, string, skipped, bool\r\n")
+        for i in range(size):
+            string = f'"x{i},\n""y"""' if i % 3 == 0 else str(i)
+            int_ = "" if i % 5 == 0 else str(i)
+            f.write(f"{int_},{string}, foo, {i % 2 == 0}\r\n")
+    schema = {"int": "int32", "string": "string", "bool": "bool"}
+    result = ul.read_csv(path, schema, n_threads=n_threads)
+    check_test_result(path, ul.read_csv, result, expected_value)
+
+
+@pytest.mark.parametrize("n_threads", [2, 3, 8])
+def test_read_csv_parallel_literal_quotes(
+    tmp_path: Path,
+    n_threads: int,
+) -> None:
+    # The quotes in the unquoted fields are literal, so that they do not
+    # open a quoted field when the file is split into chunks.
+    path = str(tmp_path / "foo.csv")
+    with open(path, "w", newline="") as f:
+        f.write("int,size,string\n")
+        for i in range(20000):
+            f.write(f'{i},{i % 7}" disk,"a\nb, ""c"""\n')
+    schema = {"int": "int64", "size": "string", "string": "string"}
+    expected = ul.read_csv(path, schema, n_threads=1)
+    assert expected["size"][1] == '1" disk'
+    assert expected["string"][0] == 'a\nb, "c"'
+    result = ul.read_csv(path, schema, n_threads=n_threads)
+    for name, col in expected.items():
+        assert result[name].to_list() == col.to_list()
+
+
+@pytest.mark.parametrize("n_threads", [1, 2])
+def test_read_csv_projection(tmp_path: Path, n_threads: int) -> None:
+    # The fields not in the schema are never decoded or parsed, so that the
+    # invalid UTF-8 and the malformed numbers in them are fine.
+    path = str(tmp_path / "foo.csv")
+    n_cols = 200
+    with open(path, "wb") as f:
+        f.write(b",".join(b"c%d" % j for j in range(n_cols)) + b"\n")
+        for i in range(100):
+            row = [b"\xff%d" % i] * n_cols
+            row[3], row[150] = b"%d" % i, b"%d.5" % i
+            f.write(b",".join(row) + b"\n")
+    schema = {"c150": "float32", "c3": "int", "missing": "bool"}
+    result = ul.read_csv(path, schema, n_threads=n_threads)
+    assert list(result.keys()) == ["c150", "c3", "missing"]
+    expected_value: Dict[str, List] = {
+        "c150": [i + 0.5 for i in range(100)],
+        "c3": list(range(100)),
+        "missing": [],
+    }
+    check_test_result(path, ul.read_csv, result, expected_value)
+
+
+@pytest.mark.parametrize(
+    "path, schema, expected_dtypes, expected_value",
+    [
+        (
+            "00_test_int.csv",
+            None,
+            {"int32": "int32", "int64": "int64"},
+            {
+                "int32": [-2147483648, 2147483647, 2147483647],
+                "int64": [-9223372036854774808,
+                          9223372036854774807,
+                          9223372036854774807],
+            },
+        ),
+        (
+            "01_test_float.csv",
+            None,
+            {"float32": "float64", "float64": "float64"},
+            {
+                "float32": [3.14159, 0.314, 0.314],
+                "float64": [3.14159, 31.4, 31.4],
+            },
+        ),
+        (
+            "02_test_bool.csv",
+            None,
+            {"bool": "bool"},
+            {"bool": [True, False, True, False]},
+        ),
+        (
+            "03_test_string.csv",
+            None,
+            {"string": "string"},
+            {"string": ["String", 'Hello, "World"', None, "Long\nString"]},
+        ),
+        (
+            "04_test_nan.csv",
+            None,
+            {"int": "int32", "float": "float32", "string": "int32",
+             "bool": "bool"},
+            {
+                "int": [None, 2, 3, 4],
+                "float": [1.0, None, 3.0, 4.0],
+                "string": [1, 2, None, 4],
+                "bool": [True, False, True, None],
+            },
+        ),
+        (
+            "04_test_nan.csv",
+            {"bool": None, "float": "float64", "foo": None},
+            {"bool": "bool", "float": "float64", "foo": "string"},
+            {
+                "bool": [True, False, True, None],
+                "float": [1.0, None, 3.0, 4.0],
+                "foo": [],
+            },
+        ),
+    ],
+)
+@pytest.mark.parametrize("n_threads", [1, 2])
+def test_read_csv_infer(
+    path: str,
+    schema: Optional[Dict[str, Optional[str]]],
+    expected_dtypes: Dict[str, str],
+    expected_value: Dict[str, List],
+    n_threads: int,
+) -> None:
+    path = str(here / "test_csv" / path)
+    result = ul.read_csv(path, schema, n_threads=n_threads)
+    assert list(result.keys()) == list(expected_dtypes.keys())
+    assert {k: v.dtype for k, v in result.items()} == expected_dtypes
+    check_test_result(path, ul.read_csv, result, expected_value)
+    batches = list(ul.read_csv_batches(path, schema, batch_size=2))
+    for k, v in result.items():
+        assert batches[0][k].dtype == v.dtype
+        assert [x for y in batches for x in y[k].to_list()] == v.to_list()
+
+
+@pytest.mark.parametrize("sample_size", [1, 10, 1000])
+def test_read_csv_infer_sample(tmp_path: Path, sample_size: int) -> None:
+    path = str(tmp_path / "foo.csv")
+    with open(path, "w") as f:
+        f.write("foo,bar\n")
+        for i in range(100):
+            f.write(f"{i},{i * 1000}\n")
+    result = ul.read_csv(path, sample_size=sample_size)
+    assert result["foo"].dtype == "int32"
+    assert result["foo"].to_list() == list(range(100))
+    assert result["bar"].to_list() == [i * 1000 for i in range(100)]
+
+
+@pytest.mark.parametrize(
+    "tail, expected_dtype, expected_tail",
+    [
+        ("3000000000", "int64", 3000000000),
+        ("0.1", "float64", 0.1),
+        ("x", "string", "x"),
+    ],
+)
+@pytest.mark.parametrize("n_threads", [1, 2])
+def test_read_csv_infer_promote(
+    tmp_path: Path,
+    tail: str,
+    expected_dtype: str,
+    expected_tail: Union[int, float, str],
+    n_threads: int,
+) -> None:
+    path = str(tmp_path / "foo.csv")
+    with open(path, "w") as f:
+        f.write("foo\n" + "1\n" * 10 + " \n" + tail + "\n")
+    # The value after the sample does not fit the inferred dtype, which is
+    # promoted with the values parsed so far.
+    result = ul.read_csv(path, n_threads=n_threads, sample_size=5)["foo"]
+    assert result.dtype == expected_dtype
+    expected_head = "1" if expected_dtype == "string" else 1
+    assert result.to_list() == [expected_head] * 10 + [None, expected_tail]
+    assert ul.read_csv(path, sample_size=20)["foo"].dtype == expected_dtype
+    batches = list(ul.read_csv_batches(path, batch_size=11, sample_size=5))
+    assert batches[0]["foo"].dtype == "int32"
+    assert batches[1]["foo"].to_list() == [expected_tail]
+    # The given dtype is never promoted.
+    with pytest.raises(TypeError):
+        ul.read_csv(path, {"foo": "int32"})
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 4, 100])
+def test_read_csv_batches(batch_size: int) -> None:
+    path = str(here / "test_csv/04_test_nan.csv")
+    schema = {"bool": "bool", "string": "string", "foo": "int"}
+    expected_value = ul.read_csv(path, schema)
+    batches = list(ul.read_csv_batches(path, schema, batch_size=batch_size))
+    assert len(batches) == -(-4 // batch_size)
+    for k, v in expected_value.items():
+        assert v.dtype == batches[0][k].dtype
+        result = [x for batch in batches for x in batch[k].to_list()]
+        assert result == v.to_list()
+
+
+@pytest.mark.parametrize(
+    "dtype, nums",
+    [
+        ("bool", [True, False, None, True]),
+        ("bool", [True, None] * 50),
+        ("category", ["foo", "bar", None, "foo"]),
+        ("float32", [1.0, None, 3.0]),
+        ("float64", [1.0, 2.0, 3.0]),
+        ("int32", [1, None, 3]),
+        ("int64", list(range(100))),
+        ("int64", []),
+        ("string", ["foo", "", None, "bär"]),
+        ("string", []),
+    ],
+)
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load(
+    tmp_path: Path,
+    dtype: str,
+    nums: List,
+    mmap: bool,
+) -> None:
+    path = str(tmp_path / "foo.ulist")
+    ul.from_seq(nums, dtype).save(path)
+    result = ul.load(path, mmap=mmap)
+    assert result.dtype == dtype
+    check_test_result(dtype, "load", result, nums)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_many(tmp_path: Path, mmap: bool) -> None:
+    path = str(tmp_path / "foo.ulist")
+    expected_value = {
+        "foo": [1, None, 3],
+        "bar": ["a", None, "c"],
+        "baz": [True, None, False],
+    }
+    dtypes = {"foo": "int64", "bar": "category", "baz": "bool"}
+    ul.save_many(
+        path,
+        {k: ul.from_seq(v, dtypes[k]) for k, v in expected_value.items()}
+    )
+    result = ul.load_many(path, mmap=mmap)
+    assert list(result.keys()) == list(expected_value.keys())
+    for k, v in result.items():
+        assert v.dtype == dtypes[k]
+    check_test_result(path, ul.load_many, result, expected_value)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64", "int32", "int64"])
+def test_load_mmap_copy_on_write(tmp_path: Path, dtype: str) -> None:
+    # The values borrow the memory map, which is copied by the first write
+    # instead of writing to the file.
+    path = str(tmp_path / "foo.ulist")
+    ul.from_seq([1, 2, None, 4], dtype).save(path)
+    arr = ul.load(path, mmap=True)
+    view = arr[1:3]
+    arr.set(0, 5)
+    arr *= 2
+    assert arr.to_list() == [10, 4, None, 8]
+    assert view.to_list() == [2, None]
+    assert ul.load(path, mmap=True).to_list() == [1, 2, None, 4]
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64", "int32", "int64"])
+def test_load_mmap_save_same_path(tmp_path: Path, dtype: str) -> None:
+    # Saving to the path of a mapped file replaces the file instead of
+    # truncating it under the loaded ulist.
+    path = str(tmp_path / "foo.ulist")
+    ul.from_seq([1, 2, None, 4], dtype).save(path)
+    arr = ul.load(path, mmap=True)
+    ul.from_seq([3], dtype).save(path)
+    assert arr.to_list() == [1, 2, None, 4]
+    assert ul.load(path, mmap=True).to_list() == [3]
+    arr.save(path)
+    assert ul.load(path, mmap=True).to_list() == [1, 2, None, 4]
+    assert [x.name for x in tmp_path.iterdir()] == ["foo.ulist"]
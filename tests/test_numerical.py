@@ -110,6 +110,67 @@ def test_statistics_methods(
     check_test_result(dtype, test_method, result, expected_value)
 
 
+@expand_dtypes
+@pytest.mark.parametrize(
+    "test_method, dtype, nums, expected_value, kwargs",
+    [
+        ('append', 'int', [1, 2], (3, 1, 2, 0, False), {'elem': 3}),
+        ('append', 'float', [1.0, 2.0], (2.0, 0.0, 1, 2, True),
+         {'elem': 0.0}),
+        ('pop', 'int', [1, 0, 5], (1, 0, 0, 1, True), {}),
+        ('replace', 'int', [1, 0, 5], (5, 1, 2, 0, False),
+         {'old': 0, 'new': 1}),
+        ('replace', 'float', [1.0, None], (2.0, 1.0, 1, 0, False),
+         {'old': None, 'new': 2.0}),
+        ('set', 'int', [1, 2, 3], (3, -1, 2, 1, False),
+         {'index': 1, 'elem': -1}),
+        ('set', 'float', [1.0, 2.0, 3.0], (2.0, 1.0, 1, 0, False),
+         {'index': 2, 'elem': None}),
+        ('sort', 'int', [3, None, 0, 3], (3, 0, 1, 0, True),
+         {'ascending': True}),
+        ('sort', 'float', [3.0, None, 0.0, 3.0], (3.0, 0.0, 0, 2, True),
+         {'ascending': False}),
+    ],
+)
+def test_statistics_cache(
+    test_method: str,
+    dtype: str,
+    nums: LIST_TYPE,
+    expected_value: tuple,
+    kwargs: dict,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    # Compute the cached statistics before modifying the ulist.
+    result = (arr.max(), arr.min(), arr.argmax(), arr.argmin(),
+              arr.has_zero())
+    getattr(arr, test_method)(**kwargs)
+    result = (arr.max(), arr.min(), arr.argmax(), arr.argmin(),
+              arr.has_zero())
+    check_test_result(dtype, test_method, list(result), list(expected_value))
+
+
+@expand_dtypes
+@pytest.mark.parametrize(
+    "dtype, nums, expected_value",
+    [
+        ('int', [1, 1, 2, 5, 5, None], [1, 2, 5, None]),
+        ('int', [None, None], [None]),
+        ('float', [1.0, 2.0, 2.0], [1.0, 2.0]),
+        ('float', [], []),
+    ],
+)
+def test_unique_sorted(
+    dtype: str,
+    nums: LIST_TYPE,
+    expected_value: LIST_TYPE,
+) -> None:
+    arr = ul.from_seq(nums, dtype)
+    # The unique elements of a sorted ulist keep the order.
+    check_test_result(dtype, 'unique', arr.unique(), expected_value)
+    arr.sort(ascending=True)
+    check_test_result(dtype, 'unique', arr.unique(), expected_value)
+
+
 @expand_dtypes
 @pytest.mark.parametrize(
     "test_method, dtype, nums, expected_value, kwargs",
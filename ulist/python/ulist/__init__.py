@@ -1,7 +1,9 @@
-from .constructor import arange, choices, cycle, from_seq, random, repeat  # noqa:F401, E501
-from .control_flow import select  # noqa:F401
+from .constructor import arange, choices, cycle, from_arrow_c, from_buffer, from_seq, random, repeat  # noqa:F401, E501
+from .control_flow import all_of, any_of, select  # noqa:F401
 from .core import UltraFastList  # noqa:F401
-from .io import read_csv  # noqa:F401
+from .expr import Expr, col  # noqa:F401
+from .io import load, load_many, read_csv, read_csv_batches, save_many  # noqa:F401, E501
 from .ulist import IndexList  # noqa:F401
+from .ulist import get_parallel_threshold, set_parallel_threshold  # noqa:F401
 
 __version__ = "0.12.1"
@@ -1,12 +1,16 @@
-from typing import Optional, Sequence, Union, Type
+from typing import Any, Optional, Sequence, Union, Type
 
 from .core import UltraFastList
 from .typedef import ELEM
-from .ulist import (BooleanList, FloatList32, FloatList64, IntegerList32,
-                    IntegerList64, StringList, arange32, arange64)
+from .ulist import (BooleanList, CategoryList, FloatList32, FloatList64,
+                    IntegerList32, IntegerList64, StringList, arange32,
+                    arange64)
+from .ulist import from_arrow_c as _from_arrow_c
+from .ulist import from_buffer as _from_buffer
 
 T = Union[
     Type[BooleanList],
+    Type[CategoryList],
     Type[FloatList32],
     Type[FloatList64],
     Type[IntegerList32],
@@ -14,6 +18,32 @@ T = Union[
     Type[StringList],
 ]
 
+# The struct format characters of the element types.
+BUFFER_FORMATS = {
+    "int": "q",
+    "int32": "i",
+    "int64": "q",
+    "float": "d",
+    "float32": "f",
+    "float64": "d",
+    "bool": "B",
+}
+BYTE_FORMATS = ("B", "b", "c")
+
+
+def _as_buffer(obj: Any, fmt: str) -> memoryview:
+    """View obj as a buffer, the raw bytes such as `bytes` objects are
+    reinterpreted as the elements of format fmt without copying."""
+    result = memoryview(obj)
+    if result.format == fmt:
+        return result
+    # Numpy exports the bool arrays with format '?'.
+    if result.format in BYTE_FORMATS or (fmt == "B" and result.format == "?"):
+        if not result.c_contiguous:
+            result = memoryview(result.tobytes())
+        return result.cast("B").cast(fmt)  # type: ignore
+    return result
+
 
 def arange(
     start: int,
@@ -167,6 +197,96 @@ def cycle(obj: Sequence, size: int, dtype: str) -> UltraFastList:
     return result
 
 
+def from_arrow_c(obj: Any) -> UltraFastList:
+    """Construct a ulist object by the Arrow C data interface.
+
+    Args:
+        obj (Any):
+            Object which implements `__arrow_c_array__`, such as
+            `pyarrow.Array`, or a tuple of the PyCapsules of the
+            ArrowSchema and the ArrowArray. The supported types are
+            int32, int64, float32, float64, bool, string, large string
+            and the dictionary arrays of string values. The numerical
+            values without missing values are borrowed from the array
+            instead of copied, so that the exporter keeps them until the
+            ulist is modified or deleted.
+
+    Raises:
+        TypeError:
+            Unsupported arrow format!
+
+    Returns:
+        UltraFastList: A ulist object.
+
+    Examples
+    --------
+    >>> import ulist as ul
+    >>> arr1 = ul.from_seq([1, None, 3], dtype='int')
+    >>> arr2 = ul.from_arrow_c(arr1)
+    >>> arr2
+    UltraFastList([1, None, 3])
+    """
+    if hasattr(obj, "__arrow_c_array__"):
+        schema, array = obj.__arrow_c_array__()
+    else:
+        schema, array = obj
+    return UltraFastList(_from_arrow_c(schema, array))
+
+
+def from_buffer(
+    obj: Any,
+    dtype: str,
+    mask: Optional[Any] = None,
+) -> UltraFastList:
+    """Construct a ulist object from an object which supports the buffer
+    protocol, such as numpy array, array.array, bytes and memoryview.
+    The elements are copied only once, instead of being converted to
+    Python objects.
+
+    Args:
+        obj (Any):
+            Object which supports the buffer protocol. The element type of
+            the buffer should match dtype, and the buffers of bytes are
+            reinterpreted as the raw memory of the elements.
+        dtype (str):
+            The type of the output ulist. 'int', 'int32', 'int64',
+            'float', 'float32', 'float64' or 'bool'.
+        mask (Optional[Any], optional):
+            Buffer of bool or uint8 elements with the same length as obj,
+            the nonzero elements mark the missing values. Defaults to None.
+
+    Raises:
+        ValueError:
+            Parameter dtype should be 'int', 'int32', 'int64',
+            'float', 'float32', 'float64' or 'bool'!
+
+    Returns:
+        UltraFastList: A ulist object.
+
+    Examples
+    --------
+    >>> import array
+    >>> import ulist as ul
+    >>> arr1 = ul.from_buffer(array.array('q', [1, 2, 3]), dtype='int')
+    >>> arr1
+    UltraFastList([1, 2, 3])
+
+    >>> arr2 = ul.from_buffer(array.array('d', [1.0, 2.0]), dtype='float',
+    ...                       mask=bytes([0, 1]))
+    >>> arr2
+    UltraFastList([1.0, None])
+    """
+    if dtype not in BUFFER_FORMATS:
+        raise ValueError(
+            "Parameter dtype should be 'int', 'int32', 'int64', " +
+            "'float', 'float32', 'float64' or 'bool'!"
+        )
+    values = _as_buffer(obj, BUFFER_FORMATS[dtype])
+    if mask is not None:
+        mask = _as_buffer(mask, "B")
+    return UltraFastList(_from_buffer(values, dtype, mask))
+
+
 def from_seq(obj: Sequence, dtype: str) -> UltraFastList:
     """Construct a ulist object from a sequence object.
 
@@ -175,12 +295,15 @@ def from_seq(obj: Sequence, dtype: str) -> UltraFastList:
             Sequence object such as list, tuple and range.
         dtype (str):
             The type of the output ulist. 'int', 'int32', 'int64',
-            'float', 'float32', 'float64', 'bool' or 'string'.
+            'float', 'float32', 'float64', 'bool', 'string' or 'category'.
+            The 'category' ulist stores the strings as integer codes of
+            their distinct values.
 
     Raises:
         ValueError:
             Parameter dtype should be 'int', 'int32', 'int64',
-            'float', 'float32', 'float64', 'bool' or 'string'!
+            'float', 'float32', 'float64', 'bool', 'string' or
+            'category'!
 
     Returns:
         UltraFastList: A ulist object.
@@ -203,6 +326,10 @@ def from_seq(obj: Sequence, dtype: str) -> UltraFastList:
     >>> arr4 = ul.from_seq(('foo', 'bar', 'baz'), dtype='string')
     >>> arr4
     UltraFastList(['foo', 'bar', 'baz'])
+
+    >>> arr5 = ul.from_seq(['foo', 'bar', 'foo'], dtype='category')
+    >>> arr5
+    UltraFastList(['foo', 'bar', 'foo'])
     """
     na_indexes = set([i for i, x in enumerate(obj) if x is None])
     if dtype == "int" or dtype == "int64":
@@ -223,10 +350,14 @@ def from_seq(obj: Sequence, dtype: str) -> UltraFastList:
     elif dtype == "string":
         cls = StringList
         na_val = ''
+    elif dtype == "category":
+        cls = CategoryList
+        na_val = ''
     else:
         raise ValueError(
             "Parameter dtype should be 'int', 'int32', 'int64', " +
-            "'float', 'float32', 'float64', 'bool' or 'string'!"
+            "'float', 'float32', 'float64', 'bool', 'string' or " +
+            "'category'!"
         )
     elements = [x if x is not None else na_val for x in obj]
     result = UltraFastList(cls(elements, na_indexes))
@@ -1,21 +1,95 @@
 from __future__ import annotations  # To avoid circular import.
-from typing import Callable, List, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from typing import TYPE_CHECKING
 
 from .ulist import BooleanList
-from .typedef import ELEM, LIST_PY
+from .typedef import ELEM
+from .ulist import all_of as _all_of
+from .ulist import any_of as _any_of
+from .ulist import eval_expr as _eval_expr
 from .ulist import select_bool as _select_bool
 from .ulist import select_float as _select_float
+from .ulist import select_float32 as _select_float32
 from .ulist import select_int as _select_int
+from .ulist import select_int32 as _select_int32
 from .ulist import select_string as _select_string
 
 
 if TYPE_CHECKING:  # To avoid circular import.
     from . import UltraFastList
+    from .expr import Expr
+
+_SELECT_FNS: Dict[str, Callable] = {
+    "bool": _select_bool,
+    "float32": _select_float32,
+    "float64": _select_float,
+    "int32": _select_int32,
+    "int64": _select_int,
+    "string": _select_string,
+}
+
+
+def _bool_values(conditions: List[UltraFastList]) -> List[BooleanList]:
+    result = []
+    for cond in conditions:
+        assert isinstance(cond._values, BooleanList)
+        result.append(cond._values)
+    return result
+
+
+def all_of(conditions: List[UltraFastList]) -> UltraFastList:
+    """Return the element-wise AND of all the conditions, which are combined
+    in one pass without the intermediate ulists of `a & b & c`.
+
+    The missing values follow the three-valued logic as `&`, that is
+    `False & None` is False and `True & None` is None.
+
+    Args:
+        conditions (List[UltraFastList]):
+            The non-empty list of ulists with dtype bool and the same size.
+
+    Returns:
+        UltraFastList: A ulist object.
+
+    Examples
+    --------
+    >>> import ulist as ul
+    >>> arr = ul.arange(6)
+    >>> ul.all_of([arr > 1, arr < 4, arr != 2])
+    UltraFastList([False, False, False, True, False, False])
+    """
+    from . import UltraFastList  # To avoid circular import.
+    return UltraFastList(_all_of(_bool_values(conditions)))
+
+
+def any_of(conditions: List[UltraFastList]) -> UltraFastList:
+    """Return the element-wise OR of all the conditions, which are combined
+    in one pass without the intermediate ulists of `a | b | c`.
+
+    The missing values follow the three-valued logic as `|`, that is
+    `True | None` is True and `False | None` is None.
+
+    Args:
+        conditions (List[UltraFastList]):
+            The non-empty list of ulists with dtype bool and the same size.
+
+    Returns:
+        UltraFastList: A ulist object.
+
+    Examples
+    --------
+    >>> import ulist as ul
+    >>> arr = ul.arange(6)
+    >>> ul.any_of([arr < 1, arr > 4, arr == 2])
+    UltraFastList([True, False, True, False, False, True])
+    """
+    from . import UltraFastList  # To avoid circular import.
+    return UltraFastList(_any_of(_bool_values(conditions)))
 
 
 def select(
         conditions: List[UltraFastList],
-        choices: LIST_PY,
+        choices: Sequence[Union[ELEM, UltraFastList]],
         default: ELEM,
 ) -> UltraFastList:
     """Return a ulist drawn from elements in `choices`, depending on`conditions`.
@@ -25,9 +99,10 @@ def select(
             The list of conditions which determine from which array in
             `choices` the output elements are taken. When multiple conditions
             are satisfied, the first one encountered in `conditions` is used.
-        choices (LIST_PY):
-            The list of ulist from which the output elements are taken.
-            It has to be of the same length as `conditions`.
+        choices (Sequence[Union[ELEM, UltraFastList]]):
+            The elements or the ulists from which the output elements are
+            taken, the i-th row of a ulist is taken for the i-th row of the
+            output. It has to be of the same length as `conditions`.
         default (ELEM):
             The element inserted in output when all conditions evaluate
             to False.
@@ -35,9 +110,13 @@ def select(
     Raises:
         TypeError:
             The type of parameter `default` should be bool, float, int or str!
+        TypeError:
+            The ulists in `choices` should have the same dtype!
 
     Returns:
-        UltraFastList: A ulist object.
+        UltraFastList: A ulist object, of the dtype of the ulists in
+        `choices` if any, e.g. int32 or float32, otherwise of the type of
+        `default`. The missing values of the ulists stay missing.
 
     Examples
     --------
@@ -56,11 +135,29 @@ def select(
     >>> result = ul.select(conditions, choices=[0, 1], default=2)
     >>> result
     UltraFastList([0, 0, 1, 1, 2, 2])
+
+    >>> result = ul.select(conditions, choices=[arr * 10, 1], default=2)
+    >>> result
+    UltraFastList([0, 10, 1, 1, 2, 2])
     """
+    from . import UltraFastList  # To avoid circular import.
+
     assert len(conditions) == len(choices)
+    choices = [
+        x.astype("string")
+        if isinstance(x, UltraFastList) and x.dtype == "category" else x
+        for x in choices
+    ]
+    dtypes = {x.dtype for x in choices if isinstance(x, UltraFastList)}
 
-    if type(default) is bool:
-        fn: Callable = _select_bool
+    if len(dtypes) > 1:
+        raise TypeError(
+            "The ulists in `choices` should have the same dtype!"
+        )
+    elif dtypes:
+        fn: Callable = _SELECT_FNS[dtypes.pop()]
+    elif type(default) is bool:
+        fn = _select_bool
     elif type(default) is float:
         fn = _select_float
     elif type(default) is int:
@@ -73,13 +170,9 @@ def select(
             " bool, float, int or str!"
         )
 
-    _conditions = []
-    for cond in conditions:
-        assert isinstance(cond._values, BooleanList)
-        _conditions.append(cond._values)
-    result = fn(_conditions, choices, default)
-
-    from . import UltraFastList  # To avoid circular import.
+    values = [x._values if isinstance(x, UltraFastList) else x
+              for x in choices]
+    result = fn(_bool_values(conditions), values, default)
     return UltraFastList(result)
 
 
@@ -87,23 +180,52 @@ class CaseObject:
     """
     This is designed to implement `case` method for UtraFastList.
     To provide an interface similar to SQL's `case` statement.
+
+    The function of a condition can return a lazy expression, such as
+    `lambda x: x.lazy() < 2`. For the default of dtype int, float or bool,
+    such conditions are calculated by `end` in one pass, where each row
+    skips the conditions after the first True one.
     """
 
     def __init__(self, nums: UltraFastList, default: ELEM) -> None:
         self._values = nums
         self._default = default
-        self._conditions: List[UltraFastList] = []
+        self._conditions: List[Union[UltraFastList, Expr]] = []
         self._choices: list = []
 
+    def _end_lazy(self) -> Optional[UltraFastList]:
+        """Execute the case statement by the lazy expressions, and return
+        None if the conditions can not be calculated lazily."""
+        from . import UltraFastList  # To avoid circular import.
+        from .expr import Expr, _Program
+
+        if isinstance(self._default, str) or \
+                not any(isinstance(x, Expr) for x in self._conditions):
+            return None
+        program = _Program({})
+        conditions = [x if isinstance(x, Expr) else x.lazy()
+                      for x in self._conditions]
+        result = program.select(conditions, self._choices, self._default)
+        # `select` does not accept the missing values in the conditions,
+        # which are checked by the eager way.
+        if any(x.count_na() > 0 for x in program.inputs):
+            return None
+        try:
+            values = _eval_expr(program.instrs, program.inputs, result, [])
+        except (TypeError, ValueError):
+            return None
+        return UltraFastList(values)
+
     def when(
         self,
-        fn: Callable[[UltraFastList], UltraFastList],
+        fn: Callable[[UltraFastList], Union[UltraFastList, Expr]],
         then: ELEM
     ) -> 'CaseObject':
         """Calculate the condition, and keep the condition and element to use.
+        The condition is kept as it is if it is a lazy expression.
 
         Args:
-            fn (Callable[[UltraFastList], UltraFastList]):
+            fn (Callable[[UltraFastList], Union[UltraFastList, Expr]]):
                 Function to calculate the condition.
             then (ELEM):
                 The element to use when the condition is satisfied.
@@ -117,8 +239,13 @@ class CaseObject:
         Returns:
             CaseObject
         """
+        from .expr import Expr, _Program
+
         cond = fn(self._values)
-        if cond.dtype != "bool":
+        if isinstance(cond, Expr):
+            # Only compiled to check the dtype, the rows are not evaluated.
+            _Program({}).conditions([cond])
+        elif cond.dtype != "bool":
             raise TypeError(
                 "Calling parameter `fn` should return a ulist with dtype bool!"
             )
@@ -133,5 +260,16 @@ class CaseObject:
         return self
 
     def end(self) -> UltraFastList:
-        """Execute the case statement."""
-        return select(self._conditions, self._choices, self._default)
+        """Execute the case statement.
+
+        Returns:
+            UltraFastList: A ulist object.
+        """
+        from .expr import Expr
+
+        result = self._end_lazy()
+        if result is not None:
+            return result
+        conditions = [x.collect() if isinstance(x, Expr) else x
+                      for x in self._conditions]
+        return select(conditions, self._choices, self._default)
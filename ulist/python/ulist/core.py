@@ -1,10 +1,12 @@
 from __future__ import annotations  # To avoid circular import.
 
-from typing import TYPE_CHECKING, Callable, Union, Optional, Any
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Union, Optional, Any, Tuple
 
 from .typedef import COUNTER, ELEM, LIST_PY, LIST_RS, NUM, ELEM_OPT
 from .ulist import (
     BooleanList,
+    CategoryList,
     FloatList32,
     FloatList64,
     IndexList,
@@ -15,9 +17,12 @@ from .ulist import (
 
 if TYPE_CHECKING:  # To avoid circular import.
     from .control_flow import CaseObject
+    from .expr import Expr
 
 NUM_OR_LIST = Union[NUM, "UltraFastList"]
 ELEM_OR_LIST = Union[ELEM, "UltraFastList"]
+NON_NUM_TYPES = (BooleanList, StringList, CategoryList)
+STR_TYPES = (StringList, CategoryList)
 
 
 class UltraFastList:
@@ -39,11 +44,14 @@ class UltraFastList:
             self.dtype = "bool"
         elif type(values) is StringList:
             self.dtype = "string"
+        elif type(values) is CategoryList:
+            self.dtype = "category"
         else:
             raise TypeError(
                 "Parameter values should be " +
                 "FloatList32, FloatList64, IntegerList32, " +
-                "IntegerList64, BooleanList or StringList type!"
+                "IntegerList64, BooleanList, StringList or " +
+                "CategoryList type!"
             )
         self._values = values
 
@@ -80,6 +88,17 @@ class UltraFastList:
             "bool, str or UltraFastList type!"
         )
 
+    def _slice(self, index: slice) -> "UltraFastList":
+        start, stop, step = index.indices(self.size())
+        indexes = range(start, stop, step)
+        if len(indexes) == 0:
+            return UltraFastList(self._values.slice(0, 0))
+        elif step == 1:
+            return UltraFastList(self._values.slice(start, stop))
+        else:
+            # The strided elements are copied.
+            return self.get_by_indexes(IndexList(list(indexes)))
+
     def __add__(self, other: NUM_OR_LIST) -> "UltraFastList":
         """Return self + other."""
         return self._arithmetic_method(other, self.add, self.add_scala)
@@ -88,20 +107,48 @@ class UltraFastList:
         """Return self & other."""
         return self.and_(other)
 
+    @property
+    def __array_interface__(self) -> dict:
+        """The numpy array interface of self, so that `np.asarray(arr)`
+        shares the memory of the numerical ulist instead of copying it.
+        The missing values are exposed as the na value, see
+        `validity_buffer` for the validity mask. Self can not be modified
+        while the numpy arrays are alive.
+        """
+        if isinstance(self._values, NON_NUM_TYPES):
+            raise AttributeError(
+                f"dtype {self.dtype} does not support __array_interface__!"
+            )
+        return self._values.__array_interface__
+
+    def __arrow_c_array__(
+        self,
+        requested_schema: Optional[object] = None,
+    ) -> Tuple[object, object]:
+        """The Arrow PyCapsule interface of self, see `to_arrow_c`. The
+        requested schema is ignored, and self is exported as it is.
+        """
+        return self.to_arrow_c()
+
     def __eq__(self, other: ELEM_OR_LIST) -> "UltraFastList":  # type: ignore
         """Return self == other."""
         return self._cmp_method(other, self.equal, self.equal_scala)
 
-    def __getitem__(self, index: Union[int, IndexList]
+    def __getitem__(self, index: Union[int, IndexList, slice]
                     ) -> Union[ELEM_OPT, "UltraFastList"]:
-        """Return self[index]."""
+        """Return self[index]. The contiguous slice such as `self[a:b]` of
+        a numerical or category ulist is a view which shares the values with
+        self, only the validity bits of the slice are copied. The slice of a
+        string or bool ulist copies its values."""
         if isinstance(index, int):
             return self._values.get(index)
         elif isinstance(index, IndexList):
             return UltraFastList(self._values.get_by_indexes(index))
+        elif isinstance(index, slice):
+            return self._slice(index)
         else:
             raise TypeError(
-                "Parameter index should be int or IndexList type!"
+                "Parameter index should be int, IndexList or slice type!"
             )
 
     def __ge__(self, other: NUM_OR_LIST) -> "UltraFastList":
@@ -120,10 +167,45 @@ class UltraFastList:
             self.greater_than_scala,
         )
 
+    def __iadd__(self, other: NUM_OR_LIST) -> "UltraFastList":
+        """Update self to self + other in place."""
+        return self._arithmetic_method(
+            other,
+            partial(self.add, out=self),
+            partial(self.add_scala, out=self),
+        )
+
+    def __imul__(self, other: NUM_OR_LIST) -> "UltraFastList":
+        """Update self to self * other in place."""
+        return self._arithmetic_method(
+            other,
+            partial(self.mul, out=self),
+            partial(self.mul_scala, out=self),
+        )
+
     def __invert__(self) -> "UltraFastList":
         """Return ~self."""
         return self.not_()
 
+    def __isub__(self, other: NUM_OR_LIST) -> "UltraFastList":
+        """Update self to self - other in place."""
+        return self._arithmetic_method(
+            other,
+            partial(self.sub, out=self),
+            partial(self.sub_scala, out=self),
+        )
+
+    def __itruediv__(self, other: NUM_OR_LIST) -> "UltraFastList":
+        """Update self to self / other in place. The quotients of the
+        integer lists are floats, so they are returned as a new ulist."""
+        if not isinstance(self._values, (FloatList32, FloatList64)):
+            return self / other
+        return self._arithmetic_method(
+            other,
+            partial(self.div, out=self),
+            partial(self.div_scala, out=self),
+        )
+
     def __le__(self, other: int) -> "UltraFastList":
         """Return self <= other."""
         return self._cmp_method(
@@ -192,15 +274,29 @@ class UltraFastList:
         """Return self / other."""
         return self._arithmetic_method(other, self.div, self.div_scala)
 
-    def add(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self + other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def add(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self + other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.add_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.add(other._values))
 
-    def add_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self + elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def add_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self + elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.add_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.add_scala(elem))
 
     def all(self) -> Optional[bool]:
@@ -258,12 +354,12 @@ class UltraFastList:
 
     def argmax(self) -> int:
         """Returns the indices of the maximum values of self."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+        assert not isinstance(self._values, NON_NUM_TYPES)
         return self._values.argmax()
 
     def argmin(self) -> int:
         """Returns the indices of the minimum values of self."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+        assert not isinstance(self._values, NON_NUM_TYPES)
         return self._values.argmin()
 
     def astype(self, dtype: str) -> "UltraFastList":
@@ -272,7 +368,8 @@ class UltraFastList:
         Raises:
             ValueError:
                 Parameter dtype should be 'int', 'int32', 'int64',
-                'float', 'float32', 'float64', 'bool' or 'string'!
+                'float', 'float32', 'float64', 'bool', 'string' or
+                'category'!
 
         Returns:
             UltraFastList: A ulist object.
@@ -307,10 +404,18 @@ class UltraFastList:
                 result = self.copy()
             else:
                 result = UltraFastList(self._values.as_str())
+        elif dtype == "category":
+            if isinstance(self._values, CategoryList):
+                result = self.copy()
+            elif isinstance(self._values, StringList):
+                result = UltraFastList(self._values.as_category())
+            else:
+                result = UltraFastList(self._values.as_str().as_category())
         else:
             raise ValueError(
                 "Parameter dtype should be 'int', 'int32', 'int64', " +
-                "'float', 'float32', 'float64', 'bool' or 'string'!"
+                "'float', 'float32', 'float64', 'bool', 'string' or " +
+                "'category'!"
             )
         return result
 
@@ -338,6 +443,13 @@ class UltraFastList:
         ...             .end()
         >>> result
         UltraFastList([0, 0, 1, 1, 2, 2])
+
+        >>> result = arr.case(default=2)\
+        ...             .when(lambda x: x.lazy() < 2, then=0)\
+        ...             .when(lambda x: x.lazy() < 4, then=1)\
+        ...             .end()
+        >>> result
+        UltraFastList([0, 0, 1, 1, 2, 2])
         """
         assert self.count_na() == 0
         from .control_flow import CaseObject  # To avoid circular import.
@@ -345,7 +457,7 @@ class UltraFastList:
 
     def contains(self, elem: str) -> UltraFastList:
         """Return whether the element of self contains `elem`."""
-        assert isinstance(self._values, StringList)
+        assert isinstance(self._values, STR_TYPES)
         return UltraFastList(self._values.contains(elem))
 
     def copy(self) -> "UltraFastList":
@@ -372,36 +484,60 @@ class UltraFastList:
         self,
         other: "UltraFastList",
         zero_div: bool = False,
+        out: Optional["UltraFastList"] = None,
     ) -> "UltraFastList":
-        """Return self / other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+        """Return self / other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
         if not zero_div and self.has_zero():
             raise ValueError("Does not allow zero division!")
+        if out is not None:
+            self._values.div_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.div(other._values))
 
     def div_scala(
         self,
         elem: float,
         zero_div: bool = False,
+        out: Optional["UltraFastList"] = None,
     ) -> "UltraFastList":
-        """Return self / elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+        """Return self / elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
         if not zero_div and elem == 0.0:
             raise ValueError("Does not allow zero division!")
+        if out is not None:
+            self._values.div_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.div_scala(elem))
 
     def ends_with(self, elem: str) -> UltraFastList:
         """Return whether the element of self ends with `elem`."""
-        assert isinstance(self._values, StringList)
+        assert isinstance(self._values, STR_TYPES)
         return UltraFastList(self._values.ends_with(elem))
 
-    def equal(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self == other."""
+    def equal(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self == other, which is written to `out` if given."""
+        if out is not None:
+            assert not isinstance(self._values, NON_NUM_TYPES)
+            self._values.equal_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.equal(other._values))
 
-    def equal_scala(self, elem: ELEM) -> "UltraFastList":
-        """Return self == elem."""
+    def equal_scala(
+        self,
+        elem: ELEM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self == elem, which is written to `out` if given."""
+        if out is not None:
+            assert not isinstance(self._values, NON_NUM_TYPES)
+            self._values.equal_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.equal_scala(elem))
 
     def filter(self, condition: "UltraFastList") -> "UltraFastList":
@@ -420,26 +556,54 @@ class UltraFastList:
         """Return self[indexes]."""
         return UltraFastList(self._values.get_by_indexes(indexes))
 
-    def greater_than(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self > other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def greater_than(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self > other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.greater_than_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.greater_than(other._values))
 
-    def greater_than_or_equal(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self >= other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def greater_than_or_equal(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self >= other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.greater_than_or_equal_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.greater_than_or_equal(other._values))
 
-    def greater_than_or_equal_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self >= elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def greater_than_or_equal_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self >= elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.greater_than_or_equal_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.greater_than_or_equal_scala(elem))
 
-    def greater_than_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self > elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def greater_than_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self > elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.greater_than_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.greater_than_scala(elem))
 
     def has_na(self) -> bool:
@@ -448,34 +612,82 @@ class UltraFastList:
 
     def has_zero(self) -> bool:
         """Return zero in self."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+        assert not isinstance(self._values, NON_NUM_TYPES)
         return self._values.has_zero()
 
-    def less_than(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self < other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def head(self, n: int = 5) -> "UltraFastList":
+        """Return the first n elements of self, see `__getitem__` for when
+        the result is a view sharing the values with self."""
+        return self._slice(slice(None, n))
+
+    def lazy(self) -> Expr:
+        """Return a lazy expression of self, which is evaluated in one pass
+        by `collect`, see `ulist.Expr`.
+
+        Examples
+        --------
+        >>> import ulist as ul
+        >>> arr = ul.arange(6)
+        >>> expr = (arr.lazy() * 2 + 1 > 4) & (arr.lazy() < 5)
+        >>> expr.collect()
+        UltraFastList([False, False, True, True, True, False])
+        """
+        from .expr import Expr  # To avoid circular import.
+        return Expr("col", value=self)
+
+    def less_than(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self < other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.less_than_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.less_than(other._values))
 
-    def less_than_or_equal(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self <= other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def less_than_or_equal(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self <= other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.less_than_or_equal_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.less_than_or_equal(other._values))
 
-    def less_than_or_equal_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self <= elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def less_than_or_equal_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self <= elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.less_than_or_equal_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.less_than_or_equal_scala(elem))
 
-    def less_than_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self < elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def less_than_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self < elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.less_than_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.less_than_scala(elem))
 
     def max(self) -> NUM:
         """Return the maximum of self."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+        assert not isinstance(self._values, NON_NUM_TYPES)
         return self._values.max()
 
     def mean(self) -> float:
@@ -484,31 +696,69 @@ class UltraFastList:
 
     def min(self) -> NUM:
         """Return the minimum of self."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+        assert not isinstance(self._values, NON_NUM_TYPES)
         return self._values.min()
 
-    def mul(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self * other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def mul(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self * other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.mul_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.mul(other._values))
 
-    def mul_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self * elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def mul_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self * elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.mul_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.mul_scala(elem))
 
+    def n_chunks(self) -> int:
+        """Number of the chunks of self. The `union_all` result is made of
+        the chunks of both sides, which are compacted by `rechunk` or by the
+        first write. `get`, `count_na` and `to_list` read the chunks without
+        compacting them, and so do `sum`, `filter`, `equal` and `not_equal`
+        of the numerical ulists."""
+        return self._values.n_chunks()
+
     def not_(self) -> "UltraFastList":
         """Return ~self."""
         assert isinstance(self._values, BooleanList)
         return UltraFastList(self._values.not_())
 
-    def not_equal(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self != other."""
+    def not_equal(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self != other, which is written to `out` if given."""
+        if out is not None:
+            assert not isinstance(self._values, NON_NUM_TYPES)
+            self._values.not_equal_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.not_equal(other._values))
 
-    def not_equal_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self != elem."""
+    def not_equal_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self != elem, which is written to `out` if given."""
+        if out is not None:
+            assert not isinstance(self._values, NON_NUM_TYPES)
+            self._values.not_equal_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.not_equal_scala(elem))
 
     def or_(self, other: "UltraFastList") -> "UltraFastList":
@@ -521,17 +771,36 @@ class UltraFastList:
         """Removes the last element of self."""
         self._values.pop()
 
-    def pow_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self ** elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def pow_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self ** elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.pow_scala_into(elem, out._values)
+            if elem == 0:
+                out._values.replace(None, 1)
+            return out
         if elem == 0:
             return UltraFastList(self._values.repeat(1, self.size()))
         return UltraFastList(self._values.pow_scala(elem))
 
+    def rechunk(self) -> None:
+        """Compact the chunks of self into one buffer."""
+        self._values.rechunk()
+
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> None:
         """Replace the old elements of self with the new one."""
         self._values.replace(old, new)
 
+    def save(self, path: str) -> None:
+        """Save self to `path` in the binary format of ulist, which can be
+        loaded by `ulist.load`."""
+        from .io import save_many  # To avoid circular import.
+        save_many(path, {"": self})
+
     def set(self, index: int, elem: ELEM_OPT) -> None:
         """Set self[index] to elem."""
         self._values.set(index, elem)
@@ -554,30 +823,64 @@ class UltraFastList:
 
     def starts_with(self, elem: str) -> UltraFastList:
         """Return whether the element of self starts with `elem`."""
-        assert isinstance(self._values, StringList)
+        assert isinstance(self._values, STR_TYPES)
         return UltraFastList(self._values.starts_with(elem))
 
     def str_len(self) -> "UltraFastList":
         """Return each element's string length of self."""
-        assert isinstance(self._values, StringList)
+        assert isinstance(self._values, STR_TYPES)
         return UltraFastList(self._values.str_len())
 
-    def sub(self, other: "UltraFastList") -> "UltraFastList":
-        """Return self - other."""
-        assert not isinstance(self._values, (BooleanList, StringList))
-        assert not isinstance(other._values, (BooleanList, StringList))
+    def sub(
+        self,
+        other: "UltraFastList",
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self - other, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        assert not isinstance(other._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.sub_into(other._values, out._values)
+            return out
         return UltraFastList(self._values.sub(other._values))
 
-    def sub_scala(self, elem: NUM) -> "UltraFastList":
-        """Return self - elem."""
-        assert not isinstance(self._values, (BooleanList, StringList))
+    def sub_scala(
+        self,
+        elem: NUM,
+        out: Optional["UltraFastList"] = None,
+    ) -> "UltraFastList":
+        """Return self - elem, which is written to `out` if given."""
+        assert not isinstance(self._values, NON_NUM_TYPES)
+        if out is not None:
+            self._values.sub_scala_into(elem, out._values)
+            return out
         return UltraFastList(self._values.sub_scala(elem))
 
     def sum(self) -> NUM:
         """Return the sum of self."""
-        assert not isinstance(self._values, StringList)
+        assert not isinstance(self._values, STR_TYPES)
         return self._values.sum()
 
+    def tail(self, n: int = 5) -> "UltraFastList":
+        """Return the last n elements of self, see `__getitem__` for when
+        the result is a view sharing the values with self."""
+        return self._slice(slice(max(self.size() - n, 0), None))
+
+    def to_arrow_c(self) -> Tuple[object, object]:
+        """Export self by the Arrow C data interface without copying.
+
+        The missing values are marked by the Arrow validity bitmap. The
+        'string' ulist is exported as a large string array on 64-bit
+        platforms, and the 'category' ulist is exported as a dictionary
+        array with uint32 indices. The ulist can not be modified until the
+        exported array is released.
+
+        Returns:
+            Tuple[object, object]: The PyCapsules of the ArrowSchema and
+            the ArrowArray.
+        """
+        return self._values.to_arrow_c()
+
     def to_index(self) -> IndexList:
         """Convert self from BooleanList to IndexList by filtering the
         indexes where the element of self is True.
@@ -600,13 +903,31 @@ class UltraFastList:
         return self._values.to_list()
 
     def union_all(self, other: "UltraFastList") -> "UltraFastList":
-        """Concatenate self and other together as a new ulist."""
+        """Concatenate self and other together as a new ulist, which only
+        shares the chunks of both, so that repeatedly appending batches costs
+        linear time. See `n_chunks` for when the chunks are compacted."""
         return UltraFastList(self._values.union_all(other._values))
 
     def unique(self) -> "UltraFastList":
         """Returns the sorted unique elements of self. """
         return UltraFastList(self._values.unique())
 
+    def validity_buffer(self) -> bytes:
+        """Return the validity mask of self packed into bytes, LSB first,
+        which is the layout of the Arrow validity bitmap. A set bit means
+        the element is valid, and an unset bit means the element is na.
+        """
+        return self._values.validity_buffer()
+
+    def values_buffer(self) -> memoryview:
+        """Return a read-only memoryview of the values of self without
+        copying. The values of bool dtype are bit-packed, LSB first. The
+        ulist can not be appended or popped until the memoryview is
+        released.
+        """
+        assert not isinstance(self._values, STR_TYPES)
+        return memoryview(self._values)
+
     def var(self, ddof: int = 0) -> float:
         """Returns the variance of self.
 
@@ -622,16 +943,19 @@ class UltraFastList:
         Returns:
             float: variance
         """
+        # The deviations are computed in one temporary list, which is
+        # updated in place.
         if isinstance(self._values, (FloatList32, FloatList64)):
-            data = self
+            data = self.sub_scala(self.mean())
         elif isinstance(self._values, (IntegerList32, IntegerList64)):
             data = self.astype('float')
+            data.sub_scala(data.mean(), out=data)
         elif isinstance(self._values, BooleanList):
             data = self.astype('float')
+            data.sub_scala(data.mean(), out=data)
         else:
             raise TypeError(f"Var method does not support dtype {self.dtype}!")
-        mean = data.mean()
-        numerator = data.sub_scala(mean).pow_scala(2).sum()
+        numerator = data.pow_scala(2, out=data).sum()
         denominator = data.size() - ddof - self.count_na()
         return numerator / denominator
 
@@ -642,6 +966,9 @@ class UltraFastList:
         """Calculate the condition by fn(self), and return a ulist
         with elements of self correspondingly.
 
+        The lazy `Expr.where`, e.g. `arr.lazy().where(fn).sum()`, combines
+        the chained predicates and never allocates the condition.
+
         Args:
             fn (Callable[[UltraFastList], UltraFastList]):
                 Function to process self and return a BooleanList.
@@ -0,0 +1,429 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .core import UltraFastList
+from .typedef import ELEM, NUM
+from .ulist import eval_expr as _eval_expr
+from .ulist import eval_sum as _eval_sum
+
+INSTR = Tuple[str, List[int], Optional[str], Optional[Any]]
+EXPR_OR_ELEM = Union["Expr", UltraFastList, ELEM]
+INT_TYPES = ("int32", "int64")
+SYMBOLS = {
+    "add": "+",
+    "and": "&",
+    "div": "/",
+    "equal": "==",
+    "greater_than": ">",
+    "greater_than_or_equal": ">=",
+    "less_than": "<",
+    "less_than_or_equal": "<=",
+    "mul": "*",
+    "not_equal": "!=",
+    "or": "|",
+    "sub": "-",
+}
+# The dtype of the result of these operations is bool.
+BOOL_OPS = (
+    "and",
+    "equal",
+    "greater_than",
+    "greater_than_or_equal",
+    "less_than",
+    "less_than_or_equal",
+    "not_equal",
+    "or",
+)
+
+
+class Expr:
+    """
+    Lazy expression of ulists, which is built by `UltraFastList.lazy` or
+    `ulist.col` and the operators of ulist. The expression is evaluated by
+    `collect` in one pass over chunks of rows, so that the intermediate
+    results are never allocated for the whole ulists.
+
+    The operators support the dtypes int, float and bool. The division by
+    zero is allowed, like `div` with `zero_div=True`.
+
+    The predicates of the chained `where` are combined and pushed down to
+    the chunks of rows, so that a chunk skips the rest of the predicates
+    once all its rows are rejected, and the aggregates such as `sum` never
+    allocate the filtered rows.
+
+    Examples
+    --------
+    >>> import ulist as ul
+    >>> arr = ul.arange(6)
+    >>> expr = (arr.lazy() * 2 + 1 > 4) & (arr.lazy() < 5)
+    >>> expr.collect()
+    UltraFastList([False, False, True, True, True, False])
+
+    >>> expr = ul.col('x') * 2 + ul.col('y')
+    >>> expr.collect(x=arr, y=arr)
+    UltraFastList([0, 3, 6, 9, 12, 15])
+
+    >>> arr.lazy().where(lambda x: x > 1).where(lambda x: x < 5).sum()
+    9
+    """
+
+    def __init__(
+        self,
+        op: str,
+        args: Tuple["Expr", ...] = (),
+        value: Any = None,
+    ) -> None:
+        self._op = op
+        self._args = args
+        self._value = value
+
+    def _binary(self, op: str, other: EXPR_OR_ELEM) -> "Expr":
+        if isinstance(other, UltraFastList):
+            other = other.lazy()
+        elif isinstance(other, (int, float, bool)):
+            other = Expr("lit", value=other)
+        elif not isinstance(other, Expr):
+            raise TypeError(
+                "Parameter other should be int, float, bool, " +
+                "UltraFastList or Expr type!"
+            )
+        # The operation is pushed down below the predicates, which are
+        # shared by both operands. A scalar fits any predicates.
+        x, preds = _split(self)
+        y, other_preds = _split(other)
+        if y._op == "lit":
+            other_preds = preds
+        if not _same(preds, other_preds):
+            raise ValueError(
+                "The operands should be filtered by the same predicates!"
+            )
+        return _where(Expr(op, (x, y)), preds)
+
+    def _summary(self, columns: Dict[str, UltraFastList]) -> tuple:
+        """The sum, the size and the count of the missing values of self,
+        which are evaluated without allocating the rows of self."""
+        program = _Program(columns)
+        result, predicates = program.compile(self)
+        return _eval_sum(program.instrs, program.inputs, result, predicates)
+
+    def _unary(self, op: str, value: Any = None) -> "Expr":
+        x, preds = _split(self)
+        return _where(Expr(op, (x,), value), preds)
+
+    def __add__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self + other."""
+        return self._binary("add", other)
+
+    def __and__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self & other."""
+        return self._binary("and", other)
+
+    def __eq__(self, other: EXPR_OR_ELEM) -> "Expr":  # type: ignore
+        """Return self == other."""
+        return self._binary("equal", other)
+
+    def __ge__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self >= other."""
+        return self._binary("greater_than_or_equal", other)
+
+    def __gt__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self > other."""
+        return self._binary("greater_than", other)
+
+    def __invert__(self) -> "Expr":
+        """Return ~self."""
+        return self._unary("not")
+
+    def __le__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self <= other."""
+        return self._binary("less_than_or_equal", other)
+
+    def __lt__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self < other."""
+        return self._binary("less_than", other)
+
+    def __mul__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self * other."""
+        return self._binary("mul", other)
+
+    def __ne__(self, other: EXPR_OR_ELEM) -> "Expr":  # type: ignore
+        """Return self != other."""
+        return self._binary("not_equal", other)
+
+    def __or__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self | other."""
+        return self._binary("or", other)
+
+    def __pow__(self, other: int) -> "Expr":
+        """Return self ** other."""
+        if not isinstance(other, int):
+            raise TypeError("Parameter other should be int type!")
+        return self._unary("pow", other)
+
+    def __repr__(self) -> str:
+        """Return repr(self)."""
+        return f"Expr({str(self)})"
+
+    def __str__(self) -> str:
+        """Return str(self)."""
+        if self._op == "col":
+            if isinstance(self._value, str):
+                return f"col('{self._value}')"
+            return f"<{self._value.dtype} ulist>"
+        if self._op == "lit":
+            return repr(self._value)
+        if self._op == "astype":
+            return f"{self._args[0]}.astype('{self._value}')"
+        if self._op == "not":
+            return f"~{self._args[0]}"
+        if self._op == "pow":
+            return f"({self._args[0]} ** {self._value})"
+        if self._op == "where":
+            base, *preds = self._args
+            return f"{base}" + "".join(f".where({x})" for x in preds)
+        x, y = self._args
+        return f"({x} {SYMBOLS[self._op]} {y})"
+
+    def __sub__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self - other."""
+        return self._binary("sub", other)
+
+    def __truediv__(self, other: EXPR_OR_ELEM) -> "Expr":
+        """Return self / other."""
+        return self._binary("div", other)
+
+    def astype(self, dtype: str) -> "Expr":
+        """Cast self to dtype 'int', 'int32', 'int64', 'float', 'float32',
+        'float64' or 'bool'."""
+        return self._unary("astype", dtype)
+
+    def collect(self, **columns: UltraFastList) -> UltraFastList:
+        """Evaluate self, where `ulist.col(name)` is bound to the ulist
+        `columns[name]`. All the ulists should be of the same size.
+
+        Returns:
+            UltraFastList: A ulist object.
+        """
+        program = _Program(columns)
+        result, predicates = program.compile(self)
+        return UltraFastList(
+            _eval_expr(program.instrs, program.inputs, result, predicates)
+        )
+
+    def count_na(self, **columns: UltraFastList) -> int:
+        """Return the count of the missing values of self, where the
+        columns are bound like `collect`."""
+        return self._summary(columns)[2]
+
+    def mean(self, **columns: UltraFastList) -> float:
+        """Return the mean of self, where the columns are bound like
+        `collect`."""
+        total, size, count_na = self._summary(columns)
+        return total / (size - count_na)
+
+    def size(self, **columns: UltraFastList) -> int:
+        """Return the size of self, where the columns are bound like
+        `collect`."""
+        return self._summary(columns)[1]
+
+    def sum(self, **columns: UltraFastList) -> NUM:
+        """Return the sum of self, where the columns are bound like
+        `collect`."""
+        return self._summary(columns)[0]
+
+    def where(self, fn: Callable[["Expr"], "Expr"]) -> "Expr":
+        """Keep the rows of self where the bool expression fn(self) is
+        True, like `UltraFastList.where`. The predicate can also use other
+        columns which are not filtered.
+
+        Examples
+        --------
+        >>> import ulist as ul
+        >>> expr = ul.col('x').where(lambda x: x > 2).where(lambda x: x < 5)
+        >>> expr
+        Expr(col('x').where((col('x') > 2)).where((col('x') < 5)))
+
+        >>> expr.collect(x=ul.arange(6))
+        UltraFastList([3, 4])
+        """
+        cond = fn(self)
+        if not isinstance(cond, Expr):
+            raise TypeError("Calling parameter `fn` should return an Expr!")
+        base, preds = _split(self)
+        cond, cond_preds = _split(cond)
+        if cond_preds and not _same(preds, cond_preds):
+            raise ValueError(
+                "The condition should be filtered by the predicates of self!"
+            )
+        return Expr("where", (base, *preds, cond))
+
+
+class _Program:
+    """
+    Compile an expression to the instructions of `eval_expr`. Each
+    instruction writes one register, and the shared subexpressions are
+    evaluated only once.
+    """
+
+    def __init__(self, columns: Dict[str, UltraFastList]) -> None:
+        self._columns = columns
+        self.instrs: List[INSTR] = []
+        self.inputs: list = []
+        # The dtype of each register.
+        self._dtypes: List[str] = []
+        # The register of each visited expression and input ulist. The
+        # expressions are kept, so that their ids are not reused.
+        self._registers: Dict[int, Tuple[Expr, int]] = {}
+        self._input_registers: Dict[int, int] = {}
+
+    def _emit(
+        self,
+        op: str,
+        args: List[int],
+        dtype: str,
+        value: Any = None,
+    ) -> int:
+        cast = dtype if op in ("astype", "lit", "select") else None
+        self.instrs.append((op, args, cast, value))
+        self._dtypes.append(dtype)
+        return len(self.instrs) - 1
+
+    def _col(self, value: Union[str, UltraFastList]) -> int:
+        if isinstance(value, str):
+            if value not in self._columns:
+                raise ValueError(f"Column '{value}' is not given!")
+            arr = self._columns[value]
+        else:
+            arr = value
+        key = id(arr._values)
+        if key not in self._input_registers:
+            self._input_registers[key] = self._emit(
+                "col", [len(self.inputs)], arr.dtype
+            )
+            self.inputs.append(arr._values)
+        return self._input_registers[key]
+
+    def _lit(self, value: ELEM, dtype: str) -> int:
+        """Literal of the dtype of the other operand."""
+        if dtype == "bool":
+            ok = isinstance(value, bool)
+        elif dtype in INT_TYPES:
+            ok = isinstance(value, int)
+        else:
+            ok = isinstance(value, (int, float))
+        if not ok:
+            raise TypeError(
+                f"Can not operate a {type(value).__name__} with dtype {dtype}!"
+            )
+        if dtype.startswith("float"):
+            value = float(value)
+        return self._emit("lit", [], dtype, value)
+
+    def _to_float(self, i: int) -> int:
+        # Like `div`, the integers are divided as float64.
+        if self._dtypes[i] in INT_TYPES:
+            return self._emit("astype", [i], "float64")
+        return i
+
+    def compile(self, expr: Expr) -> Tuple[int, List[int]]:
+        """Emit the instructions of expr, and return the register of its
+        rows and the registers of its predicates."""
+        base, preds = _split(expr)
+        predicates = [self.visit(x) for x in preds]
+        return self.visit(base), predicates
+
+    def conditions(self, conditions: List[Expr]) -> List[int]:
+        """Emit the instructions of the conditions of `select`, which should
+        be of dtype bool, and return their registers."""
+        registers = [self.visit(x) for x in conditions]
+        if any(self._dtypes[i] != "bool" for i in registers):
+            raise TypeError(
+                "Calling parameter `fn` should return a ulist with dtype bool!"
+            )
+        return registers
+
+    def select(
+        self,
+        conditions: List[Expr],
+        choices: list,
+        default: ELEM,
+    ) -> int:
+        """Emit the instructions of `ulist.select`, where each row skips the
+        conditions after the first True one, and return its register."""
+        registers = self.conditions(conditions)
+        dtypes = {bool: "bool", float: "float64", int: "int64"}
+        if type(default) not in dtypes:
+            raise TypeError(
+                "The type of parameter `default` should be" +
+                " bool, float or int!"
+            )
+        dtype = dtypes[type(default)]
+        return self._emit("select", registers, dtype, choices + [default])
+
+    def visit(self, expr: Expr) -> int:
+        """Emit the instructions of expr, and return its register."""
+        key = id(expr)
+        if key not in self._registers:
+            self._registers[key] = (expr, self._visit(expr))
+        return self._registers[key][1]
+
+    def _visit(self, expr: Expr) -> int:
+        op = expr._op
+        if op == "where":
+            raise ValueError("The filtered expression can not be an operand!")
+        if op == "col":
+            return self._col(expr._value)
+        if op == "astype":
+            i = self.visit(expr._args[0])
+            dtype = {"int": "int64", "float": "float64"}.get(
+                expr._value, expr._value
+            )
+            return self._emit("astype", [i], dtype)
+        if op in ("not", "pow"):
+            i = self.visit(expr._args[0])
+            return self._emit(op, [i], self._dtypes[i], expr._value)
+
+        x, y = expr._args
+        i = self.visit(x)
+        if op == "div":
+            i = self._to_float(i)
+        if y._op == "lit":
+            # The scalar is of the dtype of the other operand.
+            j = self._lit(y._value, self._dtypes[i])
+        else:
+            j = self.visit(y)
+            if op == "div":
+                j = self._to_float(j)
+        dtype = "bool" if op in BOOL_OPS else self._dtypes[i]
+        return self._emit(op, [i, j], dtype)
+
+
+def _same(x: Tuple[Expr, ...], y: Tuple[Expr, ...]) -> bool:
+    """Whether the predicates are the same expressions."""
+    return len(x) == len(y) and all(a is b for a, b in zip(x, y))
+
+
+def _split(expr: Expr) -> Tuple[Expr, Tuple[Expr, ...]]:
+    """Split expr into the expression of its rows and its predicates."""
+    if expr._op == "where":
+        return expr._args[0], expr._args[1:]
+    return expr, ()
+
+
+def _where(expr: Expr, preds: Tuple[Expr, ...]) -> Expr:
+    if preds:
+        return Expr("where", (expr, *preds))
+    return expr
+
+
+def col(name: str) -> Expr:
+    """The column `name` of an expression, which is bound to a ulist by
+    `Expr.collect`.
+
+    Examples
+    --------
+    >>> import ulist as ul
+    >>> expr = ul.col('x') > 1
+    >>> expr.collect(x=ul.arange(3))
+    UltraFastList([False, False, True])
+    """
+    return Expr("col", value=name)
@@ -1,28 +1,155 @@
 from __future__ import annotations  # To avoid circular import.
-from .ulist import read_csv as _read_csv
-from typing import Dict, TYPE_CHECKING
+from .ulist import CsvReader
+from .ulist import load as _load, read_csv as _read_csv, save as _save
+from typing import Dict, Iterator, List, Mapping, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:  # To avoid circular import.
     from . import UltraFastList
 
 
-def read_csv(path: str, schema: Dict[str, str]) -> Dict[str, UltraFastList]:
+def load(path: str, mmap: bool = True) -> UltraFastList:
+    """Load the ulist saved by `UltraFastList.save`.
+
+    Args:
+        path (str):
+            The path of the file.
+        mmap (bool, optional):
+            Whether to memory-map the file instead of reading it. The
+            values of the numerical ulists are borrowed from the mapping
+            until they are modified, so that the file should not be modified
+            while they are alive. Defaults to True.
+
+    Returns:
+        UltraFastList
+    """
+    result = load_many(path, mmap)
+    if len(result) != 1:
+        raise ValueError(
+            "The file contains %d ulists, use `load_many` instead!"
+            % len(result)
+        )
+    return next(iter(result.values()))
+
+
+def load_many(path: str, mmap: bool = True) -> Dict[str, UltraFastList]:
+    """Load the ulists saved by `save_many`.
+
+    Args:
+        path (str):
+            The path of the file.
+        mmap (bool, optional):
+            Whether to memory-map the file instead of reading it. The
+            values of the numerical ulists are borrowed from the mapping
+            until they are modified, so that the file should not be modified
+            while they are alive. Defaults to True.
+
+    Returns:
+        Dict[str, UltraFastList]
+    """
+    from . import UltraFastList  # To avoid circular import.
+    return {name: UltraFastList(x) for name, x in _load(path, mmap)}
+
+
+def read_csv(
+    path: str,
+    schema: Optional[Mapping[str, Optional[str]]] = None,
+    n_threads: int = 1,
+    sample_size: int = 1000,
+) -> Dict[str, UltraFastList]:
     """Read the csv file.
 
     Args:
         path (str):
             The path of the csv file.
-        schema (Dict[str,str]):
+        schema (Optional[Mapping[str, Optional[str]]], optional):
             The structure of the csv file, such as
-            `{"foo" : "int", "bar" : "bool"}`
+            `{"foo" : "int", "bar" : "bool"}`. The dtypes given as None,
+            or all the fields in the header if `schema` is None, are
+            inferred from the first `sample_size` rows. The narrowest of
+            'bool', 'int32', 'int64', 'float32', 'float64' and 'string'
+            is chosen, and promoted to a wider one by a value which does
+            not fit it after the sample, in the order of 'int32', 'int64',
+            'float64' and 'string'. A value which does not fit a given
+            dtype raises TypeError. Defaults to None.
+        n_threads (int, optional):
+            The number of threads parsing the file, which is split into
+            chunks at the record boundaries. 0 means all the cores.
+            Defaults to 1.
+        sample_size (int, optional):
+            The number of rows to infer the dtypes from. Defaults to 1000.
 
     Returns:
         Dict[str, UltraFastList]
     """
     from . import UltraFastList  # To avoid circular import.
-    schema_seq = [x for x in schema.items()]  # To ensure the right order
-    rslist = [UltraFastList(x) for x in _read_csv(path, schema_seq)]
-    res = {}
-    for i in range(len(schema_seq)):
-        res[schema_seq[i][0]] = rslist[i]
-    return res
+    assert n_threads >= 0
+    assert sample_size > 0
+    # To ensure the right order
+    schema_seq = None if schema is None else list(schema.items())
+    result = _read_csv(path, schema_seq, n_threads, sample_size)
+    return {k: UltraFastList(v) for k, v in result}
+
+
+def read_csv_batches(
+    path: str,
+    schema: Optional[Mapping[str, Optional[str]]] = None,
+    batch_size: int = 65536,
+    sample_size: int = 1000,
+) -> Iterator[Dict[str, UltraFastList]]:
+    """Read the csv file by batches of rows with a persistent reader, so that
+    the files larger than the memory can be processed batch by batch.
+
+    Args:
+        path (str):
+            The path of the csv file.
+        schema (Optional[Mapping[str, Optional[str]]], optional):
+            The structure of the csv file, such as
+            `{"foo" : "int", "bar" : "bool"}`. The dtypes are inferred as
+            `read_csv` does, and a promoted dtype applies to the batches
+            from the one which promotes it. Defaults to None.
+        batch_size (int, optional):
+            The number of rows of each batch, the last batch may be
+            shorter. Defaults to 65536.
+        sample_size (int, optional):
+            The number of rows to infer the dtypes from. Defaults to 1000.
+
+    Returns:
+        Iterator[Dict[str, UltraFastList]]
+    """
+    assert batch_size > 0
+    assert sample_size > 0
+    schema_seq = None if schema is None else list(schema.items())
+    # Open the file at once, so that the errors are not deferred to the
+    # first batch.
+    reader = CsvReader(path, schema_seq, batch_size, sample_size)
+    return _iter_batches(reader, reader.names())
+
+
+def _iter_batches(
+    reader: CsvReader,
+    names: List[str],
+) -> Iterator[Dict[str, UltraFastList]]:
+    from . import UltraFastList  # To avoid circular import.
+    while True:
+        batch = reader.read_batch()
+        if batch is None:
+            return
+        yield {k: UltraFastList(v) for k, v in zip(names, batch)}
+
+
+def save_many(path: str, columns: Dict[str, UltraFastList]) -> None:
+    """Save the ulists to `path` in the binary format of ulist. The buffers
+    are written as they are in the memory, so that loading the file needs
+    no parsing. The file is written to a temporary file first and renamed
+    to `path`, so that the ulists loaded from `path` with `mmap` stay valid.
+
+    Args:
+        path (str):
+            The path of the file.
+        columns (Dict[str, UltraFastList]):
+            The names and the ulists, such as `{"foo": arr1, "bar": arr2}`
+
+    Returns:
+        None
+    """
+    _save(path, [(name, x.dtype, x._values) for name, x in columns.items()])
@@ -2,6 +2,7 @@ from typing import Dict, List, Union, Optional
 
 from .ulist import (
     BooleanList,
+    CategoryList,
     FloatList32,
     FloatList64,
     IntegerList32,
@@ -15,7 +16,7 @@ NUM = Union[int, float]
 LIST_PY = Union[List[Optional[float]], List[Optional[int]],
                 List[Optional[bool]], List[Optional[str]]]
 LIST_RS = Union[FloatList32, FloatList64, IntegerList32,
-                IntegerList64, BooleanList, StringList]
+                IntegerList64, BooleanList, StringList, CategoryList]
 NUM_LIST_RS = Union[FloatList32, FloatList64, IntegerList32, IntegerList64]
 COUNTER = Union[
     Dict[Optional[int], int],
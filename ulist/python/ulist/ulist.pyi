@@ -1,12 +1,13 @@
-from typing import List, Sequence, Dict, Set, Optional, Tuple
+from typing import Any, List, Sequence, Dict, Set, Optional, Tuple, Union
 
-from .typedef import ELEM, LIST_PY, NUM, NUM_LIST_RS, LIST_RS, ELEM_OPT
+from .typedef import ELEM, NUM, NUM_LIST_RS, LIST_RS, ELEM_OPT
 
 
 class BooleanList:
     # Arrange the following methods in alphabetical order.
 
     def __init__(self, vec: Sequence[bool], hset: Set[int]) -> None: ...
+    def __buffer__(self, flags: int) -> memoryview: ...
     def all(self) -> Optional[bool]: ...
     def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
     def and_(self, other: BooleanList) -> BooleanList: ...
@@ -29,6 +30,7 @@ class BooleanList:
     def filter(self, condition: BooleanList) -> BooleanList: ...
     def get(self, index: int) -> Optional[bool]: ...
     def get_by_indexes(self, indexes: IndexList) -> BooleanList: ...
+    def n_chunks(self) -> int: ...
     def not_(self) -> BooleanList: ...
     def not_equal(self, other: LIST_RS) -> BooleanList: ...
     def not_equal_scala(self, elem: ELEM) -> BooleanList: ...
@@ -36,23 +38,73 @@ class BooleanList:
     def pop(self) -> None: ...
     @staticmethod
     def repeat(elem: bool, size: int) -> BooleanList: ...
+    def rechunk(self) -> None: ...
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> BooleanList: ...
     def set(self, index: int, elem: ELEM_OPT) -> None: ...
     def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> BooleanList: ...
     def sort(self, ascending: bool) -> None: ...
     def sum(self) -> int: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
     def to_index(self) -> IndexList: ...
     def to_list(self) -> List[Optional[bool]]: ...
     def union_all(self, other: LIST_RS) -> LIST_RS: ...
     def unique(self) -> BooleanList: ...
+    def validity_buffer(self) -> bytes: ...
+
+
+class CategoryList:
+    # Arrange the following methods in alphabetical order.
+
+    def __init__(self, vec: Sequence[str], hset: Set[int]) -> None: ...
+    def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
+    def append(self, elem: ELEM_OPT) -> None: ...
+    def as_bool(self) -> BooleanList: ...
+    def as_float32(self) -> FloatList32: ...
+    def as_float64(self) -> FloatList64: ...
+    def as_int32(self) -> IntegerList32: ...
+    def as_int64(self) -> IntegerList64: ...
+    def as_str(self) -> StringList: ...
+    def contains(self, elem: str) -> BooleanList: ...
+    def copy(self) -> CategoryList: ...
+    def count_na(self) -> int: ...
+    def counter(self) -> Dict[Optional[str], int]: ...
+    def ends_with(self, elem: str) -> BooleanList: ...
+    def equal(self, other: LIST_RS) -> BooleanList: ...
+    def equal_scala(self, elem: ELEM) -> BooleanList: ...
+    def filter(self, condition: BooleanList) -> CategoryList: ...
+    def get(self, index: int) -> Optional[str]: ...
+    def get_by_indexes(self, indexes: IndexList) -> CategoryList: ...
+    def n_chunks(self) -> int: ...
+    def not_equal(self, other: LIST_RS) -> BooleanList: ...
+    def not_equal_scala(self, elem: ELEM) -> BooleanList: ...
+    def pop(self) -> None: ...
+    def rechunk(self) -> None: ...
+    def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> CategoryList: ...
+    def set(self, index: int, elem: ELEM_OPT) -> None: ...
+    def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> CategoryList: ...
+    def sort(self, ascending: bool) -> None: ...
+    def starts_with(self, elem: str) -> BooleanList: ...
+    def str_len(self) -> IntegerList64: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
+    def to_list(self) -> List[Optional[str]]: ...
+    def union_all(self, other: LIST_RS) -> LIST_RS: ...
+    def unique(self) -> CategoryList: ...
+    def validity_buffer(self) -> bytes: ...
 
 
 class FloatList32:
     #  Arrange the following methods in alphabetical order.
 
     def __init__(self, vec: Sequence[float], hset: Set[int]) -> None: ...
+    @property
+    def __array_interface__(self) -> dict: ...
+    def __buffer__(self, flags: int) -> memoryview: ...
     def add(self, other: NUM_LIST_RS) -> FloatList32: ...
+    def add_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def add_scala(self, elem: NUM) -> FloatList32: ...
+    def add_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
     def append(self, elem: ELEM_OPT) -> None: ...
     def argmax(self) -> int: ...
@@ -69,51 +121,80 @@ class FloatList32:
     @staticmethod
     def cycle(obj: Sequence[float], size: int) -> FloatList32: ...
     def div(self, other: NUM_LIST_RS) -> FloatList32: ...
+    def div_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def div_scala(self, elem: float) -> FloatList32: ...
+    def div_scala_into(self, elem: float, out: LIST_RS) -> None: ...
     def equal(self, other: LIST_RS) -> BooleanList: ...
+    def equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def equal_scala(self, elem: ELEM) -> BooleanList: ...
+    def equal_scala_into(self, elem: ELEM, out: LIST_RS) -> None: ...
     def filter(self, condition: BooleanList) -> FloatList32: ...
     def get(self, index: int) -> Optional[float]: ...
     def get_by_indexes(self, indexes: IndexList) -> FloatList32: ...
     def greater_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def greater_than_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def has_zero(self) -> bool: ...
     def less_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def less_than_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def max(self) -> float: ...
     def min(self) -> float: ...
     def mul(self, other: NUM_LIST_RS) -> FloatList32: ...
+    def mul_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def mul_scala(self, elem: NUM) -> FloatList32: ...
+    def mul_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
+    def n_chunks(self) -> int: ...
     def not_equal(self, other: LIST_RS) -> BooleanList: ...
+    def not_equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def not_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def not_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def pop(self) -> None: ...
     def pow_scala(self, elem: NUM) -> FloatList32: ...
+    def pow_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     @staticmethod
     def random(size: int) -> FloatList32: ...
     @staticmethod
     def repeat(elem: float, size: int) -> FloatList32: ...
+    def rechunk(self) -> None: ...
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> FloatList32: ...
     def set(self, index: int, elem: ELEM_OPT) -> None: ...
     def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> FloatList32: ...
     def sort(self, ascending: bool) -> None: ...
     def sub(self, other: NUM_LIST_RS) -> FloatList32: ...
+    def sub_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def sub_scala(self, elem: NUM) -> FloatList32: ...
+    def sub_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def sum(self) -> float: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
     def to_list(self) -> List[Optional[float]]: ...
     def union_all(self, other: LIST_RS) -> LIST_RS: ...
     def unique(self) -> FloatList32: ...
+    def validity_buffer(self) -> bytes: ...
 
 
 class FloatList64:
     #  Arrange the following methods in alphabetical order.
 
     def __init__(self, vec: Sequence[float], hset: Set[int]) -> None: ...
+    @property
+    def __array_interface__(self) -> dict: ...
+    def __buffer__(self, flags: int) -> memoryview: ...
     def add(self, other: NUM_LIST_RS) -> FloatList64: ...
+    def add_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def add_scala(self, elem: NUM) -> FloatList64: ...
+    def add_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
     def append(self, elem: ELEM_OPT) -> None: ...
     def argmax(self) -> int: ...
@@ -130,51 +211,80 @@ class FloatList64:
     @staticmethod
     def cycle(obj: Sequence[float], size: int) -> FloatList64: ...
     def div(self, other: NUM_LIST_RS) -> FloatList64: ...
+    def div_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def div_scala(self, elem: float) -> FloatList64: ...
+    def div_scala_into(self, elem: float, out: LIST_RS) -> None: ...
     def equal(self, other: LIST_RS) -> BooleanList: ...
+    def equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def equal_scala(self, elem: ELEM) -> BooleanList: ...
+    def equal_scala_into(self, elem: ELEM, out: LIST_RS) -> None: ...
     def filter(self, condition: BooleanList) -> FloatList64: ...
     def get(self, index: int) -> Optional[float]: ...
     def get_by_indexes(self, indexes: IndexList) -> FloatList64: ...
     def greater_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def greater_than_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def has_zero(self) -> bool: ...
     def less_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def less_than_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def max(self) -> float: ...
     def min(self) -> float: ...
     def mul(self, other: NUM_LIST_RS) -> FloatList64: ...
+    def mul_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def mul_scala(self, elem: NUM) -> FloatList64: ...
+    def mul_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
+    def n_chunks(self) -> int: ...
     def not_equal(self, other: LIST_RS) -> BooleanList: ...
+    def not_equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def not_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def not_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def pop(self) -> None: ...
     def pow_scala(self, elem: NUM) -> FloatList64: ...
+    def pow_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     @staticmethod
     def random(size: int) -> FloatList64: ...
     @staticmethod
     def repeat(elem: float, size: int) -> FloatList64: ...
+    def rechunk(self) -> None: ...
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> FloatList64: ...
     def set(self, index: int, elem: ELEM_OPT) -> None: ...
     def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> FloatList64: ...
     def sort(self, ascending: bool) -> None: ...
     def sub(self, other: NUM_LIST_RS) -> FloatList64: ...
+    def sub_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def sub_scala(self, elem: NUM) -> FloatList64: ...
+    def sub_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def sum(self) -> float: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
     def to_list(self) -> List[Optional[float]]: ...
     def union_all(self, other: LIST_RS) -> LIST_RS: ...
     def unique(self) -> FloatList64: ...
+    def validity_buffer(self) -> bytes: ...
 
 
 class IntegerList32:
     #  Arrange the following methods in alphabetical order.
 
     def __init__(self, vec: Sequence[int], hset: Set[int]) -> None: ...
+    @property
+    def __array_interface__(self) -> dict: ...
+    def __buffer__(self, flags: int) -> memoryview: ...
     def add(self, other: NUM_LIST_RS) -> IntegerList32: ...
+    def add_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def add_scala(self, elem: NUM) -> IntegerList32: ...
+    def add_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
     def append(self, elem: ELEM_OPT) -> None: ...
     def argmax(self) -> int: ...
@@ -192,49 +302,78 @@ class IntegerList32:
     @staticmethod
     def cycle(obj: Sequence[int], size: int) -> IntegerList32: ...
     def div(self, other: NUM_LIST_RS) -> FloatList32: ...
+    def div_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def div_scala(self, elem: float) -> FloatList32: ...
+    def div_scala_into(self, elem: float, out: LIST_RS) -> None: ...
     def equal(self, other: LIST_RS) -> BooleanList: ...
+    def equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def equal_scala(self, elem: ELEM) -> BooleanList: ...
+    def equal_scala_into(self, elem: ELEM, out: LIST_RS) -> None: ...
     def filter(self, condition: BooleanList) -> IntegerList32: ...
     def get(self, index: int) -> Optional[int]: ...
     def get_by_indexes(self, indexes: IndexList) -> IntegerList32: ...
     def greater_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def greater_than_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def has_zero(self) -> bool: ...
     def less_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def less_than_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def max(self) -> int: ...
     def min(self) -> int: ...
     def mul(self, other: NUM_LIST_RS) -> IntegerList32: ...
+    def mul_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def mul_scala(self, elem: NUM) -> IntegerList32: ...
+    def mul_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
+    def n_chunks(self) -> int: ...
     def not_equal(self, other: LIST_RS) -> BooleanList: ...
+    def not_equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def not_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def not_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def pop(self) -> None: ...
     def pow_scala(self, elem: NUM) -> IntegerList32: ...
+    def pow_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def set(self, index: int, elem: ELEM_OPT) -> None: ...
     @staticmethod
     def repeat(elem: int, size: int) -> IntegerList32: ...
+    def rechunk(self) -> None: ...
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> IntegerList32: ...
     def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> IntegerList32: ...
     def sort(self, ascending: bool) -> None: ...
     def sub(self, other: NUM_LIST_RS) -> IntegerList32: ...
+    def sub_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def sub_scala(self, elem: NUM) -> IntegerList32: ...
+    def sub_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def sum(self) -> int: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
     def to_list(self) -> List[Optional[int]]: ...
     def union_all(self, other: LIST_RS) -> LIST_RS: ...
     def unique(self) -> IntegerList32: ...
+    def validity_buffer(self) -> bytes: ...
 
 
 class IntegerList64:
     #  Arrange the following methods in alphabetical order.
 
     def __init__(self, vec: Sequence[int], hset: Set[int]) -> None: ...
+    @property
+    def __array_interface__(self) -> dict: ...
+    def __buffer__(self, flags: int) -> memoryview: ...
     def add(self, other: NUM_LIST_RS) -> IntegerList64: ...
+    def add_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def add_scala(self, elem: NUM) -> IntegerList64: ...
+    def add_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
     def append(self, elem: ELEM_OPT) -> None: ...
     def argmax(self) -> int: ...
@@ -252,41 +391,65 @@ class IntegerList64:
     @staticmethod
     def cycle(obj: Sequence[int], size: int) -> IntegerList64: ...
     def div(self, other: NUM_LIST_RS) -> FloatList64: ...
+    def div_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def div_scala(self, elem: float) -> FloatList64: ...
+    def div_scala_into(self, elem: float, out: LIST_RS) -> None: ...
     def equal(self, other: LIST_RS) -> BooleanList: ...
+    def equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def equal_scala(self, elem: ELEM) -> BooleanList: ...
+    def equal_scala_into(self, elem: ELEM, out: LIST_RS) -> None: ...
     def filter(self, condition: BooleanList) -> IntegerList64: ...
     def get(self, index: int) -> Optional[int]: ...
     def get_by_indexes(self, indexes: IndexList) -> IntegerList64: ...
     def greater_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def greater_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def greater_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def greater_than_scala(self, elem: NUM) -> BooleanList: ...
+    def greater_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def has_zero(self) -> bool: ...
     def less_than(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal(self, other: NUM_LIST_RS) -> BooleanList: ...
+    def less_than_or_equal_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def less_than_or_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_or_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def less_than_scala(self, elem: NUM) -> BooleanList: ...
+    def less_than_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def max(self) -> int: ...
     def min(self) -> int: ...
     def mul(self, other: NUM_LIST_RS) -> IntegerList64: ...
+    def mul_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def mul_scala(self, elem: NUM) -> IntegerList64: ...
+    def mul_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
+    def n_chunks(self) -> int: ...
     def not_equal(self, other: LIST_RS) -> BooleanList: ...
+    def not_equal_into(self, other: LIST_RS, out: LIST_RS) -> None: ...
     def not_equal_scala(self, elem: NUM) -> BooleanList: ...
+    def not_equal_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def pop(self) -> None: ...
     def pow_scala(self, elem: NUM) -> IntegerList64: ...
+    def pow_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def set(self, index: int, elem: ELEM_OPT) -> None: ...
     @staticmethod
     def repeat(elem: int, size: int) -> IntegerList64: ...
+    def rechunk(self) -> None: ...
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> IntegerList64: ...
     def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> IntegerList64: ...
     def sort(self, ascending: bool) -> None: ...
     def sub(self, other: NUM_LIST_RS) -> IntegerList64: ...
+    def sub_into(self, other: NUM_LIST_RS, out: LIST_RS) -> None: ...
     def sub_scala(self, elem: NUM) -> IntegerList64: ...
+    def sub_scala_into(self, elem: NUM, out: LIST_RS) -> None: ...
     def sum(self) -> int: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
     def to_list(self) -> List[Optional[int]]: ...
     def union_all(self, other: LIST_RS) -> LIST_RS: ...
     def unique(self) -> IntegerList64: ...
+    def validity_buffer(self) -> bytes: ...
 
 
 class StringList:
@@ -296,6 +459,7 @@ class StringList:
     def all_equal(self, other: LIST_RS) -> Optional[bool]: ...
     def append(self, elem: ELEM_OPT) -> None: ...
     def as_bool(self) -> BooleanList: ...
+    def as_category(self) -> CategoryList: ...
     def as_float32(self) -> FloatList32: ...
     def as_float64(self) -> FloatList64: ...
     def as_int32(self) -> IntegerList32: ...
@@ -314,20 +478,39 @@ class StringList:
     def filter(self, condition: BooleanList) -> StringList: ...
     def get(self, index: int) -> Optional[str]: ...
     def get_by_indexes(self, indexes: IndexList) -> StringList: ...
+    def n_chunks(self) -> int: ...
     def not_equal(self, other: LIST_RS) -> BooleanList: ...
     def not_equal_scala(self, elem: ELEM) -> BooleanList: ...
     def pop(self) -> None: ...
     @staticmethod
     def repeat(elem: str, size: int) -> StringList: ...
+    def rechunk(self) -> None: ...
     def replace(self, old: ELEM_OPT, new: ELEM_OPT) -> StringList: ...
     def set(self, index: int, elem: ELEM_OPT) -> None: ...
     def size(self) -> int: ...
+    def slice(self, start: int, end: int) -> StringList: ...
     def sort(self, ascending: bool) -> None: ...
     def starts_with(self, elem: str) -> BooleanList: ...
     def str_len(self) -> IntegerList64: ...
+    def to_arrow_c(self) -> Tuple[object, object]: ...
     def to_list(self) -> List[Optional[str]]: ...
     def union_all(self, other: LIST_RS) -> LIST_RS: ...
     def unique(self) -> StringList: ...
+    def validity_buffer(self) -> bytes: ...
+
+
+class CsvReader:
+    # Arrange the following methods in alphabetical order.
+
+    def __init__(
+        self,
+        path: str,
+        schema: Optional[Sequence[Tuple[str, Optional[str]]]],
+        batch_size: int,
+        sample_size: int,
+    ) -> None: ...
+    def names(self) -> List[str]: ...
+    def read_batch(self) -> Optional[List[LIST_RS]]: ...
 
 
 class IndexList:
@@ -340,38 +523,101 @@ class IndexList:
     def to_list(self) -> List[int]: ...
 
 
+def all_of(lists: List[BooleanList]) -> BooleanList: ...
+
+
+def any_of(lists: List[BooleanList]) -> BooleanList: ...
+
+
 def arange32(start: int, stop: int, step: int) -> IntegerList32: ...
 
 
 def arange64(start: int, stop: int, step: int) -> IntegerList64: ...
 
 
-def read_csv(path: str, schema: Sequence[Tuple[str, str]]) -> List[LIST_RS]: ...
+def eval_expr(
+    program: List[Tuple[str, List[int], Optional[str], Optional[Any]]],
+    inputs: List[LIST_RS],
+    result: int,
+    predicates: List[int],
+) -> LIST_RS: ...
+
+
+def eval_sum(
+    program: List[Tuple[str, List[int], Optional[str], Optional[Any]]],
+    inputs: List[LIST_RS],
+    result: int,
+    predicates: List[int],
+) -> Tuple[NUM, int, int]: ...
+
+
+def from_arrow_c(schema: object, array: object) -> LIST_RS: ...
+
+
+def from_buffer(
+    obj: Any,
+    dtype: str,
+    mask: Optional[Any],
+) -> LIST_RS: ...
+
+
+def get_parallel_threshold() -> int: ...
+
+
+def load(path: str, mmap: bool) -> List[Tuple[str, LIST_RS]]: ...
+
+
+def read_csv(
+    path: str,
+    schema: Optional[Sequence[Tuple[str, Optional[str]]]],
+    n_threads: int,
+    sample_size: int,
+) -> List[Tuple[str, LIST_RS]]: ...
+
+
+def save(path: str, columns: Sequence[Tuple[str, str, LIST_RS]]) -> None: ...
 
 
 def select_bool(
     conditions: List[BooleanList],
-    choices: LIST_PY,
+    choices: Sequence[Union[ELEM, LIST_RS]],
     default: bool,
 ) -> BooleanList: ...
 
 
 def select_float(
     conditions: List[BooleanList],
-    choices: LIST_PY,
+    choices: Sequence[Union[ELEM, LIST_RS]],
     default: float,
 ) -> FloatList64: ...
 
 
+def select_float32(
+    conditions: List[BooleanList],
+    choices: Sequence[Union[ELEM, LIST_RS]],
+    default: float,
+) -> FloatList32: ...
+
+
 def select_int(
     conditions: List[BooleanList],
-    choices: LIST_PY,
+    choices: Sequence[Union[ELEM, LIST_RS]],
     default: int,
 ) -> IntegerList64: ...
 
 
+def select_int32(
+    conditions: List[BooleanList],
+    choices: Sequence[Union[ELEM, LIST_RS]],
+    default: int,
+) -> IntegerList32: ...
+
+
 def select_string(
     conditions: List[BooleanList],
-    choices: LIST_PY,
+    choices: Sequence[Union[ELEM, LIST_RS]],
     default: str,
 ) -> StringList: ...
+
+
+def set_parallel_threshold(threshold: int) -> None: ...
@@ -0,0 +1,527 @@
+use crate::base::List;
+use crate::base::_fill_na;
+use crate::bitmap::Bitmap;
+use crate::boolean::BooleanList;
+use crate::category::CategoryList;
+use crate::export::ExportGuard;
+use crate::floatings::{FloatList32, FloatList64};
+use crate::integers::{IntegerList32, IntegerList64};
+use crate::shared::{Foreign, SharedVec};
+use crate::string::StringList;
+use crate::string_buffer::StringBuffer;
+use pyo3::exceptions::{PyBufferError, PyTypeError, PyValueError};
+use pyo3::ffi;
+use pyo3::prelude::*;
+use pyo3::AsPyPointer;
+use std::any::Any;
+use std::collections::HashSet;
+use std::ffi::CStr;
+use std::ffi::CString;
+use std::mem;
+use std::os::raw::c_char;
+use std::os::raw::c_void;
+use std::ptr;
+use std::slice;
+use std::sync::Arc;
+
+const ARRAY_NAME: &[u8] = b"arrow_array\0";
+const SCHEMA_NAME: &[u8] = b"arrow_schema\0";
+/// The `ARROW_FLAG_NULLABLE` flag of `ArrowSchema`.
+const FLAG_NULLABLE: i64 = 2;
+
+/// `struct ArrowSchema` of the Arrow C data interface.
+#[repr(C)]
+pub struct ArrowSchema {
+    format: *const c_char,
+    name: *const c_char,
+    metadata: *const c_char,
+    flags: i64,
+    n_children: i64,
+    children: *mut *mut ArrowSchema,
+    dictionary: *mut ArrowSchema,
+    release: Option<unsafe extern "C" fn(*mut ArrowSchema)>,
+    private_data: *mut c_void,
+}
+
+/// `struct ArrowArray` of the Arrow C data interface.
+#[repr(C)]
+pub struct ArrowArray {
+    length: i64,
+    null_count: i64,
+    offset: i64,
+    n_buffers: i64,
+    n_children: i64,
+    buffers: *mut *const c_void,
+    children: *mut *mut ArrowArray,
+    dictionary: *mut ArrowArray,
+    release: Option<unsafe extern "C" fn(*mut ArrowArray)>,
+    private_data: *mut c_void,
+}
+
+/// The buffers of a list to export, which are borrowed from the list.
+pub struct ArrowExport {
+    format: &'static str,
+    length: usize,
+    null_count: usize,
+    buffers: Vec<*const c_void>,
+    dictionary: Option<Box<ArrowExport>>,
+}
+
+impl ArrowExport {
+    // Arrange the following methods in alphabetical order.
+
+    /// `buffers` are the buffers after the validity buffer, the validity
+    /// buffer is not exported if there is no missing value.
+    pub fn new(format: &'static str, validity: &Bitmap, buffers: Vec<*const c_void>) -> Self {
+        let null_count = validity.count_zeros();
+        let mut result = Vec::with_capacity(buffers.len() + 1);
+        if null_count == 0 {
+            result.push(ptr::null());
+        } else {
+            // The words are little-endian, so that the bits are LSB first as
+            // the Arrow validity bitmap.
+            result.push(validity.words().as_ptr() as *const c_void);
+        }
+        result.extend(buffers);
+        ArrowExport {
+            format,
+            length: validity.len(),
+            null_count,
+            buffers: result,
+            dictionary: None,
+        }
+    }
+
+    /// Format of the large string array, of which the offsets are `usize`.
+    pub fn string_format() -> &'static str {
+        if mem::size_of::<usize>() == 8 {
+            "U"
+        } else {
+            "u"
+        }
+    }
+
+    pub fn with_dictionary(mut self, dictionary: ArrowExport) -> Self {
+        self.dictionary = Some(Box::new(dictionary));
+        self
+    }
+}
+
+struct SchemaPrivate {
+    _format: CString,
+}
+
+struct ArrayPrivate {
+    _buffers: Vec<*const c_void>,
+    // The exported memory belongs to the owner, and the guard keeps it from
+    // being reallocated.
+    _owner: PyObject,
+    _guard: ExportGuard,
+}
+
+/// Export the buffers of `owner` to the `arrow_schema` and `arrow_array`
+/// PyCapsules without copying.
+pub fn to_capsules(
+    py: Python,
+    owner: PyObject,
+    guard: ExportGuard,
+    export: ArrowExport,
+) -> PyResult<(PyObject, PyObject)> {
+    if cfg!(target_endian = "big") {
+        return Err(PyBufferError::new_err(
+            "The arrow arrays can only be exported on little-endian targets!",
+        ));
+    }
+    let schema = Box::into_raw(Box::new(_new_schema(&export)));
+    let array = Box::into_raw(Box::new(_new_array(export, &owner, &guard)));
+    unsafe {
+        let schema = PyObject::from_owned_ptr_or_err(
+            py,
+            ffi::PyCapsule_New(
+                schema as *mut c_void,
+                SCHEMA_NAME.as_ptr() as *const c_char,
+                Some(_drop_schema_capsule),
+            ),
+        )?;
+        let array = PyObject::from_owned_ptr_or_err(
+            py,
+            ffi::PyCapsule_New(
+                array as *mut c_void,
+                ARRAY_NAME.as_ptr() as *const c_char,
+                Some(_drop_array_capsule),
+            ),
+        )?;
+        Ok((schema, array))
+    }
+}
+
+/// Construct a list from the `arrow_schema` and `arrow_array` PyCapsules.
+/// The numerical values without missing values are borrowed from the array,
+/// which is released once no list borrows it. The other buffers are copied.
+#[pyfunction]
+pub fn from_arrow_c(schema: &PyAny, array: &PyAny, py: Python) -> PyResult<PyObject> {
+    let schema = _capsule_pointer(py, schema, SCHEMA_NAME)? as *const ArrowSchema;
+    let array = _capsule_pointer(py, array, ARRAY_NAME)? as *mut ArrowArray;
+    unsafe {
+        if (*schema).release.is_none() || (*array).release.is_none() {
+            return Err(PyValueError::new_err("The arrow array has been released!"));
+        }
+        // Move the array out of the capsule, so that it is released by the
+        // lists which borrow it, or as soon as the buffers are copied.
+        let imported = Arc::new(_ImportedArray(ptr::read(array)));
+        (*array).release = None;
+        _import(&*schema, &imported, py)
+    }
+}
+
+/// An array moved out of its capsule, which is released when dropped.
+struct _ImportedArray(ArrowArray);
+
+// The array is only read, and the C data interface allows the consumer to
+// release it from any thread.
+unsafe impl Send for _ImportedArray {}
+unsafe impl Sync for _ImportedArray {}
+
+impl Drop for _ImportedArray {
+    fn drop(&mut self) {
+        if let Some(release) = self.0.release {
+            unsafe { release(&mut self.0) };
+        }
+    }
+}
+
+fn _capsule_pointer(py: Python, capsule: &PyAny, name: &[u8]) -> PyResult<*mut c_void> {
+    let result =
+        unsafe { ffi::PyCapsule_GetPointer(capsule.as_ptr(), name.as_ptr() as *const c_char) };
+    if result.is_null() {
+        Err(PyErr::fetch(py))
+    } else {
+        Ok(result)
+    }
+}
+
+unsafe extern "C" fn _drop_array_capsule(capsule: *mut ffi::PyObject) {
+    let array =
+        ffi::PyCapsule_GetPointer(capsule, ARRAY_NAME.as_ptr() as *const c_char) as *mut ArrowArray;
+    if array.is_null() {
+        ffi::PyErr_Clear();
+        return;
+    }
+    if let Some(release) = (*array).release {
+        release(array);
+    }
+    drop(Box::from_raw(array));
+}
+
+unsafe extern "C" fn _drop_schema_capsule(capsule: *mut ffi::PyObject) {
+    let schema = ffi::PyCapsule_GetPointer(capsule, SCHEMA_NAME.as_ptr() as *const c_char)
+        as *mut ArrowSchema;
+    if schema.is_null() {
+        ffi::PyErr_Clear();
+        return;
+    }
+    if let Some(release) = (*schema).release {
+        release(schema);
+    }
+    drop(Box::from_raw(schema));
+}
+
+/// Read the list from the imported array of type `schema`.
+unsafe fn _import(
+    schema: &ArrowSchema,
+    imported: &Arc<_ImportedArray>,
+    py: Python,
+) -> PyResult<PyObject> {
+    let array = &imported.0;
+    let format = _format(schema)?;
+    if !schema.dictionary.is_null() {
+        if array.dictionary.is_null() {
+            return Err(PyValueError::new_err(
+                "The dictionary of the arrow array is missing!",
+            ));
+        }
+        return _import_category(format, &*schema.dictionary, array, py);
+    }
+    let validity = _read_validity(array);
+    let res = match format {
+        "l" => {
+            let values = _share_values(imported, &validity);
+            IntegerList64::_from_shared(values, validity).into_py(py)
+        }
+        "i" => {
+            let values = _share_values(imported, &validity);
+            IntegerList32::_from_shared(values, validity).into_py(py)
+        }
+        "g" => {
+            let values = _share_values(imported, &validity);
+            FloatList64::_from_shared(values, validity).into_py(py)
+        }
+        "f" => {
+            let values = _share_values(imported, &validity);
+            FloatList32::_from_shared(values, validity).into_py(py)
+        }
+        "b" => {
+            let values = _read_bits(array, 1).and(&validity);
+            BooleanList::_new(values, validity).into_py(py)
+        }
+        "u" => StringList::_new(_read_strings::<i32>(array, &validity)?, validity).into_py(py),
+        "U" => StringList::_new(_read_strings::<i64>(array, &validity)?, validity).into_py(py),
+        _ => return Err(_unsupported(format)),
+    };
+    Ok(res)
+}
+
+/// Read the category list from the dictionary encoded `array`, of which the
+/// indexes are of type `format`.
+unsafe fn _import_category(
+    format: &str,
+    dictionary_schema: &ArrowSchema,
+    array: &ArrowArray,
+    py: Python,
+) -> PyResult<PyObject> {
+    let validity = _read_validity(array);
+    let mut codes: Vec<u32> = match format {
+        "c" => _read_values::<i8>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        "C" => _read_values::<u8>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        "s" => _read_values::<i16>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        "S" => _read_values::<u16>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        "i" => _read_values::<i32>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        "I" => _read_values::<u32>(array, 1),
+        "l" => _read_values::<i64>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        "L" => _read_values::<u64>(array, 1)
+            .iter()
+            .map(|&x| x as u32)
+            .collect(),
+        _ => return Err(_unsupported(format)),
+    };
+    _fill_na(&mut codes, &validity, 0);
+    let dictionary_array = &*array.dictionary;
+    let dictionary_validity = _read_validity(dictionary_array);
+    let dictionary = match _format(dictionary_schema)? {
+        "u" => _read_strings::<i32>(dictionary_array, &dictionary_validity)?,
+        "U" => _read_strings::<i64>(dictionary_array, &dictionary_validity)?,
+        format => return Err(_unsupported(format)),
+    };
+    let n = dictionary.len();
+    if validity.iter_ones().any(|i| codes[i] as usize >= n) {
+        return Err(PyValueError::new_err(
+            "The indexes of the arrow array are out of the dictionary!",
+        ));
+    }
+    // The dictionary of arrow is not necessarily unique, encode the strings
+    // again in that case.
+    let mut seen = HashSet::with_capacity(n);
+    let result = if dictionary.iter().all(|x| seen.insert(x)) {
+        CategoryList::_new(codes, dictionary, validity)
+    } else {
+        let iter = codes.iter().zip(validity.iter()).map(|(&code, valid)| {
+            if valid {
+                dictionary.get(code as usize)
+            } else {
+                ""
+            }
+        });
+        CategoryList::_encode(iter, validity.clone())
+    };
+    Ok(result.into_py(py))
+}
+
+unsafe fn _format(schema: &ArrowSchema) -> PyResult<&str> {
+    if schema.format.is_null() {
+        return Err(PyValueError::new_err("The arrow format is missing!"));
+    }
+    CStr::from_ptr(schema.format)
+        .to_str()
+        .map_err(|e| PyValueError::new_err(e.to_string()))
+}
+
+fn _new_array(export: ArrowExport, owner: &PyObject, guard: &ExportGuard) -> ArrowArray {
+    let dictionary = match export.dictionary {
+        Some(dictionary) => Box::into_raw(Box::new(_new_array(*dictionary, owner, guard))),
+        None => ptr::null_mut(),
+    };
+    let mut private = Box::new(ArrayPrivate {
+        _buffers: export.buffers,
+        _owner: owner.clone(),
+        _guard: guard.clone(),
+    });
+    ArrowArray {
+        length: export.length as i64,
+        null_count: export.null_count as i64,
+        offset: 0,
+        n_buffers: private._buffers.len() as i64,
+        n_children: 0,
+        buffers: private._buffers.as_mut_ptr(),
+        children: ptr::null_mut(),
+        dictionary,
+        release: Some(_release_array),
+        private_data: Box::into_raw(private) as *mut c_void,
+    }
+}
+
+fn _new_schema(export: &ArrowExport) -> ArrowSchema {
+    let dictionary = match export.dictionary {
+        Some(ref dictionary) => Box::into_raw(Box::new(_new_schema(dictionary))),
+        None => ptr::null_mut(),
+    };
+    let private = Box::new(SchemaPrivate {
+        _format: CString::new(export.format).unwrap(),
+    });
+    ArrowSchema {
+        format: private._format.as_ptr(),
+        name: ptr::null(),
+        metadata: ptr::null(),
+        flags: FLAG_NULLABLE,
+        n_children: 0,
+        children: ptr::null_mut(),
+        dictionary,
+        release: Some(_release_schema),
+        private_data: Box::into_raw(private) as *mut c_void,
+    }
+}
+
+/// Read the bits of the `index`-th buffer of `array`.
+unsafe fn _read_bits(array: &ArrowArray, index: usize) -> Bitmap {
+    let data = *array.buffers.add(index) as *const u8;
+    let offset = array.offset as usize;
+    Bitmap::from_fn(array.length as usize, |i| {
+        let j = offset + i;
+        unsafe { (*data.add(j / 8) >> (j % 8)) & 1 == 1 }
+    })
+}
+
+/// Read the strings of `array`, of which the offsets are of type `O`. The
+/// missing values are read as empty strings.
+unsafe fn _read_strings<O: Copy + Into<i64>>(
+    array: &ArrowArray,
+    validity: &Bitmap,
+) -> PyResult<StringBuffer> {
+    let n = array.length as usize;
+    if n == 0 {
+        return Ok(StringBuffer::new());
+    }
+    let offsets = slice::from_raw_parts(
+        (*array.buffers.add(1) as *const O).add(array.offset as usize),
+        n + 1,
+    );
+    let start = offsets[0].into();
+    let end = offsets[n].into();
+    if start < 0 || end < start {
+        return Err(PyValueError::new_err(
+            "The offsets of the arrow array are invalid!",
+        ));
+    }
+    let bytes = slice::from_raw_parts(
+        (*array.buffers.add(2) as *const u8).add(start as usize),
+        (end - start) as usize,
+    );
+    let offsets = offsets
+        .iter()
+        .map(|&x| (x.into() - start) as usize)
+        .collect();
+    let result =
+        StringBuffer::try_from_parts(bytes.to_vec(), offsets).map_err(PyValueError::new_err)?;
+    if validity
+        .iter_zeros()
+        .any(|i| !result.get_bytes(i).is_empty())
+    {
+        let values = result
+            .iter()
+            .zip(validity.iter())
+            .map(|(x, valid)| if valid { x } else { "" })
+            .collect();
+        return Ok(values);
+    }
+    Ok(result)
+}
+
+unsafe fn _read_validity(array: &ArrowArray) -> Bitmap {
+    if array.null_count == 0 || (*array.buffers).is_null() {
+        Bitmap::new(array.length as usize, true)
+    } else {
+        _read_bits(array, 0)
+    }
+}
+
+/// Copy the elements of the `index`-th buffer of `array`.
+unsafe fn _read_values<T: Copy>(array: &ArrowArray, index: usize) -> Vec<T> {
+    let n = array.length as usize;
+    if n == 0 {
+        return Vec::new();
+    }
+    let data = (*array.buffers.add(index) as *const T).add(array.offset as usize);
+    slice::from_raw_parts(data, n).to_vec()
+}
+
+/// The elements of the values buffer of the imported array, which are
+/// borrowed if they are aligned and there is no missing value to fill,
+/// otherwise copied.
+unsafe fn _share_values<T: Copy + Default + Sync>(
+    imported: &Arc<_ImportedArray>,
+    validity: &Bitmap,
+) -> SharedVec<T> {
+    let array = &imported.0;
+    let n = array.length as usize;
+    if n > 0 && validity.count_zeros() == 0 {
+        let data = (*array.buffers.add(1) as *const T).add(array.offset as usize);
+        if data as usize % mem::align_of::<T>() == 0 {
+            let owner: Arc<dyn Any + Send + Sync> = imported.clone();
+            return SharedVec::from_foreign(Foreign::new(data, n, owner));
+        }
+    }
+    let mut vec = _read_values::<T>(array, 1);
+    _fill_na(&mut vec, validity, T::default());
+    SharedVec::new(vec)
+}
+
+unsafe extern "C" fn _release_array(array: *mut ArrowArray) {
+    if array.is_null() || (*array).release.is_none() {
+        return;
+    }
+    let dictionary = (*array).dictionary;
+    if !dictionary.is_null() {
+        if let Some(release) = (*dictionary).release {
+            release(dictionary);
+        }
+        drop(Box::from_raw(dictionary));
+    }
+    drop(Box::from_raw((*array).private_data as *mut ArrayPrivate));
+    (*array).release = None;
+}
+
+unsafe extern "C" fn _release_schema(schema: *mut ArrowSchema) {
+    if schema.is_null() || (*schema).release.is_none() {
+        return;
+    }
+    let dictionary = (*schema).dictionary;
+    if !dictionary.is_null() {
+        if let Some(release) = (*dictionary).release {
+            release(dictionary);
+        }
+        drop(Box::from_raw(dictionary));
+    }
+    drop(Box::from_raw((*schema).private_data as *mut SchemaPrivate));
+    (*schema).release = None;
+}
+
+fn _unsupported(format: &str) -> PyErr {
+    PyTypeError::new_err(format!("Unsupported arrow format '{}'!", format))
+}
@@ -1,5 +1,8 @@
+use crate::bitmap::Bitmap;
 use crate::boolean::BooleanList;
 use crate::index::IndexList;
+use crate::parallel;
+use crate::shared::_locate;
 use pyo3::exceptions::PyIndexError;
 use pyo3::exceptions::PyRuntimeError;
 use pyo3::PyResult;
@@ -7,24 +10,41 @@ use rand::distributions::Uniform;
 use rand::Rng;
 use std::cell::Ref;
 use std::cell::RefMut;
-use std::collections::HashSet;
 
-pub fn _fill_na<T: Clone>(vec: &mut [T], na_indexes: Ref<HashSet<usize>>, na_value: T) {
-    for i in na_indexes.iter() {
-        let ptr = unsafe { vec.get_unchecked_mut(*i) };
+pub fn _check_range(start: usize, end: usize, size: usize) -> PyResult<()> {
+    if start > end || end > size {
+        Err(PyIndexError::new_err("Index out of range!"))
+    } else {
+        Ok(())
+    }
+}
+
+pub fn _fill_na<T: Clone>(vec: &mut [T], validity: &Bitmap, na_value: T) {
+    for i in validity.iter_zeros() {
+        let ptr = unsafe { vec.get_unchecked_mut(i) };
         *ptr = na_value.clone();
     }
 }
 
+/// Iterate the elements of the chunks.
+pub fn _flatten<'a, T>(chunks: &'a [&'a [T]]) -> impl Iterator<Item = &'a T> {
+    chunks.iter().flat_map(|x| x.iter())
+}
+
+/// Iterate the bits of the chunks.
+pub fn _flatten_bits<'a>(chunks: &'a [&'a Bitmap]) -> impl Iterator<Item = bool> + 'a {
+    chunks.iter().flat_map(|x| x.iter())
+}
+
 /// Abstract List with generic type elements.
 pub trait List<T>
 where
-    T: PartialEq + Clone,
+    T: PartialEq + Clone + Send + Sync,
     Self: Sized,
 {
     // Arrange the following methods in alphabetical order.
 
-    fn _new(vec: Vec<T>, hset: HashSet<usize>) -> Self;
+    fn _new(vec: Vec<T>, validity: Bitmap) -> Self;
 
     fn _check_len_eq(&self, other: &Self) -> PyResult<()> {
         if self.size() != other.size() {
@@ -36,76 +56,150 @@ where
         }
     }
 
+    fn _check_out_len(&self, size: usize) -> PyResult<()> {
+        if self.size() != size {
+            Err(PyRuntimeError::new_err(
+                "The sizes of `self` and `out` should be equal!",
+            ))
+        } else {
+            Ok(())
+        }
+    }
+
     // TODO: Better abstraction for List::_cmp and NumericalList::_fn methods.
-    fn _cmp(&self, other: &Self, func: impl Fn(T, T) -> bool) -> PyResult<BooleanList> {
+    fn _cmp(
+        &self,
+        other: &Self,
+        func: impl Fn(&T, &T) -> bool + Send + Sync,
+    ) -> PyResult<BooleanList> {
         self._check_len_eq(other)?;
-        let vec = self
-            .values()
-            .iter()
-            .zip(other.values().iter())
-            .map(|(x, y)| func(x.clone(), y.clone()))
-            .collect();
-        let hset: HashSet<usize> = self
-            .na_indexes()
-            .iter()
-            .chain(other.na_indexes().iter())
-            .copied()
-            .collect();
-        let result = BooleanList::_new(vec, hset);
-        _fill_na(&mut result.values_mut(), result.na_indexes(), false);
-        Ok(result)
+        let (values, validity) = self.with_chunks(|x, x_validity| {
+            other.with_chunks(|y, y_validity| match (x, y, x_validity, y_validity) {
+                // The lists which are not chunked are compared in parallel.
+                ([x], [y], [x_validity], [y_validity]) => {
+                    (parallel::zip_mask(x, y, &func), x_validity.and(y_validity))
+                }
+                _ => (
+                    _flatten(x)
+                        .zip(_flatten(y))
+                        .map(|(x, y)| func(x, y))
+                        .collect(),
+                    _flatten_bits(x_validity)
+                        .zip(_flatten_bits(y_validity))
+                        .map(|(x, y)| x && y)
+                        .collect(),
+                ),
+            })
+        });
+        Ok(BooleanList::_new(values.and(&validity), validity))
     }
 
-    fn _fn_scala<U>(&self, func: impl Fn(&T) -> U) -> Vec<U> {
-        self.values().iter().map(func).collect()
+    /// Same as `_cmp`, but write the result to the buffers of `out`.
+    fn _cmp_into(
+        &self,
+        other: &Self,
+        out: &BooleanList,
+        func: impl Fn(&T, &T) -> bool + Send + Sync,
+    ) -> PyResult<()> {
+        self._check_len_eq(other)?;
+        self._check_out_len(out.size())?;
+        let mut validity = out.validity_mut();
+        validity.copy_from(&self.validity());
+        validity.and_assign(&other.validity());
+        let mut values = out.values_mut();
+        parallel::zip_mask_into(&mut values, &self.values(), &other.values(), func);
+        values.and_assign(&validity);
+        Ok(())
+    }
+
+    /// Pack the results of `func` into a boolean list, the missing values
+    /// of self stay missing.
+    fn _fn_mask(&self, func: impl Fn(&T) -> bool + Send + Sync) -> BooleanList {
+        let validity = self.validity().clone();
+        let values = parallel::mask(&self.values(), func).and(&validity);
+        BooleanList::_new(values, validity)
+    }
+
+    /// Same as `_fn_mask`, but write the result to the buffers of `out`.
+    fn _fn_mask_into(
+        &self,
+        out: &BooleanList,
+        func: impl Fn(&T) -> bool + Send + Sync,
+    ) -> PyResult<()> {
+        self._check_out_len(out.size())?;
+        let mut validity = out.validity_mut();
+        validity.copy_from(&self.validity());
+        let mut values = out.values_mut();
+        parallel::mask_into(&mut values, &self.values(), func);
+        values.and_assign(&validity);
+        Ok(())
+    }
+
+    fn _fn_scala<U: Send>(&self, func: impl Fn(&T) -> U + Send + Sync) -> Vec<U> {
+        parallel::map(&self.values(), func)
+    }
+
+    /// Copy of self which shares the buffers, to run a kernel on while the
+    /// GIL is released. The other Python threads may modify self meanwhile,
+    /// which copies the shared buffers on write instead of racing the kernel.
+    fn _snapshot(&self) -> Self {
+        // Compact the chunks once, instead of in every snapshot.
+        self.rechunk();
+        self.copy()
     }
 
     fn _sort(&self) {
         let n = self.size();
         let m = self.count_na();
-        if m == n {
+        if m == 0 || m == n {
             return;
         }
-        let mut vec = self.values_mut();
-        let mut hset = self.na_indexes_mut();
         // Put all the na elements to the right side.
-        let mut l = 0;
-        let mut r = n - 1;
-        while l < r && !hset.is_empty() {
-            while l < r && !hset.contains(&l) {
-                l += 1;
+        {
+            let mut vec = self.values_mut();
+            for (l, r) in self.validity().iter_ones().enumerate() {
+                vec.swap(l, r);
             }
-            while l < r && hset.contains(&r) {
-                r -= 1;
-            }
-            vec.swap(l, r);
-            hset.remove(&l);
-            hset.insert(r);
         }
+        *self.validity_mut() = Bitmap::from_fn(n, |i| i < n - m);
     }
 
     fn all_equal(&self, other: &Self) -> Option<bool> {
         if self.size() != other.size() {
             return Some(false);
         };
-        let hset1 = self.na_indexes();
-        let hset2 = other.na_indexes();
-        let mut result = Some(true);
-        for (i, (x1, x2)) in self.values().iter().zip(other.values().iter()).enumerate() {
-            if hset1.contains(&i) || hset2.contains(&i) {
-                result = None;
-            } else if x1 != x2 {
-                return Some(false);
+        let validity = self.validity().and(&other.validity());
+        let vec1 = self.values();
+        let vec2 = other.values();
+        // Compare the elements word by word, a full word of valid elements
+        // is compared as a whole slice.
+        let chunks1 = vec1.chunks(64);
+        let chunks2 = vec2.chunks(64);
+        for ((x1, x2), &word) in chunks1.zip(chunks2).zip(validity.words()) {
+            if word.count_ones() as usize == x1.len() {
+                if x1 != x2 {
+                    return Some(false);
+                }
+            } else {
+                for j in (0..x1.len()).filter(|j| (word >> j) & 1 == 1) {
+                    if x1[j] != x2[j] {
+                        return Some(false);
+                    }
+                }
             }
         }
-        result
+        if validity.all() {
+            Some(true)
+        } else {
+            None
+        }
     }
 
     fn append(&self, elem: Option<T>) {
+        self.validity_mut().push(elem.is_some());
         if let Some(i) = elem {
             self.values_mut().push(i);
         } else {
-            self.na_indexes_mut().insert(self.size());
             self.values_mut().push(self.na_value());
         }
     }
@@ -118,32 +212,36 @@ where
             .map(|x| unsafe { vec.get_unchecked(x).clone() })
             .take(size)
             .collect();
-        List::_new(v, HashSet::new())
+        List::_new(v, Bitmap::new(size, true))
     }
 
-    fn copy(&self) -> Self {
-        let hset = self.na_indexes().clone();
-        List::_new(self.values().clone(), hset)
-    }
+    /// Copy of self in O(1), which shares the buffers of self until either
+    /// of them is modified.
+    fn copy(&self) -> Self;
 
     fn count_na(&self) -> usize {
-        self.na_indexes().len()
+        self.with_chunks(|_, validity| validity.iter().map(|x| x.count_zeros()).sum())
     }
 
     fn cycle(vec: &[T], size: usize) -> Self {
         let v: Vec<_> = vec.iter().cycle().take(size).cloned().collect();
-        List::_new(v, HashSet::new())
+        List::_new(v, Bitmap::new(size, true))
     }
 
     fn equal(&self, other: &Self) -> PyResult<BooleanList> {
         self._cmp(other, |x, y| x == y)
     }
 
+    fn equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        self._cmp_into(other, out, |x, y| x == y)
+    }
+
     fn equal_scala(&self, elem: T) -> BooleanList {
-        let mut vec = self._fn_scala(|x| x == &elem);
-        _fill_na(&mut vec, self.na_indexes(), false);
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+        self._fn_mask(|x| x == &elem)
+    }
+
+    fn equal_scala_into(&self, elem: T, out: &BooleanList) -> PyResult<()> {
+        self._fn_mask_into(out, |x| x == &elem)
     }
 
     fn filter(&self, condition: &BooleanList) -> PyResult<Self> {
@@ -153,81 +251,77 @@ where
             ));
         }
 
-        let n = self.size();
-        let m = self.count_na();
-        let mut vec: Vec<T> = Vec::with_capacity(n);
-        let mut hset: HashSet<usize> = HashSet::with_capacity(m);
         let cond = condition.values();
-        let mut i = 0;
-        for ((j, x), cond) in self.values().iter().enumerate().zip(cond.iter()) {
-            if *cond {
-                vec.push(x.clone());
-                if self.na_indexes().contains(&j) {
-                    hset.insert(i);
+        let n = cond.count_ones();
+        let mut vec: Vec<T> = Vec::with_capacity(n);
+        let mut validity = Bitmap::with_capacity(n);
+        self.with_chunks(|self_vec, self_validity| {
+            let iter = _flatten(self_vec).zip(_flatten_bits(self_validity));
+            for ((x, valid), keep) in iter.zip(cond.iter()) {
+                if keep {
+                    vec.push(x.clone());
+                    validity.push(valid);
                 }
-                i += 1;
             }
-        }
-        vec.shrink_to_fit();
-        hset.shrink_to_fit();
-        Ok(List::_new(vec, hset))
+        });
+        Ok(List::_new(vec, validity))
     }
 
     fn get(&self, index: usize) -> PyResult<Option<T>> {
-        if self.na_indexes().contains(&index) {
-            return Ok(None);
-        }
-        let vec = self.values();
-        let val = vec.get(index);
-        if let Some(i) = val {
-            Ok(Some(i.clone()))
-        } else {
-            Err(PyIndexError::new_err("Index out of range!"))
+        if index >= self.size() {
+            return Err(PyIndexError::new_err("Index out of range!"));
         }
+        self.with_chunks(|vec, validity| {
+            let (i, j) = _locate(validity.iter().map(|x| x.len()), index);
+            if !validity[i].get(j) {
+                return Ok(None);
+            }
+            let (i, j) = _locate(vec.iter().map(|x| x.len()), index);
+            Ok(Some(vec[i][j].clone()))
+        })
     }
 
     fn get_by_indexes(&self, indexes: &IndexList) -> PyResult<Self> {
         if indexes.back() >= self.size() {
             return Err(PyIndexError::new_err("Index out of range!"));
         }
+        let self_vec = self.values();
+        let self_validity = self.validity();
         let mut vec: Vec<T> = Vec::with_capacity(indexes.size());
-        let mut hset: HashSet<usize> = HashSet::new();
-        for (i, j) in indexes.values().iter().enumerate() {
-            let elem = unsafe { self.values().get_unchecked(*j).clone() };
+        let mut validity = Bitmap::with_capacity(indexes.size());
+        for j in indexes.values().iter() {
+            let elem = unsafe { self_vec.get_unchecked(*j).clone() };
             vec.push(elem);
-            if self.na_indexes().contains(j) {
-                hset.insert(i);
-            }
+            validity.push(self_validity.get(*j));
         }
-        hset.shrink_to_fit();
-        Ok(List::_new(vec, hset))
+        Ok(List::_new(vec, validity))
     }
 
-    fn na_indexes(&self) -> Ref<HashSet<usize>>;
-
-    fn na_indexes_mut(&self) -> RefMut<HashSet<usize>>;
-
     fn na_value(&self) -> T;
 
     fn not_equal(&self, other: &Self) -> PyResult<BooleanList> {
         self._cmp(other, |x, y| x != y)
     }
 
+    fn not_equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        self._cmp_into(other, out, |x, y| x != y)
+    }
+
     fn not_equal_scala(&self, elem: T) -> BooleanList {
-        let mut vec = self._fn_scala(|x| x != &elem);
-        _fill_na(&mut vec, self.na_indexes(), false);
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+        self._fn_mask(|x| x != &elem)
+    }
+
+    fn not_equal_scala_into(&self, elem: T, out: &BooleanList) -> PyResult<()> {
+        self._fn_mask_into(out, |x| x != &elem)
     }
 
     fn pop(&self) {
-        let i = self.size() - 1;
-        if self.na_indexes().contains(&i) {
-            self.na_indexes_mut().remove(&i);
-        }
+        self.validity_mut().pop();
         self.values_mut().pop();
     }
 
+    fn rechunk(&self);
+
     // TODO: Test if old does not exist in self.
     fn replace(&self, old: Option<T>, new: Option<T>) {
         if let Some(_old) = old {
@@ -244,19 +338,20 @@ where
     fn replace_by_na(&self, old: T) {
         let n = self.size();
         let mut vec = self.values_mut();
+        let mut validity = self.validity_mut();
         for i in 0..n {
             let ptr = unsafe { vec.get_unchecked_mut(i) };
             if *ptr == old {
                 *ptr = self.na_value();
-                self.na_indexes_mut().insert(i);
+                validity.set(i, false);
             }
         }
     }
 
     fn replace_elem(&self, old: T, new: T) {
-        let n = self.size();
         let mut vec = self.values_mut();
-        for i in 0..n {
+        // The na elements are skipped, so that they keep the na value.
+        for i in self.validity().iter_ones() {
             let ptr = unsafe { vec.get_unchecked_mut(i) };
             if *ptr == old {
                 *ptr = new.clone();
@@ -266,11 +361,11 @@ where
 
     fn replace_na(&self, new: T) {
         let mut vec = self.values_mut();
-        for i in self.na_indexes().iter() {
-            let ptr = unsafe { vec.get_unchecked_mut(*i) };
+        for i in self.validity().iter_zeros() {
+            let ptr = unsafe { vec.get_unchecked_mut(i) };
             *ptr = new.clone();
         }
-        self.na_indexes_mut().clear();
+        self.validity_mut().set_all(true);
     }
 
     fn set(&self, index: usize, elem: Option<T>) -> PyResult<()> {
@@ -279,51 +374,50 @@ where
         }
         let mut vec = self.values_mut();
         let ptr = unsafe { vec.get_unchecked_mut(index) };
+        self.validity_mut().set(index, elem.is_some());
         if let Some(i) = elem {
             *ptr = i;
-            self.na_indexes_mut().remove(&index);
         } else {
             *ptr = self.na_value();
-            self.na_indexes_mut().insert(index);
         }
         Ok(())
     }
 
     fn repeat(elem: T, size: usize) -> Self {
         let vec = vec![elem; size];
-        let hset = HashSet::new();
-        List::_new(vec, hset)
+        List::_new(vec, Bitmap::new(size, true))
     }
 
     fn size(&self) -> usize {
         self.values().len()
     }
 
+    /// View of the elements in `start..end` of self, which shares the
+    /// values with self until either of them is modified.
+    fn slice(&self, start: usize, end: usize) -> Self;
+
     fn to_list(&self) -> Vec<Option<T>> {
-        let mut vec: Vec<Option<T>> = self.values().iter().map(|x| Some(x.clone())).collect();
-        for i in self.na_indexes().iter() {
-            // let ptr = unsafe { vec.get_unchecked_mut(*i) };
-            // *ptr = None;
-            vec[*i] = None;
-        }
-        vec
+        self.with_chunks(|vec, validity| {
+            _flatten(vec)
+                .zip(_flatten_bits(validity))
+                .map(|(x, valid)| if valid { Some(x.clone()) } else { None })
+                .collect()
+        })
     }
 
-    fn union_all(&self, other: &Self) -> Self {
-        let vec = self
-            .values()
-            .iter()
-            .cloned()
-            .chain(other.values().iter().cloned())
-            .collect();
-        let mut hset = self.na_indexes().clone();
-        for i in other.na_indexes().iter() {
-            hset.insert(i + self.size());
-        }
-        List::_new(vec, hset)
-    }
+    /// Concatenate self and other in O(1) for the number of elements, the
+    /// chunks of both are shared by the result.
+    fn union_all(&self, other: &Self) -> Self;
+
+    fn validity(&self) -> Ref<Bitmap>;
 
-    fn values(&self) -> Ref<Vec<T>>;
+    fn validity_mut(&self) -> RefMut<Bitmap>;
+
+    fn values(&self) -> Ref<[T]>;
 
     fn values_mut(&self) -> RefMut<Vec<T>>;
+
+    /// Call `func` with the chunks of the values and the validity, which
+    /// does not compact them. The boundaries of the two may differ.
+    fn with_chunks<R>(&self, func: impl FnOnce(&[&[T]], &[&Bitmap]) -> R) -> R;
 }
@@ -0,0 +1,414 @@
+use crate::base::List;
+use crate::base::_fill_na;
+use crate::bitmap::Bitmap;
+use crate::boolean::BooleanList;
+use crate::category::CategoryList;
+use crate::floatings::{FloatList32, FloatList64};
+use crate::integers::{IntegerList32, IntegerList64};
+use crate::shared::{Foreign, SharedVec};
+use crate::string::StringList;
+use crate::string_buffer::StringBuffer;
+use memmap2::Mmap;
+use pyo3::exceptions::{PyIOError, PyValueError};
+use pyo3::prelude::*;
+use std::any::Any;
+use std::fs;
+use std::fs::File;
+use std::io::BufWriter;
+use std::io::Write;
+use std::mem;
+use std::process;
+use std::ptr;
+use std::slice;
+use std::sync::Arc;
+
+// The layout of the file, all the integers are little-endian u64.
+//
+// magic | header length | header | padding | buffers
+//
+// The header is the number of columns followed by the columns, each column
+// is its name, dtype, length and the `(offset, nbytes)` of its buffers. The
+// lengths of the strings go before them. The buffers are aligned to 64
+// bytes, and stored as they are in the memory.
+const MAGIC: &[u8; 8] = b"ULIST\0\0\x01";
+const ALIGNMENT: usize = 64;
+
+/// A borrowed list to save.
+enum _Column<'a> {
+    Bool(PyRef<'a, BooleanList>),
+    Category(PyRef<'a, CategoryList>),
+    Float32(PyRef<'a, FloatList32>),
+    Float64(PyRef<'a, FloatList64>),
+    Int32(PyRef<'a, IntegerList32>),
+    Int64(PyRef<'a, IntegerList64>),
+    String(PyRef<'a, StringList>),
+}
+
+impl<'a> _Column<'a> {
+    // Arrange the following methods in alphabetical order.
+
+    fn extract(dtype: &str, obj: &'a PyAny) -> PyResult<Self> {
+        let result = match dtype {
+            "bool" => _Column::Bool(obj.extract()?),
+            "category" => _Column::Category(obj.extract()?),
+            "float32" => _Column::Float32(obj.extract()?),
+            "float64" => _Column::Float64(obj.extract()?),
+            "int32" => _Column::Int32(obj.extract()?),
+            "int64" => _Column::Int64(obj.extract()?),
+            "string" => _Column::String(obj.extract()?),
+            _ => return Err(_unsupported(dtype)),
+        };
+        Ok(result)
+    }
+
+    fn size(&self) -> usize {
+        match self {
+            _Column::Bool(x) => x.size(),
+            _Column::Category(x) => x.size(),
+            _Column::Float32(x) => x.size(),
+            _Column::Float64(x) => x.size(),
+            _Column::Int32(x) => x.size(),
+            _Column::Int64(x) => x.size(),
+            _Column::String(x) => x.size(),
+        }
+    }
+
+    /// Call `func` with the buffers of the column as bytes, which are
+    /// borrowed instead of copied.
+    fn with_buffers<R>(&self, func: impl FnOnce(&[&[u8]]) -> R) -> R {
+        match self {
+            _Column::Bool(x) => func(&[
+                _as_bytes(x.validity().words()),
+                _as_bytes(x.values().words()),
+            ]),
+            _Column::Category(x) => {
+                let dictionary = x.dictionary();
+                func(&[
+                    _as_bytes(x.validity().words()),
+                    _as_bytes(&x.codes()),
+                    _as_bytes(dictionary.offsets()),
+                    dictionary.bytes(),
+                ])
+            }
+            _Column::Float32(x) => func(&[_as_bytes(x.validity().words()), _as_bytes(&x.values())]),
+            _Column::Float64(x) => func(&[_as_bytes(x.validity().words()), _as_bytes(&x.values())]),
+            _Column::Int32(x) => func(&[_as_bytes(x.validity().words()), _as_bytes(&x.values())]),
+            _Column::Int64(x) => func(&[_as_bytes(x.validity().words()), _as_bytes(&x.values())]),
+            _Column::String(x) => {
+                let values = x.values();
+                func(&[
+                    _as_bytes(x.validity().words()),
+                    _as_bytes(values.offsets()),
+                    values.bytes(),
+                ])
+            }
+        }
+    }
+}
+
+/// Save the lists to `path`.
+/// `columns` is a vector contains the `(name, dtype, list)` tuples.
+#[pyfunction]
+pub fn save(path: String, columns: Vec<(String, String, &PyAny)>) -> PyResult<()> {
+    _check_platform()?;
+    let mut lists = Vec::with_capacity(columns.len());
+    for (_, dtype, obj) in columns.iter() {
+        lists.push(_Column::extract(dtype, obj)?);
+    }
+
+    // The header does not depend on the offsets, so that its length is known
+    // before the offsets.
+    let sizes: Vec<Vec<usize>> = lists
+        .iter()
+        .map(|x| x.with_buffers(|buffers| buffers.iter().map(|b| b.len()).collect()))
+        .collect();
+    let mut header_len = 8;
+    for ((name, dtype, _), nbytes) in columns.iter().zip(sizes.iter()) {
+        header_len += 8 + name.len() + 8 + dtype.len() + 8 + 8 + 16 * nbytes.len();
+    }
+    let mut header = Vec::with_capacity(header_len);
+    let mut offset = _align(MAGIC.len() + 8 + header_len);
+    _push_u64(&mut header, columns.len());
+    for (((name, dtype, _), list), nbytes) in columns.iter().zip(lists.iter()).zip(sizes.iter()) {
+        _push_str(&mut header, name);
+        _push_str(&mut header, dtype);
+        _push_u64(&mut header, list.size());
+        _push_u64(&mut header, nbytes.len());
+        for &n in nbytes.iter() {
+            _push_u64(&mut header, offset);
+            _push_u64(&mut header, n);
+            offset = _align(offset + n);
+        }
+    }
+    debug_assert_eq!(header.len(), header_len);
+
+    // Write a temporary file in the same directory, then rename it over
+    // `path`. The lists loaded from `path` by a memory map keep the old file,
+    // which would be truncated under them by writing `path` in place.
+    let tmp = format!("{}.{}.tmp", path, process::id());
+    let res = _write(&tmp, &header, &lists)
+        .and_then(|_| fs::rename(&tmp, &path).map_err(|e| PyIOError::new_err(e.to_string())));
+    if res.is_err() {
+        let _ = fs::remove_file(&tmp);
+    }
+    res
+}
+
+/// Load the lists saved by `save` from `path`, which returns a vector
+/// contains the `(name, list)` tuples. The file is memory-mapped if `mmap`
+/// is true, and the values of the numerical lists borrow the mapping until
+/// they are modified. Otherwise the file is read into the memory.
+#[pyfunction]
+pub fn load(path: String, mmap: bool, py: Python) -> PyResult<Vec<(String, PyObject)>> {
+    _check_platform()?;
+    let mapped = if mmap {
+        let file = File::open(&path).map_err(|e| PyIOError::new_err(e.to_string()))?;
+        // The file should not be modified while it is mapped.
+        let map = unsafe { Mmap::map(&file) }.map_err(|e| PyIOError::new_err(e.to_string()))?;
+        Some(Arc::new(map))
+    } else {
+        None
+    };
+    let read;
+    let data: &[u8] = match mapped {
+        Some(ref map) => &map[..],
+        None => {
+            read = fs::read(&path).map_err(|e| PyIOError::new_err(e.to_string()))?;
+            &read
+        }
+    };
+
+    if data.len() < MAGIC.len() + 8 || &data[..MAGIC.len()] != MAGIC {
+        return Err(PyIOError::new_err("The file is not saved by ulist!"));
+    }
+    let mut header = _Reader {
+        data,
+        position: MAGIC.len() + 8,
+    };
+    let n_columns = header.read_u64()?;
+    let mut result = Vec::new();
+    for _ in 0..n_columns {
+        let name = header.read_str()?.to_string();
+        let dtype = header.read_str()?.to_string();
+        let len = header.read_u64()?;
+        let n_buffers = header.read_u64()?;
+        let mut buffers = Vec::new();
+        for _ in 0..n_buffers {
+            let offset = header.read_u64()?;
+            let nbytes = header.read_u64()?;
+            match offset.checked_add(nbytes) {
+                Some(end) if end <= data.len() => buffers.push(&data[offset..end]),
+                _ => return Err(_corrupted()),
+            }
+        }
+        let list = _load_list(&dtype, len, &buffers, mapped.as_ref(), py)?;
+        result.push((name, list));
+    }
+    Ok(result)
+}
+
+/// Cursor of the header of the file.
+struct _Reader<'a> {
+    data: &'a [u8],
+    position: usize,
+}
+
+impl<'a> _Reader<'a> {
+    // Arrange the following methods in alphabetical order.
+
+    fn read_bytes(&mut self, n: usize) -> PyResult<&'a [u8]> {
+        let end = self.position.checked_add(n).ok_or_else(_corrupted)?;
+        if end > self.data.len() {
+            return Err(_corrupted());
+        }
+        let result = &self.data[self.position..end];
+        self.position = end;
+        Ok(result)
+    }
+
+    fn read_str(&mut self) -> PyResult<&'a str> {
+        let n = self.read_u64()?;
+        std::str::from_utf8(self.read_bytes(n)?).map_err(|_| _corrupted())
+    }
+
+    fn read_u64(&mut self) -> PyResult<usize> {
+        let mut bytes = [0; 8];
+        bytes.copy_from_slice(self.read_bytes(8)?);
+        Ok(u64::from_le_bytes(bytes) as usize)
+    }
+}
+
+fn _align(n: usize) -> usize {
+    (n + ALIGNMENT - 1) / ALIGNMENT * ALIGNMENT
+}
+
+fn _as_bytes<T: Copy>(slice: &[T]) -> &[u8] {
+    unsafe { slice::from_raw_parts(slice.as_ptr() as *const u8, mem::size_of_val(slice)) }
+}
+
+/// The buffers are stored as they are in the memory, so that the files can
+/// only be shared between the little-endian 64-bit platforms.
+fn _check_platform() -> PyResult<()> {
+    if cfg!(target_endian = "big") || mem::size_of::<usize>() != 8 {
+        return Err(PyIOError::new_err(
+            "The ulist files are only supported on little-endian 64-bit platforms!",
+        ));
+    }
+    Ok(())
+}
+
+fn _corrupted() -> PyErr {
+    PyIOError::new_err("The ulist file is corrupted!")
+}
+
+/// `mapped` is the memory map of `buffers` if any.
+fn _load_list(
+    dtype: &str,
+    len: usize,
+    buffers: &[&[u8]],
+    mapped: Option<&Arc<Mmap>>,
+    py: Python,
+) -> PyResult<PyObject> {
+    let n_buffers = match dtype {
+        "category" => 4,
+        "string" => 3,
+        _ => 2,
+    };
+    if buffers.len() != n_buffers {
+        return Err(_corrupted());
+    }
+    let validity = _read_bitmap(buffers[0], len)?;
+    let res = match dtype {
+        "bool" => {
+            let values = _read_bitmap(buffers[1], len)?.and(&validity);
+            BooleanList::_new(values, validity).into_py(py)
+        }
+        "category" => {
+            let mut codes = _read_vec::<u32>(buffers[1], len)?;
+            _fill_na(&mut codes, &validity, 0);
+            let dictionary = _read_strings(buffers[2], buffers[3])?;
+            if validity
+                .iter_ones()
+                .any(|i| codes[i] as usize >= dictionary.len())
+            {
+                return Err(_corrupted());
+            }
+            CategoryList::_new(codes, dictionary, validity).into_py(py)
+        }
+        "float32" => {
+            let values = _read_values(buffers[1], len, mapped)?;
+            FloatList32::_from_shared(values, validity).into_py(py)
+        }
+        "float64" => {
+            let values = _read_values(buffers[1], len, mapped)?;
+            FloatList64::_from_shared(values, validity).into_py(py)
+        }
+        "int32" => {
+            let values = _read_values(buffers[1], len, mapped)?;
+            IntegerList32::_from_shared(values, validity).into_py(py)
+        }
+        "int64" => {
+            let values = _read_values(buffers[1], len, mapped)?;
+            IntegerList64::_from_shared(values, validity).into_py(py)
+        }
+        "string" => {
+            let values = _read_strings(buffers[1], buffers[2])?;
+            if values.len() != len {
+                return Err(_corrupted());
+            }
+            StringList::_new(values, validity).into_py(py)
+        }
+        _ => return Err(_unsupported(dtype)),
+    };
+    Ok(res)
+}
+
+fn _push_str(header: &mut Vec<u8>, s: &str) {
+    _push_u64(header, s.len());
+    header.extend_from_slice(s.as_bytes());
+}
+
+fn _push_u64(header: &mut Vec<u8>, n: usize) {
+    header.extend_from_slice(&(n as u64).to_le_bytes());
+}
+
+fn _read_bitmap(bytes: &[u8], len: usize) -> PyResult<Bitmap> {
+    let words = _read_vec::<u64>(bytes, (len + 63) / 64)?;
+    Ok(Bitmap::from_words(words, len))
+}
+
+fn _read_strings(offsets: &[u8], bytes: &[u8]) -> PyResult<StringBuffer> {
+    if offsets.len() % 8 != 0 {
+        return Err(_corrupted());
+    }
+    let offsets = _read_vec::<usize>(offsets, offsets.len() / 8)?;
+    StringBuffer::try_from_parts(bytes.to_vec(), offsets).map_err(|_| _corrupted())
+}
+
+/// The `len` elements of `bytes`, which are borrowed from the memory map if
+/// any, otherwise copied. The buffers are aligned to 64 bytes in the file
+/// and the map is aligned to pages, so that the elements are aligned.
+fn _read_values<T: Copy + Sync>(
+    bytes: &[u8],
+    len: usize,
+    mapped: Option<&Arc<Mmap>>,
+) -> PyResult<SharedVec<T>> {
+    match mapped {
+        Some(map) if bytes.as_ptr() as usize % mem::align_of::<T>() == 0 => {
+            if len.checked_mul(mem::size_of::<T>()) != Some(bytes.len()) {
+                return Err(_corrupted());
+            }
+            let owner: Arc<dyn Any + Send + Sync> = map.clone();
+            let foreign = unsafe { Foreign::new(bytes.as_ptr() as *const T, len, owner) };
+            Ok(SharedVec::from_foreign(foreign))
+        }
+        _ => Ok(SharedVec::new(_read_vec(bytes, len)?)),
+    }
+}
+
+/// Copy the `len` elements of `bytes` to a vector by one memcpy. Any bit
+/// pattern should be a valid `T`.
+fn _read_vec<T: Copy>(bytes: &[u8], len: usize) -> PyResult<Vec<T>> {
+    if len.checked_mul(mem::size_of::<T>()) != Some(bytes.len()) {
+        return Err(_corrupted());
+    }
+    let mut result = Vec::with_capacity(len);
+    unsafe {
+        ptr::copy_nonoverlapping(bytes.as_ptr(), result.as_mut_ptr() as *mut u8, bytes.len());
+        result.set_len(len);
+    }
+    Ok(result)
+}
+
+fn _unsupported(dtype: &str) -> PyErr {
+    PyValueError::new_err(format!("Unsupported dtype '{}'!", dtype))
+}
+
+/// Write the file of `save` to `path`.
+fn _write(path: &str, header: &[u8], lists: &[_Column]) -> PyResult<()> {
+    let file = File::create(path).map_err(|e| PyIOError::new_err(e.to_string()))?;
+    let mut writer = BufWriter::new(file);
+    let mut write = |bytes: &[u8]| {
+        writer
+            .write_all(bytes)
+            .map_err(|e| PyIOError::new_err(e.to_string()))
+    };
+    let padding = [0; ALIGNMENT];
+    write(MAGIC)?;
+    write(&(header.len() as u64).to_le_bytes())?;
+    write(header)?;
+    let mut position = MAGIC.len() + 8 + header.len();
+    for list in lists.iter() {
+        list.with_buffers(|buffers| {
+            for buffer in buffers.iter() {
+                write(&padding[..(_align(position) - position)])?;
+                write(buffer)?;
+                position = _align(position) + buffer.len();
+            }
+            Ok::<(), PyErr>(())
+        })?;
+    }
+    writer
+        .flush()
+        .map_err(|e| PyIOError::new_err(e.to_string()))
+}
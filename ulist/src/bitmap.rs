@@ -0,0 +1,357 @@
+use std::cmp::min;
+use std::collections::HashSet;
+use std::iter::FromIterator;
+
+pub const WORD_BITS: usize = u64::BITS as usize;
+
+/// Number of words needed to store `len` bits.
+pub fn _n_words(len: usize) -> usize {
+    (len + WORD_BITS - 1) / WORD_BITS
+}
+
+/// Mask of the bits in use of the last word of a bitmap with `len` bits.
+pub fn _tail_mask(len: usize) -> u64 {
+    match len % WORD_BITS {
+        0 => u64::MAX,
+        r => (1 << r) - 1,
+    }
+}
+
+/// Packed bitmap with one bit per element, 64 elements per word.
+///
+/// The lists use it as the validity mask, a set bit means the element is
+/// valid and an unset bit means the element is a missing value. The bits
+/// beyond `len` in the last word are always unset.
+#[derive(Clone, Debug, Default, PartialEq, Eq)]
+pub struct Bitmap {
+    _words: Vec<u64>,
+    _len: usize,
+}
+
+impl Bitmap {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn new(len: usize, value: bool) -> Self {
+        let word = if value { u64::MAX } else { 0 };
+        let mut result = Bitmap {
+            _words: vec![word; _n_words(len)],
+            _len: len,
+        };
+        result._clear_tail();
+        result
+    }
+
+    fn _clear_tail(&mut self) {
+        let mask = _tail_mask(self._len);
+        if let Some(last) = self._words.last_mut() {
+            *last &= mask;
+        }
+    }
+
+    pub fn all(&self) -> bool {
+        match self._words.split_last() {
+            None => true,
+            Some((last, words)) => {
+                words.iter().all(|&w| w == u64::MAX) && *last == _tail_mask(self._len)
+            }
+        }
+    }
+
+    pub fn and(&self, other: &Self) -> Self {
+        debug_assert_eq!(self._len, other._len);
+        let words = self
+            ._words
+            .iter()
+            .zip(other._words.iter())
+            .map(|(x, y)| x & y)
+            .collect();
+        Bitmap {
+            _words: words,
+            _len: self._len,
+        }
+    }
+
+    /// Unset the bits of self which are unset in `other`, in place.
+    pub fn and_assign(&mut self, other: &Self) {
+        debug_assert_eq!(self._len, other._len);
+        for (x, y) in self._words.iter_mut().zip(other._words.iter()) {
+            *x &= y;
+        }
+    }
+
+    pub fn any(&self) -> bool {
+        self._words.iter().any(|&w| w != 0)
+    }
+
+    /// Overwrite self with the bits of `other`, which reuses the words of
+    /// self instead of allocating when they are long enough.
+    pub fn copy_from(&mut self, other: &Self) {
+        self._words.clear();
+        self._words.extend_from_slice(&other._words);
+        self._len = other._len;
+    }
+
+    pub fn count_ones(&self) -> usize {
+        self._words.iter().map(|w| w.count_ones() as usize).sum()
+    }
+
+    pub fn count_zeros(&self) -> usize {
+        self._len - self.count_ones()
+    }
+
+    /// Append the bits of `other` to the end of self.
+    pub fn extend(&mut self, other: &Self) {
+        let shift = self._len % WORD_BITS;
+        if shift == 0 {
+            self._words.extend_from_slice(&other._words);
+        } else {
+            for &word in other._words.iter() {
+                if let Some(last) = self._words.last_mut() {
+                    *last |= word << shift;
+                }
+                self._words.push(word >> (WORD_BITS - shift));
+            }
+        }
+        self._len += other._len;
+        self._words.truncate(_n_words(self._len));
+    }
+
+    /// Pack the bits of `func(0), func(1), ..., func(len - 1)`, one word at
+    /// a time.
+    pub fn from_fn(len: usize, func: impl Fn(usize) -> bool) -> Self {
+        let mut words = Vec::with_capacity(_n_words(len));
+        let mut start = 0;
+        while start < len {
+            let end = min(start + WORD_BITS, len);
+            let word = (start..end).fold(0, |acc, i| acc | ((func(i) as u64) << (i - start)));
+            words.push(word);
+            start = end;
+        }
+        Bitmap {
+            _words: words,
+            _len: len,
+        }
+    }
+
+    /// Validity mask of `len` elements, with the bits of `na_indexes` unset.
+    /// The indexes out of range are ignored.
+    pub fn from_na_indexes(len: usize, na_indexes: &HashSet<usize>) -> Self {
+        let mut result = Bitmap::new(len, true);
+        for &i in na_indexes.iter().filter(|&&i| i < len) {
+            result.set(i, false);
+        }
+        result
+    }
+
+    /// Pack the bits of `func(x)` for the elements `x` of `vec`, one word
+    /// at a time.
+    pub fn from_slice<T>(vec: &[T], func: impl Fn(&T) -> bool) -> Self {
+        let words = vec
+            .chunks(WORD_BITS)
+            .map(|chunk| {
+                chunk
+                    .iter()
+                    .enumerate()
+                    .fold(0, |acc, (i, x)| acc | ((func(x) as u64) << i))
+            })
+            .collect();
+        Bitmap {
+            _words: words,
+            _len: vec.len(),
+        }
+    }
+
+    pub fn from_words(words: Vec<u64>, len: usize) -> Self {
+        debug_assert_eq!(words.len(), _n_words(len));
+        let mut result = Bitmap {
+            _words: words,
+            _len: len,
+        };
+        result._clear_tail();
+        result
+    }
+
+    pub fn get(&self, index: usize) -> bool {
+        debug_assert!(index < self._len);
+        (self._words[index / WORD_BITS] >> (index % WORD_BITS)) & 1 == 1
+    }
+
+    pub fn iter(&self) -> impl Iterator<Item = bool> + '_ {
+        (0..self._len).map(move |i| self.get(i))
+    }
+
+    /// Positions of the set bits in ascending order.
+    pub fn iter_ones(&self) -> impl Iterator<Item = usize> + '_ {
+        self._words
+            .iter()
+            .enumerate()
+            .flat_map(|(i, &word)| _BitPositions {
+                word,
+                offset: i * WORD_BITS,
+            })
+    }
+
+    /// Positions of the unset bits in ascending order.
+    pub fn iter_zeros(&self) -> impl Iterator<Item = usize> + '_ {
+        let n = self._words.len();
+        self._words.iter().enumerate().flat_map(move |(i, &word)| {
+            let mask = if i + 1 == n {
+                _tail_mask(self._len)
+            } else {
+                u64::MAX
+            };
+            _BitPositions {
+                word: !word & mask,
+                offset: i * WORD_BITS,
+            }
+        })
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self._len == 0
+    }
+
+    pub fn len(&self) -> usize {
+        self._len
+    }
+
+    pub fn not(&self) -> Self {
+        let mut result = Bitmap {
+            _words: self._words.iter().map(|w| !w).collect(),
+            _len: self._len,
+        };
+        result._clear_tail();
+        result
+    }
+
+    pub fn or(&self, other: &Self) -> Self {
+        debug_assert_eq!(self._len, other._len);
+        let words = self
+            ._words
+            .iter()
+            .zip(other._words.iter())
+            .map(|(x, y)| x | y)
+            .collect();
+        Bitmap {
+            _words: words,
+            _len: self._len,
+        }
+    }
+
+    pub fn pop(&mut self) -> Option<bool> {
+        if self._len == 0 {
+            return None;
+        }
+        let value = self.get(self._len - 1);
+        self._len -= 1;
+        self._words.truncate(_n_words(self._len));
+        self._clear_tail();
+        Some(value)
+    }
+
+    pub fn push(&mut self, value: bool) {
+        let shift = self._len % WORD_BITS;
+        if shift == 0 {
+            self._words.push(0);
+        }
+        if value {
+            if let Some(last) = self._words.last_mut() {
+                *last |= 1 << shift;
+            }
+        }
+        self._len += 1;
+    }
+
+    pub fn set(&mut self, index: usize, value: bool) {
+        debug_assert!(index < self._len);
+        let word = &mut self._words[index / WORD_BITS];
+        let bit = 1 << (index % WORD_BITS);
+        if value {
+            *word |= bit;
+        } else {
+            *word &= !bit;
+        }
+    }
+
+    pub fn set_all(&mut self, value: bool) {
+        let word = if value { u64::MAX } else { 0 };
+        for w in self._words.iter_mut() {
+            *w = word;
+        }
+        self._clear_tail();
+    }
+
+    /// Copy of the bits in `start..end`, which are shifted a word at a time.
+    pub fn slice(&self, start: usize, end: usize) -> Self {
+        debug_assert!(start <= end && end <= self._len);
+        let len = end - start;
+        let first = start / WORD_BITS;
+        let shift = start % WORD_BITS;
+        let words = (first..(first + _n_words(len)))
+            .map(|i| {
+                let word = self._words[i] >> shift;
+                match self._words.get(i + 1) {
+                    Some(next) if shift > 0 => word | (next << (WORD_BITS - shift)),
+                    _ => word,
+                }
+            })
+            .collect();
+        Bitmap::from_words(words, len)
+    }
+
+    /// The bits packed LSB first into `(len + 7) / 8` bytes, which is the
+    /// layout of the Arrow validity bitmap.
+    pub fn to_bytes(&self) -> Vec<u8> {
+        let mut result: Vec<u8> = self._words.iter().flat_map(|w| w.to_le_bytes()).collect();
+        result.truncate((self._len + 7) / 8);
+        result
+    }
+
+    pub fn with_capacity(capacity: usize) -> Self {
+        Bitmap {
+            _words: Vec::with_capacity(_n_words(capacity)),
+            _len: 0,
+        }
+    }
+
+    pub fn words(&self) -> &[u64] {
+        &self._words
+    }
+
+    /// The words to overwrite, where the bits beyond `len` should be kept
+    /// unset.
+    pub fn words_mut(&mut self) -> &mut [u64] {
+        &mut self._words
+    }
+}
+
+impl FromIterator<bool> for Bitmap {
+    fn from_iter<I: IntoIterator<Item = bool>>(iter: I) -> Self {
+        let iter = iter.into_iter();
+        let mut result = Bitmap::with_capacity(iter.size_hint().0);
+        for value in iter {
+            result.push(value);
+        }
+        result
+    }
+}
+
+/// Iterator over the positions of the set bits of a single word.
+struct _BitPositions {
+    word: u64,
+    offset: usize,
+}
+
+impl Iterator for _BitPositions {
+    type Item = usize;
+
+    fn next(&mut self) -> Option<usize> {
+        if self.word == 0 {
+            return None;
+        }
+        let i = self.word.trailing_zeros() as usize;
+        // Unset the lowest set bit.
+        self.word &= self.word - 1;
+        Some(self.offset + i)
+    }
+}
@@ -1,31 +1,52 @@
+use crate::arrow::to_capsules;
+use crate::arrow::ArrowExport;
 use crate::base::List;
-use crate::base::_fill_na;
+use crate::base::_check_range;
+use crate::base::_flatten_bits;
+use crate::bitmap::Bitmap;
+use crate::export::fill_view;
+use crate::export::release_view;
+use crate::export::Exports;
 use crate::floatings::FloatList32;
 use crate::floatings::FloatList64;
 use crate::index::IndexList;
 use crate::integers::IntegerList32;
 use crate::integers::IntegerList64;
-use crate::non_float::NonFloatList;
+use crate::parallel;
+use crate::shared::Shared;
 use crate::string::StringList;
 use crate::types::AsFloatList32;
 use crate::types::AsFloatList64;
 use crate::types::AsIntegerList32;
 use crate::types::AsIntegerList64;
 use crate::types::AsStringList;
+use pyo3::exceptions::PyBufferError;
+use pyo3::exceptions::PyIndexError;
+use pyo3::exceptions::PyRuntimeError;
+use pyo3::exceptions::PyValueError;
+use pyo3::ffi;
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use pyo3::AsPyPointer;
+use rand::distributions::Uniform;
+use rand::Rng;
 use std::cell::Ref;
-use std::cell::RefCell;
 use std::cell::RefMut;
 use std::collections::HashMap;
 use std::collections::HashSet;
 use std::ops::Fn;
-use std::cmp::max;
+use std::os::raw::c_int;
+use std::os::raw::c_void;
+use std::ptr;
+use std::slice;
 
-/// List with boolean type elements.
+/// List with boolean type elements, the elements are bit-packed 64 per word.
+/// The bits of the missing values are always unset.
 #[pyclass]
 pub struct BooleanList {
-    _values: RefCell<Vec<bool>>,
-    _na_indexes: RefCell<HashSet<usize>>,
+    _values: Shared<Bitmap>,
+    _validity: Shared<Bitmap>,
+    _exports: Exports,
 }
 
 #[pymethods]
@@ -34,285 +55,592 @@ impl BooleanList {
 
     #[new]
     pub fn new(vec: Vec<bool>, hset: HashSet<usize>) -> Self {
-        List::_new(vec, hset)
+        let validity = Bitmap::from_na_indexes(vec.len(), &hset);
+        let values = Bitmap::from_slice(&vec, |&x| x).and(&validity);
+        BooleanList::_new(values, validity)
+    }
+
+    /// Export the packed values as read-only bytes, LSB first, which is the
+    /// layout of the Arrow boolean array.
+    unsafe fn __getbuffer__(
+        slf: PyRef<Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        if cfg!(target_endian = "big") {
+            return Err(PyBufferError::new_err(
+                "The packed values can only be exported on little-endian targets!",
+            ));
+        }
+        {
+            let values = slf.values();
+            // The words are little-endian, so that their bytes are LSB first.
+            let bytes =
+                slice::from_raw_parts(values.words().as_ptr() as *const u8, (values.len() + 7) / 8);
+            fill_view(view, slf.as_ptr(), bytes, flags)?;
+        }
+        slf._exports.acquire();
+        Ok(())
+    }
+
+    unsafe fn __releasebuffer__(&self, view: *mut ffi::Py_buffer) {
+        release_view(view);
+        self._exports.release();
+    }
+
+    pub fn all(&self, py: Python) -> Option<bool> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let values = list.values();
+            let validity = list.validity();
+            // Any valid false element decides the result.
+            let has_false = values
+                .words()
+                .iter()
+                .zip(validity.words().iter())
+                .any(|(&x, &v)| v & !x != 0);
+            if has_false {
+                Some(false)
+            } else if validity.all() {
+                Some(true)
+            } else {
+                None
+            }
+        })
     }
 
-    pub fn all(&self) -> Option<bool> {
-        let hset = self.na_indexes();
-        let mut result = Some(true);
-        for (i, x) in self.values().iter().enumerate() {
-            if hset.contains(&i) {
-                result = None;
-            } else if !x {
+    pub fn all_equal(&self, other: &Self, py: Python) -> Option<bool> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || {
+            if list.size() != other.size() {
                 return Some(false);
             }
-        }
-        result
+            let validity = list.validity().and(&other.validity());
+            let has_diff = list
+                .values()
+                .words()
+                .iter()
+                .zip(other.values().words().iter())
+                .zip(validity.words().iter())
+                .any(|((&x1, &x2), &v)| (x1 ^ x2) & v != 0);
+            if has_diff {
+                Some(false)
+            } else if validity.all() {
+                Some(true)
+            } else {
+                None
+            }
+        })
     }
 
-    pub fn all_equal(&self, other: &Self) -> Option<bool> {
-        List::all_equal(self, other)
+    pub fn and_(&self, other: &Self, py: Python) -> PyResult<Self> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || _logical_operate(&list, &other, _and_words))
     }
 
-    pub fn and_(&self, other: &Self) -> PyResult<Self> {
-        self._check_len_eq(other)?;
-        let hset1 = self.na_indexes();
-        let hset2 = other.na_indexes();
-        let mut hset: HashSet<usize> = HashSet::with_capacity(max(hset1.len(), hset2.len()));
-        let vec = self
-            .values()
-            .iter()
-            .zip(other.values().iter())
-            .enumerate()
-            .map(|(i, (x1, x2))| {
-                if hset1.contains(&i) {
-                    if hset2.contains(&i) | *x2 {
-                        hset.insert(i);
-                        false
-                    } else {
-                        false
-                    }
-                } else if hset2.contains(&i) {
-                    if *x1 {
-                        hset.insert(i);
-                        false
-                    } else {
-                        false
-                    }
-                } else {
-                    *x1 & *x2
-                }
-            })
-            .collect();
-        hset.shrink_to_fit();
-        Ok(BooleanList::new(vec, hset))
-    }
-
-    pub fn any(&self) -> Option<bool> {
-        let hset = self.na_indexes();
-        let mut result = Some(false);
-        for (i, x) in self.values().iter().enumerate() {
-            if hset.contains(&i) {
-                result = None;
-            } else if *x {
-                return Some(true);
+    pub fn any(&self, py: Python) -> Option<bool> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            // Any valid true element decides the result.
+            if list.values().any() {
+                Some(true)
+            } else if list.validity().all() {
+                Some(false)
+            } else {
+                None
             }
-        }
-        result
+        })
     }
 
-    pub fn append(&self, elem: Option<bool>) {
-        List::append(self, elem)
+    pub fn append(&self, elem: Option<bool>) -> PyResult<()> {
+        self._exports.check()?;
+        self.values_mut().push(elem.unwrap_or(false));
+        self.validity_mut().push(elem.is_some());
+        Ok(())
     }
 
-    pub fn as_float32(&self) -> FloatList32 {
-        AsFloatList32::as_float32(self)
+    pub fn as_float32(&self, py: Python) -> FloatList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList32::as_float32(&list))
     }
 
-    pub fn as_float64(&self) -> FloatList64 {
-        AsFloatList64::as_float64(self)
+    pub fn as_float64(&self, py: Python) -> FloatList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList64::as_float64(&list))
     }
 
-    pub fn as_int32(&self) -> IntegerList32 {
-        AsIntegerList32::as_int32(self)
+    pub fn as_int32(&self, py: Python) -> IntegerList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList32::as_int32(&list))
     }
 
-    pub fn as_int64(&self) -> IntegerList64 {
-        AsIntegerList64::as_int64(self)
+    pub fn as_int64(&self, py: Python) -> IntegerList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList64::as_int64(&list))
     }
 
-    pub fn as_str(&self) -> StringList {
-        AsStringList::as_str(self)
+    pub fn as_str(&self, py: Python) -> StringList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsStringList::as_str(&list))
     }
 
     pub fn copy(&self) -> Self {
-        List::copy(self)
+        Self {
+            _values: self._values.share(),
+            _validity: self._validity.share(),
+            _exports: Exports::default(),
+        }
     }
 
     pub fn count_na(&self) -> usize {
-        List::count_na(self)
-    }
-
-    pub fn counter(&self) -> HashMap<bool, usize> {
-        NonFloatList::counter(self)
+        self._validity
+            .with_chunks(|x| x.iter().map(|x| x.count_zeros()).sum())
+    }
+
+    pub fn counter(&self, py: Python) -> HashMap<bool, usize> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let n_true = list.values().count_ones();
+            let n_false = list.size() - n_true - list.count_na();
+            let mut result = HashMap::new();
+            if n_true > 0 {
+                result.insert(true, n_true);
+            }
+            if n_false > 0 {
+                result.insert(false, n_false);
+            }
+            result
+        })
     }
 
     #[staticmethod]
     pub fn choices(vec: Vec<bool>, size: usize) -> Self {
-        List::choices(&vec, size)
+        let dist: Uniform<usize> = Uniform::from(0..vec.len());
+        let values: Bitmap = rand::thread_rng()
+            .sample_iter(dist)
+            .map(|x| unsafe { *vec.get_unchecked(x) })
+            .take(size)
+            .collect();
+        BooleanList::_new(values, Bitmap::new(size, true))
     }
 
     #[staticmethod]
     pub fn cycle(vec: Vec<bool>, size: usize) -> Self {
-        List::cycle(&vec, size)
+        let values: Bitmap = vec.iter().cycle().take(size).copied().collect();
+        BooleanList::_new(values, Bitmap::new(size, true))
+    }
+
+    pub fn equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || {
+            _logical_operate(&list, &other, |x1, v1, x2, v2| (!(x1 ^ x2), v1 & v2))
+        })
+    }
+
+    pub fn equal_scala(&self, elem: bool, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let validity = list.validity().clone();
+            let values = if elem {
+                list.values().clone()
+            } else {
+                list.values().not().and(&validity)
+            };
+            BooleanList::_new(values, validity)
+        })
+    }
+
+    pub fn filter(&self, condition: &BooleanList, py: Python) -> PyResult<Self> {
+        let (list, condition) = (self._snapshot(), condition._snapshot());
+        py.allow_threads(move || {
+            list._check_len_eq(&condition)?;
+            let cond = condition.values();
+            let self_values = list.values();
+            let self_validity = list.validity();
+            let values: Bitmap = cond.iter_ones().map(|i| self_values.get(i)).collect();
+            let validity: Bitmap = cond.iter_ones().map(|i| self_validity.get(i)).collect();
+            Ok(BooleanList::_new(values, validity))
+        })
     }
 
-    pub fn equal(&self, other: &Self) -> PyResult<BooleanList> {
-        List::equal(self, other)
+    pub fn get(&self, index: usize) -> PyResult<Option<bool>> {
+        if index >= self.size() {
+            Err(PyIndexError::new_err("Index out of range!"))
+        } else if self._validity.with_chunk_of(index, |x, j| x.get(j)) {
+            Ok(Some(self._values.with_chunk_of(index, |x, j| x.get(j))))
+        } else {
+            Ok(None)
+        }
     }
 
-    pub fn equal_scala(&self, elem: bool) -> BooleanList {
-        List::equal_scala(self, elem)
+    pub fn get_by_indexes(&self, indexes: &IndexList, py: Python) -> PyResult<Self> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            if indexes.back() >= list.size() {
+                return Err(PyIndexError::new_err("Index out of range!"));
+            }
+            let self_values = list.values();
+            let self_validity = list.validity();
+            let values: Bitmap = indexes
+                .values()
+                .iter()
+                .map(|&i| self_values.get(i))
+                .collect();
+            let validity: Bitmap = indexes
+                .values()
+                .iter()
+                .map(|&i| self_validity.get(i))
+                .collect();
+            Ok(BooleanList::_new(values, validity))
+        })
     }
 
-    pub fn filter(&self, condition: &BooleanList) -> PyResult<Self> {
-        List::filter(self, condition)
+    pub fn n_chunks(&self) -> usize {
+        self._values.n_chunks()
     }
 
-    pub fn get(&self, index: usize) -> PyResult<Option<bool>> {
-        List::get(self, index)
+    pub fn not_(&self, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let validity = list.validity().clone();
+            let values = list.values().not().and(&validity);
+            BooleanList::_new(values, validity)
+        })
     }
 
-    pub fn get_by_indexes(&self, indexes: &IndexList) -> PyResult<Self> {
-        List::get_by_indexes(self, indexes)
+    pub fn not_equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || {
+            _logical_operate(&list, &other, |x1, v1, x2, v2| (x1 ^ x2, v1 & v2))
+        })
     }
 
-    pub fn not_(&self) -> Self {
-        let mut vec: Vec<_> = self.values().iter().map(|&x| !x).collect();
-        _fill_na(&mut vec, self.na_indexes(), false);
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+    pub fn not_equal_scala(&self, elem: bool, py: Python) -> BooleanList {
+        self.equal_scala(!elem, py)
     }
 
-    pub fn not_equal(&self, other: &Self) -> PyResult<BooleanList> {
-        List::not_equal(self, other)
+    pub fn or_(&self, other: &Self, py: Python) -> PyResult<Self> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || _logical_operate(&list, &other, _or_words))
     }
 
-    pub fn not_equal_scala(&self, elem: bool) -> BooleanList {
-        List::not_equal_scala(self, elem)
+    pub fn pop(&self) -> PyResult<()> {
+        self._exports.check()?;
+        self.values_mut().pop();
+        self.validity_mut().pop();
+        Ok(())
     }
 
-    pub fn or_(&self, other: &Self) -> PyResult<Self> {
-        self._check_len_eq(other)?;
-        let hset1 = self.na_indexes();
-        let hset2 = other.na_indexes();
-        let mut hset: HashSet<usize> = HashSet::with_capacity(max(hset1.len(), hset2.len()));
-        let vec = self
-            .values()
-            .iter()
-            .zip(other.values().iter())
-            .enumerate()
-            .map(|(i, (x1, x2))| {
-                if hset1.contains(&i) {
-                    if hset2.contains(&i) | !*x2 {
-                        hset.insert(i);
-                        false
-                    } else {
-                        true
-                    }
-                } else if hset2.contains(&i) {
-                    if *x1 {
-                        true
-                    } else {
-                        hset.insert(i);
-                        false
-                    }
-                } else {
-                    *x1 | *x2
-                }
-            })
-            .collect();
-        hset.shrink_to_fit();
-        Ok(BooleanList::new(vec, hset))
-    }
-
-    pub fn pop(&self) {
-        List::pop(self);
+    pub fn rechunk(&self) {
+        self._values.rechunk();
+        self._validity.rechunk();
     }
 
     #[staticmethod]
     pub fn repeat(elem: bool, size: usize) -> Self {
-        List::repeat(elem, size)
-    }
-
-    pub fn replace(&self, old: Option<bool>, new: Option<bool>) {
-        List::replace(self, old, new)
+        BooleanList::_new(Bitmap::new(size, elem), Bitmap::new(size, true))
+    }
+
+    pub fn replace(&self, old: Option<bool>, new: Option<bool>) -> PyResult<()> {
+        self._exports.check()?;
+        let mut values = self.values_mut();
+        let mut validity = self.validity_mut();
+        match (old, new) {
+            (Some(_old), Some(_new)) => {
+                if _old != _new {
+                    // All the valid elements are `old`, replace them by `new`.
+                    *values = if _new {
+                        validity.clone()
+                    } else {
+                        Bitmap::new(values.len(), false)
+                    };
+                }
+            }
+            (Some(_old), None) => {
+                let matched = if _old {
+                    values.clone()
+                } else {
+                    values.not().and(&validity)
+                };
+                *validity = validity.and(&matched.not());
+                *values = values.and(&validity);
+            }
+            (None, Some(_new)) => {
+                if _new {
+                    *values = values.or(&validity.not());
+                }
+                validity.set_all(true);
+            }
+            (None, None) => {}
+        }
+        Ok(())
     }
 
     pub fn set(&self, index: usize, elem: Option<bool>) -> PyResult<()> {
-        List::set(self, index, elem)
+        self._exports.check()?;
+        if index >= self.size() {
+            return Err(PyIndexError::new_err("Index out of range!"));
+        }
+        self.values_mut().set(index, elem.unwrap_or(false));
+        self.validity_mut().set(index, elem.is_some());
+        Ok(())
     }
 
     pub fn size(&self) -> usize {
-        List::size(self)
+        self._values.len()
+    }
+
+    pub fn slice(&self, start: usize, end: usize) -> PyResult<Self> {
+        _check_range(start, end, self.size())?;
+        Ok(BooleanList::_new(
+            self.values().slice(start, end),
+            self.validity().slice(start, end),
+        ))
+    }
+
+    pub fn sort(&self, ascending: bool, py: Python) -> PyResult<()> {
+        self._exports.check()?;
+        // Sort a snapshot while the GIL is released, then take its buffers.
+        let snapshot = self._snapshot();
+        let list = snapshot._snapshot();
+        let mut list = py.allow_threads(move || list._sorted(ascending));
+        // Self may be modified by another thread meanwhile, which replaces
+        // the buffers shared with the snapshot. Then it is sorted again
+        // with the GIL held, so that the modification is not lost.
+        if !(ptr::eq(&*self.values(), &*snapshot.values())
+            && ptr::eq(&*self.validity(), &*snapshot.validity()))
+        {
+            list = self._snapshot()._sorted(ascending);
+        }
+        // The buffers may be exported by another thread meanwhile.
+        self._exports.check()?;
+        self._values.replace(list._values);
+        self._validity.replace(list._validity);
+        Ok(())
     }
 
-    pub fn sort(&self, ascending: bool) {
-        NonFloatList::sort(self, ascending)
+    pub fn sum(&self, py: Python) -> i32 {
+        let list = self._snapshot();
+        py.allow_threads(move || list.values().count_ones() as i32)
     }
 
-    pub fn sum(&self) -> i32 {
-        self.values().iter().map(|&x| if x { 1 } else { 0 }).sum()
+    pub fn to_arrow_c(slf: PyRef<Self>, py: Python) -> PyResult<(PyObject, PyObject)> {
+        // The words are little-endian, so that the bits are LSB first.
+        let values = slf.values().words().as_ptr() as *const c_void;
+        let export = ArrowExport::new("b", &slf.validity(), vec![values]);
+        let guard = slf._exports.guard();
+        to_capsules(py, slf.into_py(py), guard, export)
     }
 
-    pub fn to_index(&self) -> IndexList {
-        let vec = self
-            .values()
-            .iter()
-            .enumerate()
-            .filter(|(_, y)| **y)
-            .map(|(x, _)| x)
-            .collect();
-        IndexList::new(vec)
+    pub fn to_index(&self, py: Python) -> IndexList {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let vec = list.values().iter_ones().collect();
+            IndexList::new(vec)
+        })
     }
 
     pub fn to_list(&self) -> Vec<Option<bool>> {
-        List::to_list(self)
+        self._values.with_chunks(|values| {
+            self._validity.with_chunks(|validity| {
+                _flatten_bits(values)
+                    .zip(_flatten_bits(validity))
+                    .map(|(x, valid)| if valid { Some(x) } else { None })
+                    .collect()
+            })
+        })
     }
 
     pub fn union_all(&self, other: &Self) -> Self {
-        List::union_all(self, other)
+        Self {
+            _values: self._values.concat(&other._values),
+            _validity: self._validity.concat(&other._validity),
+            _exports: Exports::default(),
+        }
     }
 
-    pub fn unique(&self) -> Self {
-        NonFloatList::unique(self)
+    pub fn unique(&self, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let n_true = list.values().count_ones();
+            let n_na = list.count_na();
+            let n_false = list.size() - n_true - n_na;
+            // The unique values are sorted, and the na value is the last one.
+            let mut values = Bitmap::with_capacity(3);
+            let mut validity = Bitmap::with_capacity(3);
+            for (value, count) in [(false, n_false), (true, n_true)].iter() {
+                if *count > 0 {
+                    values.push(*value);
+                    validity.push(true);
+                }
+            }
+            if n_na > 0 {
+                values.push(false);
+                validity.push(false);
+            }
+            BooleanList::_new(values, validity)
+        })
+    }
+
+    pub fn validity_buffer(&self, py: Python) -> PyObject {
+        PyBytes::new(py, &self.validity().to_bytes()).into_py(py)
     }
 }
 
-impl List<bool> for BooleanList {
-    fn _new(vec: Vec<bool>, hset: HashSet<usize>) -> Self {
+impl BooleanList {
+    // Arrange the following methods in alphabetical order.
+
+    /// The bits of `values` should be unset where `validity` is unset.
+    pub fn _new(values: Bitmap, validity: Bitmap) -> Self {
+        debug_assert_eq!(values.len(), validity.len());
         Self {
-            _values: RefCell::new(vec),
-            _na_indexes: RefCell::new(hset),
+            _values: Shared::new(values),
+            _validity: Shared::new(validity),
+            _exports: Exports::default(),
         }
     }
 
-    fn na_indexes(&self) -> Ref<HashSet<usize>> {
-        self._na_indexes.borrow()
+    /// Raise if the buffers are exported, which the numerical lists check
+    /// before they write the results of the comparisons to self.
+    pub fn _check_exports(&self) -> PyResult<()> {
+        self._exports.check()
     }
 
-    fn na_indexes_mut(&self) -> RefMut<HashSet<usize>> {
-        self._na_indexes.borrow_mut()
+    pub fn _check_len_eq(&self, other: &Self) -> PyResult<()> {
+        if self.size() != other.size() {
+            Err(PyRuntimeError::new_err(
+                "The sizes of `self` and `other` should be equal!",
+            ))
+        } else {
+            Ok(())
+        }
     }
 
-    fn na_value(&self) -> bool {
-        false
+    /// Copy of self to run a kernel on while the GIL is released, see
+    /// `List::_snapshot`.
+    pub fn _snapshot(&self) -> Self {
+        self.rechunk();
+        self.copy()
     }
 
-    fn values(&self) -> Ref<Vec<bool>> {
+    /// Sort self, which is a snapshot of a list.
+    fn _sorted(self, ascending: bool) -> Self {
+        let n = self.size();
+        let n_true = self.values().count_ones();
+        let n_valid = n - self.count_na();
+        let n_false = n_valid - n_true;
+        // Put all the na elements to the right side.
+        *self.values_mut() = if ascending {
+            Bitmap::from_fn(n, |i| n_false <= i && i < n_valid)
+        } else {
+            Bitmap::from_fn(n, |i| i < n_true)
+        };
+        *self.validity_mut() = Bitmap::from_fn(n, |i| i < n_valid);
+        self
+    }
+
+    pub fn validity(&self) -> Ref<Bitmap> {
+        self._validity.borrow()
+    }
+
+    pub fn validity_mut(&self) -> RefMut<Bitmap> {
+        self._validity.borrow_mut()
+    }
+
+    pub fn values(&self) -> Ref<Bitmap> {
         self._values.borrow()
     }
 
-    fn values_mut(&self) -> RefMut<Vec<bool>> {
+    pub fn values_mut(&self) -> RefMut<Bitmap> {
         self._values.borrow_mut()
     }
 }
 
-impl NonFloatList<bool> for BooleanList {}
+/// Kleene conjunction of the value and validity words of both sides.
+fn _and_words(x1: u64, v1: u64, x2: u64, v2: u64) -> (u64, u64) {
+    // A missing value is unknown, so that `NA & false` is false.
+    let valid = (v1 & v2) | (v1 & !x1) | (v2 & !x2);
+    (x1 & x2, valid)
+}
+
+/// Kleene disjunction of the value and validity words of both sides.
+fn _or_words(x1: u64, v1: u64, x2: u64, v2: u64) -> (u64, u64) {
+    // A missing value is unknown, so that `NA | true` is true.
+    let valid = (v1 & v2) | x1 | x2;
+    (x1 | x2, valid)
+}
 
+/// Combine `this` and `other` word by word, `func` takes the value and
+/// validity words of both sides and returns the value and validity words
+/// of the result.
 fn _logical_operate(
     this: &BooleanList,
     other: &BooleanList,
-    func: impl Fn(bool, bool) -> bool,
+    func: impl Fn(u64, u64, u64, u64) -> (u64, u64) + Send + Sync,
 ) -> PyResult<BooleanList> {
-    this._check_len_eq(other)?;
-    let vec = this
-        .values()
+    _logical_fold(&[this, other], func)
+}
+
+/// Combine all the lists word by word in one pass, `func` folds the value
+/// and validity words of the next list into those of the result. The words
+/// of all the lists at the same position are visited together, so that no
+/// intermediate list is allocated.
+fn _logical_fold(
+    lists: &[&BooleanList],
+    func: impl Fn(u64, u64, u64, u64) -> (u64, u64) + Send + Sync,
+) -> PyResult<BooleanList> {
+    let first = match lists.first() {
+        Some(first) => first,
+        None => {
+            return Err(PyValueError::new_err(
+                "Parameter `lists` should not be empty!",
+            ))
+        }
+    };
+    for list in lists.iter() {
+        first._check_len_eq(list)?;
+    }
+    let values: Vec<Ref<Bitmap>> = lists.iter().map(|x| x.values()).collect();
+    let validity: Vec<Ref<Bitmap>> = lists.iter().map(|x| x.validity()).collect();
+    let words: Vec<(&[u64], &[u64])> = values
         .iter()
-        .zip(other.values().iter())
-        .map(|(&x, &y)| func(x, y))
+        .zip(validity.iter())
+        .map(|(x, v)| (x.words(), v.words()))
         .collect();
-    Ok(BooleanList::new(vec, HashSet::new()))
+    let (values, validity) = parallel::unzip_words(first.size(), |k| {
+        let (x, v) = words[1..]
+            .iter()
+            .fold((words[0].0[k], words[0].1[k]), |(x1, v1), (x2, v2)| {
+                func(x1, v1, x2[k], v2[k])
+            });
+        (x & v, v)
+    });
+    Ok(BooleanList::_new(values, validity))
+}
+
+/// Snapshots of the lists, to combine them while the GIL is released.
+fn _snapshots(py: Python, lists: &[Py<BooleanList>]) -> Vec<BooleanList> {
+    lists.iter().map(|x| x.borrow(py)._snapshot()).collect()
+}
+
+/// Kleene conjunction of all the lists, computed in one pass.
+#[pyfunction]
+pub fn all_of(py: Python, lists: Vec<Py<BooleanList>>) -> PyResult<BooleanList> {
+    let lists = _snapshots(py, &lists);
+    py.allow_threads(move || {
+        let refs: Vec<&BooleanList> = lists.iter().collect();
+        _logical_fold(&refs, _and_words)
+    })
+}
+
+/// Kleene disjunction of all the lists, computed in one pass.
+#[pyfunction]
+pub fn any_of(py: Python, lists: Vec<Py<BooleanList>>) -> PyResult<BooleanList> {
+    let lists = _snapshots(py, &lists);
+    py.allow_threads(move || {
+        let refs: Vec<&BooleanList> = lists.iter().collect();
+        _logical_fold(&refs, _or_words)
+    })
 }
 
 impl AsFloatList32 for BooleanList {
@@ -320,10 +648,10 @@ impl AsFloatList32 for BooleanList {
         let vec = self
             .values()
             .iter()
-            .map(|&x| if x { 1.0 } else { 0.0 })
+            .map(|x| if x { 1.0 } else { 0.0 })
             .collect();
-        let hset = self.na_indexes().clone();
-        FloatList32::new(vec, hset)
+        let validity = self.validity().clone();
+        FloatList32::_new(vec, validity)
     }
 }
 
@@ -332,10 +660,10 @@ impl AsFloatList64 for BooleanList {
         let vec = self
             .values()
             .iter()
-            .map(|&x| if x { 1.0 } else { 0.0 })
+            .map(|x| if x { 1.0 } else { 0.0 })
             .collect();
-        let hset = self.na_indexes().clone();
-        FloatList64::new(vec, hset)
+        let validity = self.validity().clone();
+        FloatList64::_new(vec, validity)
     }
 }
 
@@ -344,10 +672,10 @@ impl AsIntegerList32 for BooleanList {
         let vec = self
             .values()
             .iter()
-            .map(|&x| if x { 1 } else { 0 })
+            .map(|x| if x { 1 } else { 0 })
             .collect();
-        let hset = self.na_indexes().clone();
-        IntegerList32::new(vec, hset)
+        let validity = self.validity().clone();
+        IntegerList32::_new(vec, validity)
     }
 }
 
@@ -356,17 +684,17 @@ impl AsIntegerList64 for BooleanList {
         let vec = self
             .values()
             .iter()
-            .map(|&x| if x { 1 } else { 0 })
+            .map(|x| if x { 1 } else { 0 })
             .collect();
-        let hset = self.na_indexes().clone();
-        IntegerList64::new(vec, hset)
+        let validity = self.validity().clone();
+        IntegerList64::_new(vec, validity)
     }
 }
 
 impl AsStringList for BooleanList {
     fn as_str(&self) -> StringList {
-        let vec = self.values().iter().map(|&x| x.to_string()).collect();
-        let hset = self.na_indexes().clone();
-        StringList::new(vec, hset)
+        let vec = self.values().iter().map(|x| x.to_string()).collect();
+        let validity = self.validity().clone();
+        StringList::_new(vec, validity)
     }
 }
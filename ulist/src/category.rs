@@ -0,0 +1,738 @@
+use crate::arrow::to_capsules;
+use crate::arrow::ArrowExport;
+use crate::base::List;
+use crate::base::_check_range;
+use crate::base::_flatten;
+use crate::base::_flatten_bits;
+use crate::bitmap::Bitmap;
+use crate::boolean::BooleanList;
+use crate::export::Exports;
+use crate::floatings::FloatList32;
+use crate::floatings::FloatList64;
+use crate::index::IndexList;
+use crate::integers::IntegerList32;
+use crate::integers::IntegerList64;
+use crate::parallel;
+use crate::shared::Shared;
+use crate::shared::SharedVec;
+use crate::string::StringList;
+use crate::string_buffer::StringBuffer;
+use crate::types::AsBooleanList;
+use crate::types::AsFloatList32;
+use crate::types::AsFloatList64;
+use crate::types::AsIntegerList32;
+use crate::types::AsIntegerList64;
+use crate::types::AsStringList;
+use pyo3::exceptions::PyIndexError;
+use pyo3::exceptions::PyRuntimeError;
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use std::cell::Ref;
+use std::cell::RefCell;
+use std::cell::RefMut;
+use std::collections::HashMap;
+use std::collections::HashSet;
+use std::os::raw::c_void;
+use std::ptr;
+use std::sync::Arc;
+
+/// List with dictionary encoded string elements. Each element is stored as
+/// an integer code, which is the position of its value in the dictionary of
+/// distinct strings. The codes of the missing values are 0.
+#[pyclass]
+pub struct CategoryList {
+    _codes: SharedVec<u32>,
+    _dictionary: Shared<StringBuffer>,
+    // The codes of the dictionary values, which is built by the first lookup
+    // and shared with the handles of the same dictionary.
+    _index: RefCell<Option<Arc<HashMap<String, u32>>>>,
+    _validity: Shared<Bitmap>,
+    _exports: Exports,
+}
+
+#[pymethods]
+impl CategoryList {
+    // Arrange the following methods in alphabetical order.
+
+    #[new]
+    pub fn new(vec: Vec<String>, hset: HashSet<usize>) -> Self {
+        let validity = Bitmap::from_na_indexes(vec.len(), &hset);
+        CategoryList::_encode(vec.iter().map(|x| x.as_str()), validity)
+    }
+
+    pub fn all_equal(&self, other: &Self, py: Python) -> Option<bool> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || {
+            if list.size() != other.size() {
+                return Some(false);
+            }
+            let recode = list._recode(&other);
+            let codes1 = list.codes();
+            let codes2 = other.codes();
+            let validity = list.validity().and(&other.validity());
+            if validity
+                .iter_ones()
+                .any(|i| recode[codes2[i] as usize] != Some(codes1[i]))
+            {
+                Some(false)
+            } else if validity.all() {
+                Some(true)
+            } else {
+                None
+            }
+        })
+    }
+
+    pub fn append(&self, elem: Option<String>) -> PyResult<()> {
+        self._exports.check()?;
+        let code = match elem {
+            Some(ref x) => self._get_or_insert(x),
+            None => 0,
+        };
+        self.codes_mut().push(code);
+        self.validity_mut().push(elem.is_some());
+        Ok(())
+    }
+
+    pub fn as_bool(&self, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsBooleanList::as_bool(&list))
+    }
+
+    pub fn as_float32(&self, py: Python) -> FloatList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList32::as_float32(&list))
+    }
+
+    pub fn as_float64(&self, py: Python) -> FloatList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList64::as_float64(&list))
+    }
+
+    pub fn as_int32(&self, py: Python) -> IntegerList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList32::as_int32(&list))
+    }
+
+    pub fn as_int64(&self, py: Python) -> IntegerList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList64::as_int64(&list))
+    }
+
+    pub fn as_str(&self, py: Python) -> StringList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsStringList::as_str(&list))
+    }
+
+    pub fn contains(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x.contains(elem)))
+    }
+
+    pub fn copy(&self) -> Self {
+        Self {
+            _codes: self._codes.share(),
+            _dictionary: self._dictionary.share(),
+            _index: self._index.clone(),
+            _validity: self._validity.share(),
+            _exports: Exports::default(),
+        }
+    }
+
+    pub fn count_na(&self) -> usize {
+        self._validity
+            .with_chunks(|x| x.iter().map(|x| x.count_zeros()).sum())
+    }
+
+    pub fn counter(&self, py: Python) -> HashMap<String, usize> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let dictionary = list.dictionary();
+            let counts = list._count_codes();
+            counts
+                .iter()
+                .enumerate()
+                .filter(|(_, &n)| n > 0)
+                .map(|(code, &n)| (dictionary.get(code).to_string(), n))
+                .collect()
+        })
+    }
+
+    pub fn ends_with(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x.ends_with(elem)))
+    }
+
+    pub fn equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || list._cmp(&other, |same| same))
+    }
+
+    pub fn equal_scala(&self, elem: &str, py: Python) -> BooleanList {
+        // Look the code up on self, which keeps the index for the next one.
+        let (list, code) = (self._snapshot(), self._code_of(elem));
+        py.allow_threads(move || match code {
+            Some(code) => list._mask_codes(|x| x == code),
+            None => list._mask_codes(|_| false),
+        })
+    }
+
+    pub fn filter(&self, condition: &BooleanList, py: Python) -> PyResult<Self> {
+        let (list, condition) = (self._snapshot(), condition._snapshot());
+        py.allow_threads(move || {
+            if list.size() != condition.size() {
+                return Err(PyRuntimeError::new_err(
+                    "The sizes of `list` and `other` should be equal!",
+                ));
+            }
+            let cond = condition.values();
+            let self_codes = list.codes();
+            let self_validity = list.validity();
+            let codes = cond.iter_ones().map(|i| self_codes[i]).collect();
+            let validity = cond.iter_ones().map(|i| self_validity.get(i)).collect();
+            Ok(CategoryList::_new(
+                codes,
+                list.dictionary().clone(),
+                validity,
+            ))
+        })
+    }
+
+    pub fn get(&self, index: usize) -> PyResult<Option<String>> {
+        if index >= self.size() {
+            Err(PyIndexError::new_err("Index out of range!"))
+        } else if self._validity.with_chunk_of(index, |x, j| x.get(j)) {
+            let code = self._codes.with_chunk_of(index, |x, j| x[j]) as usize;
+            Ok(Some(self.dictionary().get(code).to_string()))
+        } else {
+            Ok(None)
+        }
+    }
+
+    pub fn get_by_indexes(&self, indexes: &IndexList, py: Python) -> PyResult<Self> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            if indexes.back() >= list.size() {
+                return Err(PyIndexError::new_err("Index out of range!"));
+            }
+            let index_vec = indexes.values();
+            let self_codes = list.codes();
+            let self_validity = list.validity();
+            let codes = index_vec.iter().map(|&i| self_codes[i]).collect();
+            let validity = index_vec.iter().map(|&i| self_validity.get(i)).collect();
+            Ok(CategoryList::_new(
+                codes,
+                list.dictionary().clone(),
+                validity,
+            ))
+        })
+    }
+
+    pub fn n_chunks(&self) -> usize {
+        self._codes.n_chunks()
+    }
+
+    pub fn not_equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || list._cmp(&other, |same| !same))
+    }
+
+    pub fn not_equal_scala(&self, elem: &str, py: Python) -> BooleanList {
+        let (list, code) = (self._snapshot(), self._code_of(elem));
+        py.allow_threads(move || match code {
+            Some(code) => list._mask_codes(|x| x != code),
+            None => list._mask_codes(|_| true),
+        })
+    }
+
+    pub fn pop(&self) -> PyResult<()> {
+        self._exports.check()?;
+        self.codes_mut().pop();
+        self.validity_mut().pop();
+        Ok(())
+    }
+
+    pub fn rechunk(&self) {
+        self._codes.rechunk();
+        self._validity.rechunk();
+    }
+
+    pub fn replace(&self, old: Option<String>, new: Option<String>) -> PyResult<()> {
+        self._exports.check()?;
+        match (old, new) {
+            (Some(_old), Some(_new)) => {
+                let old_code = match self._code_of(&_old) {
+                    Some(code) => code,
+                    None => return Ok(()),
+                };
+                match self._code_of(&_new) {
+                    // Merge the codes when `new` is in the dictionary already.
+                    Some(new_code) => {
+                        let mut codes = self.codes_mut();
+                        for i in self.validity().iter_ones() {
+                            if codes[i] == old_code {
+                                codes[i] = new_code;
+                            }
+                        }
+                    }
+                    // Otherwise renaming the dictionary value is enough.
+                    None => self.dictionary_mut().set(old_code as usize, &_new),
+                }
+            }
+            (Some(_old), None) => {
+                if let Some(old_code) = self._code_of(&_old) {
+                    let mut codes = self.codes_mut();
+                    let mut validity = self.validity_mut();
+                    let matched: Vec<usize> = validity
+                        .iter_ones()
+                        .filter(|&i| codes[i] == old_code)
+                        .collect();
+                    for i in matched {
+                        codes[i] = 0;
+                        validity.set(i, false);
+                    }
+                }
+            }
+            (None, Some(_new)) => {
+                let new_code = self._get_or_insert(&_new);
+                let mut codes = self.codes_mut();
+                for i in self.validity().iter_zeros() {
+                    codes[i] = new_code;
+                }
+                self.validity_mut().set_all(true);
+            }
+            (None, None) => {}
+        }
+        Ok(())
+    }
+
+    pub fn set(&self, index: usize, elem: Option<String>) -> PyResult<()> {
+        self._exports.check()?;
+        if index >= self.size() {
+            return Err(PyIndexError::new_err("Index out of range!"));
+        }
+        let code = match elem {
+            Some(ref x) => self._get_or_insert(x),
+            None => 0,
+        };
+        self.codes_mut()[index] = code;
+        self.validity_mut().set(index, elem.is_some());
+        Ok(())
+    }
+
+    pub fn size(&self) -> usize {
+        self._codes.len()
+    }
+
+    /// View of the elements in `start..end` of self, which shares the codes
+    /// and the dictionary with self until either of them is modified.
+    pub fn slice(&self, start: usize, end: usize) -> PyResult<Self> {
+        _check_range(start, end, self.size())?;
+        Ok(Self {
+            _codes: self._codes.slice(start, end),
+            _dictionary: self._dictionary.share(),
+            _index: self._index.clone(),
+            _validity: Shared::new(self.validity().slice(start, end)),
+            _exports: Exports::default(),
+        })
+    }
+
+    pub fn sort(&self, ascending: bool, py: Python) -> PyResult<()> {
+        self._exports.check()?;
+        // Sort a snapshot while the GIL is released, then take its buffers.
+        let snapshot = self._snapshot();
+        let list = snapshot._snapshot();
+        let mut list = py.allow_threads(move || list._sorted(ascending));
+        // Self may be modified by another thread meanwhile, which replaces
+        // the buffers shared with the snapshot. Then it is sorted again
+        // with the GIL held, so that the modification is not lost.
+        if !(ptr::eq(&*self.codes(), &*snapshot.codes())
+            && ptr::eq(&*self.dictionary(), &*snapshot.dictionary())
+            && ptr::eq(&*self.validity(), &*snapshot.validity()))
+        {
+            list = self._snapshot()._sorted(ascending);
+        }
+        // The buffers may be exported by another thread meanwhile.
+        self._exports.check()?;
+        self._codes.replace(list._codes);
+        self._dictionary.replace(list._dictionary);
+        self._index.replace(list._index.into_inner());
+        self._validity.replace(list._validity);
+        Ok(())
+    }
+
+    pub fn starts_with(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x.starts_with(elem)))
+    }
+
+    pub fn str_len(&self, py: Python) -> IntegerList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let vec = list._map_dictionary(|x| x.len() as i64, 0);
+            IntegerList64::_new(vec, list.validity().clone())
+        })
+    }
+
+    pub fn to_arrow_c(slf: PyRef<Self>, py: Python) -> PyResult<(PyObject, PyObject)> {
+        let export = {
+            let dictionary = slf.dictionary();
+            let buffers = vec![
+                dictionary.offsets().as_ptr() as *const c_void,
+                dictionary.bytes().as_ptr() as *const c_void,
+            ];
+            let validity = Bitmap::new(dictionary.len(), true);
+            let dictionary = ArrowExport::new(ArrowExport::string_format(), &validity, buffers);
+            let codes = slf.codes().as_ptr() as *const c_void;
+            ArrowExport::new("I", &slf.validity(), vec![codes]).with_dictionary(dictionary)
+        };
+        let guard = slf._exports.guard();
+        to_capsules(py, slf.into_py(py), guard, export)
+    }
+
+    pub fn to_list(&self) -> Vec<Option<String>> {
+        let dictionary = self.dictionary();
+        self._codes.with_chunks(|codes| {
+            self._validity.with_chunks(|validity| {
+                _flatten(codes)
+                    .zip(_flatten_bits(validity))
+                    .map(|(&code, valid)| {
+                        if valid {
+                            Some(dictionary.get(code as usize).to_string())
+                        } else {
+                            None
+                        }
+                    })
+                    .collect()
+            })
+        })
+    }
+
+    pub fn union_all(&self, other: &Self) -> Self {
+        // The codes of the same dictionary are only chunked.
+        if *self.dictionary() == *other.dictionary() {
+            return Self {
+                _codes: self._codes.concat(&other._codes),
+                _dictionary: self._dictionary.share(),
+                _index: self._index.clone(),
+                _validity: self._validity.concat(&other._validity),
+                _exports: Exports::default(),
+            };
+        }
+        let mut dictionary = self.dictionary().clone();
+        // Add the values only in other to the end of the dictionary.
+        let recode: Vec<u32> = self
+            ._recode(other)
+            .iter()
+            .enumerate()
+            .map(|(j, code)| {
+                code.unwrap_or_else(|| {
+                    dictionary.push(other.dictionary().get(j));
+                    (dictionary.len() - 1) as u32
+                })
+            })
+            .collect();
+        let mut codes = self.codes().to_vec();
+        let other_validity = other.validity();
+        codes.extend(
+            other
+                .codes()
+                .iter()
+                .zip(other_validity.iter())
+                .map(|(&code, valid)| if valid { recode[code as usize] } else { 0 }),
+        );
+        let mut validity = self.validity().clone();
+        validity.extend(&other_validity);
+        CategoryList::_new(codes, dictionary, validity)
+    }
+
+    pub fn unique(&self, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let counts = list._count_codes();
+            let dictionary = list.dictionary();
+            // The unique values are sorted, and the na value is the last one.
+            let mut used: Vec<&str> = counts
+                .iter()
+                .enumerate()
+                .filter(|(_, &n)| n > 0)
+                .map(|(code, _)| dictionary.get(code))
+                .collect();
+            used.sort_unstable();
+            let mut codes: Vec<u32> = (0..used.len() as u32).collect();
+            let mut validity = Bitmap::new(used.len(), true);
+            if list.count_na() > 0 {
+                codes.push(0);
+                validity.push(false);
+            }
+            CategoryList::_new(codes, used.into_iter().collect(), validity)
+        })
+    }
+
+    pub fn validity_buffer(&self, py: Python) -> PyObject {
+        PyBytes::new(py, &self.validity().to_bytes()).into_py(py)
+    }
+}
+
+impl CategoryList {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn _new(codes: Vec<u32>, dictionary: StringBuffer, validity: Bitmap) -> Self {
+        debug_assert_eq!(codes.len(), validity.len());
+        Self {
+            _codes: SharedVec::new(codes),
+            _dictionary: Shared::new(dictionary),
+            _index: RefCell::default(),
+            _validity: Shared::new(validity),
+            _exports: Exports::default(),
+        }
+    }
+
+    /// `func` maps whether the two elements are equal to the result.
+    fn _cmp(
+        &self,
+        other: &Self,
+        func: impl Fn(bool) -> bool + Send + Sync,
+    ) -> PyResult<BooleanList> {
+        if self.size() != other.size() {
+            return Err(PyRuntimeError::new_err(
+                "The sizes of `self` and `other` should be equal!",
+            ));
+        }
+        // Compare the codes after translating the codes of other to self.
+        let recode = self._recode(other);
+        let (self_codes, other_codes) = (self.codes(), other.codes());
+        let (codes1, codes2) = (&*self_codes, &*other_codes);
+        let validity = self.validity().and(&other.validity());
+        let values = parallel::mask_fn(codes1.len(), |i| {
+            let same = recode.get(codes2[i] as usize).copied().flatten() == Some(codes1[i]);
+            func(same)
+        })
+        .and(&validity);
+        Ok(BooleanList::_new(values, validity))
+    }
+
+    fn _code_of(&self, elem: &str) -> Option<u32> {
+        self._index().get(elem).copied()
+    }
+
+    /// Number of the non-na elements of each code.
+    fn _count_codes(&self) -> Vec<usize> {
+        let codes = self.codes();
+        let mut counts = vec![0; self.dictionary().len()];
+        for i in self.validity().iter_ones() {
+            counts[codes[i] as usize] += 1;
+        }
+        counts
+    }
+
+    /// Encode the strings of `iter`, the missing values are not added to
+    /// the dictionary.
+    pub fn _encode<'a>(iter: impl Iterator<Item = &'a str>, validity: Bitmap) -> Self {
+        let mut lookup: HashMap<&str, u32> = HashMap::new();
+        let mut dictionary = StringBuffer::new();
+        let codes = iter
+            .zip(validity.iter())
+            .map(|(x, valid)| {
+                if !valid {
+                    return 0;
+                }
+                *lookup.entry(x).or_insert_with(|| {
+                    dictionary.push(x);
+                    (dictionary.len() - 1) as u32
+                })
+            })
+            .collect();
+        CategoryList::_new(codes, dictionary, validity)
+    }
+
+    /// Evaluate `func` once per dictionary value and look the results up
+    /// by the codes, the missing values stay missing.
+    fn _fn_mask(&self, func: impl Fn(&str) -> bool) -> BooleanList {
+        let table: Vec<bool> = self.dictionary().iter().map(func).collect();
+        // The missing values may have no dictionary value for code 0.
+        self._mask_codes(|code| table.get(code as usize).copied().unwrap_or(false))
+    }
+
+    fn _get_or_insert(&self, elem: &str) -> u32 {
+        if let Some(code) = self._code_of(elem) {
+            return code;
+        }
+        // The index is updated in place, instead of being dropped by
+        // `dictionary_mut`.
+        let mut dictionary = self._dictionary.borrow_mut();
+        dictionary.push(elem);
+        let code = (dictionary.len() - 1) as u32;
+        if let Some(index) = self._index.borrow_mut().as_mut() {
+            Arc::make_mut(index).insert(elem.to_string(), code);
+        }
+        code
+    }
+
+    /// Index of the dictionary, which is built by the first lookup.
+    fn _index(&self) -> Arc<HashMap<String, u32>> {
+        let mut index = self._index.borrow_mut();
+        let index = index.get_or_insert_with(|| {
+            let dictionary = self.dictionary();
+            let codes = dictionary
+                .iter()
+                .enumerate()
+                .map(|(code, x)| (x.to_string(), code as u32));
+            Arc::new(codes.collect())
+        });
+        index.clone()
+    }
+
+    /// Evaluate `func` once per dictionary value and gather the results
+    /// by the codes, the missing values are set to `na_value`.
+    fn _map_dictionary<U: Clone>(&self, func: impl Fn(&str) -> U, na_value: U) -> Vec<U> {
+        let table: Vec<U> = self.dictionary().iter().map(func).collect();
+        let validity = self.validity();
+        self.codes()
+            .iter()
+            .zip(validity.iter())
+            .map(|(&code, valid)| {
+                if valid {
+                    table[code as usize].clone()
+                } else {
+                    na_value.clone()
+                }
+            })
+            .collect()
+    }
+
+    fn _mask_codes(&self, func: impl Fn(u32) -> bool + Send + Sync) -> BooleanList {
+        let validity = self.validity().clone();
+        let values = parallel::mask(&self.codes(), |&x| func(x)).and(&validity);
+        BooleanList::_new(values, validity)
+    }
+
+    /// Translate the codes of other to the codes of self, `None` for the
+    /// values not in the dictionary of self.
+    fn _recode(&self, other: &Self) -> Vec<Option<u32>> {
+        let dictionary = self.dictionary();
+        let lookup: HashMap<&str, u32> = dictionary
+            .iter()
+            .enumerate()
+            .map(|(code, x)| (x, code as u32))
+            .collect();
+        let result = other
+            .dictionary()
+            .iter()
+            .map(|x| lookup.get(x).copied())
+            .collect();
+        result
+    }
+
+    /// Copy of self to run a kernel on while the GIL is released, see
+    /// `List::_snapshot`.
+    pub fn _snapshot(&self) -> Self {
+        self.rechunk();
+        self.copy()
+    }
+
+    /// Sort self, which is a snapshot of a list.
+    fn _sorted(self, ascending: bool) -> Self {
+        let n = self.size();
+        // Sort the dictionary once, then count sort the codes in that order.
+        let mut order: Vec<usize> = (0..self.dictionary().len()).collect();
+        {
+            let dictionary = self.dictionary();
+            order.sort_unstable_by_key(|&code| dictionary.get_bytes(code));
+        }
+        if !ascending {
+            order.reverse();
+        }
+        let counts = self._count_codes();
+        let mut codes = Vec::with_capacity(n);
+        for code in order {
+            codes.resize(codes.len() + counts[code], code as u32);
+        }
+        let m = codes.len();
+        // Put all the na elements to the right side.
+        codes.resize(n, 0);
+        *self.codes_mut() = codes;
+        *self.validity_mut() = Bitmap::from_fn(n, |i| i < m);
+        self
+    }
+
+    pub fn codes(&self) -> Ref<[u32]> {
+        self._codes.borrow()
+    }
+
+    pub fn codes_mut(&self) -> RefMut<Vec<u32>> {
+        self._codes.borrow_mut()
+    }
+
+    pub fn dictionary(&self) -> Ref<StringBuffer> {
+        self._dictionary.borrow()
+    }
+
+    /// Borrow the dictionary mutably, which drops the index of it.
+    pub fn dictionary_mut(&self) -> RefMut<StringBuffer> {
+        self._index.replace(None);
+        self._dictionary.borrow_mut()
+    }
+
+    pub fn validity(&self) -> Ref<Bitmap> {
+        self._validity.borrow()
+    }
+
+    pub fn validity_mut(&self) -> RefMut<Bitmap> {
+        self._validity.borrow_mut()
+    }
+}
+
+impl AsBooleanList for CategoryList {
+    fn as_bool(&self) -> BooleanList {
+        self._fn_mask(|x| x.parse().unwrap_or(false))
+    }
+}
+
+impl AsFloatList32 for CategoryList {
+    fn as_float32(&self) -> FloatList32 {
+        let vec = self._map_dictionary(|x| x.parse().unwrap_or(0.0), 0.0);
+        FloatList32::_new(vec, self.validity().clone())
+    }
+}
+
+impl AsFloatList64 for CategoryList {
+    fn as_float64(&self) -> FloatList64 {
+        let vec = self._map_dictionary(|x| x.parse().unwrap_or(0.0), 0.0);
+        FloatList64::_new(vec, self.validity().clone())
+    }
+}
+
+impl AsIntegerList32 for CategoryList {
+    fn as_int32(&self) -> IntegerList32 {
+        let vec = self._map_dictionary(|x| x.parse().unwrap_or(0), 0);
+        IntegerList32::_new(vec, self.validity().clone())
+    }
+}
+
+impl AsIntegerList64 for CategoryList {
+    fn as_int64(&self) -> IntegerList64 {
+        let vec = self._map_dictionary(|x| x.parse().unwrap_or(0), 0);
+        IntegerList64::_new(vec, self.validity().clone())
+    }
+}
+
+impl AsStringList for CategoryList {
+    fn as_str(&self) -> StringList {
+        let dictionary = self.dictionary();
+        let validity = self.validity();
+        let values = self
+            .codes()
+            .iter()
+            .zip(validity.iter())
+            .map(|(&code, valid)| {
+                if valid {
+                    dictionary.get(code as usize)
+                } else {
+                    ""
+                }
+            })
+            .collect();
+        StringList::_new(values, validity.clone())
+    }
+}
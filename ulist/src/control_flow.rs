@@ -1,89 +1,274 @@
 use crate::base::List;
+use crate::bitmap::Bitmap;
 use crate::boolean::BooleanList;
+use crate::floatings::FloatList32;
 use crate::floatings::FloatList64;
+use crate::integers::IntegerList32;
 use crate::integers::IntegerList64;
 use crate::string::StringList;
+use crate::string_buffer::StringBuffer;
 use pyo3::exceptions::PyRuntimeError;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use pyo3::Py;
-use std::collections::HashSet;
+use pyo3::PyClass;
 
-fn select<T, U>(
-    py: Python,
-    conditions: &[Py<BooleanList>],
-    choices: &[T],
-    default: T,
-) -> PyResult<U>
+/// One of the `choices` of `select`, which is an element or a list of the
+/// output type.
+enum Choice<L, T> {
+    List(L),
+    Scala(T),
+}
+
+/// Extract the choices, the lists are snapshots to read while the GIL is
+/// released.
+fn _choices<'p, L, T>(
+    choices: &[&'p PyAny],
+    snapshot: impl Fn(&L) -> L,
+) -> PyResult<Vec<Choice<L, T>>>
 where
-    T: PartialEq + Clone,
-    U: List<T>,
+    L: PyClass,
+    T: FromPyObject<'p>,
 {
-    let cond: Vec<PyRef<BooleanList>> = conditions.iter().map(|x| x.borrow(py)).collect();
-    let n = cond[0].size();
-    for c in cond.iter() {
+    choices
+        .iter()
+        .map(|x| match x.extract::<PyRef<L>>() {
+            Ok(list) => Ok(Choice::List(snapshot(&list))),
+            Err(_) => Ok(Choice::Scala(x.extract::<T>()?)),
+        })
+        .collect()
+}
+
+fn _check_choice_size(n: usize, size: usize) -> PyResult<()> {
+    if size != n {
+        Err(PyRuntimeError::new_err(
+            "The sizes of `conditions` and `choices` should be equal!",
+        ))
+    } else {
+        Ok(())
+    }
+}
+
+/// The rows decided by each condition, which is the first true one for
+/// them, and the rows left to the default. The undecided rows are tracked
+/// by a bitmap, so that the conditions after all the rows are decided are
+/// not visited.
+fn _decide(conditions: &[BooleanList]) -> PyResult<(Vec<Bitmap>, Bitmap)> {
+    let n = match conditions.first() {
+        Some(c) => c.size(),
+        None => {
+            return Err(PyValueError::new_err(
+                "Parameter `conditions` should not be empty!",
+            ))
+        }
+    };
+    for c in conditions.iter() {
         if c.size() != n {
             return Err(PyRuntimeError::new_err(
                 "BooleanList sizes in conditions should be equal!",
             ));
-        } else if c.count_na() > 0 {
+        } else if c.validity().count_zeros() > 0 {
             return Err(PyValueError::new_err(
                 "Parameter `condition` should not contain missing values!",
             ));
         }
     }
 
-    let mut vec = vec![default; cond[0].size()];
-    for j in 0..vec.len() {
-        for i in 0..cond.len() {
-            let ptr = unsafe { cond.get_unchecked(i) };
-            let choice = unsafe { choices.get_unchecked(i) };
-            // TODO: implement iter() for BooleanList
-            if ptr.get(j).unwrap().unwrap() {
-                vec[j] = choice.clone();
-                break;
+    let mut undecided = Bitmap::new(n, true);
+    let mut rows = Vec::with_capacity(conditions.len());
+    for c in conditions.iter() {
+        if !undecided.any() {
+            break;
+        }
+        let values = c.values();
+        rows.push(values.and(&undecided));
+        undecided.and_assign(&values.not());
+    }
+    Ok((rows, undecided))
+}
+
+fn _select_bool(
+    conditions: &[BooleanList],
+    choices: &[Choice<BooleanList, bool>],
+    default: bool,
+) -> PyResult<BooleanList> {
+    let (rows, undecided) = _decide(conditions)?;
+    let n = undecided.len();
+    let mut values = if default {
+        undecided
+    } else {
+        Bitmap::new(n, false)
+    };
+    let mut validity = Bitmap::new(n, true);
+    for (rows, choice) in rows.iter().zip(choices.iter()) {
+        match choice {
+            Choice::List(list) => {
+                _check_choice_size(n, list.size())?;
+                values = values.or(&rows.and(&list.values()));
+                validity.and_assign(&rows.and(&list.validity().not()).not());
             }
+            Choice::Scala(true) => values = values.or(rows),
+            Choice::Scala(false) => (),
         }
     }
-    Ok(U::_new(vec, HashSet::new()))
+    Ok(BooleanList::_new(values, validity))
+}
+
+fn _select_list<L, T>(
+    conditions: &[BooleanList],
+    choices: &[Choice<L, T>],
+    default: T,
+) -> PyResult<L>
+where
+    L: List<T>,
+    T: PartialEq + Clone + Send + Sync,
+{
+    let (rows, _) = _decide(conditions)?;
+    let n = conditions[0].size();
+    let mut vec = vec![default; n];
+    let mut validity = Bitmap::new(n, true);
+    for (rows, choice) in rows.iter().zip(choices.iter()) {
+        match choice {
+            Choice::List(list) => {
+                _check_choice_size(n, list.size())?;
+                let values = list.values();
+                let valid = list.validity();
+                for j in rows.iter_ones() {
+                    if valid.get(j) {
+                        vec[j] = values[j].clone();
+                    } else {
+                        vec[j] = list.na_value();
+                        validity.set(j, false);
+                    }
+                }
+            }
+            Choice::Scala(x) => {
+                for j in rows.iter_ones() {
+                    vec[j] = x.clone();
+                }
+            }
+        }
+    }
+    Ok(List::_new(vec, validity))
+}
+
+fn _select_string(
+    conditions: &[BooleanList],
+    choices: &[Choice<StringList, String>],
+    default: String,
+) -> PyResult<StringList> {
+    let (rows, _) = _decide(conditions)?;
+    let n = conditions[0].size();
+    // The strings are appended in the order of the rows, so the choice of
+    // each row is found first.
+    let mut which = vec![choices.len(); n];
+    for (i, rows) in rows.iter().enumerate() {
+        for j in rows.iter_ones() {
+            which[j] = i;
+        }
+    }
+    let lists = choices
+        .iter()
+        .map(|choice| match choice {
+            Choice::List(list) => {
+                _check_choice_size(n, list.size())?;
+                Ok(Some((list.values(), list.validity())))
+            }
+            Choice::Scala(_) => Ok(None),
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+    let mut values = StringBuffer::with_capacity(n, 0);
+    let mut validity = Bitmap::new(n, true);
+    for (j, &i) in which.iter().enumerate() {
+        let elem = match (choices.get(i), lists.get(i)) {
+            (Some(Choice::Scala(x)), _) => x.as_str(),
+            (_, Some(Some((vec, valid)))) if valid.get(j) => vec.get(j),
+            (_, Some(Some(_))) => {
+                validity.set(j, false);
+                ""
+            }
+            _ => default.as_str(),
+        };
+        values.push(elem);
+    }
+    Ok(StringList::_new(values, validity))
+}
+
+fn _snapshots(py: Python, conditions: &[Py<BooleanList>]) -> Vec<BooleanList> {
+    conditions
+        .iter()
+        .map(|x| x.borrow(py)._snapshot())
+        .collect()
 }
 
 #[pyfunction]
 pub fn select_bool(
     py: Python,
     conditions: Vec<Py<BooleanList>>,
-    choices: Vec<bool>,
+    choices: Vec<&PyAny>,
     default: bool,
 ) -> PyResult<BooleanList> {
-    select::<bool, BooleanList>(py, &conditions, &choices, default)
+    let conditions = _snapshots(py, &conditions);
+    let choices = _choices(&choices, BooleanList::_snapshot)?;
+    py.allow_threads(move || _select_bool(&conditions, &choices, default))
 }
 
 #[pyfunction]
 pub fn select_float(
     py: Python,
     conditions: Vec<Py<BooleanList>>,
-    choices: Vec<f64>,
+    choices: Vec<&PyAny>,
     default: f64,
 ) -> PyResult<FloatList64> {
-    select::<f64, FloatList64>(py, &conditions, &choices, default)
+    let conditions = _snapshots(py, &conditions);
+    let choices = _choices(&choices, FloatList64::_snapshot)?;
+    py.allow_threads(move || _select_list(&conditions, &choices, default))
+}
+
+#[pyfunction]
+pub fn select_float32(
+    py: Python,
+    conditions: Vec<Py<BooleanList>>,
+    choices: Vec<&PyAny>,
+    default: f32,
+) -> PyResult<FloatList32> {
+    let conditions = _snapshots(py, &conditions);
+    let choices = _choices(&choices, FloatList32::_snapshot)?;
+    py.allow_threads(move || _select_list(&conditions, &choices, default))
 }
 
 #[pyfunction]
 pub fn select_int(
     py: Python,
     conditions: Vec<Py<BooleanList>>,
-    choices: Vec<i64>,
+    choices: Vec<&PyAny>,
     default: i64,
 ) -> PyResult<IntegerList64> {
-    select::<i64, IntegerList64>(py, &conditions, &choices, default)
+    let conditions = _snapshots(py, &conditions);
+    let choices = _choices(&choices, IntegerList64::_snapshot)?;
+    py.allow_threads(move || _select_list(&conditions, &choices, default))
+}
+
+#[pyfunction]
+pub fn select_int32(
+    py: Python,
+    conditions: Vec<Py<BooleanList>>,
+    choices: Vec<&PyAny>,
+    default: i32,
+) -> PyResult<IntegerList32> {
+    let conditions = _snapshots(py, &conditions);
+    let choices = _choices(&choices, IntegerList32::_snapshot)?;
+    py.allow_threads(move || _select_list(&conditions, &choices, default))
 }
 
 #[pyfunction]
 pub fn select_string(
     py: Python,
     conditions: Vec<Py<BooleanList>>,
-    choices: Vec<String>,
+    choices: Vec<&PyAny>,
     default: String,
 ) -> PyResult<StringList> {
-    select::<String, StringList>(py, &conditions, &choices, default)
+    let conditions = _snapshots(py, &conditions);
+    let choices = _choices(&choices, StringList::_snapshot)?;
+    py.allow_threads(move || _select_string(&conditions, &choices, default))
 }
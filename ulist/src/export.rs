@@ -0,0 +1,252 @@
+use pyo3::exceptions::PyBufferError;
+use pyo3::ffi;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+use pyo3::AsPyPointer;
+use std::mem;
+use std::os::raw::c_char;
+use std::os::raw::c_int;
+use std::os::raw::c_void;
+use std::ptr;
+use std::sync::atomic::AtomicUsize;
+use std::sync::atomic::Ordering;
+use std::sync::Arc;
+
+/// Element types which can be exported by the buffer protocol.
+pub trait BufferElement: Copy {
+    /// Format character of the `struct` module, with a nul terminator.
+    const FORMAT: &'static [u8];
+    /// Type string of `__array_interface__`, without the byte order.
+    const TYPESTR: &'static str;
+}
+
+impl BufferElement for f32 {
+    const FORMAT: &'static [u8] = b"f\0";
+    const TYPESTR: &'static str = "f4";
+}
+
+impl BufferElement for f64 {
+    const FORMAT: &'static [u8] = b"d\0";
+    const TYPESTR: &'static str = "f8";
+}
+
+impl BufferElement for i32 {
+    const FORMAT: &'static [u8] = b"i\0";
+    const TYPESTR: &'static str = "i4";
+}
+
+impl BufferElement for i64 {
+    const FORMAT: &'static [u8] = b"q\0";
+    const TYPESTR: &'static str = "i8";
+}
+
+impl BufferElement for u8 {
+    const FORMAT: &'static [u8] = b"B\0";
+    const TYPESTR: &'static str = "u1";
+}
+
+/// Number of the exported buffers of a list which are not released yet.
+/// The list can not be modified while its buffers are exported, otherwise
+/// the exported memory may be reallocated, either by a resize or by the
+/// copy-on-write of a shared buffer.
+#[derive(Debug, Default)]
+pub struct Exports(Arc<AtomicUsize>);
+
+impl Exports {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn acquire(&self) {
+        self.0.fetch_add(1, Ordering::SeqCst);
+    }
+
+    pub fn check(&self) -> PyResult<()> {
+        if self.0.load(Ordering::SeqCst) > 0 {
+            Err(PyBufferError::new_err(
+                "Existing exports of data: the ulist can not be modified!",
+            ))
+        } else {
+            Ok(())
+        }
+    }
+
+    /// Acquire an export which is released when the guard is dropped, so
+    /// that the export can outlive the borrow of the list.
+    pub fn guard(&self) -> ExportGuard {
+        self.acquire();
+        ExportGuard(self.0.clone())
+    }
+
+    pub fn release(&self) {
+        self.0.fetch_sub(1, Ordering::SeqCst);
+    }
+}
+
+/// An export of a list, see `Exports::guard`.
+#[derive(Debug)]
+pub struct ExportGuard(Arc<AtomicUsize>);
+
+impl Clone for ExportGuard {
+    fn clone(&self) -> Self {
+        self.0.fetch_add(1, Ordering::SeqCst);
+        ExportGuard(self.0.clone())
+    }
+}
+
+impl Drop for ExportGuard {
+    fn drop(&mut self) {
+        self.0.fetch_sub(1, Ordering::SeqCst);
+    }
+}
+
+/// `__array_interface__` of the 1-D array `data` of `list`, of which the
+/// data field is a `BufferOwner` with the export `guard` of the list. The
+/// consumers such as numpy keep the owner as the base of their arrays, so
+/// that the list can not be modified until the arrays are deleted.
+pub fn array_interface<T: BufferElement>(
+    py: Python,
+    list: PyObject,
+    data: &[T],
+    guard: ExportGuard,
+) -> PyResult<PyObject> {
+    let byteorder = if mem::size_of::<T>() == 1 {
+        "|"
+    } else if cfg!(target_endian = "little") {
+        "<"
+    } else {
+        ">"
+    };
+    let owner = BufferOwner {
+        data: data.as_ptr() as *const u8,
+        len: data.len(),
+        itemsize: mem::size_of::<T>(),
+        format: T::FORMAT,
+        _list: list,
+        _guard: guard,
+    };
+    let dict = PyDict::new(py);
+    dict.set_item("data", Py::new(py, owner)?)?;
+    dict.set_item("shape", (data.len(),))?;
+    dict.set_item("typestr", format!("{}{}", byteorder, T::TYPESTR))?;
+    dict.set_item("version", 3)?;
+    Ok(dict.into_py(py))
+}
+
+/// Owner of the memory of a list exported by `array_interface`, which is
+/// exported again by the buffer protocol. The list is kept alive and can
+/// not be modified until the owner is deleted.
+#[pyclass(unsendable)]
+pub struct BufferOwner {
+    data: *const u8,
+    len: usize,
+    itemsize: usize,
+    format: &'static [u8],
+    _list: PyObject,
+    _guard: ExportGuard,
+}
+
+#[pymethods]
+impl BufferOwner {
+    unsafe fn __getbuffer__(
+        slf: PyRef<Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        _fill_view(
+            view,
+            slf.as_ptr(),
+            slf.data,
+            slf.len,
+            slf.itemsize,
+            slf.format,
+            flags,
+        )
+    }
+
+    unsafe fn __releasebuffer__(&self, view: *mut ffi::Py_buffer) {
+        release_view(view);
+    }
+}
+
+/// Fill `view` to export `data` as a read-only 1-D buffer of `owner`.
+///
+/// # Safety
+///
+/// `view` should be the pointer passed to `__getbuffer__`, `owner` should
+/// be the exporting object, and `data` should neither be moved nor freed
+/// before `release_view` is called.
+pub unsafe fn fill_view<T: BufferElement>(
+    view: *mut ffi::Py_buffer,
+    owner: *mut ffi::PyObject,
+    data: &[T],
+    flags: c_int,
+) -> PyResult<()> {
+    _fill_view(
+        view,
+        owner,
+        data.as_ptr() as *const u8,
+        data.len(),
+        mem::size_of::<T>(),
+        T::FORMAT,
+        flags,
+    )
+}
+
+/// Same as `fill_view`, but `data` is `len` elements of `itemsize` bytes
+/// and of the `format` of the `struct` module.
+unsafe fn _fill_view(
+    view: *mut ffi::Py_buffer,
+    owner: *mut ffi::PyObject,
+    data: *const u8,
+    len: usize,
+    itemsize: usize,
+    format: &'static [u8],
+    flags: c_int,
+) -> PyResult<()> {
+    if view.is_null() {
+        return Err(PyBufferError::new_err("View is null!"));
+    }
+    if flags & ffi::PyBUF_WRITABLE == ffi::PyBUF_WRITABLE {
+        return Err(PyBufferError::new_err("The ulist buffer is read-only!"));
+    }
+    let itemsize = itemsize as ffi::Py_ssize_t;
+    ffi::Py_INCREF(owner);
+    (*view).obj = owner;
+    (*view).buf = data as *mut c_void;
+    (*view).len = len as ffi::Py_ssize_t * itemsize;
+    (*view).readonly = 1;
+    (*view).itemsize = itemsize;
+    (*view).format = if flags & ffi::PyBUF_FORMAT == ffi::PyBUF_FORMAT {
+        format.as_ptr() as *mut c_char
+    } else {
+        ptr::null_mut()
+    };
+    (*view).ndim = 1;
+    // The shape is kept in `internal` until the view is released.
+    let shape = Box::into_raw(Box::new(len as ffi::Py_ssize_t));
+    (*view).internal = shape as *mut c_void;
+    (*view).shape = if flags & ffi::PyBUF_ND == ffi::PyBUF_ND {
+        shape
+    } else {
+        ptr::null_mut()
+    };
+    (*view).strides = if flags & ffi::PyBUF_STRIDES == ffi::PyBUF_STRIDES {
+        &mut (*view).itemsize
+    } else {
+        ptr::null_mut()
+    };
+    (*view).suboffsets = ptr::null_mut();
+    Ok(())
+}
+
+/// Free the memory allocated by `fill_view`.
+///
+/// # Safety
+///
+/// `view` should be filled by `fill_view` and not released yet.
+pub unsafe fn release_view(view: *mut ffi::Py_buffer) {
+    let shape = (*view).internal as *mut ffi::Py_ssize_t;
+    if !shape.is_null() {
+        drop(Box::from_raw(shape));
+        (*view).internal = ptr::null_mut();
+    }
+}
@@ -0,0 +1,1151 @@
+use crate::base::List;
+use crate::bitmap::Bitmap;
+use crate::bitmap::_n_words;
+use crate::bitmap::_tail_mask;
+use crate::bitmap::WORD_BITS;
+use crate::boolean::BooleanList;
+use crate::floatings::FloatList32;
+use crate::floatings::FloatList64;
+use crate::integers::IntegerList32;
+use crate::integers::IntegerList64;
+use crate::parallel;
+use crate::types::AnyList;
+use pyo3::exceptions::PyTypeError;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use rayon::prelude::*;
+use std::cell::Ref;
+use std::ops::Add;
+use std::ops::Div;
+use std::ops::Mul;
+use std::ops::Sub;
+
+/// Number of rows evaluated by each instruction at once, so that the
+/// registers of an expression stay in the cache between the instructions.
+const CHUNK: usize = 1024;
+
+/// Number of rows evaluated by one task of the thread pool.
+const GROUP: usize = 64 * CHUNK;
+
+/// Instruction of an expression, built by `ulist.Expr.collect`. It is the
+/// tuple of the name of the operation, the indexes of the registers of its
+/// arguments (of the input list for "col"), the target dtype of "astype",
+/// "lit" and "select", and the value of "lit", the exponent of "pow" or the
+/// choices of "select" followed by its default.
+type PyInstr = (String, Vec<usize>, Option<String>, Option<PyObject>);
+/// The instructions and the dtypes of their registers.
+type Program = Vec<(Instr, DType)>;
+
+/// Evaluate the expression `program` on the lists `inputs` in one pass,
+/// which is split into chunks of rows so that the intermediate results are
+/// never allocated for the whole lists. Each instruction writes one
+/// register, and the result is the register `result`. Only the rows where
+/// all the bool registers `predicates` are True are kept.
+#[pyfunction]
+pub fn eval_expr(
+    py: Python,
+    program: Vec<PyInstr>,
+    inputs: Vec<&PyAny>,
+    result: usize,
+    predicates: Vec<usize>,
+) -> PyResult<PyObject> {
+    let (program, lists, len) = _prepare(py, program, inputs, result, &predicates)?;
+    let output = py.allow_threads(move || _collect(&program, &lists, len, result, &predicates));
+    Ok(output.into_py(py))
+}
+
+/// Like `eval_expr`, but return the sum, the size and the count of the
+/// missing values of the result instead of the result itself.
+#[pyfunction]
+pub fn eval_sum(
+    py: Python,
+    program: Vec<PyInstr>,
+    inputs: Vec<&PyAny>,
+    result: usize,
+    predicates: Vec<usize>,
+) -> PyResult<PyObject> {
+    let (program, lists, len) = _prepare(py, program, inputs, result, &predicates)?;
+    let summary = py.allow_threads(move || _sum(&program, &lists, len, result, &predicates));
+    Ok(summary.into_py(py))
+}
+
+/// Take the snapshots of the lists, and check the program.
+fn _prepare(
+    py: Python,
+    program: Vec<PyInstr>,
+    inputs: Vec<&PyAny>,
+    result: usize,
+    predicates: &[usize],
+) -> PyResult<(Program, Vec<AnyList>, usize)> {
+    let mut lists = Vec::new();
+    for obj in inputs.iter() {
+        let list = if let Ok(x) = obj.extract::<PyRef<BooleanList>>() {
+            AnyList::Bool(x._snapshot())
+        } else if let Ok(x) = obj.extract::<PyRef<FloatList32>>() {
+            AnyList::Float32(x._snapshot())
+        } else if let Ok(x) = obj.extract::<PyRef<FloatList64>>() {
+            AnyList::Float64(x._snapshot())
+        } else if let Ok(x) = obj.extract::<PyRef<IntegerList32>>() {
+            AnyList::Int32(x._snapshot())
+        } else if let Ok(x) = obj.extract::<PyRef<IntegerList64>>() {
+            AnyList::Int64(x._snapshot())
+        } else {
+            return Err(PyTypeError::new_err(
+                "The lists of the expression should be of dtype int, float or bool!",
+            ));
+        };
+        lists.push(list);
+    }
+    let sizes: Vec<usize> = lists.iter().map(_size).collect();
+    if sizes.is_empty() || sizes.iter().any(|&x| x != sizes[0]) {
+        return Err(PyValueError::new_err(
+            "The expression should have the lists of the same size!",
+        ));
+    }
+    let dtypes: Vec<DType> = lists.iter().map(_dtype).collect();
+    let program = _parse(py, program, &dtypes)?;
+    if result >= program.len() {
+        return Err(PyValueError::new_err("The result is not a register!"));
+    }
+    for &i in predicates.iter() {
+        match program.get(i) {
+            Some((_, DType::Bool)) => (),
+            _ => {
+                return Err(PyTypeError::new_err(
+                    "The predicates should be of dtype bool!",
+                ))
+            }
+        }
+    }
+    Ok((program, lists, sizes[0]))
+}
+
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum DType {
+    Bool,
+    Float32,
+    Float64,
+    Int32,
+    Int64,
+}
+
+impl DType {
+    fn new(dtype: &str) -> PyResult<Self> {
+        match dtype {
+            "bool" => Ok(DType::Bool),
+            "float32" => Ok(DType::Float32),
+            "float" | "float64" => Ok(DType::Float64),
+            "int32" => Ok(DType::Int32),
+            "int" | "int64" => Ok(DType::Int64),
+            _ => Err(PyValueError::new_err(format!(
+                "dtype {} is not supported by the expression!",
+                dtype
+            ))),
+        }
+    }
+
+    fn is_float(&self) -> bool {
+        matches!(self, DType::Float32 | DType::Float64)
+    }
+
+    fn name(&self) -> &str {
+        match self {
+            DType::Bool => "bool",
+            DType::Float32 => "float32",
+            DType::Float64 => "float64",
+            DType::Int32 => "int32",
+            DType::Int64 => "int64",
+        }
+    }
+}
+
+#[derive(Clone, Copy, Debug)]
+enum Op {
+    Add,
+    And,
+    Div,
+    Equal,
+    GreaterThan,
+    GreaterThanOrEqual,
+    LessThan,
+    LessThanOrEqual,
+    Mul,
+    NotEqual,
+    Or,
+    Sub,
+}
+
+impl Op {
+    fn new(name: &str) -> Option<Self> {
+        let op = match name {
+            "add" => Op::Add,
+            "and" => Op::And,
+            "div" => Op::Div,
+            "equal" => Op::Equal,
+            "greater_than" => Op::GreaterThan,
+            "greater_than_or_equal" => Op::GreaterThanOrEqual,
+            "less_than" => Op::LessThan,
+            "less_than_or_equal" => Op::LessThanOrEqual,
+            "mul" => Op::Mul,
+            "not_equal" => Op::NotEqual,
+            "or" => Op::Or,
+            "sub" => Op::Sub,
+            _ => return None,
+        };
+        Some(op)
+    }
+
+    /// The dtype of the result of the operation on two registers of the
+    /// same `dtype`, None if the operation does not support the dtype.
+    fn dtype(&self, dtype: DType) -> Option<DType> {
+        match self {
+            Op::Add | Op::Mul | Op::Sub if dtype != DType::Bool => Some(dtype),
+            Op::Div if dtype.is_float() => Some(dtype),
+            Op::And | Op::Or if dtype == DType::Bool => Some(DType::Bool),
+            Op::Equal | Op::NotEqual => Some(DType::Bool),
+            Op::GreaterThan | Op::GreaterThanOrEqual | Op::LessThan | Op::LessThanOrEqual
+                if dtype != DType::Bool =>
+            {
+                Some(DType::Bool)
+            }
+            _ => None,
+        }
+    }
+}
+
+enum Instr {
+    Astype(usize),
+    Binary(Op, usize, usize),
+    Col(usize),
+    Lit(Buffer),
+    Not(usize),
+    Pow(usize, i32),
+    /// The conditions, and the choices followed by the default.
+    Select(Vec<usize>, Buffer),
+}
+
+/// Check the instructions built by Python, and find the dtype of each
+/// register.
+fn _parse(py: Python, program: Vec<PyInstr>, inputs: &[DType]) -> PyResult<Program> {
+    let invalid = || PyValueError::new_err("Invalid expression!");
+    let mut result: Program = Vec::new();
+    for (name, args, dtype, value) in program.into_iter() {
+        // The arguments are the registers written before.
+        let arg = |i: usize| match args.get(i) {
+            Some(&j) if j < result.len() => Ok(j),
+            _ => Err(invalid()),
+        };
+        let dtype_of = |i: usize| arg(i).map(|j| result[j].1);
+        let instr = match name.as_str() {
+            "astype" => {
+                let dtype = DType::new(&dtype.ok_or_else(invalid)?)?;
+                (Instr::Astype(arg(0)?), dtype)
+            }
+            "col" => match args.first() {
+                Some(&j) if j < inputs.len() => (Instr::Col(j), inputs[j]),
+                _ => return Err(invalid()),
+            },
+            "lit" => {
+                let dtype = DType::new(&dtype.ok_or_else(invalid)?)?;
+                let value = value.ok_or_else(invalid)?;
+                (Instr::Lit(Buffer::fill(dtype, value.as_ref(py))?), dtype)
+            }
+            "not" => match dtype_of(0)? {
+                DType::Bool => (Instr::Not(arg(0)?), DType::Bool),
+                dtype => {
+                    return Err(PyTypeError::new_err(format!(
+                        "not does not support dtype {}!",
+                        dtype.name()
+                    )))
+                }
+            },
+            "pow" => {
+                let dtype = dtype_of(0)?;
+                let exp: i32 = value.ok_or_else(invalid)?.extract(py)?;
+                if dtype == DType::Bool || (!dtype.is_float() && exp < 0) {
+                    return Err(PyTypeError::new_err(format!(
+                        "dtype {} does not support pow with exponent {}!",
+                        dtype.name(),
+                        exp
+                    )));
+                }
+                (Instr::Pow(arg(0)?, exp), dtype)
+            }
+            "select" => {
+                let dtype = DType::new(&dtype.ok_or_else(invalid)?)?;
+                let choices = value.ok_or_else(invalid)?;
+                let choices = choices.as_ref(py);
+                if choices.len()? != args.len() + 1 {
+                    return Err(invalid());
+                }
+                for i in 0..args.len() {
+                    if dtype_of(i)? != DType::Bool {
+                        return Err(PyTypeError::new_err(
+                            "The conditions of select should be of dtype bool!",
+                        ));
+                    }
+                }
+                (
+                    Instr::Select(args.clone(), Buffer::from_list(dtype, choices)?),
+                    dtype,
+                )
+            }
+            _ => {
+                let op = Op::new(&name).ok_or_else(invalid)?;
+                let (x, y) = (dtype_of(0)?, dtype_of(1)?);
+                match op.dtype(x) {
+                    Some(dtype) if x == y => (Instr::Binary(op, arg(0)?, arg(1)?), dtype),
+                    _ => {
+                        return Err(PyTypeError::new_err(format!(
+                            "{} does not support dtypes {} and {}!",
+                            name,
+                            x.name(),
+                            y.name()
+                        )))
+                    }
+                }
+            }
+        };
+        result.push(instr);
+    }
+    if result.is_empty() {
+        return Err(invalid());
+    }
+    Ok(result)
+}
+
+fn _dtype(list: &AnyList) -> DType {
+    match list {
+        AnyList::Bool(_) => DType::Bool,
+        AnyList::Float32(_) => DType::Float32,
+        AnyList::Float64(_) => DType::Float64,
+        AnyList::Int32(_) => DType::Int32,
+        AnyList::Int64(_) => DType::Int64,
+        _ => unreachable!("Only the lists above are evaluated."),
+    }
+}
+
+fn _size(list: &AnyList) -> usize {
+    match list {
+        AnyList::Bool(x) => x.size(),
+        AnyList::Float32(x) => x.size(),
+        AnyList::Float64(x) => x.size(),
+        AnyList::Int32(x) => x.size(),
+        AnyList::Int64(x) => x.size(),
+        _ => unreachable!("Only the lists above are evaluated."),
+    }
+}
+
+/// Values of the input lists, borrowed while the expression is evaluated.
+enum Borrowed<'a> {
+    Bool(Ref<'a, Bitmap>),
+    Float32(Ref<'a, [f32]>),
+    Float64(Ref<'a, [f64]>),
+    Int32(Ref<'a, [i32]>),
+    Int64(Ref<'a, [i64]>),
+}
+
+/// Values of an input list, which can be shared by the thread pool.
+enum Column<'a> {
+    Bool(&'a Bitmap),
+    Float32(&'a [f32]),
+    Float64(&'a [f64]),
+    Int32(&'a [i32]),
+    Int64(&'a [i64]),
+}
+
+/// The rows of the register `result` where all the predicates are True.
+fn _collect(
+    program: &[(Instr, DType)],
+    lists: &[AnyList],
+    len: usize,
+    result: usize,
+    predicates: &[usize],
+) -> AnyList {
+    _with_inputs(lists, |inputs| {
+        let dtype = program[result].1;
+        let func = |start: usize, end: usize| {
+            let mut chunk = Chunk::new(program, inputs);
+            let mut output = Output::new(dtype);
+            for offset in (start..end).step_by(CHUNK) {
+                chunk.seek(offset, CHUNK.min(end - offset));
+                chunk.collect(result, predicates, &mut output);
+            }
+            output
+        };
+        _eval_groups(len, func, Output::extend).into_list()
+    })
+}
+
+/// The sum of the rows of the register `result` where all the predicates
+/// are True, which never allocates these rows.
+fn _sum(
+    program: &[(Instr, DType)],
+    lists: &[AnyList],
+    len: usize,
+    result: usize,
+    predicates: &[usize],
+) -> Summary {
+    _with_inputs(lists, |inputs| {
+        let dtype = program[result].1;
+        let func = |start: usize, end: usize| {
+            let mut chunk = Chunk::new(program, inputs);
+            let mut summary = Summary::new(dtype);
+            for offset in (start..end).step_by(CHUNK) {
+                chunk.seek(offset, CHUNK.min(end - offset));
+                chunk.sum(result, predicates, &mut summary);
+            }
+            summary
+        };
+        _eval_groups(len, func, Summary::merge)
+    })
+}
+
+/// Borrow the values of the lists for `func`.
+fn _with_inputs<R>(lists: &[AnyList], func: impl FnOnce(&[(Column, &Bitmap)]) -> R) -> R {
+    let borrowed: Vec<(Borrowed, Ref<Bitmap>)> = lists
+        .iter()
+        .map(|list| match list {
+            AnyList::Bool(x) => (Borrowed::Bool(x.values()), x.validity()),
+            AnyList::Float32(x) => (Borrowed::Float32(x.values()), x.validity()),
+            AnyList::Float64(x) => (Borrowed::Float64(x.values()), x.validity()),
+            AnyList::Int32(x) => (Borrowed::Int32(x.values()), x.validity()),
+            AnyList::Int64(x) => (Borrowed::Int64(x.values()), x.validity()),
+            _ => unreachable!("Only the lists above are evaluated."),
+        })
+        .collect();
+    let inputs: Vec<(Column, &Bitmap)> = borrowed
+        .iter()
+        .map(|(values, validity)| {
+            let column = match values {
+                Borrowed::Bool(x) => Column::Bool(x),
+                Borrowed::Float32(x) => Column::Float32(x),
+                Borrowed::Float64(x) => Column::Float64(x),
+                Borrowed::Int32(x) => Column::Int32(x),
+                Borrowed::Int64(x) => Column::Int64(x),
+            };
+            (column, &**validity)
+        })
+        .collect();
+    func(&inputs)
+}
+
+/// Evaluate `func(start, end)` for the groups of rows, where `start` is a
+/// multiple of `CHUNK`, and merge the results in the order of the rows. The
+/// groups are evaluated by the thread pool for long lists.
+fn _eval_groups<R: Send>(
+    len: usize,
+    func: impl Fn(usize, usize) -> R + Send + Sync,
+    merge: impl Fn(R, R) -> R,
+) -> R {
+    if parallel::_is_parallel(len) && len > GROUP {
+        let results: Vec<R> = (0..(len + GROUP - 1) / GROUP)
+            .into_par_iter()
+            .map(|k| func(k * GROUP, len.min((k + 1) * GROUP)))
+            .collect();
+        results
+            .into_iter()
+            .reduce(merge)
+            .expect("There are at least two groups.")
+    } else {
+        func(0, len)
+    }
+}
+
+/// Registers of a program for a chunk of rows. The registers are evaluated
+/// on demand, so that the ones which do not change the result of the chunk
+/// are skipped.
+struct Chunk<'a> {
+    program: &'a [(Instr, DType)],
+    inputs: &'a [(Column<'a>, &'a Bitmap)],
+    registers: Vec<Register>,
+    done: Vec<bool>,
+    offset: usize,
+    n: usize,
+}
+
+impl<'a> Chunk<'a> {
+    // Arrange the following methods in alphabetical order.
+
+    fn new(program: &'a [(Instr, DType)], inputs: &'a [(Column<'a>, &'a Bitmap)]) -> Self {
+        Chunk {
+            program,
+            inputs,
+            registers: program.iter().map(Register::new).collect(),
+            done: vec![false; program.len()],
+            offset: 0,
+            n: 0,
+        }
+    }
+
+    /// Append the rows of the chunk in the `i`-th register to the result.
+    fn collect(&mut self, i: usize, predicates: &[usize], output: &mut Output) {
+        if predicates.is_empty() {
+            self.eval(i);
+            output.append(&self.registers[i], self.n);
+        } else if let Some(mask) = self.mask(predicates) {
+            self.eval(i);
+            output.append_masked(&self.registers[i], &mask);
+        }
+    }
+
+    /// Evaluate the `i`-th register and the registers it depends on.
+    fn eval(&mut self, i: usize) {
+        if self.done[i] {
+            return;
+        }
+        let program = self.program;
+        match &program[i].0 {
+            Instr::Astype(j) | Instr::Not(j) | Instr::Pow(j, _) => self.eval(*j),
+            Instr::Binary(_, j, k) => {
+                self.eval(*j);
+                self.eval(*k);
+            }
+            Instr::Col(_) | Instr::Lit(_) => (),
+            Instr::Select(conditions, choices) => self.select(i, conditions, choices),
+        }
+        let (done, rest) = self.registers.split_at_mut(i);
+        rest[0].eval(&program[i].0, done, self.inputs, self.offset, self.n);
+        self.done[i] = true;
+    }
+
+    /// The rows of the chunk where all the predicates are True, None if
+    /// there is no such row. The predicates after the one which rejects all
+    /// the rows are not evaluated.
+    fn mask(&mut self, predicates: &[usize]) -> Option<Vec<u64>> {
+        let mut mask = _ones(self.n);
+        for &i in predicates.iter() {
+            if mask.iter().all(|&w| w == 0) {
+                return None;
+            }
+            self.eval(i);
+            let x = &self.registers[i];
+            if let Buffer::Bool(values) = &x.values {
+                for (k, w) in mask.iter_mut().enumerate() {
+                    *w &= values[k] & x.validity[k];
+                }
+            }
+        }
+        if mask.iter().all(|&w| w == 0) {
+            return None;
+        }
+        Some(mask)
+    }
+
+    /// Move to the `n` rows from `offset`.
+    fn seek(&mut self, offset: usize, n: usize) {
+        self.offset = offset;
+        self.n = n;
+        for x in self.done.iter_mut() {
+            *x = false;
+        }
+    }
+
+    /// Evaluate the conditions of the `i`-th register in order, and set
+    /// each row to the choice of the first condition which is True for it.
+    /// The conditions after all the rows are decided are not evaluated.
+    fn select(&mut self, i: usize, conditions: &[usize], choices: &Buffer) {
+        let rows = _ones(self.n);
+        let mut decided = vec![0; rows.len()];
+        for (k, &j) in conditions.iter().enumerate() {
+            if decided == rows {
+                break;
+            }
+            self.eval(j);
+            let (done, rest) = self.registers.split_at_mut(i);
+            let x = &done[j];
+            let chosen: Vec<u64> = match &x.values {
+                Buffer::Bool(values) => (0..rows.len())
+                    .map(|w| values[w] & x.validity[w] & !decided[w])
+                    .collect(),
+                _ => unreachable!("Checked by `_parse`."),
+            };
+            for (w, &c) in decided.iter_mut().zip(chosen.iter()) {
+                *w |= c;
+            }
+            rest[0].values.choose(&chosen, choices, k);
+        }
+        let rest: Vec<u64> = rows
+            .iter()
+            .zip(decided.iter())
+            .map(|(&r, &d)| r & !d)
+            .collect();
+        self.registers[i]
+            .values
+            .choose(&rest, choices, conditions.len());
+    }
+
+    /// Add the rows of the chunk in the `i`-th register to the sum.
+    fn sum(&mut self, i: usize, predicates: &[usize], summary: &mut Summary) {
+        if let Some(mask) = self.mask(predicates) {
+            self.eval(i);
+            summary.add(&self.registers[i], &mask);
+        }
+    }
+}
+
+/// Values of a chunk of rows. The bool values are packed into words like
+/// `Bitmap`.
+#[derive(Clone)]
+enum Buffer {
+    Bool(Vec<u64>),
+    Float32(Vec<f32>),
+    Float64(Vec<f64>),
+    Int32(Vec<i32>),
+    Int64(Vec<i64>),
+}
+
+impl Buffer {
+    // Arrange the following methods in alphabetical order.
+
+    fn new(dtype: DType) -> Self {
+        match dtype {
+            DType::Bool => Buffer::Bool(vec![0; CHUNK / WORD_BITS]),
+            DType::Float32 => Buffer::Float32(vec![0.0; CHUNK]),
+            DType::Float64 => Buffer::Float64(vec![0.0; CHUNK]),
+            DType::Int32 => Buffer::Int32(vec![0; CHUNK]),
+            DType::Int64 => Buffer::Int64(vec![0; CHUNK]),
+        }
+    }
+
+    /// Set the `rows` to the `k`-th element of `choices`.
+    fn choose(&mut self, rows: &[u64], choices: &Buffer, k: usize) {
+        match (self, choices) {
+            (Buffer::Bool(x), Buffer::Bool(y)) => {
+                let value = if _bit(y, k) { u64::MAX } else { 0 };
+                for (w, &r) in x.iter_mut().zip(rows.iter()) {
+                    *w = (*w & !r) | (value & r);
+                }
+            }
+            (Buffer::Float32(x), Buffer::Float32(y)) => _choose(x, rows, y[k]),
+            (Buffer::Float64(x), Buffer::Float64(y)) => _choose(x, rows, y[k]),
+            (Buffer::Int32(x), Buffer::Int32(y)) => _choose(x, rows, y[k]),
+            (Buffer::Int64(x), Buffer::Int64(y)) => _choose(x, rows, y[k]),
+            _ => unreachable!("The choices have the dtype of the register."),
+        }
+    }
+
+    /// A chunk filled with the scalar `value` of `dtype`.
+    fn fill(dtype: DType, value: &PyAny) -> PyResult<Self> {
+        let result = match dtype {
+            DType::Bool => {
+                let word = if value.extract()? { u64::MAX } else { 0 };
+                Buffer::Bool(vec![word; CHUNK / WORD_BITS])
+            }
+            DType::Float32 => Buffer::Float32(vec![value.extract()?; CHUNK]),
+            DType::Float64 => Buffer::Float64(vec![value.extract()?; CHUNK]),
+            DType::Int32 => Buffer::Int32(vec![value.extract()?; CHUNK]),
+            DType::Int64 => Buffer::Int64(vec![value.extract()?; CHUNK]),
+        };
+        Ok(result)
+    }
+
+    /// The elements of the Python list `value` of `dtype`.
+    fn from_list(dtype: DType, value: &PyAny) -> PyResult<Self> {
+        let result = match dtype {
+            DType::Bool => {
+                let x: Vec<bool> = value.extract()?;
+                let mut words = vec![0; _n_words(x.len())];
+                _pack(x.len(), &mut words, |i| x[i]);
+                Buffer::Bool(words)
+            }
+            DType::Float32 => Buffer::Float32(value.extract()?),
+            DType::Float64 => Buffer::Float64(value.extract()?),
+            DType::Int32 => Buffer::Int32(value.extract()?),
+            DType::Int64 => Buffer::Int64(value.extract()?),
+        };
+        Ok(result)
+    }
+}
+
+/// Register of one instruction, which holds its result for a chunk of
+/// rows.
+struct Register {
+    values: Buffer,
+    validity: Vec<u64>,
+}
+
+impl Register {
+    // Arrange the following methods in alphabetical order.
+
+    fn new((instr, dtype): &(Instr, DType)) -> Self {
+        let values = match instr {
+            // The literal is written once for all the chunks.
+            Instr::Lit(x) => x.clone(),
+            _ => Buffer::new(*dtype),
+        };
+        Register {
+            values,
+            validity: vec![u64::MAX; CHUNK / WORD_BITS],
+        }
+    }
+
+    /// Evaluate `instr` on the `n` rows from `offset`, where `registers`
+    /// are the registers of the previous instructions.
+    fn eval(
+        &mut self,
+        instr: &Instr,
+        registers: &[Register],
+        inputs: &[(Column, &Bitmap)],
+        offset: usize,
+        n: usize,
+    ) {
+        let n_words = _n_words(n);
+        match instr {
+            Instr::Astype(i) => {
+                _astype(&registers[*i].values, &mut self.values, n);
+                self.validity[..n_words].copy_from_slice(&registers[*i].validity[..n_words]);
+            }
+            Instr::Binary(op, i, j) => {
+                let (x, y) = (&registers[*i], &registers[*j]);
+                _binary(*op, &x.values, &y.values, &mut self.values, n);
+                for (k, w) in self.validity[..n_words].iter_mut().enumerate() {
+                    *w = x.validity[k] & y.validity[k];
+                }
+            }
+            Instr::Col(i) => {
+                let (column, validity) = &inputs[*i];
+                let (start, end) = (offset, offset + n);
+                let words = offset / WORD_BITS..offset / WORD_BITS + n_words;
+                match (column, &mut self.values) {
+                    (Column::Bool(x), Buffer::Bool(y)) => {
+                        y[..n_words].copy_from_slice(&x.words()[words.clone()])
+                    }
+                    (Column::Float32(x), Buffer::Float32(y)) => {
+                        y[..n].copy_from_slice(&x[start..end])
+                    }
+                    (Column::Float64(x), Buffer::Float64(y)) => {
+                        y[..n].copy_from_slice(&x[start..end])
+                    }
+                    (Column::Int32(x), Buffer::Int32(y)) => y[..n].copy_from_slice(&x[start..end]),
+                    (Column::Int64(x), Buffer::Int64(y)) => y[..n].copy_from_slice(&x[start..end]),
+                    _ => unreachable!("The register has the dtype of the column."),
+                }
+                self.validity[..n_words].copy_from_slice(&validity.words()[words]);
+            }
+            // The rows of select are written by `Chunk::select`.
+            Instr::Lit(_) | Instr::Select(..) => (),
+            Instr::Not(i) => {
+                let x = &registers[*i];
+                match (&x.values, &mut self.values) {
+                    (Buffer::Bool(x), Buffer::Bool(y)) => _map(&x[..n_words], y, |a| !a),
+                    _ => unreachable!("Checked by `_parse`."),
+                }
+                self.validity[..n_words].copy_from_slice(&x.validity[..n_words]);
+            }
+            Instr::Pow(i, exp) => {
+                let x = &registers[*i];
+                match (&x.values, &mut self.values) {
+                    (Buffer::Float32(x), Buffer::Float32(y)) => _map(&x[..n], y, |a| a.powi(*exp)),
+                    (Buffer::Float64(x), Buffer::Float64(y)) => _map(&x[..n], y, |a| a.powi(*exp)),
+                    (Buffer::Int32(x), Buffer::Int32(y)) => {
+                        _map(&x[..n], y, |a| a.pow(*exp as u32))
+                    }
+                    (Buffer::Int64(x), Buffer::Int64(y)) => {
+                        _map(&x[..n], y, |a| a.pow(*exp as u32))
+                    }
+                    _ => unreachable!("Checked by `_parse`."),
+                }
+                self.validity[..n_words].copy_from_slice(&x.validity[..n_words]);
+            }
+        }
+    }
+}
+
+/// Result of `eval_expr`, which is appended by chunks.
+struct Output {
+    values: Values,
+    validity: Bitmap,
+}
+
+enum Values {
+    Bool(Bitmap),
+    Float32(Vec<f32>),
+    Float64(Vec<f64>),
+    Int32(Vec<i32>),
+    Int64(Vec<i64>),
+}
+
+impl Output {
+    // Arrange the following methods in alphabetical order.
+
+    fn new(dtype: DType) -> Self {
+        let values = match dtype {
+            DType::Bool => Values::Bool(Bitmap::default()),
+            DType::Float32 => Values::Float32(Vec::new()),
+            DType::Float64 => Values::Float64(Vec::new()),
+            DType::Int32 => Values::Int32(Vec::new()),
+            DType::Int64 => Values::Int64(Vec::new()),
+        };
+        Output {
+            values,
+            validity: Bitmap::default(),
+        }
+    }
+
+    /// Append the first `n` rows of the register, where the missing values
+    /// are set to the na value.
+    fn append(&mut self, x: &Register, n: usize) {
+        let words = &x.validity[.._n_words(n)];
+        match (&x.values, &mut self.values) {
+            (Buffer::Bool(x), Values::Bool(y)) => {
+                let x = x.iter().zip(words.iter()).map(|(&x, &v)| x & v).collect();
+                y.extend(&Bitmap::from_words(x, n));
+            }
+            (Buffer::Float32(x), Values::Float32(y)) => _store(&x[..n], words, y),
+            (Buffer::Float64(x), Values::Float64(y)) => _store(&x[..n], words, y),
+            (Buffer::Int32(x), Values::Int32(y)) => _store(&x[..n], words, y),
+            (Buffer::Int64(x), Values::Int64(y)) => _store(&x[..n], words, y),
+            _ => unreachable!("The result has the dtype of the register."),
+        }
+        self.validity.extend(&Bitmap::from_words(words.to_vec(), n));
+    }
+
+    /// Append the rows of the register in `mask`, like `append`.
+    fn append_masked(&mut self, x: &Register, mask: &[u64]) {
+        let words = &x.validity;
+        match (&x.values, &mut self.values) {
+            (Buffer::Bool(x), Values::Bool(y)) => {
+                for i in _iter_ones(mask) {
+                    y.push(_bit(x, i) && _bit(words, i));
+                }
+            }
+            (Buffer::Float32(x), Values::Float32(y)) => _store_masked(x, words, mask, y),
+            (Buffer::Float64(x), Values::Float64(y)) => _store_masked(x, words, mask, y),
+            (Buffer::Int32(x), Values::Int32(y)) => _store_masked(x, words, mask, y),
+            (Buffer::Int64(x), Values::Int64(y)) => _store_masked(x, words, mask, y),
+            _ => unreachable!("The result has the dtype of the register."),
+        }
+        for i in _iter_ones(mask) {
+            self.validity.push(_bit(words, i));
+        }
+    }
+
+    fn extend(mut self, other: Self) -> Self {
+        match (&mut self.values, &other.values) {
+            (Values::Bool(x), Values::Bool(y)) => x.extend(y),
+            (Values::Float32(x), Values::Float32(y)) => x.extend_from_slice(y),
+            (Values::Float64(x), Values::Float64(y)) => x.extend_from_slice(y),
+            (Values::Int32(x), Values::Int32(y)) => x.extend_from_slice(y),
+            (Values::Int64(x), Values::Int64(y)) => x.extend_from_slice(y),
+            _ => unreachable!("The results have the same dtype."),
+        }
+        self.validity.extend(&other.validity);
+        self
+    }
+
+    fn into_list(self) -> AnyList {
+        let validity = self.validity;
+        match self.values {
+            Values::Bool(x) => AnyList::Bool(BooleanList::_new(x, validity)),
+            Values::Float32(x) => AnyList::Float32(FloatList32::_new(x, validity)),
+            Values::Float64(x) => AnyList::Float64(FloatList64::_new(x, validity)),
+            Values::Int32(x) => AnyList::Int32(IntegerList32::_new(x, validity)),
+            Values::Int64(x) => AnyList::Int64(IntegerList64::_new(x, validity)),
+        }
+    }
+}
+
+/// Result of `eval_sum`, which is added by chunks.
+struct Summary {
+    sum: Sum,
+    size: usize,
+    count_na: usize,
+}
+
+/// Sum of the valid elements, which is the count of True for bool.
+enum Sum {
+    Bool(usize),
+    Float32(f32),
+    Float64(f64),
+    Int32(i32),
+    Int64(i64),
+}
+
+impl Summary {
+    // Arrange the following methods in alphabetical order.
+
+    fn new(dtype: DType) -> Self {
+        let sum = match dtype {
+            DType::Bool => Sum::Bool(0),
+            DType::Float32 => Sum::Float32(0.0),
+            DType::Float64 => Sum::Float64(0.0),
+            DType::Int32 => Sum::Int32(0),
+            DType::Int64 => Sum::Int64(0),
+        };
+        Summary {
+            sum,
+            size: 0,
+            count_na: 0,
+        }
+    }
+
+    /// Add the rows of the register in `mask`.
+    fn add(&mut self, x: &Register, mask: &[u64]) {
+        let valid: Vec<u64> = mask
+            .iter()
+            .zip(x.validity.iter())
+            .map(|(&m, &v)| m & v)
+            .collect();
+        let size: usize = mask.iter().map(|w| w.count_ones() as usize).sum();
+        let n_valid: usize = valid.iter().map(|w| w.count_ones() as usize).sum();
+        self.size += size;
+        self.count_na += size - n_valid;
+        match (&x.values, &mut self.sum) {
+            (Buffer::Bool(x), Sum::Bool(y)) => {
+                *y += x
+                    .iter()
+                    .zip(valid.iter())
+                    .map(|(&x, &v)| (x & v).count_ones() as usize)
+                    .sum::<usize>()
+            }
+            (Buffer::Float32(x), Sum::Float32(y)) => {
+                *y = _iter_ones(&valid).fold(*y, |acc, i| acc + x[i])
+            }
+            (Buffer::Float64(x), Sum::Float64(y)) => {
+                *y = _iter_ones(&valid).fold(*y, |acc, i| acc + x[i])
+            }
+            (Buffer::Int32(x), Sum::Int32(y)) => {
+                *y = _iter_ones(&valid).fold(*y, |acc, i| acc + x[i])
+            }
+            (Buffer::Int64(x), Sum::Int64(y)) => {
+                *y = _iter_ones(&valid).fold(*y, |acc, i| acc + x[i])
+            }
+            _ => unreachable!("The sum has the dtype of the register."),
+        }
+    }
+
+    fn merge(mut self, other: Self) -> Self {
+        self.sum = match (self.sum, other.sum) {
+            (Sum::Bool(x), Sum::Bool(y)) => Sum::Bool(x + y),
+            (Sum::Float32(x), Sum::Float32(y)) => Sum::Float32(x + y),
+            (Sum::Float64(x), Sum::Float64(y)) => Sum::Float64(x + y),
+            (Sum::Int32(x), Sum::Int32(y)) => Sum::Int32(x + y),
+            (Sum::Int64(x), Sum::Int64(y)) => Sum::Int64(x + y),
+            _ => unreachable!("The sums have the same dtype."),
+        };
+        self.size += other.size;
+        self.count_na += other.count_na;
+        self
+    }
+}
+
+impl IntoPy<PyObject> for Summary {
+    fn into_py(self, py: Python) -> PyObject {
+        let sum = match self.sum {
+            Sum::Bool(x) => x.into_py(py),
+            Sum::Float32(x) => x.into_py(py),
+            Sum::Float64(x) => x.into_py(py),
+            Sum::Int32(x) => x.into_py(py),
+            Sum::Int64(x) => x.into_py(py),
+        };
+        (sum, self.size, self.count_na).into_py(py)
+    }
+}
+
+/// Element of the numerical registers.
+trait Num:
+    Copy
+    + Default
+    + PartialOrd
+    + Add<Output = Self>
+    + Div<Output = Self>
+    + Mul<Output = Self>
+    + Sub<Output = Self>
+{
+    const IS_FLOAT: bool;
+
+    fn from_f64(x: f64) -> Self;
+    fn from_i64(x: i64) -> Self;
+    fn to_f64(self) -> f64;
+    fn to_i64(self) -> i64;
+}
+
+macro_rules! impl_num {
+    ($t:ty, $is_float:expr) => {
+        impl Num for $t {
+            const IS_FLOAT: bool = $is_float;
+
+            fn from_f64(x: f64) -> Self {
+                x as $t
+            }
+
+            fn from_i64(x: i64) -> Self {
+                x as $t
+            }
+
+            fn to_f64(self) -> f64 {
+                self as f64
+            }
+
+            fn to_i64(self) -> i64 {
+                self as i64
+            }
+        }
+    };
+}
+
+impl_num!(f32, true);
+impl_num!(f64, true);
+impl_num!(i32, false);
+impl_num!(i64, false);
+
+fn _astype(x: &Buffer, y: &mut Buffer, n: usize) {
+    match x {
+        Buffer::Bool(x) => {
+            let bit = |i: usize| _bit(x, i) as u8;
+            match y {
+                Buffer::Bool(y) => y.copy_from_slice(x),
+                Buffer::Float32(y) => _map_index(&mut y[..n], |i| bit(i) as f32),
+                Buffer::Float64(y) => _map_index(&mut y[..n], |i| bit(i) as f64),
+                Buffer::Int32(y) => _map_index(&mut y[..n], |i| bit(i) as i32),
+                Buffer::Int64(y) => _map_index(&mut y[..n], |i| bit(i) as i64),
+            }
+        }
+        Buffer::Float32(x) => _cast(&x[..n], y),
+        Buffer::Float64(x) => _cast(&x[..n], y),
+        Buffer::Int32(x) => _cast(&x[..n], y),
+        Buffer::Int64(x) => _cast(&x[..n], y),
+    }
+}
+
+/// Cast the elements like `as`, which is done by the way of f64 for floats
+/// and of i64 for integers without changing the results.
+fn _cast<T: Num>(x: &[T], y: &mut Buffer) {
+    match y {
+        Buffer::Bool(y) => _pack(x.len(), y, |i| x[i] != T::default()),
+        Buffer::Float32(y) => _map(x, y, |a| _cast_num(a)),
+        Buffer::Float64(y) => _map(x, y, |a| _cast_num(a)),
+        Buffer::Int32(y) => _map(x, y, |a| _cast_num(a)),
+        Buffer::Int64(y) => _map(x, y, |a| _cast_num(a)),
+    }
+}
+
+fn _cast_num<T: Num, U: Num>(x: T) -> U {
+    if T::IS_FLOAT {
+        U::from_f64(x.to_f64())
+    } else {
+        U::from_i64(x.to_i64())
+    }
+}
+
+fn _bit(words: &[u64], i: usize) -> bool {
+    (words[i / WORD_BITS] >> (i % WORD_BITS)) & 1 == 1
+}
+
+fn _binary(op: Op, x: &Buffer, y: &Buffer, z: &mut Buffer, n: usize) {
+    match (x, y, z) {
+        (Buffer::Bool(x), Buffer::Bool(y), Buffer::Bool(z)) => {
+            let (x, y) = (&x[.._n_words(n)], &y[.._n_words(n)]);
+            match op {
+                Op::And => _zip(x, y, z, |a, b| a & b),
+                Op::Equal => _zip(x, y, z, |a, b| !(a ^ b)),
+                Op::NotEqual => _zip(x, y, z, |a, b| a ^ b),
+                Op::Or => _zip(x, y, z, |a, b| a | b),
+                _ => unreachable!("Checked by `_parse`."),
+            }
+        }
+        (Buffer::Float32(x), Buffer::Float32(y), Buffer::Float32(z)) => _arith(op, &x[..n], y, z),
+        (Buffer::Float64(x), Buffer::Float64(y), Buffer::Float64(z)) => _arith(op, &x[..n], y, z),
+        (Buffer::Int32(x), Buffer::Int32(y), Buffer::Int32(z)) => _arith(op, &x[..n], y, z),
+        (Buffer::Int64(x), Buffer::Int64(y), Buffer::Int64(z)) => _arith(op, &x[..n], y, z),
+        (Buffer::Float32(x), Buffer::Float32(y), Buffer::Bool(z)) => _cmp(op, &x[..n], y, z),
+        (Buffer::Float64(x), Buffer::Float64(y), Buffer::Bool(z)) => _cmp(op, &x[..n], y, z),
+        (Buffer::Int32(x), Buffer::Int32(y), Buffer::Bool(z)) => _cmp(op, &x[..n], y, z),
+        (Buffer::Int64(x), Buffer::Int64(y), Buffer::Bool(z)) => _cmp(op, &x[..n], y, z),
+        _ => unreachable!("Checked by `_parse`."),
+    }
+}
+
+fn _arith<T: Num>(op: Op, x: &[T], y: &[T], z: &mut [T]) {
+    match op {
+        Op::Add => _zip(x, y, z, |a, b| a + b),
+        Op::Div => _zip(x, y, z, |a, b| a / b),
+        Op::Mul => _zip(x, y, z, |a, b| a * b),
+        Op::Sub => _zip(x, y, z, |a, b| a - b),
+        _ => unreachable!("Checked by `_parse`."),
+    }
+}
+
+fn _cmp<T: Num>(op: Op, x: &[T], y: &[T], z: &mut [u64]) {
+    let n = x.len();
+    match op {
+        Op::Equal => _pack(n, z, |i| x[i] == y[i]),
+        Op::GreaterThan => _pack(n, z, |i| x[i] > y[i]),
+        Op::GreaterThanOrEqual => _pack(n, z, |i| x[i] >= y[i]),
+        Op::LessThan => _pack(n, z, |i| x[i] < y[i]),
+        Op::LessThanOrEqual => _pack(n, z, |i| x[i] <= y[i]),
+        Op::NotEqual => _pack(n, z, |i| x[i] != y[i]),
+        _ => unreachable!("Checked by `_parse`."),
+    }
+}
+
+fn _choose<T: Copy>(x: &mut [T], rows: &[u64], value: T) {
+    for i in _iter_ones(rows) {
+        x[i] = value;
+    }
+}
+
+/// Indexes of the set bits of `words`.
+fn _iter_ones(words: &[u64]) -> impl Iterator<Item = usize> + '_ {
+    words.iter().enumerate().flat_map(|(k, &word)| {
+        let mut word = word;
+        std::iter::from_fn(move || {
+            if word == 0 {
+                return None;
+            }
+            let i = word.trailing_zeros() as usize;
+            word &= word - 1;
+            Some(k * WORD_BITS + i)
+        })
+    })
+}
+
+/// Write `func(x)` for the elements of `x` to `y`.
+fn _map<T: Copy, U>(x: &[T], y: &mut [U], func: impl Fn(T) -> U) {
+    for (b, &a) in y.iter_mut().zip(x.iter()) {
+        *b = func(a);
+    }
+}
+
+fn _map_index<U>(y: &mut [U], func: impl Fn(usize) -> U) {
+    for (i, b) in y.iter_mut().enumerate() {
+        *b = func(i);
+    }
+}
+
+/// Words of `n` set bits.
+fn _ones(n: usize) -> Vec<u64> {
+    let mut words = vec![u64::MAX; _n_words(n)];
+    if let Some(last) = words.last_mut() {
+        *last = _tail_mask(n);
+    }
+    words
+}
+
+/// Pack the bits of `func(i)` for `i` in `0..n` into the words of `y`.
+fn _pack(n: usize, y: &mut [u64], func: impl Fn(usize) -> bool) {
+    for (k, w) in y[.._n_words(n)].iter_mut().enumerate() {
+        let start = k * WORD_BITS;
+        let end = n.min(start + WORD_BITS);
+        *w = (start..end).fold(0, |acc, i| acc | ((func(i) as u64) << (i - start)));
+    }
+}
+
+fn _store<T: Num>(x: &[T], words: &[u64], y: &mut Vec<T>) {
+    y.extend(
+        x.iter()
+            .enumerate()
+            .map(|(i, &a)| if _bit(words, i) { a } else { T::default() }),
+    );
+}
+
+fn _store_masked<T: Num>(x: &[T], words: &[u64], mask: &[u64], y: &mut Vec<T>) {
+    y.extend(_iter_ones(mask).map(|i| if _bit(words, i) { x[i] } else { T::default() }));
+}
+
+fn _zip<T: Copy>(x: &[T], y: &[T], z: &mut [T], func: impl Fn(T, T) -> T) {
+    for ((c, &a), &b) in z.iter_mut().zip(x.iter()).zip(y.iter()) {
+        *c = func(a, b);
+    }
+}
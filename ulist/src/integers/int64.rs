@@ -1,31 +1,52 @@
+use crate::arrow::to_capsules;
+use crate::arrow::ArrowExport;
 use crate::base::List;
+use crate::base::_check_range;
+use crate::base::_flatten;
+use crate::bitmap::Bitmap;
 use crate::boolean::BooleanList;
+use crate::export::array_interface;
+use crate::export::fill_view;
+use crate::export::release_view;
+use crate::export::Exports;
 use crate::floatings::FloatList32;
 use crate::floatings::FloatList64;
 use crate::index::IndexList;
 use crate::integers::IntegerList32;
 use crate::non_float::NonFloatList;
 use crate::numerical::NumericalList;
+use crate::numerical::Stats;
+use crate::parallel;
+use crate::shared::Shared;
+use crate::shared::SharedVec;
 use crate::string::StringList;
 use crate::types::AsBooleanList;
 use crate::types::AsFloatList32;
 use crate::types::AsFloatList64;
 use crate::types::AsIntegerList32;
 use crate::types::AsStringList;
+use pyo3::ffi;
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use pyo3::AsPyPointer;
+use std::cell::Cell;
 use std::cell::Ref;
-use std::cell::RefCell;
 use std::cell::RefMut;
 use std::collections::HashMap;
 use std::collections::HashSet;
+use std::os::raw::c_int;
+use std::os::raw::c_void;
+use std::ptr;
 
 /// List with i64 type elements.
 /// TODO: Use macro to generate codes by using IntegerList32's
 /// implementation
 #[pyclass]
 pub struct IntegerList64 {
-    _values: RefCell<Vec<i64>>,
-    _na_indexes: RefCell<HashSet<usize>>,
+    _values: SharedVec<i64>,
+    _validity: Shared<Bitmap>,
+    _stats: Cell<Option<Stats>>,
+    _exports: Exports,
 }
 
 #[pymethods]
@@ -34,51 +55,100 @@ impl IntegerList64 {
 
     #[new]
     pub fn new(vec: Vec<i64>, hset: HashSet<usize>) -> Self {
-        List::_new(vec, hset)
+        let validity = Bitmap::from_na_indexes(vec.len(), &hset);
+        List::_new(vec, validity)
     }
 
-    pub fn add(&self, other: &Self) -> PyResult<Self> {
-        NumericalList::add(self, other)
+    /// The numpy array interface, which exports the values like
+    /// `__getbuffer__` until the consumers of the data field are deleted.
+    #[getter]
+    fn __array_interface__(slf: PyRef<Self>, py: Python) -> PyResult<PyObject> {
+        let guard = slf._exports.guard();
+        let list = unsafe { PyObject::from_borrowed_ptr(py, slf.as_ptr()) };
+        array_interface(py, list, &slf.values(), guard)
     }
 
-    pub fn add_scala(&self, elem: i64) -> Self {
-        NumericalList::add_scala(self, elem)
+    /// Export the values as a read-only buffer without copying, the missing
+    /// values are exported as the na value.
+    unsafe fn __getbuffer__(
+        slf: PyRef<Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        fill_view(view, slf.as_ptr(), &slf.values(), flags)?;
+        slf._exports.acquire();
+        Ok(())
     }
 
-    pub fn all_equal(&self, other: &Self) -> Option<bool> {
-        List::all_equal(self, other)
+    unsafe fn __releasebuffer__(&self, view: *mut ffi::Py_buffer) {
+        release_view(view);
+        self._exports.release();
     }
 
-    pub fn append(&self, elem: Option<i64>) {
-        List::append(self, elem)
+    pub fn add(&self, other: &Self, py: Python) -> PyResult<Self> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::add(&list, &other))
     }
 
-    pub fn argmax(&self) -> PyResult<usize> {
+    pub fn add_into(&self, other: &Self, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        NumericalList::add_into(self, other, out)
+    }
+
+    pub fn add_scala(&self, elem: i64, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::add_scala(&list, elem))
+    }
+
+    pub fn add_scala_into(&self, elem: i64, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        NumericalList::add_scala_into(self, elem, out)
+    }
+
+    pub fn all_equal(&self, other: &Self, py: Python) -> Option<bool> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || List::all_equal(&list, &other))
+    }
+
+    pub fn append(&self, elem: Option<i64>) -> PyResult<()> {
+        self._exports.check()?;
+        List::append(self, elem);
+        Ok(())
+    }
+
+    pub fn argmax(&self, py: Python) -> PyResult<usize> {
+        self._cache_stats(py);
         NumericalList::argmax(self)
     }
 
-    pub fn argmin(&self) -> PyResult<usize> {
+    pub fn argmin(&self, py: Python) -> PyResult<usize> {
+        self._cache_stats(py);
         NumericalList::argmin(self)
     }
 
-    pub fn as_bool(&self) -> BooleanList {
-        AsBooleanList::as_bool(self)
+    pub fn as_bool(&self, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsBooleanList::as_bool(&list))
     }
 
-    pub fn as_float32(&self) -> FloatList32 {
-        AsFloatList32::as_float32(self)
+    pub fn as_float32(&self, py: Python) -> FloatList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList32::as_float32(&list))
     }
 
-    pub fn as_float64(&self) -> FloatList64 {
-        AsFloatList64::as_float64(self)
+    pub fn as_float64(&self, py: Python) -> FloatList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList64::as_float64(&list))
     }
 
-    pub fn as_int32(&self) -> IntegerList32 {
-        AsIntegerList32::as_int32(self)
+    pub fn as_int32(&self, py: Python) -> IntegerList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList32::as_int32(&list))
     }
 
-    pub fn as_str(&self) -> StringList {
-        AsStringList::as_str(self)
+    pub fn as_str(&self, py: Python) -> StringList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsStringList::as_str(&list))
     }
 
     #[staticmethod]
@@ -94,8 +164,9 @@ impl IntegerList64 {
         List::count_na(self)
     }
 
-    pub fn counter(&self) -> HashMap<i64, usize> {
-        NonFloatList::counter(self)
+    pub fn counter(&self, py: Python) -> HashMap<i64, usize> {
+        let list = self._snapshot();
+        py.allow_threads(move || NonFloatList::counter(&list))
     }
 
     #[staticmethod]
@@ -103,107 +174,224 @@ impl IntegerList64 {
         List::cycle(&vec, size)
     }
 
-    pub fn div(&self, other: &Self) -> PyResult<FloatList64> {
-        let hset: HashSet<usize> = self
-            .na_indexes()
-            .iter()
-            .chain(other.na_indexes().iter())
-            .copied()
-            .collect();
-        Ok(FloatList64::new(NumericalList::div(self, other)?, hset))
+    pub fn div(&self, other: &Self, py: Python) -> PyResult<FloatList64> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || {
+            let vec = NumericalList::div(&list, &other)?;
+            let validity = list.validity().and(&other.validity());
+            Ok(FloatList64::_new(vec, validity))
+        })
     }
 
-    pub fn div_scala(&self, elem: f64) -> FloatList64 {
-        let hset = self.na_indexes().clone();
-        FloatList64::new(NumericalList::div_scala(self, elem), hset)
+    pub fn div_into(&self, other: &Self, out: &FloatList64) -> PyResult<()> {
+        out._check_exports()?;
+        self._fn_into(other, out, 0.0, |x, y| x as f64 / y as f64)
     }
 
-    pub fn equal(&self, other: &Self) -> PyResult<BooleanList> {
-        List::equal(self, other)
+    pub fn div_scala(&self, elem: f64, py: Python) -> FloatList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let validity = list.validity().clone();
+            FloatList64::_new(NumericalList::div_scala(&list, elem), validity)
+        })
     }
 
-    pub fn equal_scala(&self, elem: i64) -> BooleanList {
-        List::equal_scala(self, elem)
+    pub fn div_scala_into(&self, elem: f64, out: &FloatList64) -> PyResult<()> {
+        out._check_exports()?;
+        self._fn_num_into(out, 0.0, |x| x as f64 / elem)
     }
 
-    pub fn filter(&self, condition: &BooleanList) -> PyResult<Self> {
-        List::filter(self, condition)
+    pub fn equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self.copy(), other.copy());
+        py.allow_threads(move || List::equal(&list, &other))
+    }
+
+    pub fn equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        List::equal_into(self, other, out)
+    }
+
+    pub fn equal_scala(&self, elem: i64, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || List::equal_scala(&list, elem))
+    }
+
+    pub fn equal_scala_into(&self, elem: i64, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        List::equal_scala_into(self, elem, out)
+    }
+
+    pub fn filter(&self, condition: &BooleanList, py: Python) -> PyResult<Self> {
+        let (list, condition) = (self.copy(), condition._snapshot());
+        py.allow_threads(move || List::filter(&list, &condition))
     }
 
     pub fn get(&self, index: usize) -> PyResult<Option<i64>> {
         List::get(self, index)
     }
 
-    pub fn get_by_indexes(&self, indexes: &IndexList) -> PyResult<Self> {
-        List::get_by_indexes(self, indexes)
+    pub fn get_by_indexes(&self, indexes: &IndexList, py: Python) -> PyResult<Self> {
+        let list = self._snapshot();
+        py.allow_threads(move || List::get_by_indexes(&list, indexes))
+    }
+
+    pub fn greater_than_or_equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::greater_than_or_equal(&list, &other))
+    }
+
+    pub fn greater_than_or_equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::greater_than_or_equal_into(self, other, out)
+    }
+
+    pub fn greater_than_or_equal_scala(&self, elem: i64, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::greater_than_or_equal_scala(&list, elem))
     }
 
-    pub fn greater_than_or_equal(&self, other: &Self) -> PyResult<BooleanList> {
-        NumericalList::greater_than_or_equal(self, other)
+    pub fn greater_than_or_equal_scala_into(&self, elem: i64, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::greater_than_or_equal_scala_into(self, elem, out)
     }
 
-    pub fn greater_than_or_equal_scala(&self, elem: i64) -> BooleanList {
-        NumericalList::greater_than_or_equal_scala(self, elem)
+    pub fn greater_than(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::greater_than(&list, &other))
     }
 
-    pub fn greater_than(&self, other: &Self) -> PyResult<BooleanList> {
-        NumericalList::greater_than(self, other)
+    pub fn greater_than_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::greater_than_into(self, other, out)
     }
 
-    pub fn greater_than_scala(&self, elem: i64) -> BooleanList {
-        NumericalList::greater_than_scala(self, elem)
+    pub fn greater_than_scala(&self, elem: i64, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::greater_than_scala(&list, elem))
     }
 
-    pub fn has_zero(&self) -> bool{
+    pub fn greater_than_scala_into(&self, elem: i64, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::greater_than_scala_into(self, elem, out)
+    }
+
+    pub fn has_zero(&self, py: Python) -> bool {
+        self._cache_stats(py);
         NumericalList::has_zero(self)
     }
 
-    pub fn less_than_or_equal(&self, other: &Self) -> PyResult<BooleanList> {
-        NumericalList::less_than_or_equal(self, other)
+    pub fn less_than_or_equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::less_than_or_equal(&list, &other))
+    }
+
+    pub fn less_than_or_equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::less_than_or_equal_into(self, other, out)
+    }
+
+    pub fn less_than_or_equal_scala(&self, elem: i64, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::less_than_or_equal_scala(&list, elem))
+    }
+
+    pub fn less_than_or_equal_scala_into(&self, elem: i64, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::less_than_or_equal_scala_into(self, elem, out)
     }
 
-    pub fn less_than_or_equal_scala(&self, elem: i64) -> BooleanList {
-        NumericalList::less_than_or_equal_scala(self, elem)
+    pub fn less_than(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::less_than(&list, &other))
     }
 
-    pub fn less_than(&self, other: &Self) -> PyResult<BooleanList> {
-        NumericalList::less_than(self, other)
+    pub fn less_than_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::less_than_into(self, other, out)
     }
 
-    pub fn less_than_scala(&self, elem: i64) -> BooleanList {
-        NumericalList::less_than_scala(self, elem)
+    pub fn less_than_scala(&self, elem: i64, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::less_than_scala(&list, elem))
     }
 
-    pub fn max(&self) -> PyResult<i64> {
+    pub fn less_than_scala_into(&self, elem: i64, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        NumericalList::less_than_scala_into(self, elem, out)
+    }
+
+    pub fn max(&self, py: Python) -> PyResult<i64> {
+        self._cache_stats(py);
         NumericalList::max(self)
     }
 
-    pub fn min(&self) -> PyResult<i64> {
+    pub fn min(&self, py: Python) -> PyResult<i64> {
+        self._cache_stats(py);
         NumericalList::min(self)
     }
 
-    pub fn mul(&self, other: &Self) -> PyResult<Self> {
-        NumericalList::mul(self, other)
+    pub fn n_chunks(&self) -> usize {
+        self._values.n_chunks()
+    }
+
+    pub fn mul(&self, other: &Self, py: Python) -> PyResult<Self> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::mul(&list, &other))
+    }
+
+    pub fn mul_into(&self, other: &Self, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        NumericalList::mul_into(self, other, out)
+    }
+
+    pub fn mul_scala(&self, elem: i64, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::mul_scala(&list, elem))
+    }
+
+    pub fn mul_scala_into(&self, elem: i64, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        NumericalList::mul_scala_into(self, elem, out)
     }
 
-    pub fn mul_scala(&self, elem: i64) -> Self {
-        NumericalList::mul_scala(self, elem)
+    pub fn not_equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self.copy(), other.copy());
+        py.allow_threads(move || List::not_equal(&list, &other))
     }
 
-    pub fn not_equal(&self, other: &Self) -> PyResult<BooleanList> {
-        List::not_equal(self, other)
+    pub fn not_equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        List::not_equal_into(self, other, out)
     }
 
-    pub fn not_equal_scala(&self, elem: i64) -> BooleanList {
-        List::not_equal_scala(self, elem)
+    pub fn not_equal_scala(&self, elem: i64, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || List::not_equal_scala(&list, elem))
     }
 
-    pub fn pop(&self) {
+    pub fn not_equal_scala_into(&self, elem: i64, out: &BooleanList) -> PyResult<()> {
+        out._check_exports()?;
+        List::not_equal_scala_into(self, elem, out)
+    }
+
+    pub fn pop(&self) -> PyResult<()> {
+        self._exports.check()?;
         List::pop(self);
+        Ok(())
+    }
+
+    pub fn pow_scala(&self, elem: u32, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::pow_scala(&list, elem))
+    }
+
+    pub fn pow_scala_into(&self, elem: u32, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        self._fn_num_to(out, |x| x.pow(elem))
     }
 
-    pub fn pow_scala(&self, elem: u32) -> Self {
-        NumericalList::pow_scala(self, elem)
+    pub fn rechunk(&self) {
+        List::rechunk(self)
     }
 
     #[staticmethod]
@@ -211,11 +399,14 @@ impl IntegerList64 {
         List::repeat(elem, size)
     }
 
-    pub fn replace(&self, old: Option<i64>, new: Option<i64>) {
-        List::replace(self, old, new)
+    pub fn replace(&self, old: Option<i64>, new: Option<i64>) -> PyResult<()> {
+        self._exports.check()?;
+        List::replace(self, old, new);
+        Ok(())
     }
 
     pub fn set(&self, index: usize, elem: Option<i64>) -> PyResult<()> {
+        self._exports.check()?;
         List::set(self, index, elem)
     }
 
@@ -223,20 +414,63 @@ impl IntegerList64 {
         List::size(self)
     }
 
-    pub fn sort(&self, ascending: bool) {
-        NonFloatList::sort(self, ascending)
+    pub fn slice(&self, start: usize, end: usize) -> PyResult<Self> {
+        _check_range(start, end, self.size())?;
+        Ok(List::slice(self, start, end))
+    }
+
+    pub fn sort(&self, ascending: bool, py: Python) -> PyResult<()> {
+        self._exports.check()?;
+        // Sort a snapshot while the GIL is released, then take its buffers.
+        let snapshot = self._snapshot();
+        let list = snapshot._snapshot();
+        let mut list = py.allow_threads(move || list._sorted(ascending));
+        // Self may be modified by another thread meanwhile, which replaces
+        // the buffers shared with the snapshot. Then it is sorted again
+        // with the GIL held, so that the modification is not lost.
+        if !(ptr::eq(&*self.values(), &*snapshot.values())
+            && ptr::eq(&*self.validity(), &*snapshot.validity()))
+        {
+            list = self._snapshot()._sorted(ascending);
+        }
+        // The buffers may be exported by another thread meanwhile.
+        self._exports.check()?;
+        self._values.replace(list._values);
+        self._validity.replace(list._validity);
+        self._stats.set(list._stats.get());
+        Ok(())
+    }
+
+    pub fn sub(&self, other: &Self, py: Python) -> PyResult<Self> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || NumericalList::sub(&list, &other))
+    }
+
+    pub fn sub_into(&self, other: &Self, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        NumericalList::sub_into(self, other, out)
     }
 
-    pub fn sub(&self, other: &Self) -> PyResult<Self> {
-        NumericalList::sub(self, other)
+    pub fn sub_scala(&self, elem: i64, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || NumericalList::sub_scala(&list, elem))
     }
 
-    pub fn sub_scala(&self, elem: i64) -> Self {
-        NumericalList::sub_scala(self, elem)
+    pub fn sub_scala_into(&self, elem: i64, out: &Self) -> PyResult<()> {
+        out._exports.check()?;
+        NumericalList::sub_scala_into(self, elem, out)
     }
 
-    pub fn sum(&self) -> i64 {
-        NumericalList::sum(self)
+    pub fn sum(&self, py: Python) -> i64 {
+        let list = self.copy();
+        py.allow_threads(move || NumericalList::sum(&list))
+    }
+
+    pub fn to_arrow_c(slf: PyRef<Self>, py: Python) -> PyResult<(PyObject, PyObject)> {
+        let values = slf.values().as_ptr() as *const c_void;
+        let export = ArrowExport::new("l", &slf.validity(), vec![values]);
+        let guard = slf._exports.guard();
+        to_capsules(py, slf.into_py(py), guard, export)
     }
 
     pub fn to_list(&self) -> Vec<Option<i64>> {
@@ -247,169 +481,186 @@ impl IntegerList64 {
         List::union_all(self, other)
     }
 
-    pub fn unique(&self) -> Self {
-        NonFloatList::unique(self)
+    pub fn unique(&self, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            // Only use the cached stats, an unsorted list is sorted anyway.
+            if list._stats.get().map_or(false, |s| s.is_sorted) {
+                return list._unique_sorted();
+            }
+            NonFloatList::unique(&list)
+        })
+    }
+
+    pub fn validity_buffer(&self, py: Python) -> PyObject {
+        PyBytes::new(py, &self.validity().to_bytes()).into_py(py)
     }
 }
 
-impl List<i64> for IntegerList64 {
-    fn _new(vec: Vec<i64>, hset: HashSet<usize>) -> Self {
+impl IntegerList64 {
+    /// Construct the list from the values, which may be borrowed from
+    /// a foreign owner.
+    pub fn _from_shared(values: SharedVec<i64>, validity: Bitmap) -> Self {
         Self {
-            _values: RefCell::new(vec),
-            _na_indexes: RefCell::new(hset),
+            _values: values,
+            _validity: Shared::new(validity),
+            _stats: Cell::default(),
+            _exports: Exports::default(),
         }
     }
 
-    fn na_indexes(&self) -> Ref<HashSet<usize>> {
-        self._na_indexes.borrow()
+    /// Sort self, which is a snapshot of a list.
+    fn _sorted(self, ascending: bool) -> Self {
+        NonFloatList::sort(&self, ascending);
+        // The statistics of the sorted list are found by binary searches.
+        if ascending {
+            let n = self.size() - self.count_na();
+            let stats = Stats::sorted(&self.values(), n, 0);
+            self._stats.set(Some(stats));
+        }
+        self
+    }
+}
+
+impl List<i64> for IntegerList64 {
+    fn _new(vec: Vec<i64>, validity: Bitmap) -> Self {
+        Self::_from_shared(SharedVec::new(vec), validity)
     }
 
-    fn na_indexes_mut(&self) -> RefMut<HashSet<usize>> {
-        self._na_indexes.borrow_mut()
+    fn copy(&self) -> Self {
+        Self {
+            _values: self._values.share(),
+            _validity: self._validity.share(),
+            _stats: self._stats.clone(),
+            _exports: Exports::default(),
+        }
     }
 
     fn na_value(&self) -> i64 {
         0
     }
 
-    fn values(&self) -> Ref<Vec<i64>> {
+    fn rechunk(&self) {
+        self._values.rechunk();
+        self._validity.rechunk();
+    }
+
+    fn size(&self) -> usize {
+        self._values.len()
+    }
+
+    fn slice(&self, start: usize, end: usize) -> Self {
+        Self {
+            _values: self._values.slice(start, end),
+            _validity: Shared::new(self.validity().slice(start, end)),
+            _stats: Cell::default(),
+            _exports: Exports::default(),
+        }
+    }
+
+    fn union_all(&self, other: &Self) -> Self {
+        Self {
+            _values: self._values.concat(&other._values),
+            _validity: self._validity.concat(&other._validity),
+            _stats: Cell::default(),
+            _exports: Exports::default(),
+        }
+    }
+
+    fn validity(&self) -> Ref<Bitmap> {
+        self._validity.borrow()
+    }
+
+    fn validity_mut(&self) -> RefMut<Bitmap> {
+        self._stats.set(None);
+        self._validity.borrow_mut()
+    }
+
+    fn values(&self) -> Ref<[i64]> {
         self._values.borrow()
     }
 
     fn values_mut(&self) -> RefMut<Vec<i64>> {
+        self._stats.set(None);
         self._values.borrow_mut()
     }
+
+    fn with_chunks<R>(&self, func: impl FnOnce(&[&[i64]], &[&Bitmap]) -> R) -> R {
+        self._values.with_chunks(|values| {
+            self._validity
+                .with_chunks(|validity| func(values, validity))
+        })
+    }
 }
 
 impl NonFloatList<i64> for IntegerList64 {}
 
 impl NumericalList<i64, u32, f64> for IntegerList64 {
-    fn argmax(&self) -> PyResult<usize> {
-        self._check_empty()?;
-        self._check_all_na()?;
-        let hset = self.na_indexes();
-        Ok(self
-            .values()
-            .iter()
-            .enumerate()
-            .filter(|(i, _)| !hset.contains(i))
-            .max_by_key(|x| x.1)
-            .unwrap()
-            .0)
-    }
-
-    fn argmin(&self) -> PyResult<usize> {
-        self._check_empty()?;
-        self._check_all_na()?;
-        let hset = self.na_indexes();
-        Ok(self
-            .values()
-            .iter()
-            .enumerate()
-            .filter(|(i, _)| !hset.contains(i))
-            .min_by_key(|x| x.1)
-            .unwrap()
-            .0)
+    fn _stats_cell(&self) -> &Cell<Option<Stats>> {
+        &self._stats
     }
 
     fn div(&self, other: &Self) -> PyResult<Vec<f64>> {
         self._check_len_eq(other)?;
-        let hset1 = self.na_indexes();
-        let hset2 = other.na_indexes();
-        Ok(self
-            .values()
-            .iter()
-            .enumerate()
-            .zip(other.values().iter())
-            .map(|((i, &x), &y)| {
-                if hset1.contains(&i) | hset2.contains(&i) {
-                    0.0
-                } else {
-                    x as f64 / y as f64
-                }
-            })
-            .collect())
+        let validity = self.validity().and(&other.validity());
+        Ok(parallel::zip_map_valid(
+            &self.values(),
+            &other.values(),
+            &validity,
+            0.0,
+            |x, y| x as f64 / y as f64,
+        ))
     }
 
     fn div_scala(&self, elem: f64) -> Vec<f64> {
-        self.values().iter().map(|x| *x as f64 / elem).collect()
-    }
-
-    fn max(&self) -> PyResult<i64> {
-        self._check_empty()?;
-        self._check_all_na()?;
-        let hset = self.na_indexes();
-        Ok(*self
-            .values()
-            .iter()
-            .enumerate()
-            .filter(|(i, _)| !hset.contains(i))
-            .map(|(_, x)| x)
-            .max()
-            .unwrap())
-    }
-
-    fn min(&self) -> PyResult<i64> {
-        self._check_empty()?;
-        self._check_all_na()?;
-        let hset = self.na_indexes();
-        Ok(*self
-            .values()
-            .iter()
-            .enumerate()
-            .filter(|(i, _)| !hset.contains(i))
-            .map(|(_, x)| x)
-            .min()
-            .unwrap())
+        self._fn_num(|x| x as f64 / elem, 0.0)
     }
 
     fn pow_scala(&self, elem: u32) -> Self {
-        let vec = self.values().iter().map(|&x| x.pow(elem)).collect();
-        let hset = self.na_indexes().clone();
-        IntegerList64::new(vec, hset)
+        let vec = self._fn_num(|x| x.pow(elem), 0);
+        let validity = self.validity().clone();
+        IntegerList64::_new(vec, validity)
     }
 
     fn sum(&self) -> i64 {
-        self.values().iter().sum()
+        self.with_chunks(|values, _| _flatten(values).sum())
     }
 }
 
 impl AsBooleanList for IntegerList64 {
     fn as_bool(&self) -> BooleanList {
-        let vec = self.values().iter().map(|&x| x != 0).collect();
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+        self._fn_mask(|&x| x != 0)
     }
 }
 
 impl AsFloatList32 for IntegerList64 {
     fn as_float32(&self) -> FloatList32 {
-        let vec = self.values().iter().map(|&x| x as f32).collect();
-        let hset = self.na_indexes().clone();
-        FloatList32::new(vec, hset)
+        let vec = parallel::map(&self.values(), |&x| x as f32);
+        let validity = self.validity().clone();
+        FloatList32::_new(vec, validity)
     }
 }
 
 impl AsFloatList64 for IntegerList64 {
     fn as_float64(&self) -> FloatList64 {
-        let vec = self.values().iter().map(|&x| x as f64).collect();
-        let hset = self.na_indexes().clone();
-        FloatList64::new(vec, hset)
+        let vec = parallel::map(&self.values(), |&x| x as f64);
+        let validity = self.validity().clone();
+        FloatList64::_new(vec, validity)
     }
 }
 
 impl AsIntegerList32 for IntegerList64 {
     fn as_int32(&self) -> IntegerList32 {
-        let vec = self.values().iter().map(|&x| x as i32).collect();
-        let hset = self.na_indexes().clone();
-        IntegerList32::new(vec, hset)
+        let vec = parallel::map(&self.values(), |&x| x as i32);
+        let validity = self.validity().clone();
+        IntegerList32::_new(vec, validity)
     }
 }
 
 impl AsStringList for IntegerList64 {
     fn as_str(&self) -> StringList {
         let vec = self.values().iter().map(|&x| x.to_string()).collect();
-        let hset = self.na_indexes().clone();
-        StringList::new(vec, hset)
+        let validity = self.validity().clone();
+        StringList::_new(vec, validity)
     }
 }
@@ -1,18 +1,21 @@
 mod int32;
 mod int64;
+use crate::base::List;
+use crate::bitmap::Bitmap;
 pub use int32::IntegerList32;
 pub use int64::IntegerList64;
 use pyo3::prelude::*;
-use std::collections::HashSet;
 
 #[pyfunction]
 pub fn arange32(start: i32, stop: i32, step: usize) -> IntegerList32 {
-    let vec = (start..stop).step_by(step).collect();
-    IntegerList32::new(vec, HashSet::new())
+    let vec: Vec<i32> = (start..stop).step_by(step).collect();
+    let validity = Bitmap::new(vec.len(), true);
+    List::_new(vec, validity)
 }
 
 #[pyfunction]
 pub fn arange64(start: i64, stop: i64, step: usize) -> IntegerList64 {
-    let vec = (start..stop).step_by(step).collect();
-    IntegerList64::new(vec, HashSet::new())
+    let vec: Vec<i64> = (start..stop).step_by(step).collect();
+    let validity = Bitmap::new(vec.len(), true);
+    List::_new(vec, validity)
 }
@@ -1,121 +1,776 @@
+use crate::base::List;
+use crate::base::_fill_na;
+use crate::bitmap::Bitmap;
 use crate::boolean::BooleanList;
+use crate::category::CategoryList;
 use crate::floatings::{FloatList32, FloatList64};
 use crate::integers::{IntegerList32, IntegerList64};
 use crate::string::StringList;
-use pyo3::exceptions::{PyIOError, PyTypeError, PyValueError};
+use crate::string_buffer::StringBuffer;
+use crate::types::AnyList;
+use memmap2::Mmap;
+use pyo3::buffer::Element;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyIOError, PyRuntimeError, PyTypeError, PyValueError};
 use pyo3::prelude::*;
-use std::collections::{HashMap, HashSet};
+use rayon::prelude::*;
+use std::cmp::{max, min};
+use std::collections::VecDeque;
+use std::fs::File;
+use std::io;
+use std::mem;
+use std::str;
 use std::str::FromStr;
 
+/// Minimum number of bytes parsed by one task of `read_csv`.
+const CSV_MIN_CHUNK: usize = 1 << 16;
+
+/// The dtypes inferred for the csv fields, from the narrowest to the widest.
+const INFERRED_DTYPES: [&str; 6] = ["bool", "int32", "int64", "float32", "float64", "string"];
+
+/// Construct a list of type `dtype` from an object which supports the
+/// buffer protocol, such as a numpy array, copying the values only once.
+/// The nonzero bytes of the optional `mask` buffer mark the missing values.
+#[pyfunction]
+pub fn from_buffer(
+    obj: &PyAny,
+    dtype: &str,
+    mask: Option<&PyAny>,
+    py: Python,
+) -> PyResult<PyObject> {
+    let res = match dtype {
+        "int" | "int64" => {
+            let (vec, validity) = read_buffer::<i64>(obj, mask, 0, py)?;
+            IntegerList64::_new(vec, validity).into_py(py)
+        }
+        "int32" => {
+            let (vec, validity) = read_buffer::<i32>(obj, mask, 0, py)?;
+            IntegerList32::_new(vec, validity).into_py(py)
+        }
+        "float" | "float64" => {
+            let (vec, validity) = read_buffer::<f64>(obj, mask, 0.0, py)?;
+            FloatList64::_new(vec, validity).into_py(py)
+        }
+        "float32" => {
+            let (vec, validity) = read_buffer::<f32>(obj, mask, 0.0, py)?;
+            FloatList32::_new(vec, validity).into_py(py)
+        }
+        "bool" => {
+            let (vec, validity) = read_buffer::<u8>(obj, mask, 0, py)?;
+            BooleanList::_new(Bitmap::from_slice(&vec, |&x| x != 0), validity).into_py(py)
+        }
+        _ => {
+            return Err(PyValueError::new_err(
+                "Parameter dtype should be 'int', 'int32', 'int64', \
+                'float', 'float32', 'float64' or 'bool'!",
+            ));
+        }
+    };
+    Ok(res)
+}
+
+/// Read a csv file by batches of records with a persistent reader, so that
+/// the memory used is bounded by the size of a batch.
+#[pyclass]
+pub struct CsvReader {
+    _batch_size: usize,
+    // Whether the dtypes of the columns are inferred, which are promoted
+    // for the next batches once a batch has promoted them.
+    _inferred: Vec<bool>,
+    _projection: Vec<(usize, usize)>,
+    _reader: csv::Reader<File>,
+    // The records read to infer the dtypes, which are parsed by the first
+    // batches.
+    _sample: VecDeque<csv::ByteRecord>,
+    _schema: Vec<(String, String)>,
+}
+
+impl CsvReader {
+    fn _open(
+        path: String,
+        schema: Option<Vec<(String, Option<String>)>>,
+        batch_size: usize,
+        sample_size: usize,
+    ) -> PyResult<Self> {
+        let mut reader = csv::Reader::from_path(path).map_err(_io_error)?;
+        let headers = reader.headers().map_err(_io_error)?.clone();
+        let sample = _read_sample(&mut reader, schema.as_deref(), sample_size)?;
+        let (schema, inferred) = _infer_schema(&headers, schema, &sample)?;
+        Ok(CsvReader {
+            _batch_size: batch_size,
+            _inferred: inferred,
+            _projection: _projection(&headers, &schema),
+            _reader: reader,
+            _sample: sample.into(),
+            _schema: schema,
+        })
+    }
+
+    /// Parse the next `batch_size` records, or return `None` at the end of
+    /// the file.
+    fn _read_batch(&mut self) -> PyResult<Option<Vec<ColumnBuilder>>> {
+        let mut builders = _new_builders(&self._schema)?;
+        let k = min(self._sample.len(), self._batch_size);
+        for record in self._sample.drain(..k) {
+            _push_record(&record, &self._projection, &self._inferred, &mut builders)?;
+        }
+        let n = k + _read_records(
+            &mut self._reader,
+            &self._projection,
+            &self._inferred,
+            &mut builders,
+            self._batch_size - k,
+        )?;
+        for (j, x) in builders.iter().enumerate() {
+            if self._inferred[j] {
+                self._schema[j].1 = x.dtype().to_string();
+            }
+        }
+        Ok(if n == 0 { None } else { Some(builders) })
+    }
+}
+
+#[pymethods]
+impl CsvReader {
+    // Arrange the following methods in alphabetical order.
+
+    #[new]
+    fn new(
+        path: String,
+        schema: Option<Vec<(String, Option<String>)>>,
+        batch_size: usize,
+        sample_size: usize,
+    ) -> PyResult<Self> {
+        CsvReader::_open(path, schema, batch_size, sample_size)
+    }
+
+    /// Names of the fields, in the order of the lists of the batches.
+    fn names(&self) -> Vec<String> {
+        self._schema
+            .iter()
+            .map(|(field, _)| field.clone())
+            .collect()
+    }
+
+    /// Read the lists of the next `batch_size` records, or return `None` at
+    /// the end of the file.
+    fn read_batch(&mut self, py: Python) -> PyResult<Option<Vec<PyObject>>> {
+        let lists = py.allow_threads(|| -> PyResult<Option<Vec<AnyList>>> {
+            let batch = self._read_batch()?;
+            Ok(batch.map(|x| x.into_iter().map(|x| x.finish()).collect()))
+        })?;
+        Ok(lists.map(|x| x.into_iter().map(|x| x.into_py(py)).collect()))
+    }
+}
+
 /// Read `csv` from path. May fail.
-/// `schema` is a vector contains the `(field, type)` tuples.
+/// `schema` is a vector contains the `(field, type)` tuples, the types which
+/// are `None` are inferred from the first `sample_size` records, and all the
+/// fields in the header are inferred if `schema` is `None`. The file is
+/// split into chunks parsed by `n_threads` threads if `n_threads` is not 1,
+/// and 0 means all the cores. Returns the `(field, list)` tuples.
 #[pyfunction]
 pub fn read_csv(
     path: String,
-    schema: Vec<(String, String)>,
+    schema: Option<Vec<(String, Option<String>)>>,
+    n_threads: usize,
+    sample_size: usize,
     py: Python,
-) -> PyResult<Vec<PyObject>> {
-    let mut reader = match csv::Reader::from_path(path) {
-        Err(e) => return Err(PyIOError::new_err(e.to_string())),
-        Ok(reader) => reader,
+) -> PyResult<Vec<(String, PyObject)>> {
+    // Parse the file while the GIL is released, then convert the lists.
+    let lists = py.allow_threads(move || _read_csv(path, schema, n_threads, sample_size))?;
+    Ok(lists
+        .into_iter()
+        .map(|(field, x)| (field, x.into_py(py)))
+        .collect())
+}
+
+fn _read_csv(
+    path: String,
+    schema: Option<Vec<(String, Option<String>)>>,
+    n_threads: usize,
+    sample_size: usize,
+) -> PyResult<Vec<(String, AnyList)>> {
+    let columns = if n_threads == 1 {
+        let mut reader = CsvReader::_open(path, schema, usize::MAX, sample_size)?;
+        let builders = match reader._read_batch()? {
+            Some(builders) => builders,
+            None => _new_builders(&reader._schema)?,
+        };
+        reader.names().into_iter().zip(builders).collect()
+    } else {
+        _read_csv_chunks(path, schema, n_threads, sample_size)?
     };
+    Ok(columns
+        .into_iter()
+        .map(|(field, x)| (field, x.finish()))
+        .collect())
+}
+
+/// Split the records of the file into chunks, parse the chunks on a
+/// thread pool of `n_threads` threads, then concatenate them in order.
+fn _read_csv_chunks(
+    path: String,
+    schema: Option<Vec<(String, Option<String>)>>,
+    n_threads: usize,
+    sample_size: usize,
+) -> PyResult<Vec<(String, ColumnBuilder)>> {
+    let file = File::open(&path).map_err(|e| PyIOError::new_err(e.to_string()))?;
+    // The file should not be modified while it is mapped.
+    let data = unsafe { Mmap::map(&file) }.map_err(|e| PyIOError::new_err(e.to_string()))?;
 
-    // Get records from reader.
-    let mut records: HashMap<&String, Vec<String>> = HashMap::new();
-    let headers: Vec<String> = match reader.headers() {
-        Ok(headers) => headers.into_iter().map(|s| s.trim().into()).collect(),
-        Err(e) => return Err(PyIOError::new_err(e.to_string())),
+    let mut reader = csv::Reader::from_reader(&data[..]);
+    let headers = reader.headers().map_err(_io_error)?.clone();
+    let sample = _read_sample(&mut reader, schema.as_deref(), sample_size)?;
+    let (schema, inferred) = _infer_schema(&headers, schema, &sample)?;
+    let projection = _projection(&headers, &schema);
+    // The sampled records are parsed here, and the chunks start after them.
+    let mut result = _new_builders(&schema)?;
+    for record in sample.iter() {
+        _push_record(record, &projection, &inferred, &mut result)?;
+    }
+    let body = &data[reader.position().byte() as usize..];
+
+    let pool = rayon::ThreadPoolBuilder::new()
+        .num_threads(n_threads)
+        .build()
+        .map_err(|e| PyRuntimeError::new_err(e.to_string()))?;
+    let chunks = pool.install(|| {
+        // A few chunks per thread, so that the threads are kept busy when
+        // some chunks take longer.
+        let n = min(pool.current_num_threads() * 4, body.len() / CSV_MIN_CHUNK);
+        let mut ends = vec![0];
+        ends.extend(_split_records(body, max(n, 1)));
+        ends.par_windows(2)
+            .map(|w| {
+                let mut reader = csv::ReaderBuilder::new()
+                    .has_headers(false)
+                    .from_reader(&body[w[0]..w[1]]);
+                let mut builders = _new_builders(&schema)?;
+                _read_records(
+                    &mut reader,
+                    &projection,
+                    &inferred,
+                    &mut builders,
+                    usize::MAX,
+                )?;
+                Ok(builders)
+            })
+            .collect::<PyResult<Vec<_>>>()
+    })?;
+
+    for builders in chunks {
+        for (x, y) in result.iter_mut().zip(builders.into_iter()) {
+            x.extend(y);
+        }
+    }
+    Ok(schema
+        .into_iter()
+        .map(|(field, _)| field)
+        .zip(result)
+        .collect())
+}
+
+/// Narrowest dtype which both of the inferred dtypes `x` and `y` are
+/// promoted to, see `_promoted`.
+fn _common_dtype(x: &'static str, y: &'static str) -> &'static str {
+    let chain = |mut t: &'static str| {
+        let mut res = vec![t];
+        while t != "string" {
+            t = _promoted(t);
+            res.push(t);
+        }
+        res
     };
-    for record in reader.records() {
-        match record {
-            Err(e) => return Err(PyIOError::new_err(e.to_string())),
-            Ok(record) => {
-                for (idx, entry) in record.into_iter().enumerate() {
-                    let entry = &entry.trim().replace("\r\n", "\n");
-                    records
-                        .entry(&headers[idx])
-                        .and_modify(|v| v.push(entry.into()))
-                        .or_insert_with(|| vec![entry.into()]);
-                }
+    let ys = chain(y);
+    chain(x).into_iter().find(|t| ys.contains(t)).unwrap()
+}
+
+/// Whether the trimmed `field` can be parsed as `dtype`, where `float32`
+/// requires the value to be exact in 32 bits.
+fn _fits(dtype: &str, field: &str) -> bool {
+    match dtype {
+        "bool" => field.eq_ignore_ascii_case("true") || field.eq_ignore_ascii_case("false"),
+        "int32" => field.parse::<i32>().is_ok(),
+        "int64" => field.parse::<i64>().is_ok(),
+        "float32" => match (field.parse::<f32>(), field.parse::<f64>()) {
+            (Ok(x), Ok(y)) => x.is_nan() || x as f64 == y,
+            _ => false,
+        },
+        "float64" => field.parse::<f64>().is_ok(),
+        _ => true,
+    }
+}
+
+/// Infer the narrowest dtype in `INFERRED_DTYPES` which all the nonempty
+/// `fields` fit, the fields which are all empty are strings.
+fn _infer_dtype<'a>(fields: impl Iterator<Item = &'a [u8]>) -> &'static str {
+    let mut values = Vec::new();
+    for field in fields {
+        match str::from_utf8(field) {
+            Ok(x) if !x.trim().is_empty() => values.push(x.trim()),
+            Ok(_) => {}
+            Err(_) => return "string",
+        }
+    }
+    if values.is_empty() {
+        return "string";
+    }
+    INFERRED_DTYPES
+        .iter()
+        .copied()
+        .find(|t| values.iter().all(|x| _fits(t, x)))
+        .unwrap_or("string")
+}
+
+/// Complete `schema` with the dtypes inferred from the `sample` records for
+/// the fields without dtype, where `None` means all the fields in the header.
+/// Also return whether the dtypes of the fields are inferred.
+fn _infer_schema(
+    headers: &csv::StringRecord,
+    schema: Option<Vec<(String, Option<String>)>>,
+    sample: &[csv::ByteRecord],
+) -> PyResult<(Vec<(String, String)>, Vec<bool>)> {
+    let names: Vec<&str> = headers.iter().map(|x| x.trim()).collect();
+    let schema = schema.unwrap_or_else(|| names.iter().map(|x| (x.to_string(), None)).collect());
+    let inferred = schema.iter().map(|(_, t)| t.is_none()).collect();
+    let res: Vec<(String, String)> = schema
+        .into_iter()
+        .map(|(field, t)| {
+            let t = t.unwrap_or_else(|| {
+                let i = names.iter().position(|x| *x == field);
+                let fields = sample.iter().filter_map(|x| i.and_then(|i| x.get(i)));
+                _infer_dtype(fields).to_string()
+            });
+            (field, t)
+        })
+        .collect();
+    // Reject the wrong dtypes before parsing the records.
+    _new_builders(&res)?;
+    Ok((res, inferred))
+}
+
+fn _new_builders(schema: &[(String, String)]) -> PyResult<Vec<ColumnBuilder>> {
+    schema.iter().map(|(_, t)| ColumnBuilder::new(t)).collect()
+}
+
+/// Resolve the fields of `schema` to the positions in the header once, and
+/// return the `(position, column)` pairs in the order of the positions.
+/// The other fields of the records are skipped without decoding, and the
+/// fields which are not in the file get empty lists.
+fn _projection(headers: &csv::StringRecord, schema: &[(String, String)]) -> Vec<(usize, usize)> {
+    let names: Vec<&str> = headers.iter().map(|x| x.trim()).collect();
+    let mut res: Vec<(usize, usize)> = schema
+        .iter()
+        .enumerate()
+        .filter_map(|(j, (field, _))| names.iter().position(|x| x == field).map(|i| (i, j)))
+        .collect();
+    res.sort_unstable();
+    res
+}
+
+/// The wider dtype which the inferred `dtype` is promoted to, when a field
+/// after the sample does not fit it.
+fn _promoted(dtype: &str) -> &'static str {
+    match dtype {
+        "int32" => "int64",
+        "int64" | "float32" => "float64",
+        _ => "string",
+    }
+}
+
+/// Append the fields at `projection` of `record` to the `builders` of the
+/// columns. The columns of which the dtypes are `inferred` are promoted to
+/// a wider dtype if the field does not fit.
+fn _push_record(
+    record: &csv::ByteRecord,
+    projection: &[(usize, usize)],
+    inferred: &[bool],
+    builders: &mut [ColumnBuilder],
+) -> PyResult<()> {
+    for &(i, j) in projection.iter() {
+        if let Some(field) = record.get(i) {
+            if inferred[j] {
+                builders[j].push_or_promote(field)?;
+            } else {
+                builders[j].push(field)?;
             }
         }
     }
+    Ok(())
+}
+
+/// Append at most `limit` records of `reader` to the `builders`, and return
+/// the number of the records.
+fn _read_records<R: io::Read>(
+    reader: &mut csv::Reader<R>,
+    projection: &[(usize, usize)],
+    inferred: &[bool],
+    builders: &mut [ColumnBuilder],
+    limit: usize,
+) -> PyResult<usize> {
+    // The record is reused, so that reading a row allocates nothing.
+    let mut record = csv::ByteRecord::new();
+    let mut n = 0;
+    while n < limit && reader.read_byte_record(&mut record).map_err(_io_error)? {
+        _push_record(&record, projection, inferred, builders)?;
+        n += 1;
+    }
+    Ok(n)
+}
 
-    // Cast `records` to `PyObject`.
-    let mut result = Vec::new();
-    for (header, t) in schema.iter() {
-        if let Some(list) = records.remove(header) {
-            result.push(get_pylist(t, list, py)?);
-        } else {
-            result.push(get_pylist(t, Vec::new(), py)?);
+/// Read at most `sample_size` records to infer the dtypes, if `schema` is
+/// `None` or has the fields without dtype.
+fn _read_sample<R: io::Read>(
+    reader: &mut csv::Reader<R>,
+    schema: Option<&[(String, Option<String>)]>,
+    sample_size: usize,
+) -> PyResult<Vec<csv::ByteRecord>> {
+    let mut sample = Vec::new();
+    if let Some(schema) = schema {
+        if schema.iter().all(|(_, t)| t.is_some()) {
+            return Ok(sample);
         }
     }
-    Ok(result)
+    let mut record = csv::ByteRecord::new();
+    while sample.len() < sample_size && reader.read_byte_record(&mut record).map_err(_io_error)? {
+        sample.push(record.clone());
+    }
+    Ok(sample)
 }
 
-/// Get a translated `python list` from a `rust list` with the given type `t`.
-fn get_pylist(t: &str, list: Vec<String>, py: Python) -> PyResult<PyObject> {
-    let res = match t {
-        // TODO: <24-05-22, yingmanwumen> Write a macro to uncurry, for example:
-        // ```
-        // IntegerList64::new(uncurry!(parse_vstr(list)?)).into_py(py)
-        // ```
-        "int" | "int64" => {
-            let (vec, hset) = parse_vec(list, |e| e.parse())?;
-            IntegerList64::new(vec, hset).into_py(py)
+/// The states of scanning the csv bytes for the record boundaries. A
+/// quote only opens a quoted field at the start of the field, so that the
+/// literal quotes in the unquoted fields are not counted.
+#[derive(Clone, Copy, PartialEq)]
+enum _ScanState {
+    FieldStart,
+    Unquoted,
+    Quoted,
+    // A quote in a quoted field, which is either the closing quote or the
+    // first half of an escaped quote.
+    QuoteInQuoted,
+}
+
+impl _ScanState {
+    const ALL: [Self; 4] = [
+        Self::FieldStart,
+        Self::Unquoted,
+        Self::Quoted,
+        Self::QuoteInQuoted,
+    ];
+
+    fn step(self, b: u8) -> Self {
+        match (self, b) {
+            (Self::Quoted, b'"') => Self::QuoteInQuoted,
+            (Self::Quoted, _) => Self::Quoted,
+            (Self::QuoteInQuoted, b'"') => Self::Quoted,
+            (Self::FieldStart, b'"') => Self::Quoted,
+            (_, b',') | (_, b'\n') => Self::FieldStart,
+            _ => Self::Unquoted,
         }
-        "int32" => {
-            let (vec, hset) = parse_vec(list, |e| e.parse())?;
-            IntegerList32::new(vec, hset).into_py(py)
+    }
+}
+
+/// Return the end of the record which contains `bytes[start]`, where
+/// `state` is the scan state at `start`.
+fn _record_end(bytes: &[u8], start: usize, mut state: _ScanState) -> usize {
+    for (i, &b) in bytes[start..].iter().enumerate() {
+        if b == b'\n' && state != _ScanState::Quoted {
+            return start + i + 1;
         }
-        "float" | "float64" => {
-            let (vec, hset) = parse_vec(list, |e| e.parse())?;
-            FloatList64::new(vec, hset).into_py(py)
+        state = state.step(b);
+    }
+    bytes.len()
+}
+
+/// Split `bytes` into at most `n` chunks of about the same size at the
+/// record boundaries, and return the ends of the chunks. The newlines in
+/// the quoted fields are told apart by the scan state before them: the
+/// state at the end of each chunk is computed in parallel for every state
+/// at its start, and then chained from the first chunk.
+fn _split_records(bytes: &[u8], n: usize) -> Vec<usize> {
+    let starts: Vec<usize> = (0..=n).map(|i| i * bytes.len() / n).collect();
+    let maps: Vec<[_ScanState; 4]> = starts
+        .par_windows(2)
+        .map(|w| {
+            let mut map = _ScanState::ALL;
+            for &b in &bytes[w[0]..w[1]] {
+                for state in map.iter_mut() {
+                    *state = state.step(b);
+                }
+            }
+            map
+        })
+        .collect();
+    let mut ends = Vec::with_capacity(n);
+    let mut state = _ScanState::FieldStart;
+    let mut end = 0;
+    for k in 1..n {
+        state = maps[k - 1][state as usize];
+        let pos = _record_end(bytes, starts[k], state);
+        // A long record may span several chunks.
+        if pos > end {
+            ends.push(pos);
+            end = pos;
         }
-        "float32" => {
-            let (vec, hset) = parse_vec(list, |e| e.parse())?;
-            FloatList32::new(vec, hset).into_py(py)
+    }
+    if end < bytes.len() {
+        ends.push(bytes.len());
+    }
+    ends
+}
+
+/// Parse the fields of a csv column and append the values to the typed
+/// buffers directly. The empty fields are the missing values.
+enum ColumnBuilder {
+    Bool(Bitmap, Bitmap),
+    Category(StringBuffer, Bitmap),
+    Float32(Vec<f32>, Bitmap),
+    Float64(Vec<f64>, Bitmap),
+    Int32(Vec<i32>, Bitmap),
+    Int64(Vec<i64>, Bitmap),
+    String(StringBuffer, Bitmap),
+}
+
+impl ColumnBuilder {
+    fn new(t: &str) -> PyResult<Self> {
+        let validity = Bitmap::with_capacity(0);
+        let res = match t {
+            "int" | "int64" => ColumnBuilder::Int64(Vec::new(), validity),
+            "int32" => ColumnBuilder::Int32(Vec::new(), validity),
+            "float" | "float64" => ColumnBuilder::Float64(Vec::new(), validity),
+            "float32" => ColumnBuilder::Float32(Vec::new(), validity),
+            "bool" => ColumnBuilder::Bool(Bitmap::with_capacity(0), validity),
+            "category" => ColumnBuilder::Category(StringBuffer::new(), validity),
+            "string" => ColumnBuilder::String(StringBuffer::new(), validity),
+            _ => {
+                // Copied from `python/constructor.py`
+                return Err(PyValueError::new_err(
+                    "Parameter dtype should be 'int', 'int32', 'int64', \
+                    'float', 'float32', 'float64', 'bool', 'string' or 'category'!",
+                ));
+            }
+        };
+        Ok(res)
+    }
+
+    fn dtype(&self) -> &'static str {
+        match self {
+            ColumnBuilder::Bool(..) => "bool",
+            ColumnBuilder::Category(..) => "category",
+            ColumnBuilder::Float32(..) => "float32",
+            ColumnBuilder::Float64(..) => "float64",
+            ColumnBuilder::Int32(..) => "int32",
+            ColumnBuilder::Int64(..) => "int64",
+            ColumnBuilder::String(..) => "string",
         }
-        "bool" => {
-            // `to_ascii_lowercase` maps `True` to `true`
-            let (vec, hset) = parse_vec(list, |e| e.to_ascii_lowercase().parse())?;
-            BooleanList::new(vec, hset).into_py(py)
+    }
+
+    /// Append the values of `other` to self. The types of both are the same
+    /// unless they are inferred, then both are promoted to the narrowest
+    /// common type first.
+    fn extend(&mut self, mut other: Self) {
+        let dtype = _common_dtype(self.dtype(), other.dtype());
+        self.promote(dtype);
+        other.promote(dtype);
+        match (self, &other) {
+            (ColumnBuilder::Bool(x, m), ColumnBuilder::Bool(y, n)) => {
+                x.extend(y);
+                m.extend(n);
+            }
+            (ColumnBuilder::Category(x, m), ColumnBuilder::Category(y, n))
+            | (ColumnBuilder::String(x, m), ColumnBuilder::String(y, n)) => {
+                x.extend(y);
+                m.extend(n);
+            }
+            (ColumnBuilder::Float32(x, m), ColumnBuilder::Float32(y, n)) => {
+                x.extend_from_slice(y);
+                m.extend(n);
+            }
+            (ColumnBuilder::Float64(x, m), ColumnBuilder::Float64(y, n)) => {
+                x.extend_from_slice(y);
+                m.extend(n);
+            }
+            (ColumnBuilder::Int32(x, m), ColumnBuilder::Int32(y, n)) => {
+                x.extend_from_slice(y);
+                m.extend(n);
+            }
+            (ColumnBuilder::Int64(x, m), ColumnBuilder::Int64(y, n)) => {
+                x.extend_from_slice(y);
+                m.extend(n);
+            }
+            _ => unreachable!(),
         }
-        "string" => {
-            let (vec, hset) = parse_vec(list, |e| e.parse())?;
-            StringList::new(vec, hset).into_py(py)
+    }
+
+    /// Convert the buffers to a list.
+    fn finish(self) -> AnyList {
+        match self {
+            ColumnBuilder::Bool(vec, validity) => AnyList::Bool(BooleanList::_new(vec, validity)),
+            ColumnBuilder::Category(buffer, validity) => {
+                AnyList::Category(CategoryList::_encode(buffer.iter(), validity))
+            }
+            ColumnBuilder::Float32(vec, validity) => {
+                AnyList::Float32(FloatList32::_new(vec, validity))
+            }
+            ColumnBuilder::Float64(vec, validity) => {
+                AnyList::Float64(FloatList64::_new(vec, validity))
+            }
+            ColumnBuilder::Int32(vec, validity) => {
+                AnyList::Int32(IntegerList32::_new(vec, validity))
+            }
+            ColumnBuilder::Int64(vec, validity) => {
+                AnyList::Int64(IntegerList64::_new(vec, validity))
+            }
+            ColumnBuilder::String(buffer, validity) => {
+                AnyList::String(StringList::_new(buffer, validity))
+            }
         }
-        _ => {
-            // Copied from `python/constructor.py`
-            return Err(PyValueError::new_err(
-                "Parameter dtype should be 'int', 'int32', 'int64', \
-                'float', 'float32', 'float64', 'bool' or 'string'!",
-            ));
+    }
+
+    /// Convert the buffers to `dtype`, which is the same as or wider than
+    /// the type of self, see `_promoted`. The values are converted to their
+    /// text by the `string` type.
+    fn promote(&mut self, dtype: &str) {
+        if self.dtype() == dtype {
+            return;
         }
-    };
-    Ok(res)
+        let empty = ColumnBuilder::String(StringBuffer::new(), Bitmap::with_capacity(0));
+        *self = match (mem::replace(self, empty), dtype) {
+            (ColumnBuilder::Int32(vec, validity), "int64") => {
+                ColumnBuilder::Int64(vec.into_iter().map(i64::from).collect(), validity)
+            }
+            (ColumnBuilder::Int32(vec, validity), "float64") => {
+                ColumnBuilder::Float64(vec.into_iter().map(f64::from).collect(), validity)
+            }
+            (ColumnBuilder::Int64(vec, validity), "float64") => {
+                ColumnBuilder::Float64(vec.into_iter().map(|x| x as f64).collect(), validity)
+            }
+            (ColumnBuilder::Float32(vec, validity), "float64") => {
+                ColumnBuilder::Float64(vec.into_iter().map(f64::from).collect(), validity)
+            }
+            (ColumnBuilder::Bool(vec, validity), "string") => {
+                _string_builder(&vec.iter().collect::<Vec<bool>>(), validity)
+            }
+            (ColumnBuilder::Float32(vec, validity), "string") => _string_builder(&vec, validity),
+            (ColumnBuilder::Float64(vec, validity), "string") => _string_builder(&vec, validity),
+            (ColumnBuilder::Int32(vec, validity), "string") => _string_builder(&vec, validity),
+            (ColumnBuilder::Int64(vec, validity), "string") => _string_builder(&vec, validity),
+            _ => unreachable!(),
+        };
+    }
+
+    /// Trim the `field` and append the parsed value.
+    fn push(&mut self, field: &[u8]) -> PyResult<()> {
+        let field = match str::from_utf8(field) {
+            Ok(s) => s.trim(),
+            Err(e) => return Err(PyIOError::new_err(e.to_string())),
+        };
+        let valid = !field.is_empty();
+        match self {
+            ColumnBuilder::Bool(vec, validity) => {
+                vec.push(valid && _parse_bool(field)?);
+                validity.push(valid);
+            }
+            ColumnBuilder::Category(buffer, validity) | ColumnBuilder::String(buffer, validity) => {
+                if field.contains('\r') {
+                    buffer.push(&field.replace("\r\n", "\n"));
+                } else {
+                    buffer.push(field);
+                }
+                validity.push(valid);
+            }
+            ColumnBuilder::Float32(vec, validity) => _push_parsed(vec, validity, field)?,
+            ColumnBuilder::Float64(vec, validity) => _push_parsed(vec, validity, field)?,
+            ColumnBuilder::Int32(vec, validity) => _push_parsed(vec, validity, field)?,
+            ColumnBuilder::Int64(vec, validity) => _push_parsed(vec, validity, field)?,
+        }
+        Ok(())
+    }
+
+    /// Same as `push`, but promote self to a wider type until the `field`
+    /// fits, which is for the columns of the inferred types.
+    fn push_or_promote(&mut self, field: &[u8]) -> PyResult<()> {
+        loop {
+            match self.push(field) {
+                Err(e) if self.dtype() == "string" => return Err(e),
+                Err(_) => self.promote(_promoted(self.dtype())),
+                Ok(()) => return Ok(()),
+            }
+        }
+    }
+}
+
+fn _io_error(e: csv::Error) -> PyErr {
+    PyIOError::new_err(e.to_string())
 }
 
-/// Parse a `Vec<String>` to a `Vec<T>`.
-fn parse_vec<T>(
-    from: Vec<String>,
-    parse: fn(String) -> Result<T, T::Err>,
-) -> PyResult<(Vec<T>, HashSet<usize>)>
+/// Parse `true` or `false` ignoring the case, such as `True`.
+fn _parse_bool(field: &str) -> PyResult<bool> {
+    if field.eq_ignore_ascii_case("true") {
+        Ok(true)
+    } else if field.eq_ignore_ascii_case("false") {
+        Ok(false)
+    } else {
+        Err(PyTypeError::new_err(
+            "provided string was not `true` or `false`",
+        ))
+    }
+}
+
+/// Parse the trimmed `field` and append it to `vec`, the empty field is
+/// appended as a missing value.
+fn _push_parsed<T>(vec: &mut Vec<T>, validity: &mut Bitmap, field: &str) -> PyResult<()>
 where
     T: FromStr + Default,
     <T as FromStr>::Err: ToString,
 {
-    let (mut vec, mut hset) = (Vec::new(), HashSet::new());
-    for (idx, item) in from.into_iter().enumerate() {
-        if item.is_empty() {
-            hset.insert(idx);
-            vec.push(T::default());
-            continue;
-        }
-        match parse(item) {
-            Ok(s) => vec.push(s),
-            Err(e) => return Err(PyTypeError::new_err(e.to_string())),
-        }
+    if field.is_empty() {
+        vec.push(T::default());
+        validity.push(false);
+        return Ok(());
+    }
+    match field.parse() {
+        Ok(x) => vec.push(x),
+        Err(e) => return Err(PyTypeError::new_err(e.to_string())),
     }
-    Ok((vec, hset))
+    validity.push(true);
+    Ok(())
+}
+
+/// String column of the text of `vec`, where the missing values are empty.
+fn _string_builder<T: ToString>(vec: &[T], validity: Bitmap) -> ColumnBuilder {
+    let buffer = vec
+        .iter()
+        .zip(validity.iter())
+        .map(|(x, valid)| if valid { x.to_string() } else { String::new() })
+        .collect();
+    ColumnBuilder::String(buffer, validity)
+}
+
+/// Copy the elements of the buffer `obj` to a `Vec<T>`, and read the
+/// validity from the `mask` buffer. The missing values are set to `na_value`.
+fn read_buffer<T: Element>(
+    obj: &PyAny,
+    mask: Option<&PyAny>,
+    na_value: T,
+    py: Python,
+) -> PyResult<(Vec<T>, Bitmap)> {
+    let mut vec = PyBuffer::<T>::get(obj)?.to_vec(py)?;
+    let validity = match mask {
+        None => Bitmap::new(vec.len(), true),
+        Some(mask) => {
+            let mask = PyBuffer::<u8>::get(mask)?;
+            if mask.item_count() != vec.len() {
+                return Err(PyValueError::new_err(
+                    "The mask should have the same length as the values!",
+                ));
+            }
+            let validity = Bitmap::from_slice(&mask.to_vec(py)?, |&x| x == 0);
+            _fill_na(&mut vec, &validity, na_value);
+            validity
+        }
+    };
+    Ok((vec, validity))
 }
@@ -1,13 +1,22 @@
+mod arrow;
 mod base;
+mod binary;
+mod bitmap;
 mod boolean;
+mod category;
 mod control_flow;
+mod export;
+mod expr;
 mod floatings;
 mod index;
 mod integers;
 mod io;
 mod non_float;
 mod numerical;
+mod parallel;
+mod shared;
 mod string;
+mod string_buffer;
 mod types;
 use control_flow::*;
 use pyo3::prelude::*;
@@ -18,19 +27,33 @@ use pyo3::prelude::*;
 #[pymodule]
 fn ulist(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_class::<boolean::BooleanList>()?;
+    m.add_class::<category::CategoryList>()?;
     m.add_class::<floatings::FloatList32>()?;
     m.add_class::<floatings::FloatList64>()?;
     m.add_class::<integers::IntegerList32>()?;
     m.add_class::<integers::IntegerList64>()?;
     m.add_class::<string::StringList>()?;
     m.add_class::<index::IndexList>()?;
+    m.add_class::<io::CsvReader>()?;
+    m.add_function(wrap_pyfunction!(boolean::all_of, m)?)?;
+    m.add_function(wrap_pyfunction!(boolean::any_of, m)?)?;
     m.add_function(wrap_pyfunction!(integers::arange32, m)?)?;
     m.add_function(wrap_pyfunction!(integers::arange64, m)?)?;
     m.add_function(wrap_pyfunction!(select_bool, m)?)?;
     m.add_function(wrap_pyfunction!(select_float, m)?)?;
+    m.add_function(wrap_pyfunction!(select_float32, m)?)?;
     m.add_function(wrap_pyfunction!(select_int, m)?)?;
+    m.add_function(wrap_pyfunction!(select_int32, m)?)?;
     m.add_function(wrap_pyfunction!(select_string, m)?)?;
+    m.add_function(wrap_pyfunction!(arrow::from_arrow_c, m)?)?;
+    m.add_function(wrap_pyfunction!(expr::eval_expr, m)?)?;
+    m.add_function(wrap_pyfunction!(expr::eval_sum, m)?)?;
+    m.add_function(wrap_pyfunction!(binary::load, m)?)?;
+    m.add_function(wrap_pyfunction!(binary::save, m)?)?;
+    m.add_function(wrap_pyfunction!(io::from_buffer, m)?)?;
     m.add_function(wrap_pyfunction!(io::read_csv, m)?)?;
+    m.add_function(wrap_pyfunction!(parallel::get_parallel_threshold, m)?)?;
+    m.add_function(wrap_pyfunction!(parallel::set_parallel_threshold, m)?)?;
 
     Ok(())
 }
@@ -1,4 +1,5 @@
 use crate::base::List;
+use crate::bitmap::Bitmap;
 use std::collections::HashMap;
 use std::collections::HashSet;
 use std::hash::Hash;
@@ -6,23 +7,18 @@ use std::iter;
 
 pub trait NonFloatList<T>: List<T>
 where
-    T: Ord + Hash + Sized + Clone,
+    T: Ord + Hash + Sized + Clone + Send + Sync,
 {
     // Arrange the following methods in alphabetical order.
     fn counter(&self) -> HashMap<T, usize> {
         let vec = self.values();
+        let validity = self.validity();
         let mut result: HashMap<T, usize> = HashMap::new();
-        for key in vec.iter() {
+        // Exclude the na values.
+        for (key, _) in vec.iter().zip(validity.iter()).filter(|(_, valid)| *valid) {
             let val = result.entry(key.clone()).or_insert(0);
             *val += 1;
         }
-        // Exclude the count of na values.
-        if let Some(val) = result.get_mut(&self.na_value()) {
-            *val -= self.count_na();
-            if *val == 0 {
-                result.remove(&self.na_value());
-            }
-        }
         result
     }
 
@@ -45,10 +41,8 @@ where
         // Get the unique values.
         let mut dedup = HashSet::with_capacity(self.size());
         let vec = self.values();
-        for (i, val) in vec.iter().enumerate() {
-            if self.na_indexes().contains(&i) {
-                continue;
-            }
+        let validity = self.validity();
+        for (val, _) in vec.iter().zip(validity.iter()).filter(|(_, valid)| *valid) {
             dedup.insert(val);
         }
         // Copy the unique and na values to the vec.
@@ -65,10 +59,14 @@ where
             }
         };
         // Construct List.
-        let mut hset = HashSet::with_capacity(1);
-        if self.count_na() > 0 {
-            hset.insert(vec_dedup.len() - 1);
-        }
-        List::_new(vec_dedup, hset)
+        let n = vec_dedup.len();
+        let validity = {
+            if self.count_na() > 0 {
+                Bitmap::from_fn(n, |i| i + 1 < n)
+            } else {
+                Bitmap::new(n, true)
+            }
+        };
+        List::_new(vec_dedup, validity)
     }
 }
@@ -1,21 +1,130 @@
 use crate::base::List;
-use crate::base::_fill_na;
+use crate::bitmap::Bitmap;
 use crate::boolean::BooleanList;
+use crate::parallel;
 use pyo3::exceptions::PyRuntimeError;
 use pyo3::PyResult;
-use std::collections::HashSet;
+use pyo3::Python;
+use std::cell::Cell;
 use std::ops::Add;
 use std::ops::Div;
 use std::ops::Fn;
 use std::ops::Mul;
 use std::ops::Sub;
+use std::ptr;
+
+/// Statistics of the valid elements of a numerical list, which are computed
+/// in one pass and cached by the list until it is modified.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub struct Stats {
+    /// Index of the first maximum, None if all the elements are missing.
+    pub argmax: Option<usize>,
+    /// Index of the first minimum, None if all the elements are missing.
+    pub argmin: Option<usize>,
+    pub has_zero: bool,
+    /// Whether the valid elements are in ascending order and followed by
+    /// the missing values, which is the order after `sort(true)`.
+    pub is_sorted: bool,
+    /// Number of the distinct valid elements, which is only counted when
+    /// the elements are sorted.
+    pub n_unique: Option<usize>,
+}
+
+impl Stats {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn new<T: Copy + PartialOrd>(vec: &[T], validity: &Bitmap, zero: T) -> Self {
+        let mut result = Stats {
+            is_sorted: true,
+            ..Default::default()
+        };
+        let mut n_unique = 0;
+        let mut prev: Option<T> = None;
+        let mut na_seen = false;
+        for (i, (&x, valid)) in vec.iter().zip(validity.iter()).enumerate() {
+            if !valid {
+                na_seen = true;
+                continue;
+            }
+            // A NaN is replaced by any other element, and is never sorted.
+            let better = |j: Option<usize>, func: fn(&T, &T) -> bool| match j {
+                None => true,
+                Some(j) => func(&x, &vec[j]) || _is_nan(&vec[j]),
+            };
+            if better(result.argmax, T::gt) {
+                result.argmax = Some(i);
+            }
+            if better(result.argmin, T::lt) {
+                result.argmin = Some(i);
+            }
+            result.has_zero |= x == zero;
+            match prev {
+                Some(y) if y <= x => n_unique += (x != y) as usize,
+                Some(_) => result.is_sorted = false,
+                None => n_unique = !_is_nan(&x) as usize,
+            }
+            result.is_sorted &= !na_seen && !_is_nan(&x);
+            prev = Some(x);
+        }
+        if result.is_sorted {
+            result.n_unique = Some(n_unique);
+        }
+        result
+    }
+
+    /// Statistics of a sorted list with `n` valid elements, which are found
+    /// by binary searches.
+    pub fn sorted<T: Copy + PartialOrd>(vec: &[T], n: usize, zero: T) -> Self {
+        let valid = &vec[..n];
+        let i = valid.partition_point(|&x| x < zero);
+        Stats {
+            argmax: valid.last().map(|&y| valid.partition_point(|&x| x < y)),
+            argmin: if n > 0 { Some(0) } else { None },
+            has_zero: i < n && valid[i] == zero,
+            is_sorted: true,
+            n_unique: None,
+        }
+    }
+}
+
+/// Whether `x` is not equal to itself, which is only true for NaN.
+fn _is_nan<T: PartialOrd>(x: &T) -> bool {
+    x.partial_cmp(x).is_none()
+}
 
 /// Abstract List with Numerical type elements.
 pub trait NumericalList<T, U, V>: List<T>
 where
-    T: Copy + PartialOrd + Add<Output = T> + Sub<Output = T> + Mul<Output = T> + Div<Output = T>,
+    T: Copy
+        + PartialOrd
+        + Send
+        + Sync
+        + Add<Output = T>
+        + Sub<Output = T>
+        + Mul<Output = T>
+        + Div<Output = T>,
 {
     // Arrange the following methods in alphabetical order.
+
+    /// Compute the statistics while the GIL is released. They are cached
+    /// unless self is modified meanwhile, which replaces the buffers that
+    /// are shared with the snapshot.
+    fn _cache_stats(&self, py: Python)
+    where
+        Self: Send,
+    {
+        if self._stats_cell().get().is_some() {
+            return;
+        }
+        let list = self._snapshot();
+        let (stats, list) = py.allow_threads(move || (list._stats(), list));
+        if ptr::eq(&*self.values(), &*list.values())
+            && ptr::eq(&*self.validity(), &*list.validity())
+        {
+            self._stats_cell().set(Some(stats));
+        }
+    }
+
     fn _check_all_na(&self) -> PyResult<()> {
         if self.count_na() == self.size() {
             Err(PyRuntimeError::new_err(
@@ -34,47 +143,195 @@ where
         }
     }
 
-    fn _fn_num<W: Clone>(&self, func: impl Fn(T) -> W, default: W) -> Vec<W> {
-        let mut vec: Vec<_> = self.values().iter().map(|&x| func(x)).collect();
-        _fill_na(&mut vec, self.na_indexes(), default);
-        vec
+    fn _fn_num<W: Copy + Send + Sync>(
+        &self,
+        func: impl Fn(T) -> W + Send + Sync,
+        default: W,
+    ) -> Vec<W> {
+        parallel::map_valid(&self.values(), &self.validity(), default, func)
     }
 
-    fn _fn(&self, other: &Self, func: impl Fn(T, T) -> T) -> PyResult<Self> {
+    fn _fn(&self, other: &Self, func: impl Fn(T, T) -> T + Send + Sync) -> PyResult<Self> {
         self._check_len_eq(other)?;
-        let vec = self
-            .values()
-            .iter()
-            .zip(other.values().iter())
-            .map(|(&x, &y)| func(x, y))
-            .collect();
-        let hset: HashSet<usize> = self
-            .na_indexes()
-            .iter()
-            .chain(other.na_indexes().iter())
-            .copied()
-            .collect();
-        let result: Self = List::_new(vec, hset);
-        _fill_na(
-            &mut result.values_mut(),
-            result.na_indexes(),
+        let validity = self.validity().and(&other.validity());
+        let vec = parallel::zip_map_valid(
+            &self.values(),
+            &other.values(),
+            &validity,
             self.na_value(),
+            func,
         );
-        Ok(result)
+        Ok(List::_new(vec, validity))
+    }
+
+    /// Same as `_fn`, but update the elements of self in place.
+    fn _fn_assign(&self, other: &Self, func: impl Fn(T, T) -> T + Send + Sync) -> PyResult<()> {
+        self._check_len_eq(other)?;
+        let na_value = self.na_value();
+        if ptr::eq(self, other) {
+            let validity = self.validity();
+            parallel::map_valid_mut(&mut self.values_mut(), &validity, na_value, |x| func(x, x));
+            return Ok(());
+        }
+        let mut validity = self.validity_mut();
+        validity.and_assign(&other.validity());
+        parallel::zip_map_valid_mut(
+            &mut self.values_mut(),
+            &other.values(),
+            &validity,
+            na_value,
+            func,
+        );
+        Ok(())
+    }
+
+    /// Same as `_fn`, but write the result to the buffers of `out`, which
+    /// should be neither self nor other.
+    fn _fn_into<W, L>(
+        &self,
+        other: &Self,
+        out: &L,
+        na_value: W,
+        func: impl Fn(T, T) -> W + Send + Sync,
+    ) -> PyResult<()>
+    where
+        W: Copy + PartialEq + Send + Sync,
+        L: List<W>,
+    {
+        self._check_len_eq(other)?;
+        self._check_out_len(out.size())?;
+        let mut validity = out.validity_mut();
+        validity.copy_from(&self.validity());
+        validity.and_assign(&other.validity());
+        parallel::zip_map_valid_into(
+            &mut out.values_mut(),
+            &self.values(),
+            &other.values(),
+            &validity,
+            na_value,
+            func,
+        );
+        Ok(())
+    }
+
+    /// Same as `_fn_num`, but update the elements of self in place.
+    fn _fn_num_assign(&self, func: impl Fn(T) -> T + Send + Sync) {
+        let na_value = self.na_value();
+        let validity = self.validity();
+        parallel::map_valid_mut(&mut self.values_mut(), &validity, na_value, func);
+    }
+
+    /// Same as `_fn_num`, but write the result to the buffers of `out`,
+    /// which should not be self.
+    fn _fn_num_into<W, L>(
+        &self,
+        out: &L,
+        na_value: W,
+        func: impl Fn(T) -> W + Send + Sync,
+    ) -> PyResult<()>
+    where
+        W: Copy + PartialEq + Send + Sync,
+        L: List<W>,
+    {
+        self._check_out_len(out.size())?;
+        let mut validity = out.validity_mut();
+        validity.copy_from(&self.validity());
+        parallel::map_valid_into(
+            &mut out.values_mut(),
+            &self.values(),
+            &validity,
+            na_value,
+            func,
+        );
+        Ok(())
+    }
+
+    /// Write the result of `_fn_num` to `out`, which may be self.
+    fn _fn_num_to(&self, out: &Self, func: impl Fn(T) -> T + Send + Sync) -> PyResult<()> {
+        if ptr::eq(self, out) {
+            self._fn_num_assign(func);
+            Ok(())
+        } else {
+            self._fn_num_into(out, self.na_value(), func)
+        }
+    }
+
+    /// Write the result of `_fn` to `out`, which may be self or other.
+    fn _fn_to(
+        &self,
+        other: &Self,
+        out: &Self,
+        func: impl Fn(T, T) -> T + Send + Sync,
+    ) -> PyResult<()> {
+        if ptr::eq(self, out) {
+            self._fn_assign(other, func)
+        } else if ptr::eq(other, out) {
+            other._fn_assign(self, move |y, x| func(x, y))
+        } else {
+            self._fn_into(other, out, self.na_value(), func)
+        }
+    }
+
+    /// The cached statistics, which are computed by the first call after
+    /// the list is modified.
+    fn _stats(&self) -> Stats {
+        if let Some(stats) = self._stats_cell().get() {
+            return stats;
+        }
+        // The na value of the numerical lists is zero.
+        let stats = Stats::new(&self.values(), &self.validity(), self.na_value());
+        self._stats_cell().set(Some(stats));
+        stats
+    }
+
+    fn _stats_cell(&self) -> &Cell<Option<Stats>>;
+
+    /// Unique elements of a sorted list, which only skips the consecutive
+    /// duplicates.
+    fn _unique_sorted(&self) -> Self {
+        let n = self.size() - self.count_na();
+        let mut vec: Vec<T> = Vec::with_capacity(self._stats().n_unique.unwrap_or(0) + 1);
+        for &x in self.values()[..n].iter() {
+            if vec.last() != Some(&x) {
+                vec.push(x);
+            }
+        }
+        let mut validity = Bitmap::new(vec.len(), true);
+        if n < self.size() {
+            vec.push(self.na_value());
+            validity.push(false);
+        }
+        List::_new(vec, validity)
     }
 
     fn add(&self, other: &Self) -> PyResult<Self> {
         self._fn(other, |x, y| x + y)
     }
 
+    fn add_into(&self, other: &Self, out: &Self) -> PyResult<()> {
+        self._fn_to(other, out, |x, y| x + y)
+    }
+
     fn add_scala(&self, elem: T) -> Self {
-        let hset = self.na_indexes().clone();
-        List::_new(self._fn_num(|x| x + elem, self.na_value()), hset)
+        let validity = self.validity().clone();
+        List::_new(self._fn_num(|x| x + elem, self.na_value()), validity)
+    }
+
+    fn add_scala_into(&self, elem: T, out: &Self) -> PyResult<()> {
+        self._fn_num_to(out, |x| x + elem)
     }
 
-    fn argmax(&self) -> PyResult<usize>;
+    fn argmax(&self) -> PyResult<usize> {
+        self._check_empty()?;
+        self._check_all_na()?;
+        Ok(self._stats().argmax.unwrap())
+    }
 
-    fn argmin(&self) -> PyResult<usize>;
+    fn argmin(&self) -> PyResult<usize> {
+        self._check_empty()?;
+        self._check_all_na()?;
+        Ok(self._stats().argmin.unwrap())
+    }
 
     fn div(&self, other: &Self) -> PyResult<Vec<V>>;
 
@@ -84,59 +341,95 @@ where
         self._cmp(other, |x, y| x >= y)
     }
 
+    fn greater_than_or_equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        self._cmp_into(other, out, |x, y| x >= y)
+    }
+
     fn greater_than_or_equal_scala(&self, elem: T) -> BooleanList {
-        let hset = self.na_indexes().clone();
-        BooleanList::new(self._fn_num(|x| x >= elem, false), hset)
+        self._fn_mask(|&x| x >= elem)
+    }
+
+    fn greater_than_or_equal_scala_into(&self, elem: T, out: &BooleanList) -> PyResult<()> {
+        self._fn_mask_into(out, |&x| x >= elem)
     }
 
     fn greater_than(&self, other: &Self) -> PyResult<BooleanList> {
         self._cmp(other, |x, y| x > y)
     }
 
+    fn greater_than_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        self._cmp_into(other, out, |x, y| x > y)
+    }
+
     fn greater_than_scala(&self, elem: T) -> BooleanList {
-        let hset = self.na_indexes().clone();
-        BooleanList::new(self._fn_num(|x| x > elem, false), hset)
+        self._fn_mask(|&x| x > elem)
     }
 
-    fn has_zero(&self) -> bool{
-        let y = self.na_value();
-        for (i, &x) in self.values().iter().enumerate(){
-            if !self.na_indexes().contains(&i) && x == y{
-                return true;
-            }
-        }
-        return false;
+    fn greater_than_scala_into(&self, elem: T, out: &BooleanList) -> PyResult<()> {
+        self._fn_mask_into(out, |&x| x > elem)
+    }
+
+    fn has_zero(&self) -> bool {
+        self._stats().has_zero
     }
 
     fn less_than_or_equal(&self, other: &Self) -> PyResult<BooleanList> {
         self._cmp(other, |x, y| x <= y)
     }
 
+    fn less_than_or_equal_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        self._cmp_into(other, out, |x, y| x <= y)
+    }
+
     fn less_than_or_equal_scala(&self, elem: T) -> BooleanList {
-        let hset = self.na_indexes().clone();
-        BooleanList::new(self._fn_num(|x| x <= elem, false), hset)
+        self._fn_mask(|&x| x <= elem)
+    }
+
+    fn less_than_or_equal_scala_into(&self, elem: T, out: &BooleanList) -> PyResult<()> {
+        self._fn_mask_into(out, |&x| x <= elem)
     }
 
     fn less_than(&self, other: &Self) -> PyResult<BooleanList> {
         self._cmp(other, |x, y| x < y)
     }
 
+    fn less_than_into(&self, other: &Self, out: &BooleanList) -> PyResult<()> {
+        self._cmp_into(other, out, |x, y| x < y)
+    }
+
     fn less_than_scala(&self, elem: T) -> BooleanList {
-        let hset = self.na_indexes().clone();
-        BooleanList::new(self._fn_num(|x| x < elem, false), hset)
+        self._fn_mask(|&x| x < elem)
+    }
+
+    fn less_than_scala_into(&self, elem: T, out: &BooleanList) -> PyResult<()> {
+        self._fn_mask_into(out, |&x| x < elem)
     }
 
-    fn max(&self) -> PyResult<T>;
+    fn max(&self) -> PyResult<T> {
+        let i = self.argmax()?;
+        Ok(self.values()[i])
+    }
 
-    fn min(&self) -> PyResult<T>;
+    fn min(&self) -> PyResult<T> {
+        let i = self.argmin()?;
+        Ok(self.values()[i])
+    }
 
     fn mul(&self, other: &Self) -> PyResult<Self> {
         self._fn(other, |x, y| x * y)
     }
 
+    fn mul_into(&self, other: &Self, out: &Self) -> PyResult<()> {
+        self._fn_to(other, out, |x, y| x * y)
+    }
+
     fn mul_scala(&self, elem: T) -> Self {
-        let hset = self.na_indexes().clone();
-        List::_new(self._fn_num(|x| x * elem, self.na_value()), hset)
+        let validity = self.validity().clone();
+        List::_new(self._fn_num(|x| x * elem, self.na_value()), validity)
+    }
+
+    fn mul_scala_into(&self, elem: T, out: &Self) -> PyResult<()> {
+        self._fn_num_to(out, |x| x * elem)
     }
 
     fn pow_scala(&self, elem: U) -> Self;
@@ -145,9 +438,17 @@ where
         self._fn(other, |x, y| x - y)
     }
 
+    fn sub_into(&self, other: &Self, out: &Self) -> PyResult<()> {
+        self._fn_to(other, out, |x, y| x - y)
+    }
+
     fn sub_scala(&self, elem: T) -> Self {
-        let hset = self.na_indexes().clone();
-        List::_new(self._fn_num(|x| x - elem, self.na_value()), hset)
+        let validity = self.validity().clone();
+        List::_new(self._fn_num(|x| x - elem, self.na_value()), validity)
+    }
+
+    fn sub_scala_into(&self, elem: T, out: &Self) -> PyResult<()> {
+        self._fn_num_to(out, |x| x - elem)
     }
 
     // There is no elegant way to implement the sum method here, and have to
@@ -0,0 +1,367 @@
+use crate::bitmap::Bitmap;
+use crate::bitmap::_n_words;
+use crate::bitmap::WORD_BITS;
+use pyo3::prelude::*;
+use rayon::prelude::*;
+use std::cmp::min;
+use std::mem::MaybeUninit;
+use std::sync::atomic::AtomicUsize;
+use std::sync::atomic::Ordering;
+
+/// The lists shorter than the threshold are processed by the current
+/// thread, since splitting the work costs more than it saves for them.
+static THRESHOLD: AtomicUsize = AtomicUsize::new(100_000);
+
+/// Minimum number of elements processed by one task of the thread pool.
+const MIN_LEN: usize = 4096;
+
+/// Size of the lists from which the element-wise kernels are run on all
+/// the cores.
+#[pyfunction]
+pub fn get_parallel_threshold() -> usize {
+    THRESHOLD.load(Ordering::Relaxed)
+}
+
+#[pyfunction]
+pub fn set_parallel_threshold(threshold: usize) {
+    THRESHOLD.store(threshold, Ordering::Relaxed);
+}
+
+/// Fill a vector of `len` elements by chunks of `WORD_BITS` elements, on
+/// the thread pool for long vectors. `func(k, slots)` should write all the
+/// slots of the `k`-th chunk.
+fn _fill_chunks<U: Send>(
+    len: usize,
+    func: impl Fn(usize, &mut [MaybeUninit<U>]) + Send + Sync,
+) -> Vec<U> {
+    let mut vec = Vec::with_capacity(len);
+    _for_chunks(&mut vec.spare_capacity_mut()[..len], func);
+    // All the `len` slots have been written.
+    unsafe { vec.set_len(len) };
+    vec
+}
+
+/// Call `func(k, chunk)` for the `k`-th chunk of `WORD_BITS` slots, on the
+/// thread pool for long slices.
+fn _for_chunks<S: Send>(slots: &mut [S], func: impl Fn(usize, &mut [S]) + Send + Sync) {
+    if _is_parallel(slots.len()) {
+        slots
+            .par_chunks_mut(WORD_BITS)
+            .with_min_len(MIN_LEN / WORD_BITS)
+            .enumerate()
+            .for_each(|(k, chunk)| func(k, chunk));
+    } else {
+        for (k, chunk) in slots.chunks_mut(WORD_BITS).enumerate() {
+            func(k, chunk);
+        }
+    }
+}
+
+pub fn _is_parallel(len: usize) -> bool {
+    len >= get_parallel_threshold()
+}
+
+/// Overwrite `words` with the bits of `func(i)` for `i` in `0..len`.
+fn _pack_words(words: &mut [u64], len: usize, func: impl Fn(usize) -> bool + Send + Sync) {
+    debug_assert_eq!(words.len(), _n_words(len));
+    let word = |k: usize| {
+        let start = k * WORD_BITS;
+        let end = min(start + WORD_BITS, len);
+        (start..end).fold(0, |acc, i| acc | ((func(i) as u64) << (i - start)))
+    };
+    if _is_parallel(len) {
+        words
+            .par_iter_mut()
+            .with_min_len(MIN_LEN / WORD_BITS)
+            .enumerate()
+            .for_each(|(k, w)| *w = word(k));
+    } else {
+        for (k, w) in words.iter_mut().enumerate() {
+            *w = word(k);
+        }
+    }
+}
+
+/// Update the elements `x` of a chunk to `func(i, x)`, or `na_value` where
+/// the `i`-th bit of `word` is unset, like `_write_valid`.
+#[inline]
+fn _update_valid<T: Copy>(chunk: &mut [T], word: u64, na_value: T, func: impl Fn(usize, T) -> T) {
+    let full = u64::MAX >> (WORD_BITS - chunk.len());
+    if word & full == full {
+        for (i, x) in chunk.iter_mut().enumerate() {
+            *x = func(i, *x);
+        }
+    } else {
+        for (i, x) in chunk.iter_mut().enumerate() {
+            let valid = (word >> i) & 1 == 1;
+            *x = if valid { func(i, *x) } else { na_value };
+        }
+    }
+}
+
+/// Slot of the result of a kernel, which is either uninitialized or
+/// overwritten.
+trait Slot<U> {
+    fn put(&mut self, x: U);
+}
+
+impl<U> Slot<U> for MaybeUninit<U> {
+    #[inline]
+    fn put(&mut self, x: U) {
+        self.write(x);
+    }
+}
+
+impl<U> Slot<U> for U {
+    #[inline]
+    fn put(&mut self, x: U) {
+        *self = x;
+    }
+}
+
+/// Write `results` to the slots, or `na_value` where the bit of `word` is
+/// unset. The bits are checked by select instead of branches, and not at all
+/// when they are all set, so that the loops can be auto-vectorized.
+#[inline]
+fn _write_valid<U: Copy>(
+    slots: &mut [impl Slot<U>],
+    word: u64,
+    na_value: U,
+    results: impl Iterator<Item = U>,
+) {
+    let full = u64::MAX >> (WORD_BITS - slots.len());
+    if word & full == full {
+        for (slot, x) in slots.iter_mut().zip(results) {
+            slot.put(x);
+        }
+    } else {
+        for (i, (slot, x)) in slots.iter_mut().zip(results).enumerate() {
+            let valid = (word >> i) & 1 == 1;
+            slot.put(if valid { x } else { na_value });
+        }
+    }
+}
+
+/// Map the elements of `vec` by `func`. The work is split across the thread
+/// pool for long slices, and the results are in the order of `vec` anyway.
+pub fn map<T: Sync, U: Send>(vec: &[T], func: impl Fn(&T) -> U + Send + Sync) -> Vec<U> {
+    if _is_parallel(vec.len()) {
+        vec.par_iter().with_min_len(MIN_LEN).map(func).collect()
+    } else {
+        vec.iter().map(func).collect()
+    }
+}
+
+/// Map the valid elements of `vec` by `func`, and set the missing values to
+/// `na_value` in the same pass.
+pub fn map_valid<T: Copy + Sync, U: Copy + Send + Sync>(
+    vec: &[T],
+    validity: &Bitmap,
+    na_value: U,
+    func: impl Fn(T) -> U + Send + Sync,
+) -> Vec<U> {
+    debug_assert_eq!(vec.len(), validity.len());
+    let words = validity.words();
+    _fill_chunks(vec.len(), |k, slots| {
+        let start = k * WORD_BITS;
+        let results = vec[start..start + slots.len()].iter().map(|&x| func(x));
+        _write_valid(slots, words[k], na_value, results);
+    })
+}
+
+/// Like `map_valid`, but overwrite `out` instead of allocating the results.
+pub fn map_valid_into<T: Copy + Sync, U: Copy + Send + Sync>(
+    out: &mut [U],
+    vec: &[T],
+    validity: &Bitmap,
+    na_value: U,
+    func: impl Fn(T) -> U + Send + Sync,
+) {
+    debug_assert!(out.len() == vec.len() && vec.len() == validity.len());
+    let words = validity.words();
+    _for_chunks(out, |k, slots| {
+        let start = k * WORD_BITS;
+        let results = vec[start..start + slots.len()].iter().map(|&x| func(x));
+        _write_valid(slots, words[k], na_value, results);
+    })
+}
+
+/// Like `map_valid`, but update the elements of `vec` in place.
+pub fn map_valid_mut<T: Copy + Send + Sync>(
+    vec: &mut [T],
+    validity: &Bitmap,
+    na_value: T,
+    func: impl Fn(T) -> T + Send + Sync,
+) {
+    debug_assert_eq!(vec.len(), validity.len());
+    let words = validity.words();
+    _for_chunks(vec, |k, chunk| {
+        _update_valid(chunk, words[k], na_value, |_, x| func(x))
+    })
+}
+
+/// Pack the bits of `func(x)` for the elements `x` of `vec`. The words are
+/// filled by the thread pool for long slices.
+pub fn mask<T: Sync>(vec: &[T], func: impl Fn(&T) -> bool + Send + Sync) -> Bitmap {
+    if !_is_parallel(vec.len()) {
+        return Bitmap::from_slice(vec, func);
+    }
+    let words = vec
+        .par_chunks(WORD_BITS)
+        .with_min_len(MIN_LEN / WORD_BITS)
+        .map(|chunk| {
+            chunk
+                .iter()
+                .enumerate()
+                .fold(0, |acc, (i, x)| acc | ((func(x) as u64) << i))
+        })
+        .collect();
+    Bitmap::from_words(words, vec.len())
+}
+
+/// Pack the bits of `func(i)` for `i` in `0..len`, like `mask`.
+pub fn mask_fn(len: usize, func: impl Fn(usize) -> bool + Send + Sync) -> Bitmap {
+    if !_is_parallel(len) {
+        return Bitmap::from_fn(len, func);
+    }
+    let words = (0.._n_words(len))
+        .into_par_iter()
+        .with_min_len(MIN_LEN / WORD_BITS)
+        .map(|k| {
+            let start = k * WORD_BITS;
+            let end = min(start + WORD_BITS, len);
+            (start..end).fold(0, |acc, i| acc | ((func(i) as u64) << (i - start)))
+        })
+        .collect();
+    Bitmap::from_words(words, len)
+}
+
+/// Like `mask`, but overwrite the bits of `out` instead of allocating them.
+pub fn mask_into<T: Sync>(out: &mut Bitmap, vec: &[T], func: impl Fn(&T) -> bool + Send + Sync) {
+    debug_assert_eq!(out.len(), vec.len());
+    _pack_words(out.words_mut(), vec.len(), |i| func(&vec[i]));
+}
+
+/// Build two bitmaps of `len` bits word by word, where `func(k)` returns
+/// the `k`-th words of both. The tail bits of the words should be unset.
+pub fn unzip_words(
+    len: usize,
+    func: impl Fn(usize) -> (u64, u64) + Send + Sync,
+) -> (Bitmap, Bitmap) {
+    let n = _n_words(len);
+    let (words1, words2) = if _is_parallel(len) {
+        (0..n)
+            .into_par_iter()
+            .with_min_len(MIN_LEN / WORD_BITS)
+            .map(func)
+            .unzip()
+    } else {
+        (0..n).map(func).unzip()
+    };
+    (
+        Bitmap::from_words(words1, len),
+        Bitmap::from_words(words2, len),
+    )
+}
+
+/// Map the valid pairs of elements of `vec1` and `vec2` by `func`, like
+/// `map_valid`.
+pub fn zip_map_valid<T: Copy + Sync, U: Copy + Send + Sync>(
+    vec1: &[T],
+    vec2: &[T],
+    validity: &Bitmap,
+    na_value: U,
+    func: impl Fn(T, T) -> U + Send + Sync,
+) -> Vec<U> {
+    debug_assert!(vec1.len() == vec2.len() && vec1.len() == validity.len());
+    let words = validity.words();
+    _fill_chunks(vec1.len(), |k, slots| {
+        let (start, end) = (k * WORD_BITS, k * WORD_BITS + slots.len());
+        let results = vec1[start..end]
+            .iter()
+            .zip(vec2[start..end].iter())
+            .map(|(&x, &y)| func(x, y));
+        _write_valid(slots, words[k], na_value, results);
+    })
+}
+
+/// Like `zip_map_valid`, but overwrite `out` instead of allocating the
+/// results.
+pub fn zip_map_valid_into<T: Copy + Sync, U: Copy + Send + Sync>(
+    out: &mut [U],
+    vec1: &[T],
+    vec2: &[T],
+    validity: &Bitmap,
+    na_value: U,
+    func: impl Fn(T, T) -> U + Send + Sync,
+) {
+    debug_assert!(out.len() == vec1.len() && vec1.len() == vec2.len());
+    debug_assert_eq!(vec1.len(), validity.len());
+    let words = validity.words();
+    _for_chunks(out, |k, slots| {
+        let (start, end) = (k * WORD_BITS, k * WORD_BITS + slots.len());
+        let results = vec1[start..end]
+            .iter()
+            .zip(vec2[start..end].iter())
+            .map(|(&x, &y)| func(x, y));
+        _write_valid(slots, words[k], na_value, results);
+    })
+}
+
+/// Like `zip_map_valid`, but update the elements of `vec1` in place.
+pub fn zip_map_valid_mut<T: Copy + Send + Sync>(
+    vec1: &mut [T],
+    vec2: &[T],
+    validity: &Bitmap,
+    na_value: T,
+    func: impl Fn(T, T) -> T + Send + Sync,
+) {
+    debug_assert!(vec1.len() == vec2.len() && vec1.len() == validity.len());
+    let words = validity.words();
+    _for_chunks(vec1, |k, chunk| {
+        let other = &vec2[k * WORD_BITS..k * WORD_BITS + chunk.len()];
+        _update_valid(chunk, words[k], na_value, |i, x| func(x, other[i]))
+    })
+}
+
+/// Pack the bits of `func(x, y)` for the pairs of elements of `vec1` and
+/// `vec2`, like `mask`.
+pub fn zip_mask<T: Sync>(
+    vec1: &[T],
+    vec2: &[T],
+    func: impl Fn(&T, &T) -> bool + Send + Sync,
+) -> Bitmap {
+    debug_assert_eq!(vec1.len(), vec2.len());
+    let word = |(chunk1, chunk2): (&[T], &[T])| {
+        chunk1
+            .iter()
+            .zip(chunk2.iter())
+            .enumerate()
+            .fold(0, |acc, (i, (x, y))| acc | ((func(x, y) as u64) << i))
+    };
+    let words = if _is_parallel(vec1.len()) {
+        vec1.par_chunks(WORD_BITS)
+            .zip(vec2.par_chunks(WORD_BITS))
+            .with_min_len(MIN_LEN / WORD_BITS)
+            .map(word)
+            .collect()
+    } else {
+        vec1.chunks(WORD_BITS)
+            .zip(vec2.chunks(WORD_BITS))
+            .map(word)
+            .collect()
+    };
+    Bitmap::from_words(words, vec1.len())
+}
+
+/// Like `zip_mask`, but overwrite the bits of `out` instead of allocating
+/// them.
+pub fn zip_mask_into<T: Sync>(
+    out: &mut Bitmap,
+    vec1: &[T],
+    vec2: &[T],
+    func: impl Fn(&T, &T) -> bool + Send + Sync,
+) {
+    debug_assert!(out.len() == vec1.len() && vec1.len() == vec2.len());
+    _pack_words(out.words_mut(), vec1.len(), |i| func(&vec1[i], &vec2[i]));
+}
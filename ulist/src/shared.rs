@@ -0,0 +1,406 @@
+use crate::bitmap::Bitmap;
+use crate::string_buffer::StringBuffer;
+use std::any::Any;
+use std::cell::Ref;
+use std::cell::RefCell;
+use std::cell::RefMut;
+use std::fmt;
+use std::slice;
+use std::sync::Arc;
+use std::sync::Mutex;
+
+/// Find the element at `index` of the chunks with the lengths `lens`, which
+/// is returned as the index of its chunk and its index in the chunk.
+pub fn _locate(lens: impl Iterator<Item = usize>, mut index: usize) -> (usize, usize) {
+    for (i, len) in lens.enumerate() {
+        if index < len {
+            return (i, index);
+        }
+        index -= len;
+    }
+    unreachable!("The index should be checked first!")
+}
+
+/// Buffers which can be stored as chunks.
+pub trait Chunk: Clone {
+    /// Concatenate the chunks into one buffer.
+    fn concat(chunks: &[Arc<Self>]) -> Self;
+
+    fn len(&self) -> usize;
+}
+
+impl Chunk for Bitmap {
+    fn concat(chunks: &[Arc<Self>]) -> Self {
+        let len = chunks.iter().map(|x| x.len()).sum();
+        let mut result = Bitmap::with_capacity(len);
+        for chunk in chunks.iter() {
+            result.extend(chunk);
+        }
+        result
+    }
+
+    fn len(&self) -> usize {
+        Bitmap::len(self)
+    }
+}
+
+impl Chunk for StringBuffer {
+    fn concat(chunks: &[Arc<Self>]) -> Self {
+        let len = chunks.iter().map(|x| x.len()).sum();
+        let n_bytes = chunks.iter().map(|x| x.bytes().len()).sum();
+        let mut result = StringBuffer::with_capacity(len, n_bytes);
+        for chunk in chunks.iter() {
+            result.extend(chunk);
+        }
+        result
+    }
+
+    fn len(&self) -> usize {
+        StringBuffer::len(self)
+    }
+}
+
+/// The chunks of a handle. A chunked handle sees the first `len` chunks of
+/// a list, which is shared with the handles it is concatenated from. The
+/// list only grows, so that `concat` appends to it in place unless another
+/// handle has appended to it already, like `append` of a Go slice. Thus a
+/// chain of `concat` costs linear time for the number of the chunks.
+///
+/// A handle keeps the whole list alive, including the chunks which the other
+/// handles appended past its `len`, until it is compacted or dropped.
+#[derive(Clone, Debug)]
+enum _Chunks<C> {
+    One(C),
+    Many(Arc<Mutex<Vec<C>>>, usize),
+}
+
+impl<C: Clone> _Chunks<C> {
+    // Arrange the following methods in alphabetical order.
+
+    fn concat(&self, other: &Self) -> Self {
+        // Copied first, since other may share the list of self.
+        let tail = other.with_chunks(|x| x.to_vec());
+        if let _Chunks::Many(list, len) = self {
+            let mut vec = list.lock().unwrap();
+            if vec.len() == *len {
+                vec.extend(tail);
+                return _Chunks::Many(list.clone(), vec.len());
+            }
+        }
+        let mut vec = self.with_chunks(|x| x.to_vec());
+        vec.extend(tail);
+        let len = vec.len();
+        _Chunks::Many(Arc::new(Mutex::new(vec)), len)
+    }
+
+    fn one(&self) -> &C {
+        match self {
+            _Chunks::One(x) => x,
+            _Chunks::Many(..) => unreachable!("The chunks should be compacted first!"),
+        }
+    }
+
+    fn one_mut(&mut self) -> &mut C {
+        match self {
+            _Chunks::One(x) => x,
+            _Chunks::Many(..) => unreachable!("The chunks should be compacted first!"),
+        }
+    }
+
+    fn with_chunks<R>(&self, func: impl FnOnce(&[C]) -> R) -> R {
+        match self {
+            _Chunks::One(x) => func(slice::from_ref(x)),
+            _Chunks::Many(list, len) => func(&list.lock().unwrap()[..*len]),
+        }
+    }
+}
+
+/// Reference counted buffer with copy-on-write semantics. `share` returns
+/// another handle of the same buffer in O(1), and the buffer is cloned by
+/// the first `borrow_mut` of a handle while the buffer is shared.
+///
+/// The buffer may be made of chunks, so that `concat` only appends the
+/// references of the chunks. The chunks are compacted into one buffer by
+/// `rechunk`, which is called by the first borrow of the handle. The read
+/// kernels iterate the chunks by `with_chunks` instead.
+#[derive(Debug)]
+pub struct Shared<T>(RefCell<_Chunks<Arc<T>>>);
+
+impl<T: Chunk> Shared<T> {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn new(value: T) -> Self {
+        Shared(RefCell::new(_Chunks::One(Arc::new(value))))
+    }
+
+    pub fn borrow(&self) -> Ref<T> {
+        self.rechunk();
+        Ref::map(self.0.borrow(), |x| x.one().as_ref())
+    }
+
+    /// Borrow the buffer mutably, which is cloned first if it is shared
+    /// with other handles.
+    pub fn borrow_mut(&self) -> RefMut<T> {
+        self.rechunk();
+        RefMut::map(self.0.borrow_mut(), |x| Arc::make_mut(x.one_mut()))
+    }
+
+    pub fn concat(&self, other: &Self) -> Self {
+        Shared(RefCell::new(self.0.borrow().concat(&other.0.borrow())))
+    }
+
+    /// Total length of the chunks, which does not compact them.
+    pub fn len(&self) -> usize {
+        self.0
+            .borrow()
+            .with_chunks(|x| x.iter().map(|x| x.len()).sum())
+    }
+
+    pub fn n_chunks(&self) -> usize {
+        self.0.borrow().with_chunks(|x| x.len())
+    }
+
+    pub fn rechunk(&self) {
+        // A borrowed handle is never chunked, so that `borrow_mut` below
+        // does not conflict with any borrow.
+        if let _Chunks::One(_) = *self.0.borrow() {
+            return;
+        }
+        let result = self.0.borrow().with_chunks(|x| T::concat(x));
+        *self.0.borrow_mut() = _Chunks::One(Arc::new(result));
+    }
+
+    /// Replace the buffer of self by the one of `other`.
+    pub fn replace(&self, other: Self) {
+        *self.0.borrow_mut() = other.0.into_inner();
+    }
+
+    pub fn share(&self) -> Self {
+        Shared(RefCell::new(self.0.borrow().clone()))
+    }
+
+    /// Call `func` with the chunk of the element at `index` and the index
+    /// of the element in the chunk, which does not compact the chunks.
+    pub fn with_chunk_of<R>(&self, index: usize, func: impl FnOnce(&T, usize) -> R) -> R {
+        self.with_chunks(|chunks| {
+            let (i, j) = _locate(chunks.iter().map(|x| x.len()), index);
+            func(chunks[i], j)
+        })
+    }
+
+    /// Call `func` with the chunks, which does not compact them.
+    pub fn with_chunks<R>(&self, func: impl FnOnce(&[&T]) -> R) -> R {
+        let chunks = self.0.borrow().with_chunks(|x| x.to_vec());
+        let refs: Vec<&T> = chunks.iter().map(|x| x.as_ref()).collect();
+        func(&refs)
+    }
+}
+
+/// Elements which belong to another object, such as a memory map or an
+/// imported arrow array. The owner keeps them alive and unmodified until
+/// the last handle is dropped.
+pub struct Foreign<T> {
+    ptr: *const T,
+    len: usize,
+    _owner: Arc<dyn Any + Send + Sync>,
+}
+
+// The elements are never modified through the pointer, and the owner is
+// `Send + Sync`.
+unsafe impl<T: Sync> Send for Foreign<T> {}
+unsafe impl<T: Sync> Sync for Foreign<T> {}
+
+impl<T> Foreign<T> {
+    // Arrange the following methods in alphabetical order.
+
+    fn as_slice(&self) -> &[T] {
+        if self.len == 0 {
+            return &[];
+        }
+        unsafe { slice::from_raw_parts(self.ptr, self.len) }
+    }
+
+    /// # Safety
+    ///
+    /// `ptr` should be aligned for `T` and point to `len` valid elements,
+    /// which are not modified or freed while `owner` is alive.
+    pub unsafe fn new(ptr: *const T, len: usize, owner: Arc<dyn Any + Send + Sync>) -> Self {
+        Foreign {
+            ptr,
+            len,
+            _owner: owner,
+        }
+    }
+}
+
+impl<T> fmt::Debug for Foreign<T> {
+    fn fmt(&self, f: &mut fmt::Formatter) -> fmt::Result {
+        f.debug_struct("Foreign")
+            .field("ptr", &self.ptr)
+            .field("len", &self.len)
+            .finish()
+    }
+}
+
+/// Reference counted vector, or a range of it, with copy-on-write
+/// semantics. `slice` returns a view of the same vector in O(1), and the
+/// range is copied to a vector of its own by the first `borrow_mut` of a
+/// view. The elements may also be borrowed from a foreign owner by
+/// `from_foreign`, which are copied by the first `borrow_mut` as well.
+///
+/// Like `Shared`, the vector may be made of chunks which are compacted by
+/// `rechunk`.
+#[derive(Debug)]
+pub struct SharedVec<T>(RefCell<_Chunks<_Range<T>>>);
+
+#[derive(Debug)]
+enum _Buffer<T> {
+    Foreign(Arc<Foreign<T>>),
+    Vec(Arc<Vec<T>>),
+}
+
+#[derive(Debug)]
+struct _Range<T> {
+    buffer: _Buffer<T>,
+    // None means the whole buffer.
+    range: Option<(usize, usize)>,
+}
+
+impl<T> _Range<T> {
+    fn as_slice(&self) -> &[T] {
+        let slice = match &self.buffer {
+            _Buffer::Foreign(x) => x.as_slice(),
+            _Buffer::Vec(x) => &x[..],
+        };
+        match self.range {
+            None => slice,
+            Some((start, end)) => &slice[start..end],
+        }
+    }
+
+    fn new(vec: Vec<T>) -> Self {
+        _Range {
+            buffer: _Buffer::Vec(Arc::new(vec)),
+            range: None,
+        }
+    }
+}
+
+impl<T> Clone for _Range<T> {
+    fn clone(&self) -> Self {
+        let buffer = match &self.buffer {
+            _Buffer::Foreign(x) => _Buffer::Foreign(x.clone()),
+            _Buffer::Vec(x) => _Buffer::Vec(x.clone()),
+        };
+        _Range {
+            buffer,
+            range: self.range,
+        }
+    }
+}
+
+impl<T: Clone> SharedVec<T> {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn new(vec: Vec<T>) -> Self {
+        SharedVec(RefCell::new(_Chunks::One(_Range::new(vec))))
+    }
+
+    pub fn borrow(&self) -> Ref<[T]> {
+        self.rechunk();
+        Ref::map(self.0.borrow(), |x| x.one().as_slice())
+    }
+
+    /// Borrow the vector mutably, which is cloned first if it is shared
+    /// with other handles, the handle is a view or the elements are
+    /// foreign.
+    pub fn borrow_mut(&self) -> RefMut<Vec<T>> {
+        self.rechunk();
+        let mut x = self.0.borrow_mut();
+        let chunk = x.one_mut();
+        if chunk.range.is_some() || matches!(chunk.buffer, _Buffer::Foreign(_)) {
+            *chunk = _Range::new(chunk.as_slice().to_vec());
+        }
+        RefMut::map(x, |x| match &mut x.one_mut().buffer {
+            _Buffer::Vec(vec) => Arc::make_mut(vec),
+            _Buffer::Foreign(_) => unreachable!(),
+        })
+    }
+
+    pub fn concat(&self, other: &Self) -> Self {
+        SharedVec(RefCell::new(self.0.borrow().concat(&other.0.borrow())))
+    }
+
+    /// Borrow the elements of `foreign` without copying them.
+    pub fn from_foreign(foreign: Foreign<T>) -> Self {
+        SharedVec(RefCell::new(_Chunks::One(_Range {
+            buffer: _Buffer::Foreign(Arc::new(foreign)),
+            range: None,
+        })))
+    }
+
+    /// Total length of the chunks, which does not compact them.
+    pub fn len(&self) -> usize {
+        self.0
+            .borrow()
+            .with_chunks(|x| x.iter().map(|x| x.as_slice().len()).sum())
+    }
+
+    pub fn n_chunks(&self) -> usize {
+        self.0.borrow().with_chunks(|x| x.len())
+    }
+
+    pub fn rechunk(&self) {
+        // A borrowed handle is never chunked, so that `borrow_mut` below
+        // does not conflict with any borrow.
+        if let _Chunks::One(_) = *self.0.borrow() {
+            return;
+        }
+        let vec = self.0.borrow().with_chunks(|chunks| {
+            let len = chunks.iter().map(|x| x.as_slice().len()).sum();
+            let mut vec = Vec::with_capacity(len);
+            for chunk in chunks.iter() {
+                vec.extend_from_slice(chunk.as_slice());
+            }
+            vec
+        });
+        *self.0.borrow_mut() = _Chunks::One(_Range::new(vec));
+    }
+
+    /// Replace the buffer of self by the one of `other`.
+    pub fn replace(&self, other: Self) {
+        *self.0.borrow_mut() = other.0.into_inner();
+    }
+
+    pub fn share(&self) -> Self {
+        SharedVec(RefCell::new(self.0.borrow().clone()))
+    }
+
+    /// View of the elements in `start..end` of self.
+    pub fn slice(&self, start: usize, end: usize) -> Self {
+        self.rechunk();
+        let x = self.0.borrow();
+        let chunk = x.one();
+        let offset = chunk.range.map_or(0, |(start, _)| start);
+        debug_assert!(start <= end && end <= chunk.as_slice().len());
+        SharedVec(RefCell::new(_Chunks::One(_Range {
+            buffer: chunk.clone().buffer,
+            range: Some((offset + start, offset + end)),
+        })))
+    }
+
+    /// Same as `Shared::with_chunk_of`.
+    pub fn with_chunk_of<R>(&self, index: usize, func: impl FnOnce(&[T], usize) -> R) -> R {
+        self.with_chunks(|chunks| {
+            let (i, j) = _locate(chunks.iter().map(|x| x.len()), index);
+            func(chunks[i], j)
+        })
+    }
+
+    /// Call `func` with the chunks, which does not compact them.
+    pub fn with_chunks<R>(&self, func: impl FnOnce(&[&[T]]) -> R) -> R {
+        let chunks = self.0.borrow().with_chunks(|x| x.to_vec());
+        let slices: Vec<&[T]> = chunks.iter().map(|x| x.as_slice()).collect();
+        func(&slices)
+    }
+}
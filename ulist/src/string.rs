@@ -1,29 +1,47 @@
+use crate::arrow::to_capsules;
+use crate::arrow::ArrowExport;
 use crate::base::List;
-use crate::base::_fill_na;
+use crate::base::_check_range;
+use crate::base::_flatten_bits;
+use crate::bitmap::Bitmap;
 use crate::boolean::BooleanList;
+use crate::category::CategoryList;
+use crate::export::Exports;
 use crate::floatings::FloatList32;
 use crate::floatings::FloatList64;
 use crate::index::IndexList;
 use crate::integers::IntegerList32;
 use crate::integers::IntegerList64;
-use crate::non_float::NonFloatList;
+use crate::parallel;
+use crate::shared::Shared;
+use crate::string_buffer::StringBuffer;
 use crate::types::AsBooleanList;
+use crate::types::AsCategoryList;
 use crate::types::AsFloatList32;
 use crate::types::AsFloatList64;
 use crate::types::AsIntegerList32;
 use crate::types::AsIntegerList64;
+use pyo3::exceptions::PyIndexError;
+use pyo3::exceptions::PyRuntimeError;
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+use rand::distributions::Uniform;
+use rand::Rng;
 use std::cell::Ref;
-use std::cell::RefCell;
 use std::cell::RefMut;
 use std::collections::HashMap;
 use std::collections::HashSet;
+use std::iter;
+use std::os::raw::c_void;
+use std::ptr;
 
-/// List with string type elements.
+/// List with string type elements, the strings are stored back to back in
+/// one byte buffer. The missing values are stored as empty strings.
 #[pyclass]
 pub struct StringList {
-    _values: RefCell<Vec<String>>,
-    _na_indexes: RefCell<HashSet<usize>>,
+    _values: Shared<StringBuffer>,
+    _validity: Shared<Bitmap>,
+    _exports: Exports,
 }
 
 #[pymethods]
@@ -32,193 +50,475 @@ impl StringList {
 
     #[new]
     pub fn new(vec: Vec<String>, hset: HashSet<usize>) -> Self {
-        List::_new(vec, hset)
+        let validity = Bitmap::from_na_indexes(vec.len(), &hset);
+        let values = vec
+            .iter()
+            .zip(validity.iter())
+            .map(|(x, valid)| if valid { x.as_str() } else { "" })
+            .collect();
+        StringList::_new(values, validity)
     }
 
-    pub fn all_equal(&self, other: &Self) -> Option<bool> {
-        List::all_equal(self, other)
+    pub fn all_equal(&self, other: &Self, py: Python) -> Option<bool> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || {
+            if list.size() != other.size() {
+                return Some(false);
+            }
+            let validity = list.validity().and(&other.validity());
+            let vec1 = list.values();
+            let vec2 = other.values();
+            if validity.all() {
+                // Two buffers without missing values are equal as a whole.
+                return Some(vec1.offsets() == vec2.offsets() && vec1.bytes() == vec2.bytes());
+            }
+            if validity
+                .iter_ones()
+                .any(|i| vec1.get_bytes(i) != vec2.get_bytes(i))
+            {
+                Some(false)
+            } else {
+                None
+            }
+        })
     }
 
-    pub fn append(&self, elem: Option<String>) {
-        List::append(self, elem)
+    pub fn append(&self, elem: Option<String>) -> PyResult<()> {
+        self._exports.check()?;
+        self.values_mut().push(elem.as_deref().unwrap_or(""));
+        self.validity_mut().push(elem.is_some());
+        Ok(())
     }
 
-    pub fn as_bool(&self) -> BooleanList {
-        AsBooleanList::as_bool(self)
+    pub fn as_bool(&self, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsBooleanList::as_bool(&list))
     }
 
-    pub fn as_float32(&self) -> FloatList32 {
-        AsFloatList32::as_float32(self)
+    pub fn as_category(&self, py: Python) -> CategoryList {
+        let list = self._snapshot();
+        py.allow_threads(move || AsCategoryList::as_category(&list))
     }
 
-    pub fn as_float64(&self) -> FloatList64 {
-        AsFloatList64::as_float64(self)
+    pub fn as_float32(&self, py: Python) -> FloatList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList32::as_float32(&list))
     }
 
-    pub fn as_int32(&self) -> IntegerList32 {
-        AsIntegerList32::as_int32(self)
+    pub fn as_float64(&self, py: Python) -> FloatList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsFloatList64::as_float64(&list))
     }
 
-    pub fn as_int64(&self) -> IntegerList64 {
-        AsIntegerList64::as_int64(self)
+    pub fn as_int32(&self, py: Python) -> IntegerList32 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList32::as_int32(&list))
+    }
+
+    pub fn as_int64(&self, py: Python) -> IntegerList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || AsIntegerList64::as_int64(&list))
     }
 
     #[staticmethod]
     pub fn choices(vec: Vec<String>, size: usize) -> Self {
-        List::choices(&vec, size)
+        let dist: Uniform<usize> = Uniform::from(0..vec.len());
+        let values = rand::thread_rng()
+            .sample_iter(dist)
+            .map(|x| unsafe { vec.get_unchecked(x) })
+            .take(size)
+            .collect();
+        StringList::_new(values, Bitmap::new(size, true))
     }
 
-    pub fn contains(&self, elem: &str) -> BooleanList {
-        let mut vec: Vec<_> = self.values().iter().map(|x| x.contains(elem)).collect();
-        _fill_na(&mut vec, self.na_indexes(), false);
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+    pub fn contains(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x.contains(elem)))
     }
 
     pub fn copy(&self) -> Self {
-        List::copy(self)
+        Self {
+            _values: self._values.share(),
+            _validity: self._validity.share(),
+            _exports: Exports::default(),
+        }
     }
 
     pub fn count_na(&self) -> usize {
-        List::count_na(self)
-    }
-
-    pub fn counter(&self) -> HashMap<String, usize> {
-        NonFloatList::counter(self)
+        self._validity
+            .with_chunks(|x| x.iter().map(|x| x.count_zeros()).sum())
+    }
+
+    pub fn counter(&self, py: Python) -> HashMap<String, usize> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let vec = list.values();
+            // Count the borrowed strings, and only copy the distinct ones.
+            let mut result: HashMap<&str, usize> = HashMap::new();
+            // Exclude the na values.
+            for i in list.validity().iter_ones() {
+                let val = result.entry(vec.get(i)).or_insert(0);
+                *val += 1;
+            }
+            result
+                .into_iter()
+                .map(|(k, v)| (k.to_string(), v))
+                .collect()
+        })
     }
 
     #[staticmethod]
     pub fn cycle(vec: Vec<String>, size: usize) -> Self {
-        List::cycle(&vec, size)
+        let values = vec.iter().cycle().take(size).collect();
+        StringList::_new(values, Bitmap::new(size, true))
     }
 
-    pub fn ends_with(&self, elem: &str) -> BooleanList {
-        let mut vec: Vec<_> = self.values().iter().map(|x| x.ends_with(elem)).collect();
-        _fill_na(&mut vec, self.na_indexes(), false);
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+    pub fn ends_with(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x.ends_with(elem)))
     }
 
-    pub fn equal(&self, other: &Self) -> PyResult<BooleanList> {
-        List::equal(self, other)
+    pub fn equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || list._cmp(&other, |x, y| x == y))
     }
 
-    pub fn equal_scala(&self, elem: String) -> BooleanList {
-        List::equal_scala(self, elem)
+    pub fn equal_scala(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x == elem))
     }
 
-    pub fn filter(&self, condition: &BooleanList) -> PyResult<Self> {
-        List::filter(self, condition)
+    pub fn filter(&self, condition: &BooleanList, py: Python) -> PyResult<Self> {
+        let (list, condition) = (self._snapshot(), condition._snapshot());
+        py.allow_threads(move || {
+            if list.size() != condition.size() {
+                return Err(PyRuntimeError::new_err(
+                    "The sizes of `list` and `other` should be equal!",
+                ));
+            }
+            let cond = condition.values();
+            let values = list.values().take(cond.iter_ones());
+            let self_validity = list.validity();
+            let validity = cond.iter_ones().map(|i| self_validity.get(i)).collect();
+            Ok(StringList::_new(values, validity))
+        })
     }
 
     pub fn get(&self, index: usize) -> PyResult<Option<String>> {
-        List::get(self, index)
+        if index >= self.size() {
+            Err(PyIndexError::new_err("Index out of range!"))
+        } else if self._validity.with_chunk_of(index, |x, j| x.get(j)) {
+            let elem = self
+                ._values
+                .with_chunk_of(index, |x, j| x.get(j).to_string());
+            Ok(Some(elem))
+        } else {
+            Ok(None)
+        }
+    }
+
+    pub fn get_by_indexes(&self, indexes: &IndexList, py: Python) -> PyResult<Self> {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            if indexes.back() >= list.size() {
+                return Err(PyIndexError::new_err("Index out of range!"));
+            }
+            let index_vec = indexes.values();
+            let values = list.values().take(index_vec.iter().copied());
+            let self_validity = list.validity();
+            let validity = index_vec.iter().map(|&i| self_validity.get(i)).collect();
+            Ok(StringList::_new(values, validity))
+        })
+    }
+
+    pub fn n_chunks(&self) -> usize {
+        self._values.n_chunks()
     }
 
-    pub fn get_by_indexes(&self, indexes: &IndexList) -> PyResult<Self> {
-        List::get_by_indexes(self, indexes)
+    pub fn not_equal(&self, other: &Self, py: Python) -> PyResult<BooleanList> {
+        let (list, other) = (self._snapshot(), other._snapshot());
+        py.allow_threads(move || list._cmp(&other, |x, y| x != y))
     }
 
-    pub fn not_equal(&self, other: &Self) -> PyResult<BooleanList> {
-        List::not_equal(self, other)
+    pub fn not_equal_scala(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x != elem))
     }
 
-    pub fn not_equal_scala(&self, elem: String) -> BooleanList {
-        List::not_equal_scala(self, elem)
+    pub fn pop(&self) -> PyResult<()> {
+        self._exports.check()?;
+        self.values_mut().pop();
+        self.validity_mut().pop();
+        Ok(())
     }
 
-    pub fn pop(&self) {
-        List::pop(self);
+    pub fn rechunk(&self) {
+        self._values.rechunk();
+        self._validity.rechunk();
     }
 
     #[staticmethod]
-    pub fn repeat(elem: String, size: usize) -> Self {
-        List::repeat(elem, size)
+    pub fn repeat(elem: &str, size: usize) -> Self {
+        let values = iter::repeat(elem).take(size).collect();
+        StringList::_new(values, Bitmap::new(size, true))
     }
 
-    pub fn replace(&self, old: Option<String>, new: Option<String>) {
-        List::replace(self, old, new)
+    // TODO: Test if old does not exist in self.
+    pub fn replace(&self, old: Option<String>, new: Option<String>) -> PyResult<()> {
+        self._exports.check()?;
+        if old.is_none() && new.is_none() {
+            return Ok(());
+        }
+        let old = old.as_deref();
+        let new = new.as_deref();
+        let n = self.size();
+        let (values, validity) = {
+            let vec = self.values();
+            let self_validity = self.validity();
+            let mut values = StringBuffer::with_capacity(n, vec.bytes().len());
+            let mut validity = Bitmap::with_capacity(n);
+            for (x, valid) in vec.iter().zip(self_validity.iter()) {
+                // `None` stands for the na value on both sides.
+                let mut elem = if valid { Some(x) } else { None };
+                if elem == old {
+                    elem = new;
+                }
+                values.push(elem.unwrap_or(""));
+                validity.push(elem.is_some());
+            }
+            (values, validity)
+        };
+        *self.values_mut() = values;
+        *self.validity_mut() = validity;
+        Ok(())
     }
 
     pub fn set(&self, index: usize, elem: Option<String>) -> PyResult<()> {
-        List::set(self, index, elem)
+        self._exports.check()?;
+        if index >= self.size() {
+            return Err(PyIndexError::new_err("Index out of range!"));
+        }
+        self.values_mut().set(index, elem.as_deref().unwrap_or(""));
+        self.validity_mut().set(index, elem.is_some());
+        Ok(())
     }
 
     pub fn size(&self) -> usize {
-        List::size(self)
+        self._values.len()
+    }
+
+    pub fn slice(&self, start: usize, end: usize) -> PyResult<Self> {
+        _check_range(start, end, self.size())?;
+        Ok(StringList::_new(
+            self.values().slice(start, end),
+            self.validity().slice(start, end),
+        ))
+    }
+
+    pub fn sort(&self, ascending: bool, py: Python) -> PyResult<()> {
+        self._exports.check()?;
+        // Sort a snapshot while the GIL is released, then take its buffers.
+        let snapshot = self._snapshot();
+        let list = snapshot._snapshot();
+        let mut list = py.allow_threads(move || list._sorted(ascending));
+        // Self may be modified by another thread meanwhile, which replaces
+        // the buffers shared with the snapshot. Then it is sorted again
+        // with the GIL held, so that the modification is not lost.
+        if !(ptr::eq(&*self.values(), &*snapshot.values())
+            && ptr::eq(&*self.validity(), &*snapshot.validity()))
+        {
+            list = self._snapshot()._sorted(ascending);
+        }
+        // The buffers may be exported by another thread meanwhile.
+        self._exports.check()?;
+        self._values.replace(list._values);
+        self._validity.replace(list._validity);
+        Ok(())
     }
 
-    pub fn sort(&self, ascending: bool) {
-        NonFloatList::sort(self, ascending)
+    pub fn starts_with(&self, elem: &str, py: Python) -> BooleanList {
+        let list = self._snapshot();
+        py.allow_threads(move || list._fn_mask(|x| x.starts_with(elem)))
     }
 
-    pub fn starts_with(&self, elem: &str) -> BooleanList {
-        let mut vec: Vec<_> = self.values().iter().map(|x| x.starts_with(elem)).collect();
-        _fill_na(&mut vec, self.na_indexes(), false);
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+    pub fn str_len(&self, py: Python) -> IntegerList64 {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            // The na values are empty strings, so that their lengths are 0.
+            let vec = list.values().lengths().map(|x| x as i64).collect();
+            let validity = list.validity().clone();
+            IntegerList64::_new(vec, validity)
+        })
     }
 
-    pub fn str_len(&self) -> IntegerList64 {
-        let mut vec: Vec<_> = self.values().iter().map(|x| x.len() as i64).collect();
-        _fill_na(&mut vec, self.na_indexes(), 0);
-        let hset = self.na_indexes().clone();
-        IntegerList64::new(vec, hset)
+    pub fn to_arrow_c(slf: PyRef<Self>, py: Python) -> PyResult<(PyObject, PyObject)> {
+        let export = {
+            let values = slf.values();
+            let buffers = vec![
+                values.offsets().as_ptr() as *const c_void,
+                values.bytes().as_ptr() as *const c_void,
+            ];
+            ArrowExport::new(ArrowExport::string_format(), &slf.validity(), buffers)
+        };
+        let guard = slf._exports.guard();
+        to_capsules(py, slf.into_py(py), guard, export)
     }
 
     pub fn to_list(&self) -> Vec<Option<String>> {
-        List::to_list(self)
+        self._values.with_chunks(|vec| {
+            self._validity.with_chunks(|validity| {
+                vec.iter()
+                    .flat_map(|x| x.iter())
+                    .zip(_flatten_bits(validity))
+                    .map(|(x, valid)| if valid { Some(x.to_string()) } else { None })
+                    .collect()
+            })
+        })
     }
 
     pub fn union_all(&self, other: &Self) -> Self {
-        List::union_all(self, other)
+        Self {
+            _values: self._values.concat(&other._values),
+            _validity: self._validity.concat(&other._validity),
+            _exports: Exports::default(),
+        }
     }
 
-    pub fn unique(&self) -> Self {
-        NonFloatList::unique(self)
+    pub fn unique(&self, py: Python) -> Self {
+        let list = self._snapshot();
+        py.allow_threads(move || {
+            let vec = list.values();
+            // Get the unique values.
+            let mut dedup = HashSet::with_capacity(list.size());
+            for i in list.validity().iter_ones() {
+                dedup.insert(vec.get(i));
+            }
+            // Copy the unique and na values to the buffer.
+            let mut values: StringBuffer = dedup.into_iter().collect();
+            let mut n = values.len();
+            if list.count_na() > 0 {
+                values.push("");
+                n += 1;
+            }
+            let validity = if list.count_na() > 0 {
+                Bitmap::from_fn(n, |i| i + 1 < n)
+            } else {
+                Bitmap::new(n, true)
+            };
+            StringList::_new(values, validity)
+        })
+    }
+
+    pub fn validity_buffer(&self, py: Python) -> PyObject {
+        PyBytes::new(py, &self.validity().to_bytes()).into_py(py)
     }
 }
 
-impl List<String> for StringList {
-    fn _new(vec: Vec<String>, hset: HashSet<usize>) -> Self {
+impl StringList {
+    // Arrange the following methods in alphabetical order.
+
+    /// The na values of `values` should be empty strings.
+    pub fn _new(values: StringBuffer, validity: Bitmap) -> Self {
+        debug_assert_eq!(values.len(), validity.len());
         Self {
-            _values: RefCell::new(vec),
-            _na_indexes: RefCell::new(hset),
+            _values: Shared::new(values),
+            _validity: Shared::new(validity),
+            _exports: Exports::default(),
         }
     }
 
-    fn na_indexes(&self) -> Ref<HashSet<usize>> {
-        self._na_indexes.borrow()
-    }
-
-    fn na_indexes_mut(&self) -> RefMut<HashSet<usize>> {
-        self._na_indexes.borrow_mut()
-    }
-
-    fn na_value(&self) -> String {
-        "".to_string()
+    pub fn _check_len_eq(&self, other: &Self) -> PyResult<()> {
+        if self.size() != other.size() {
+            Err(PyRuntimeError::new_err(
+                "The sizes of `self` and `other` should be equal!",
+            ))
+        } else {
+            Ok(())
+        }
     }
 
-    fn values(&self) -> Ref<Vec<String>> {
+    fn _cmp(
+        &self,
+        other: &Self,
+        func: impl Fn(&[u8], &[u8]) -> bool + Send + Sync,
+    ) -> PyResult<BooleanList> {
+        self._check_len_eq(other)?;
+        let (values1, values2) = (self.values(), other.values());
+        let (vec1, vec2) = (&*values1, &*values2);
+        let validity = self.validity().and(&other.validity());
+        let values = parallel::mask_fn(vec1.len(), |i| func(vec1.get_bytes(i), vec2.get_bytes(i)))
+            .and(&validity);
+        Ok(BooleanList::_new(values, validity))
+    }
+
+    /// Pack the results of `func` into a boolean list, the missing values
+    /// of self stay missing.
+    fn _fn_mask(&self, func: impl Fn(&str) -> bool + Send + Sync) -> BooleanList {
+        let values = self.values();
+        let vec = &*values;
+        let validity = self.validity().clone();
+        let values = parallel::mask_fn(vec.len(), |i| func(vec.get(i))).and(&validity);
+        BooleanList::_new(values, validity)
+    }
+
+    /// Copy of self to run a kernel on while the GIL is released, see
+    /// `List::_snapshot`.
+    pub fn _snapshot(&self) -> Self {
+        self.rechunk();
+        self.copy()
+    }
+
+    /// Sort self, which is a snapshot of a list.
+    fn _sorted(self, ascending: bool) -> Self {
+        let n = self.size();
+        let (values, validity) = {
+            let vec = self.values();
+            let self_validity = self.validity();
+            // Sort the indexes of the non-na elements by their bytes, which
+            // is the same order as the strings.
+            let mut indexes: Vec<usize> = self_validity.iter_ones().collect();
+            if ascending {
+                indexes.sort_unstable_by_key(|&i| vec.get_bytes(i));
+            } else {
+                indexes.sort_unstable_by(|&i, &j| vec.get_bytes(j).cmp(vec.get_bytes(i)));
+            }
+            let m = indexes.len();
+            // Put all the na elements to the right side.
+            indexes.extend(self_validity.iter_zeros());
+            (vec.take(indexes.into_iter()), Bitmap::from_fn(n, |i| i < m))
+        };
+        *self.values_mut() = values;
+        *self.validity_mut() = validity;
+        self
+    }
+
+    pub fn validity(&self) -> Ref<Bitmap> {
+        self._validity.borrow()
+    }
+
+    pub fn validity_mut(&self) -> RefMut<Bitmap> {
+        self._validity.borrow_mut()
+    }
+
+    pub fn values(&self) -> Ref<StringBuffer> {
         self._values.borrow()
     }
 
-    fn values_mut(&self) -> RefMut<Vec<String>> {
+    pub fn values_mut(&self) -> RefMut<StringBuffer> {
         self._values.borrow_mut()
     }
 }
 
-impl NonFloatList<String> for StringList {}
-
 impl AsBooleanList for StringList {
     fn as_bool(&self) -> BooleanList {
-        let vec = self
-            .values()
-            .iter()
-            .map(|x| x.parse().unwrap_or(false))
-            .collect();
-        let hset = self.na_indexes().clone();
-        BooleanList::new(vec, hset)
+        self._fn_mask(|x| x.parse().unwrap_or(false))
+    }
+}
+
+impl AsCategoryList for StringList {
+    fn as_category(&self) -> CategoryList {
+        let validity = self.validity().clone();
+        CategoryList::_encode(self.values().iter(), validity)
     }
 }
 
@@ -229,8 +529,8 @@ impl AsFloatList32 for StringList {
             .iter()
             .map(|x| x.parse().unwrap_or(0.0))
             .collect();
-        let hset = self.na_indexes().clone();
-        FloatList32::new(vec, hset)
+        let validity = self.validity().clone();
+        FloatList32::_new(vec, validity)
     }
 }
 
@@ -241,8 +541,8 @@ impl AsFloatList64 for StringList {
             .iter()
             .map(|x| x.parse().unwrap_or(0.0))
             .collect();
-        let hset = self.na_indexes().clone();
-        FloatList64::new(vec, hset)
+        let validity = self.validity().clone();
+        FloatList64::_new(vec, validity)
     }
 }
 
@@ -253,8 +553,8 @@ impl AsIntegerList32 for StringList {
             .iter()
             .map(|x| x.parse().unwrap_or(0))
             .collect();
-        let hset = self.na_indexes().clone();
-        IntegerList32::new(vec, hset)
+        let validity = self.validity().clone();
+        IntegerList32::_new(vec, validity)
     }
 }
 
@@ -265,7 +565,7 @@ impl AsIntegerList64 for StringList {
             .iter()
             .map(|x| x.parse().unwrap_or(0))
             .collect();
-        let hset = self.na_indexes().clone();
-        IntegerList64::new(vec, hset)
+        let validity = self.validity().clone();
+        IntegerList64::_new(vec, validity)
     }
 }
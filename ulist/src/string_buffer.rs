@@ -0,0 +1,162 @@
+use std::iter::FromIterator;
+use std::str;
+
+/// Strings stored back to back in one UTF-8 byte buffer.
+///
+/// The i-th string is `bytes[offsets[i]..offsets[i + 1]]`, so that there are
+/// `len + 1` offsets and the first one is always 0.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub struct StringBuffer {
+    _bytes: Vec<u8>,
+    _offsets: Vec<usize>,
+}
+
+impl StringBuffer {
+    // Arrange the following methods in alphabetical order.
+
+    pub fn new() -> Self {
+        StringBuffer {
+            _bytes: Vec::new(),
+            _offsets: vec![0],
+        }
+    }
+
+    pub fn bytes(&self) -> &[u8] {
+        &self._bytes
+    }
+
+    /// Append the strings of `other` to the end of self.
+    pub fn extend(&mut self, other: &Self) {
+        let shift = self._bytes.len();
+        self._bytes.extend_from_slice(&other._bytes);
+        self._offsets
+            .extend(other._offsets[1..].iter().map(|x| x + shift));
+    }
+
+    pub fn get(&self, index: usize) -> &str {
+        // The buffer is only ever filled with `str`, so that every string
+        // is valid UTF-8.
+        unsafe { str::from_utf8_unchecked(self.get_bytes(index)) }
+    }
+
+    pub fn get_bytes(&self, index: usize) -> &[u8] {
+        &self._bytes[self._offsets[index]..self._offsets[index + 1]]
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    pub fn iter(&self) -> impl Iterator<Item = &str> + '_ {
+        (0..self.len()).map(move |i| self.get(i))
+    }
+
+    pub fn len(&self) -> usize {
+        self._offsets.len() - 1
+    }
+
+    /// Byte length of each string.
+    pub fn lengths(&self) -> impl Iterator<Item = usize> + '_ {
+        self._offsets.windows(2).map(|x| x[1] - x[0])
+    }
+
+    pub fn offsets(&self) -> &[usize] {
+        &self._offsets
+    }
+
+    pub fn pop(&mut self) {
+        if self.is_empty() {
+            return;
+        }
+        self._offsets.pop();
+        self._bytes.truncate(self._offsets[self.len()]);
+    }
+
+    pub fn push(&mut self, elem: &str) {
+        self._bytes.extend_from_slice(elem.as_bytes());
+        self._offsets.push(self._bytes.len());
+    }
+
+    /// Replace the string at `index`, the bytes after it are shifted when
+    /// the lengths differ.
+    pub fn set(&mut self, index: usize, elem: &str) {
+        let start = self._offsets[index];
+        let end = self._offsets[index + 1];
+        self._bytes.splice(start..end, elem.bytes());
+        let old_len = end - start;
+        let new_len = elem.len();
+        if old_len != new_len {
+            for x in self._offsets[(index + 1)..].iter_mut() {
+                *x = *x + new_len - old_len;
+            }
+        }
+    }
+
+    /// Copy of the strings in `start..end`.
+    pub fn slice(&self, start: usize, end: usize) -> Self {
+        let shift = self._offsets[start];
+        StringBuffer {
+            _bytes: self._bytes[shift..self._offsets[end]].to_vec(),
+            _offsets: self._offsets[start..=end]
+                .iter()
+                .map(|x| x - shift)
+                .collect(),
+        }
+    }
+
+    /// Gather the strings at `indexes` into a new buffer.
+    pub fn take(&self, indexes: impl Iterator<Item = usize>) -> Self {
+        let mut result = StringBuffer::with_capacity(indexes.size_hint().0, 0);
+        for i in indexes {
+            result._bytes.extend_from_slice(self.get_bytes(i));
+            result._offsets.push(result._bytes.len());
+        }
+        result
+    }
+
+    /// Construct from the parts read from outside, such as a file. The
+    /// offsets should start from 0 and end at the length of the bytes, the
+    /// bytes should be valid UTF-8 and each offset should be a char boundary.
+    pub fn try_from_parts(bytes: Vec<u8>, offsets: Vec<usize>) -> Result<Self, String> {
+        if offsets.first() != Some(&0) || offsets.last() != Some(&bytes.len()) {
+            return Err("The offsets are out of the bytes!".into());
+        }
+        if offsets.windows(2).any(|x| x[0] > x[1]) {
+            return Err("The offsets should be in ascending order!".into());
+        }
+        let text = str::from_utf8(&bytes).map_err(|e| e.to_string())?;
+        if !offsets.iter().all(|&x| text.is_char_boundary(x)) {
+            return Err("The offsets should be char boundaries!".into());
+        }
+        Ok(StringBuffer {
+            _bytes: bytes,
+            _offsets: offsets,
+        })
+    }
+
+    pub fn with_capacity(len: usize, n_bytes: usize) -> Self {
+        let mut offsets = Vec::with_capacity(len + 1);
+        offsets.push(0);
+        StringBuffer {
+            _bytes: Vec::with_capacity(n_bytes),
+            _offsets: offsets,
+        }
+    }
+}
+
+impl Default for StringBuffer {
+    fn default() -> Self {
+        StringBuffer::new()
+    }
+}
+
+impl<S: AsRef<str>> FromIterator<S> for StringBuffer {
+    fn from_iter<I: IntoIterator<Item = S>>(iter: I) -> Self {
+        let iter = iter.into_iter();
+        let mut result = StringBuffer::with_capacity(iter.size_hint().0, 0);
+        for elem in iter {
+            result.push(elem.as_ref());
+        }
+        result
+    }
+}
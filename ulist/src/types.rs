@@ -1,14 +1,46 @@
 use crate::boolean::BooleanList;
+use crate::category::CategoryList;
 use crate::floatings::FloatList32;
 use crate::floatings::FloatList64;
 use crate::integers::IntegerList32;
 use crate::integers::IntegerList64;
 use crate::string::StringList;
+use pyo3::prelude::*;
+
+/// List of any type, which can be built without the GIL and converted to a
+/// `PyObject` once the GIL is acquired.
+pub enum AnyList {
+    Bool(BooleanList),
+    Category(CategoryList),
+    Float32(FloatList32),
+    Float64(FloatList64),
+    Int32(IntegerList32),
+    Int64(IntegerList64),
+    String(StringList),
+}
+
+impl IntoPy<PyObject> for AnyList {
+    fn into_py(self, py: Python) -> PyObject {
+        match self {
+            AnyList::Bool(x) => x.into_py(py),
+            AnyList::Category(x) => x.into_py(py),
+            AnyList::Float32(x) => x.into_py(py),
+            AnyList::Float64(x) => x.into_py(py),
+            AnyList::Int32(x) => x.into_py(py),
+            AnyList::Int64(x) => x.into_py(py),
+            AnyList::String(x) => x.into_py(py),
+        }
+    }
+}
 
 pub trait AsBooleanList {
     fn as_bool(&self) -> BooleanList;
 }
 
+pub trait AsCategoryList {
+    fn as_category(&self) -> CategoryList;
+}
+
 pub trait AsFloatList32 {
     fn as_float32(&self) -> FloatList32;
 }